@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+"""
+Measures the time taken to parse and serialise large unified diffs, such as
+those produced by mutation tools.
+
+Usage: python benchmarks/bench_patch.py [num_lines ...]
+"""
+from timeit import default_timer as timer
+import sys
+
+from bugzoo.core.patch import Patch
+
+
+def generate_diff(num_lines: int, num_files: int = 10) -> str:
+    """
+    Generates a unified diff with roughly a given number of lines, spread
+    across a number of files.
+    """
+    lines = []
+    hunks_per_file = max(num_lines // (num_files * 8), 1)
+    for i in range(num_files):
+        lines.append('--- src/file{}.c'.format(i))
+        lines.append('+++ src/file{}.c'.format(i))
+        for j in range(hunks_per_file):
+            start = 10 * j + 1
+            lines.append('@@ -{},6 +{},6 @@'.format(start, start))
+            lines.append(' int x{} = 0;'.format(j))
+            lines.append(' int y{} = 1;'.format(j))
+            lines.append('-  x{} = y{};'.format(j, j))
+            lines.append('+  x{} = y{} + 1;'.format(j, j))
+            lines.append(' int z{} = 2;'.format(j))
+            lines.append(' int w{} = 3;'.format(j))
+            lines.append(' return x{};'.format(j))
+    return '\n'.join(lines) + '\n'
+
+
+def main() -> None:
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1000, 10000, 100000]
+    for size in sizes:
+        diff = generate_diff(size)
+        num_lines = diff.count('\n')
+
+        time_start = timer()
+        patch = Patch.from_unidiff(diff)
+        time_parse = timer() - time_start
+
+        time_start = timer()
+        str(patch)
+        time_str = timer() - time_start
+
+        print("{:>8} lines: parse {:.4f}s, str {:.4f}s".format(num_lines,
+                                                               time_parse,
+                                                               time_str))
+
+
+if __name__ == '__main__':
+    main()
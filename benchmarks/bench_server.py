@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+"""
+Measures the throughput and latency of a running BugZoo server under
+concurrent `/exec` and `/test` traffic. A number of containers are
+provisioned for a given bug, and a number of client threads, which share a
+single client, repeatedly issue requests against those containers for a
+fixed duration.
+
+To compare server backends, launch the server with each backend in turn,
+e.g.:
+
+    bugzood --server flask
+    bugzood --server waitress --threads 32
+
+Usage: python benchmarks/bench_server.py BUG [--url URL] [--clients N]
+           [--containers N] [--duration SECONDS] [--command CMD] [--test T]
+"""
+from typing import Callable, List, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from timeit import default_timer as timer
+import argparse
+import itertools
+
+from bugzoo.client import Client
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    index = min(int(fraction * len(ordered)), len(ordered) - 1)
+    return ordered[index]
+
+
+def measure(name: str,
+            request: Callable[[int], None],
+            clients: int,
+            duration: float
+            ) -> None:
+    """
+    Repeatedly sends a request from each of a number of clients for a given
+    duration, and reports the resulting throughput and latency.
+    """
+    def worker(index: int) -> Tuple[List[float], int]:
+        latencies = []  # type: List[float]
+        failures = 0
+        time_stop = timer() + duration
+        for i in itertools.count(index, clients):
+            if timer() >= time_stop:
+                break
+            time_start = timer()
+            try:
+                request(i)
+            except Exception:
+                failures += 1
+                continue
+            latencies.append(timer() - time_start)
+        return latencies, failures
+
+    time_start = timer()
+    with ThreadPoolExecutor(max_workers=clients) as executor:
+        results = list(executor.map(worker, range(clients)))
+    time_taken = timer() - time_start
+
+    latencies = [t for (ts, _) in results for t in ts]
+    failures = sum(f for (_, f) in results)
+    if not latencies:
+        print("{:>5}: all {} requests failed".format(name, failures))
+        return
+    print("{:>5}: {:8.1f} req/s  p50 {:7.1f} ms  p95 {:7.1f} ms  "
+          "p99 {:7.1f} ms  ({} ok, {} failed)".format(
+              name,
+              len(latencies) / time_taken,
+              percentile(latencies, 0.50) * 1000,
+              percentile(latencies, 0.95) * 1000,
+              percentile(latencies, 0.99) * 1000,
+              len(latencies),
+              failures))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('bug', help='the name of the bug.')
+    parser.add_argument('--url', default='http://127.0.0.1:6060')
+    parser.add_argument('--clients', type=int, default=32)
+    parser.add_argument('--containers', type=int, default=4)
+    parser.add_argument('--duration', type=float, default=30.0)
+    parser.add_argument('--command', default='true',
+                        help='the command that should be executed by /exec.')
+    parser.add_argument('--test',
+                        help='the name of the test that should be executed by /test (default: the first test).')  # noqa: pycodestyle
+    args = parser.parse_args()
+
+    client = Client(args.url, pool_maxsize=args.clients)
+    bug = client.bugs[args.bug]
+    test = bug.tests[args.test] if args.test else next(iter(bug.tests))
+    containers = [client.containers.provision(bug)
+                  for _ in range(args.containers)]
+    try:
+        def request_exec(i: int) -> None:
+            container = containers[i % len(containers)]
+            client.containers.exec(container, args.command)
+
+        def request_test(i: int) -> None:
+            container = containers[i % len(containers)]
+            client.containers.test(container, test)
+
+        measure('exec', request_exec, args.clients, args.duration)
+        measure('test', request_test, args.clients, args.duration)
+    finally:
+        for container in containers:
+            del client.containers[container.uid]
+        client.close()
+
+
+if __name__ == '__main__':
+    main()
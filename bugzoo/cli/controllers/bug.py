@@ -165,4 +165,5 @@ class BugController(cement.Controller):
                 cov = bz.coverage.coverage(container, bug.tests)
             finally:
                 del bz.containers[container.uid]
-        print(cov)
+        with cov:
+            print(cov)
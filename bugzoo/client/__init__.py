@@ -5,6 +5,7 @@ from .bug import BugManager
 from .container import ContainerManager
 from .file import FileManager
 from .dockerm import DockerManager
+from .job import JobManager
 from ..exceptions import ConnectionFailure
 
 logger = logging.getLogger(__name__)  # type: logging.Logger
@@ -17,7 +18,8 @@ class Client(object):
     def __init__(self,
                  base_url: str = None,
                  *,
-                 timeout_connection: int = 30
+                 timeout_connection: int = 30,
+                 pool_maxsize: int = 32
                  ) -> None:
         """
         Constructs a new client for communicating with a BugZoo server.
@@ -27,6 +29,9 @@ class Client(object):
             timeout_connection: the maximum number of seconds to wait whilst
                 attempting to connect to the server before declaring the
                 connection to have failed.
+            pool_maxsize: the maximum number of connections to the server
+                that should be kept alive for reuse. Should be at least the
+                number of threads that share this client.
 
         Raises:
             ConnectionFailure: if a connection to the server could not be
@@ -34,11 +39,14 @@ class Client(object):
         """
         if base_url is None:
             base_url = "http://127.0.0.1:6060"
-        self.__api = APIClient(base_url, timeout_connection=timeout_connection)
+        self.__api = APIClient(base_url,
+                               timeout_connection=timeout_connection,
+                               pool_maxsize=pool_maxsize)
         self.__bugs = BugManager(self.__api)
         self.__containers = ContainerManager(self.__api)
         self.__files = FileManager(self.__api, self.__bugs)
         self.__docker = DockerManager(self.__api)
+        self.__jobs = JobManager(self.__api)
 
     @property
     def bugs(self) -> BugManager:
@@ -71,6 +79,19 @@ class Client(object):
     def docker(self) -> DockerManager:
         return self.__docker
 
+    @property
+    def jobs(self) -> JobManager:
+        """
+        Provides access to the background jobs on the server, which are used
+        to perform long-running operations (see, e.g.,
+        `ContainerManager.submit_coverage`).
+        """
+        return self.__jobs
+
+    def close(self) -> None:
+        """Closes all pooled connections to the server."""
+        self.__api.close()
+
     def shutdown(self) -> None:
         """Instructs the connected BugZoo server to shutdown."""
         with self.__api.post("shutdown") as r:
@@ -0,0 +1,126 @@
+"""
+This package provides an asynchronous client for BugZoo servers, built on
+asyncio and aiohttp, which mirrors the synchronous `bugzoo.client.Client`.
+Rather than occupying a thread for the duration of each call, as the
+synchronous client does, the asynchronous client allows a single process
+to drive many containers at once, with its concurrency bounded by a
+semaphore.
+
+This package requires Python 3.7 or later and the optional `aiohttp`
+dependency, which can be installed via `pip install bugzoo[async]`.
+"""
+from typing import Any, Optional
+import logging
+import sys
+
+if sys.version_info < (3, 7):
+    raise ImportError("bugzoo.client.aio requires Python 3.7 or later")
+
+from .api import AsyncAPIClient
+from .bug import BugManager
+from .container import ContainerManager
+from .file import FileManager
+from .dockerm import DockerManager
+
+logger = logging.getLogger(__name__)  # type: logging.Logger
+logger.setLevel(logging.DEBUG)
+
+__all__ = ('AsyncClient',)
+
+
+class AsyncClient(object):
+    """
+    An asynchronous client for communicating with a BugZoo server. The
+    client should be used as an asynchronous context manager, which waits
+    for the server to become ready and closes the client upon exit:
+
+        async with AsyncClient() as client:
+            bug = await client.bugs['foo']
+            container = await client.containers.provision(bug)
+    """
+    def __init__(self,
+                 base_url: Optional[str] = None,
+                 *,
+                 timeout_connection: int = 30,
+                 max_connections: int = 100,
+                 max_concurrency: Optional[int] = None
+                 ) -> None:
+        """
+        Constructs a new asynchronous client for communicating with a BugZoo
+        server.
+
+        Parameters:
+            base_url: the base URL of the BugZoo server.
+            timeout_connection: the maximum number of seconds to wait whilst
+                attempting to connect to the server before declaring the
+                connection to have failed.
+            max_connections: the maximum number of simultaneous connections
+                to the server.
+            max_concurrency: the maximum number of requests that may be in
+                flight at once (e.g., the maximum number of tests that may be
+                executed simultaneously). If unspecified, the number of
+                requests is only bounded by `max_connections`.
+        """
+        if base_url is None:
+            base_url = "http://127.0.0.1:6060"
+        self.__api = AsyncAPIClient(base_url,
+                                    timeout_connection=timeout_connection,
+                                    max_connections=max_connections,
+                                    max_concurrency=max_concurrency)
+        self.__bugs = BugManager(self.__api)
+        self.__containers = ContainerManager(self.__api)
+        self.__files = FileManager(self.__api, self.__bugs)
+        self.__docker = DockerManager(self.__api)
+
+    async def open(self) -> None:
+        """
+        Waits until the server is ready to accept requests.
+
+        Raises:
+            ConnectionFailure: if a connection to the server could not be
+                established within the timeout window.
+        """
+        await self.__api.open()
+
+    async def close(self) -> None:
+        """Closes all connections to the server."""
+        await self.__api.close()
+
+    async def __aenter__(self) -> 'AsyncClient':
+        await self.open()
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.close()
+
+    @property
+    def bugs(self) -> BugManager:
+        """
+        Provides access to the historical bugs that are registered with the
+        server.
+        """
+        return self.__bugs
+
+    @property
+    def containers(self) -> ContainerManager:
+        """
+        Provides access to the containers running on the server.
+        """
+        return self.__containers
+
+    @property
+    def files(self) -> FileManager:
+        """
+        Provides access to the file systems used by running containers.
+        """
+        return self.__files
+
+    @property
+    def docker(self) -> DockerManager:
+        return self.__docker
+
+    async def shutdown(self) -> None:
+        """Instructs the connected BugZoo server to shutdown."""
+        async with self.__api.post("shutdown") as r:
+            if r.status != 202:
+                raise Exception("failed to shutdown server")
@@ -0,0 +1,248 @@
+from typing import Any, AsyncIterator, Optional
+try:
+    from typing import NoReturn
+except ImportError:
+    from mypy_extensions import NoReturn
+from timeit import default_timer as timer
+import asyncio
+import json
+import logging
+
+import aiohttp
+import requests
+
+from ...exceptions import ConnectionFailure, UnexpectedResponse, \
+    BugZooException
+
+logger = logging.getLogger(__name__)  # type: logging.Logger
+logger.setLevel(logging.DEBUG)
+
+__all__ = ['AsyncAPIClient']
+
+# the initial and maximum number of seconds to wait between successive
+# attempts to connect to the server
+_BACKOFF_INITIAL = 0.005
+_BACKOFF_MAX = 0.5
+
+
+class _Request(object):
+    """
+    An asynchronous context manager for a single request, which holds a slot
+    of the concurrency semaphore of its client (if any) until the response
+    has been released.
+    """
+    def __init__(self,
+                 semaphore: Optional[asyncio.Semaphore],
+                 request: Any
+                 ) -> None:
+        self.__semaphore = semaphore
+        self.__request = request
+
+    async def __aenter__(self) -> aiohttp.ClientResponse:
+        if self.__semaphore is not None:
+            await self.__semaphore.acquire()
+        try:
+            return await self.__request.__aenter__()
+        except BaseException:
+            if self.__semaphore is not None:
+                self.__semaphore.release()
+            raise
+
+    async def __aexit__(self, *args: Any) -> None:
+        try:
+            await self.__request.__aexit__(*args)
+        finally:
+            if self.__semaphore is not None:
+                self.__semaphore.release()
+
+
+class AsyncAPIClient(object):
+    """
+    Provides low-level, asynchronous access to the HTTP API of a BugZoo
+    server via a single `aiohttp.ClientSession`, whose connections to the
+    server are kept alive and reused.
+
+    The client must be opened, via `open`, from within a running event loop
+    before it is used, and should be closed, via `close`, once it is no
+    longer needed. The client may be used by any number of tasks within that
+    loop; if `max_concurrency` is given, tasks beyond that limit wait for an
+    earlier request to complete before sending their own.
+    """
+    def __init__(self,
+                 base_url: str,
+                 *,
+                 timeout_connection: int = 60,
+                 max_connections: int = 100,
+                 max_concurrency: Optional[int] = None
+                 ) -> None:
+        """
+        Constructs a new client for low-level API communications with a BugZoo
+        server.
+
+        Parameters:
+            base_url: the base URL of the BugZoo server.
+            timeout_connection: the maximum number of seconds to wait whilst
+                attempting to connect to the server before declaring the
+                connection to have failed.
+            max_connections: the maximum number of simultaneous connections
+                to the server.
+            max_concurrency: the maximum number of requests that may be in
+                flight at once. If unspecified, the number of requests is
+                only bounded by `max_connections`.
+        """
+        assert timeout_connection > 0
+        assert max_connections > 0
+        assert max_concurrency is None or max_concurrency > 0
+        self.__base_url = base_url
+        self.__timeout_connection = timeout_connection
+        self.__max_connections = max_connections
+        self.__max_concurrency = max_concurrency
+        self.__semaphore = None  # type: Optional[asyncio.Semaphore]
+        self.__session = None  # type: Optional[aiohttp.ClientSession]
+
+    async def open(self) -> None:
+        """
+        Opens a session with the server, and waits until the server is ready
+        to accept requests.
+
+        Raises:
+            ConnectionFailure: if a connection to the server could not be
+                established within the timeout window.
+        """
+        assert self.__session is None
+        if self.__max_concurrency is not None:
+            self.__semaphore = asyncio.Semaphore(self.__max_concurrency)
+        connector = aiohttp.TCPConnector(limit=self.__max_connections)
+        # requests, such as those that execute tests, may legitimately take
+        # a long time to complete
+        timeout = aiohttp.ClientTimeout(total=None)
+        self.__session = aiohttp.ClientSession(connector=connector,
+                                               timeout=timeout)
+        try:
+            await self.__wait_until_ready()
+        except BaseException:
+            await self.close()
+            raise
+
+    async def __wait_until_ready(self) -> None:
+        assert self.__session is not None
+        base_url = self.__base_url
+        timeout_connection = self.__timeout_connection
+        logger.info("Attempting to establish connection to %s within %d seconds",  # noqa: pycodestyle
+                    base_url, timeout_connection)
+        url = self._url("status")
+        time_started = timer()
+        backoff = _BACKOFF_INITIAL
+        while True:
+            time_left = timeout_connection - (timer() - time_started)
+            if time_left <= 0.0:
+                logger.error("Failed to establish connection to server: %s",
+                             base_url)
+                raise ConnectionFailure
+
+            timeout = aiohttp.ClientTimeout(total=time_left)
+            try:
+                async with self.__session.get(url, timeout=timeout) as r:
+                    if r.status == 204:
+                        break
+            except aiohttp.ClientConnectionError:
+                pass
+            except asyncio.TimeoutError:
+                logger.error("Failed to establish connection to server: %s",
+                             base_url)
+                raise ConnectionFailure
+            await asyncio.sleep(min(backoff, max(time_left, 0.0)))
+            backoff = min(backoff * 2, _BACKOFF_MAX)
+        logger.info("Established connection to server: %s", base_url)
+
+    async def close(self) -> None:
+        """Closes the session with the server."""
+        if self.__session is not None:
+            await self.__session.close()
+            self.__session = None
+
+    def _url(self, path: str) -> str:
+        """Computes the URL for a given resource on the server."""
+        url = "{}/{}".format(self.__base_url, path)
+        logger.debug("transformed path [%s] into url: %s", path, url)
+        return url
+
+    async def json_lines(self,
+                         response: aiohttp.ClientResponse
+                         ) -> AsyncIterator[Any]:
+        """
+        Asynchronously yields each value in the newline-delimited JSON body
+        of a given response as soon as its line has been received. Unlike
+        iterating over the body directly, lines may be of any length.
+        """
+        buff = bytearray()
+        async for chunk in response.content.iter_any():
+            buff += chunk
+            start = 0
+            end = buff.find(b'\n')
+            while end >= 0:
+                line = bytes(buff[start:end]).strip()
+                if line:
+                    yield json.loads(line.decode('utf-8'))
+                start = end + 1
+                end = buff.find(b'\n', start)
+            del buff[:start]
+        line = bytes(buff).strip()
+        if line:
+            yield json.loads(line.decode('utf-8'))
+
+    async def handle_erroneous_response(self,
+                                        response: aiohttp.ClientResponse
+                                        ) -> NoReturn:
+        """
+        Attempts to decode an erroneous response into an exception, and to
+        subsequently throw that exception.
+
+        Raises:
+            BugZooException: the exception described by the error response.
+            UnexpectedResponse: if the response cannot be decoded to an
+                exception.
+        """
+        logger.debug("handling erroneous response: %s", response)
+        content = await response.read()
+        try:
+            err = BugZooException.from_dict(await response.json())
+        except Exception:
+            # UnexpectedResponse describes a synchronous response
+            r = requests.Response()
+            r.status_code = response.status
+            r.url = str(response.url)
+            r.encoding = response.get_encoding()
+            r._content = content
+            err = UnexpectedResponse(r)
+        raise err
+
+    def request(self, method: str, path: str, **kwargs: Any) -> _Request:
+        """
+        Sends a request to a given resource on the server. The result should
+        be used as an asynchronous context manager, which provides the
+        response and releases it upon exit.
+        """
+        assert self.__session is not None, "client has not been opened"
+        url = self._url(path)
+        logger.debug('%s: %s', method, url)
+        return _Request(self.__semaphore,
+                        self.__session.request(method, url, **kwargs))
+
+    def get(self, path: str, **kwargs: Any) -> _Request:
+        return self.request('GET', path, **kwargs)
+
+    def post(self, path: str, **kwargs: Any) -> _Request:
+        return self.request('POST', path, **kwargs)
+
+    def put(self, path: str, **kwargs: Any) -> _Request:
+        return self.request('PUT', path, **kwargs)
+
+    def head(self, path: str, **kwargs: Any) -> _Request:
+        return self.request('HEAD', path, **kwargs)
+
+    def patch(self, path: str, data: Any, **kwargs: Any) -> _Request:
+        return self.request('PATCH', path, data=data, **kwargs)
+
+    def delete(self, path: str, **kwargs: Any) -> _Request:
+        return self.request('DELETE', path, **kwargs)
@@ -0,0 +1,224 @@
+from typing import AsyncIterator, Iterable, Optional, Sequence, Dict, Any, \
+    List, Tuple
+from collections import OrderedDict
+import logging
+
+from .api import AsyncAPIClient
+from ...core.bug import Bug
+from ...core.candidate import CandidateOutcome
+from ...core.container import Container
+from ...core.coverage import TestSuiteCoverage
+from ...core.fileline import FileLine
+from ...core.patch import Patch
+from ...core.test import TestCase, TestOutcome
+from ...exceptions import BugZooException
+
+logger = logging.getLogger(__name__)  # type: logging.Logger
+logger.setLevel(logging.DEBUG)
+
+__all__ = ['BugManager']
+
+
+class BugManager(object):
+    """
+    Provides asynchronous access to the historical bugs that are registered
+    with the server.
+
+    See: `bugzoo.client.bug.BugManager`
+    """
+    def __init__(self, api: AsyncAPIClient) -> None:
+        self.__api = api
+
+    async def contains(self, name: str) -> bool:
+        """Determines whether there is a bug registered under a given name."""
+        async with self.__api.get('bugs/{}'.format(name)) as r:
+            if r.status == 200:
+                return True
+            elif r.status == 404:
+                return False
+            await self.__api.handle_erroneous_response(r)
+
+    async def __getitem__(self, name: str) -> Bug:
+        """Retrieves the bug registered under a given name.
+
+        Raises:
+            KeyError: if no bug is found with the given name.
+        """
+        logger.debug("Fetching information for bug: %s", name)
+        async with self.__api.get('bugs/{}'.format(name)) as r:
+            if r.status == 200:
+                return Bug.from_dict(await r.json())
+            if r.status == 404:
+                logger.info("Bug not found: %s", name)
+                raise KeyError("no bug found with given name: {}".format(name))
+            await self.__api.handle_erroneous_response(r)
+
+    async def delete(self, name: str) -> None:
+        """Deregisters a bug under a given name.
+
+        Raises:
+            KeyError: if no bug is found with the given name.
+        """
+        async with self.__api.delete('bugs/{}'.format(name)) as r:
+            if r.status == 204:
+                return
+            if r.status == 404:
+                raise KeyError("no bug found with given name: {}".format(name))
+            await self.__api.handle_erroneous_response(r)
+
+    async def names(self) -> List[str]:
+        """Returns the names of the bugs registered with the server."""
+        async with self.__api.get('bugs') as r:
+            if r.status == 200:
+                names = await r.json()
+                assert isinstance(names, list)
+                assert all(isinstance(n, str) for n in names)
+                return names
+            await self.__api.handle_erroneous_response(r)
+
+    async def is_installed(self, bug: Bug) -> bool:
+        """
+        Determines whether the Docker image for a given bug has been installed
+        on the server.
+        """
+        async with self.__api.get('bugs/{}/installed'.format(bug.name)) as r:
+            if r.status == 200:
+                answer = await r.json()
+                assert isinstance(answer, bool)
+                return answer
+            if r.status == 404:
+                m = "no bug found with given name: {}".format(bug.name)
+                raise KeyError(m)
+            await self.__api.handle_erroneous_response(r)
+
+    async def register(self, bug: Bug) -> None:
+        """
+        Dynamically registers a given bug with the server for the lifetime of
+        the server.
+
+        Raises:
+            BugAlreadyExists: if there is already a bug registered on the
+                server under the same name as this bug.
+        """
+        path = "bugs/{}".format(bug.name)
+        async with self.__api.put(path, json=bug.to_dict()) as r:
+            if r.status != 204:
+                await self.__api.handle_erroneous_response(r)
+
+    async def build(self, bug: Bug) -> None:
+        """
+        Instructs the server to build the Docker image associated with a given
+        bug.
+        """
+        async with self.__api.post('bugs/{}/build'.format(bug.name)) as r:
+            if r.status == 204:
+                return
+            if r.status == 404:
+                m = "no bug found with given name: {}".format(bug.name)
+                raise KeyError(m)
+            await self.__api.handle_erroneous_response(r)
+
+    async def coverage(self, bug: Bug) -> TestSuiteCoverage:
+        """Fetches the test suite coverage for a given bug."""
+        async with self.__api.get('bugs/{}/coverage'.format(bug.name)) as r:
+            if r.status == 200:
+                jsn = await r.json()
+                return TestSuiteCoverage.from_dict(jsn)  # type: ignore
+            await self.__api.handle_erroneous_response(r)
+
+    async def localize(self,
+                       bug: Bug,
+                       formula: str = 'ochiai',
+                       limit: Optional[int] = None,
+                       *,
+                       files: Optional[List[str]] = None
+                       ) -> List[Tuple[FileLine, float]]:
+        """
+        Ranks the lines in the program for a given bug by their
+        suspiciousness on the server.
+
+        See: `bugzoo.client.bug.BugManager.localize`
+        """
+        params = [('formula', formula)]  # type: List[Tuple[str, str]]
+        if limit is not None:
+            params.append(('limit', str(limit)))
+        for fn in files or []:
+            params.append(('file', fn))
+        path = 'bugs/{}/localize'.format(bug.name)
+        async with self.__api.get(path, params=params) as r:
+            if r.status == 200:
+                return [(FileLine.from_string(d['line']), float(d['score']))
+                        for d in await r.json()]
+            if r.status == 404 \
+               and (await r.json())['error']['kind'] == 'BugNotFound':
+                raise KeyError(bug.name)
+            await self.__api.handle_erroneous_response(r)
+
+    async def test(self,
+                   bug: Bug,
+                   tests: Optional[Iterable[TestCase]] = None,
+                   *,
+                   containers: Optional[Sequence[Container]] = None,
+                   workers: int = 1
+                   ) -> Dict[str, TestOutcome]:
+        """
+        Executes a given set of tests for a bug on the server, sharding the
+        tests across a fleet of containers.
+
+        See: `bugzoo.client.bug.BugManager.test`
+        """
+        payload = {'workers': workers}  # type: Dict[str, Any]
+        if tests is not None:
+            payload['tests'] = [t.name for t in tests]
+        if containers:
+            payload['containers'] = [c.uid for c in containers]
+
+        path = 'bugs/{}/test'.format(bug.name)
+        async with self.__api.post(path, json=payload) as r:
+            if r.status == 200:
+                return OrderedDict((d['test'],
+                                    TestOutcome.from_dict(d['outcome']))
+                                   for d in await r.json())
+            if r.status == 404:
+                err = (await r.json())['error']
+                raise KeyError(err['message'])
+            await self.__api.handle_erroneous_response(r)
+
+    async def evaluate(self,
+                       bug: Bug,
+                       patches: Iterable[Patch],
+                       tests: Optional[Iterable[TestCase]] = None,
+                       *,
+                       workers: int = 1,
+                       in_process: bool = True,
+                       stop_early: bool = True,
+                       cache: bool = False,
+                       ccache: bool = False
+                       ) -> AsyncIterator[CandidateOutcome]:
+        """
+        Evaluates a sequence of candidate patches for a bug on the server,
+        and asynchronously yields the outcome of each candidate as soon as
+        the server has evaluated it.
+
+        See: `bugzoo.client.bug.BugManager.evaluate`
+        """
+        payload = {'patches': [str(p) for p in patches],
+                   'workers': workers,
+                   'in-process': in_process,
+                   'stop-early': stop_early,
+                   'cache': cache,
+                   'ccache': ccache}  # type: Dict[str, Any]
+        if tests is not None:
+            payload['tests'] = [t.name for t in tests]
+
+        path = 'bugs/{}/evaluate'.format(bug.name)
+        async with self.__api.post(path, json=payload) as r:
+            if r.status == 404:
+                err = (await r.json())['error']
+                raise KeyError(err['message'])
+            if r.status != 200:
+                await self.__api.handle_erroneous_response(r)
+            async for jsn in self.__api.json_lines(r):
+                if 'error' in jsn:
+                    raise BugZooException.from_dict(jsn)
+                yield CandidateOutcome.from_dict(jsn)
@@ -0,0 +1,445 @@
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+import logging
+
+from .api import AsyncAPIClient
+from ...compiler import CompilationOutcome
+from ...core.tool import Tool
+from ...core.patch import Patch
+from ...core.fileline import FileLineSet
+from ...core.bug import Bug
+from ...core.container import Container
+from ...core.coverage import TestSuiteCoverage
+from ...core.test import TestCase, TestOutcome
+from ...cmd import AsyncExecStream, ExecResponse
+from ...exceptions import BugZooException, UnexpectedServerError
+
+logger = logging.getLogger(__name__)  # type: logging.Logger
+logger.setLevel(logging.DEBUG)
+
+__all__ = ('ContainerManager',)
+
+
+class ContainerManager(object):
+    """
+    Provides asynchronous access to the containers running on the server.
+
+    See: `bugzoo.client.container.ContainerManager`
+    """
+    def __init__(self, api: AsyncAPIClient) -> None:
+        self.__api = api
+
+    async def __getitem__(self, uid: str) -> Container:
+        """Fetches a container by its ID.
+
+        Raises:
+            KeyError: if no container is found with the given ID.
+        """
+        async with self.__api.get('containers/{}'.format(uid)) as r:
+            if r.status == 200:
+                return Container.from_dict(await r.json())
+            if r.status == 404:
+                m = "no container found with given UID: {}".format(uid)
+                raise KeyError(m)
+            await self.__api.handle_erroneous_response(r)
+
+    async def delete(self, uid: str) -> None:
+        """Deletes a given container.
+
+        Raises:
+            KeyError: if no container is found with the given ID, or the
+                container has already been destroyed.
+        """
+        async with self.__api.delete('containers/{}'.format(uid)) as r:
+            if r.status == 204:
+                return
+            if r.status == 404:
+                m = "no container found with given UID: {}".format(uid)
+                raise KeyError(m)
+            await self.__api.handle_erroneous_response(r)
+
+    async def contains(self, uid: str) -> bool:
+        """Checks whether a container with a given ID exists."""
+        try:
+            await self[uid]
+            return True
+        except KeyError:
+            return False
+
+    async def clear(self) -> None:
+        """Destroys all running containers."""
+        async with self.__api.delete('containers') as r:
+            if r.status != 204:
+                await self.__api.handle_erroneous_response(r)
+
+    async def uids(self) -> List[str]:
+        """
+        Returns the identifiers of all of the containers that are currently
+        running on the server.
+        """
+        async with self.__api.get('containers') as r:
+            if r.status == 200:
+                ids = await r.json()
+                assert isinstance(ids, list)
+                assert all(isinstance(n, str) for n in ids)
+                return ids
+            await self.__api.handle_erroneous_response(r)
+
+    async def provision(self,
+                        bug: Bug,
+                        *,
+                        plugins: Optional[List[Tool]] = None,
+                        ccache: bool = False
+                        ) -> Container:
+        """Provisions a container for a given bug.
+
+        Raises:
+            KeyError: if no bug is registered under the given name.
+        """
+        if plugins is None:
+            plugins = []
+        logger.info("provisioning container for bug: %s", bug.name)
+        path = 'bugs/{}/provision'.format(bug.name)
+        payload = {
+            'plugins': [p.to_dict() for p in plugins],
+            'ccache': ccache
+        }  # type: Dict[str, Any]
+        async with self.__api.post(path, json=payload) as r:
+            if r.status == 200:
+                container = Container.from_dict(await r.json())
+                logger.info("provisioned container (id: %s) for bug: %s",
+                            container.uid, bug.name)
+                return container
+            if r.status == 404:
+                m = "no bug registered with given name: {}".format(bug.name)
+                raise KeyError(m)
+            await self.__api.handle_erroneous_response(r)
+
+    async def create_pool(self,
+                          bug: Bug,
+                          *,
+                          min_size: int = 1,
+                          max_size: int = 4,
+                          idle_timeout: float = 300.0
+                          ) -> None:
+        """
+        Creates a warm pool of ready-to-use containers for a given bug on the
+        server.
+
+        Raises:
+            KeyError: if no bug is registered under the given name.
+        """
+        path = 'bugs/{}/pool'.format(bug.name)
+        payload = {
+            'min-size': min_size,
+            'max-size': max_size,
+            'idle-timeout': idle_timeout
+        }  # type: Dict[str, Any]
+        async with self.__api.put(path, json=payload) as r:
+            if r.status == 204:
+                return
+            if r.status == 404:
+                m = "no bug registered with given name: {}".format(bug.name)
+                raise KeyError(m)
+            await self.__api.handle_erroneous_response(r)
+
+    async def destroy_pool(self, bug: Bug) -> None:
+        """
+        Destroys the warm pool of containers for a given bug.
+
+        Raises:
+            KeyError: if there is no pool for the given bug.
+        """
+        path = 'bugs/{}/pool'.format(bug.name)
+        async with self.__api.delete(path) as r:
+            if r.status == 204:
+                return
+            if r.status == 404:
+                m = "no pool found for given bug: {}".format(bug.name)
+                raise KeyError(m)
+            await self.__api.handle_erroneous_response(r)
+
+    async def mktemp(self, container: Container) -> str:
+        """Generates a temporary file for a given container.
+
+        Returns:
+            the path to the temporary file inside the given container.
+        """
+        path = 'containers/{}/tempfile'.format(container.uid)
+        async with self.__api.post(path) as r:
+            if r.status == 200:
+                return await r.json()
+            await self.__api.handle_erroneous_response(r)
+
+    async def ip_address(self, container: Container) -> str:
+        """The IP address used by a given container."""
+        path = 'containers/{}/ip'.format(container.uid)
+        async with self.__api.get(path) as r:
+            if r.status == 200:
+                return await r.json()
+            await self.__api.handle_erroneous_response(r)
+
+    async def is_alive(self, container: Container) -> bool:
+        """Determines whether or not a given container is still alive."""
+        uid = container.uid
+        async with self.__api.get('containers/{}/alive'.format(uid)) as r:
+            if r.status == 200:
+                return await r.json()
+            if r.status == 404:
+                m = "no container found with given UID: {}".format(uid)
+                raise KeyError(m)
+            await self.__api.handle_erroneous_response(r)
+
+    async def extract_coverage(self, container: Container) -> FileLineSet:
+        """
+        Extracts a report of the lines that have been executed since the last
+        time that a coverage report was extracted.
+        """
+        path = 'containers/{}/read-coverage'.format(container.uid)
+        async with self.__api.post(path) as r:
+            if r.status == 200:
+                return FileLineSet.from_dict(await r.json())
+            await self.__api.handle_erroneous_response(r)
+
+    async def instrument(self, container: Container) -> None:
+        """
+        Instruments the program inside the container for computing test suite
+        coverage.
+        """
+        path = "containers/{}/instrument".format(container.uid)
+        async with self.__api.post(path) as r:
+            if r.status != 204:
+                await self.__api.handle_erroneous_response(r)
+
+    async def compile(self,
+                      container: Container,
+                      verbose: bool = False,
+                      *,
+                      force: bool = False
+                      ) -> CompilationOutcome:
+        """Attempts to compile the program inside a given container.
+
+        Raises:
+            KeyError: if the container no longer exists.
+        """
+        path = "containers/{}/build".format(container.uid)
+        params = {}  # type: Dict[str, str]
+        if verbose:
+            params['verbose'] = 'yes'
+        if force:
+            params['force'] = 'yes'
+        async with self.__api.post(path, params=params) as r:
+            if r.status == 200:
+                return CompilationOutcome.from_dict(await r.json())
+            await self.__api.handle_erroneous_response(r)
+
+    build = compile
+
+    async def reset(self, container: Container) -> None:
+        """
+        Restores every file that has been changed inside a given container,
+        via a patch or a file write, to its original state.
+
+        Raises:
+            KeyError: if the container no longer exists.
+        """
+        path = "containers/{}/reset".format(container.uid)
+        async with self.__api.post(path) as r:
+            if r.status == 204:
+                return
+            if r.status == 404:
+                m = "no container found with given UID: {}"
+                raise KeyError(m.format(container.uid))
+            await self.__api.handle_erroneous_response(r)
+
+    async def test(self,
+                   container: Container,
+                   test: TestCase,
+                   *,
+                   cache: bool = False
+                   ) -> TestOutcome:
+        """Executes a given test inside a container.
+
+        Raises:
+            KeyError: if the container no longer exists, or the given test
+                doesn't exist.
+        """
+        path = "containers/{}/test/{}".format(container.uid, test.name)
+        params = {'cache': 'yes' if cache else 'no'}
+        async with self.__api.post(path, params=params) as r:
+            if r.status == 200:
+                return TestOutcome.from_dict(await r.json())
+            await self.__api.handle_erroneous_response(r)
+
+    async def outcome_cache_stats(self) -> Dict[str, Any]:
+        """
+        Returns a summary of the hits and misses for the server's test
+        outcome cache.
+        """
+        async with self.__api.get('cache/outcomes/stats') as r:
+            if r.status == 200:
+                return await r.json()
+            await self.__api.handle_erroneous_response(r)
+
+    async def coverage(self,
+                       container: Container,
+                       *,
+                       instrument: bool = True
+                       ) -> TestSuiteCoverage:
+        """Computes complete test suite coverage for a given container."""
+        uri = 'containers/{}/coverage'.format(container.uid)
+        params = {'instrument': 'yes' if instrument else 'no'}
+        async with self.__api.post(uri, params=params) as r:
+            if r.status == 200:
+                jsn = await r.json()
+                return TestSuiteCoverage.from_dict(jsn)  # type: ignore
+            await self.__api.handle_erroneous_response(r)
+
+    async def exec(self,
+                   container: Container,
+                   command: str,
+                   context: Optional[str] = None,
+                   stdout: bool = True,
+                   stderr: bool = False,
+                   time_limit: Optional[int] = None
+                   ) -> ExecResponse:
+        """Executes a given command inside a provided container.
+
+        Raises:
+            KeyError: if the container no longer exists on the server.
+        """
+        payload = {
+            'command': command,
+            'context': context,
+            'stdout': stdout,
+            'stderr': stderr,
+            'time-limit': time_limit
+        }
+        path = "containers/{}/exec".format(container.uid)
+        async with self.__api.post(path, json=payload) as r:
+            if r.status == 200:
+                return ExecResponse.from_dict(await r.json())
+            if r.status == 404:
+                m = "no container found with given UID: {}"
+                raise KeyError(m.format(container.uid))
+            await self.__api.handle_erroneous_response(r)
+
+    command = exec
+
+    def exec_stream(self,
+                    container: Container,
+                    command: str,
+                    context: Optional[str] = None,
+                    stdout: bool = True,
+                    stderr: bool = False,
+                    time_limit: Optional[int] = None
+                    ) -> AsyncExecStream:
+        """
+        Executes a given command inside a provided container, and returns an
+        asynchronous stream that yields chunks of its output as soon as they
+        are sent by the server.
+
+        See: `bugzoo.client.container.ContainerManager.exec_stream`
+        """
+        payload = {
+            'command': command,
+            'context': context,
+            'stdout': stdout,
+            'stderr': stderr,
+            'time-limit': time_limit
+        }
+        path = "containers/{}/exec".format(container.uid)
+        summary = {}  # type: Dict[str, Any]
+
+        async def chunks() -> AsyncIterator[str]:
+            params = {'stream': 'yes'}
+            async with self.__api.post(path, json=payload, params=params) as r:
+                if r.status == 404:
+                    m = "no container found with given UID: {}"
+                    raise KeyError(m.format(container.uid))
+                if r.status != 200:
+                    await self.__api.handle_erroneous_response(r)
+                async for jsn in self.__api.json_lines(r):
+                    if 'error' in jsn:
+                        raise BugZooException.from_dict(jsn)
+                    if 'output' in jsn:
+                        yield jsn['output']
+                    else:
+                        summary.update(jsn)
+
+        def finish() -> Tuple[int, float]:
+            if 'code' not in summary:
+                m = "stream ended before the command finished: {}"
+                raise UnexpectedServerError('IncompleteStream',
+                                            m.format(command))
+            return summary['code'], summary['duration']
+
+        return AsyncExecStream(chunks(), finish)
+
+    command_stream = exec_stream
+
+    async def open_session(self, container: Container) -> None:
+        """
+        Opens a persistent shell session inside a given container.
+
+        Raises:
+            KeyError: if the container no longer exists.
+        """
+        path = "containers/{}/session".format(container.uid)
+        async with self.__api.put(path) as r:
+            if r.status == 204:
+                return
+            if r.status == 404:
+                m = "no container found with given UID: {}"
+                raise KeyError(m.format(container.uid))
+            await self.__api.handle_erroneous_response(r)
+
+    async def close_session(self, container: Container) -> None:
+        """
+        Closes the persistent shell session for a given container.
+
+        Raises:
+            KeyError: if the container no longer exists, or if there is no
+                session open for the container.
+        """
+        path = "containers/{}/session".format(container.uid)
+        async with self.__api.delete(path) as r:
+            if r.status == 204:
+                return
+            if r.status == 404:
+                m = "no session found for container with given UID: {}"
+                raise KeyError(m.format(container.uid))
+            await self.__api.handle_erroneous_response(r)
+
+    async def patch(self,
+                    container: Container,
+                    patch: Patch,
+                    *,
+                    in_process: bool = False
+                    ) -> bool:
+        """
+        Attempts to apply a given patch to the source code for a program inside
+        a given container.
+
+        Returns:
+            true if patch application was successful, and false if the attempt
+            was unsuccessful.
+        """
+        path = "containers/{}".format(container.uid)
+        params = {'in-process': 'yes' if in_process else 'no'}
+        payload = str(patch).encode('utf-8')
+        async with self.__api.patch(path, payload, params=params) as r:
+            return r.status == 204
+
+    async def persist(self, container: Container, image_name: str) -> None:
+        """Persists the state of a given container as a Docker image.
+
+        Raises:
+            ContainerNotFound: if the given container does not exist on the
+                server.
+            ImageAlreadyExists: if the given image name is already in use by
+                another Docker image on the server.
+        """
+        path = "containers/{}/persist/{}".format(container.id, image_name)
+        async with self.__api.put(path) as r:
+            if r.status != 204:
+                await self.__api.handle_erroneous_response(r)
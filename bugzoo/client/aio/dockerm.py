@@ -0,0 +1,42 @@
+__all__ = ['DockerManager']
+
+import logging
+
+from .api import AsyncAPIClient
+
+logger = logging.getLogger(__name__)  # type: logging.Logger
+logger.setLevel(logging.DEBUG)
+
+
+class DockerManager(object):
+    """
+    Provides asynchronous access to the underlying Docker server used by a
+    BugZoo server.
+    """
+    def __init__(self, api: AsyncAPIClient) -> None:
+        self.__api = api
+
+    async def has_image(self, name: str) -> bool:
+        """
+        Determines whether the server has a Docker image with a given name.
+        """
+        path = "docker/images/{}".format(name)
+        async with self.__api.head(path) as r:
+            if r.status == 204:
+                return True
+            elif r.status == 404:
+                return False
+            await self.__api.handle_erroneous_response(r)
+
+    async def delete_image(self, name: str) -> None:
+        """Deletes a Docker image with a given name.
+
+        Parameters:
+            name: the name of the Docker image.
+        """
+        logger.debug("deleting Docker image: %s", name)
+        path = "docker/images/{}".format(name)
+        async with self.__api.delete(path) as r:
+            if r.status != 204:
+                await self.__api.handle_erroneous_response(r)
+        logger.info("deleted Docker image: %s", name)
@@ -0,0 +1,114 @@
+from typing import Iterable, Optional, Dict, Mapping
+import logging
+import os
+
+from .api import AsyncAPIClient
+from .bug import BugManager
+from ...core.container import Container
+
+logger = logging.getLogger(__name__)  # type: logging.Logger
+
+__all__ = ['FileManager']
+
+
+class FileManager(object):
+    """
+    Provides asynchronous access to the file systems of running containers.
+
+    See: `bugzoo.client.file.FileManager`
+    """
+    def __init__(self,
+                 api: AsyncAPIClient,
+                 mgr_bug: BugManager
+                 ) -> None:
+        self.__api = api
+        self.__mgr_bug = mgr_bug
+        # the source directory for each bug, which never changes
+        self.__source_dirs = {}  # type: Dict[str, str]
+
+    async def resolve(self, container: Container, fn: str) -> str:
+        """Ensures that relative paths are transformed into absolute paths."""
+        if os.path.isabs(fn):
+            return fn
+        name = container.bug
+        if name not in self.__source_dirs:
+            bug = await self.__mgr_bug[name]
+            self.__source_dirs[name] = bug.source_dir
+        return os.path.join(self.__source_dirs[name], fn)
+
+    async def _file_path(self, container: Container, fn: str) -> str:
+        """
+        Computes the base path for a given file.
+        """
+        fn = await self.resolve(container, fn)
+        return "files/{}/{}".format(container.uid, fn[1:])
+
+    async def write(self,
+                    container: Container,
+                    filepath: str,
+                    contents: str
+                    ) -> None:
+        """
+        Dumps the contents of a given string into a file at a specified
+        location inside the container.
+        """
+        logger.debug("writing to file [%s] in container [%s].",
+                     filepath, container.uid)
+        path = await self._file_path(container, filepath)
+        async with self.__api.put(path, data=contents.encode('utf-8')) as r:
+            if r.status != 204:
+                await self.__api.handle_erroneous_response(r)
+
+    async def read(self, container: Container, filepath: str) -> str:
+        """
+        Retrieves the contents of a given file in a running container.
+
+        Raises:
+            KeyError: if the given file was not found.
+        """
+        logger.debug("reading contents of file [%s] in container [%s].",
+                     filepath, container.uid)
+        path = await self._file_path(container, filepath)
+        async with self.__api.get(path) as r:
+            if r.status == 200:
+                return await r.text()
+            await self.__api.handle_erroneous_response(r)
+
+    async def read_many(self,
+                        container: Container,
+                        filepaths: Iterable[str]
+                        ) -> Dict[str, Optional[str]]:
+        """
+        Retrieves the contents of a number of files in a running container
+        using a single request.
+
+        Returns:
+            a mapping from each of the given file paths to the contents of
+            that file, or None if the file was not found.
+        """
+        resolved = {}  # type: Dict[str, str]
+        for fn in filepaths:
+            resolved[fn] = await self.resolve(container, fn)
+        payload = {'paths': list(resolved.values())}
+        path = "files/{}".format(container.uid)
+        async with self.__api.post(path, json=payload) as r:
+            if r.status != 200:
+                await self.__api.handle_erroneous_response(r)
+            contents = await r.json()
+        return {fn: contents[fn_abs] for (fn, fn_abs) in resolved.items()}
+
+    async def write_many(self,
+                         container: Container,
+                         files: Mapping[str, str]
+                         ) -> None:
+        """
+        Writes the contents of a number of files inside a running container
+        using a single request.
+        """
+        payload = {}  # type: Dict[str, str]
+        for (fn, contents) in files.items():
+            payload[await self.resolve(container, fn)] = contents
+        path = "files/{}".format(container.uid)
+        async with self.__api.put(path, json=payload) as r:
+            if r.status != 204:
+                await self.__api.handle_erroneous_response(r)
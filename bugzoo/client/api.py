@@ -9,6 +9,7 @@ import logging
 import time
 
 import requests
+import requests.adapters
 import urllib3.exceptions
 import urllib.parse
 
@@ -20,11 +21,31 @@ logger.setLevel(logging.DEBUG)
 __all__ = ['APIClient']
 
 
+# the initial and maximum number of seconds to wait between successive
+# attempts to connect to the server
+_BACKOFF_INITIAL = 0.005
+_BACKOFF_MAX = 0.5
+
+
 class APIClient(object):
+    """
+    Provides low-level access to the HTTP API of a BugZoo server.
+
+    All requests are sent via a single `requests.Session`, whose connection
+    pool keeps connections to the server alive between requests, sparing
+    each request the cost of establishing a new TCP connection. A single
+    client may be safely shared by many threads: the connection pool is
+    thread safe, and the client never modifies the state of its session
+    (e.g., its headers or cookies) after construction. Each thread that
+    sends a request concurrently occupies one pooled connection; threads
+    beyond `pool_maxsize` use short-lived connections.
+    """
     def __init__(self,
                  base_url: str,
                  *,
-                 timeout_connection: int = 60
+                 timeout_connection: int = 60,
+                 pool_connections: int = 1,
+                 pool_maxsize: int = 32
                  ) -> None:
         """
         Constructs a new client for low-level API communications with a BugZoo
@@ -35,20 +56,32 @@ class APIClient(object):
             timeout_connection: the maximum number of seconds to wait whilst
                 attempting to connect to the server before declaring the
                 connection to have failed.
+            pool_connections: the number of distinct hosts for which a
+                connection pool should be kept.
+            pool_maxsize: the maximum number of connections to the server
+                that should be kept alive for reuse.
 
         Raises:
             ConnectionFailure: if a connection to the server could not be
                 established within the timeout window.
         """
         assert timeout_connection > 0
+        assert pool_connections > 0
+        assert pool_maxsize > 0
 
         self.__base_url = base_url
+        self.__session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=pool_connections,
+                                                pool_maxsize=pool_maxsize)
+        self.__session.mount('http://', adapter)
+        self.__session.mount('https://', adapter)
 
         # attempt to establish a connection
         logger.info("Attempting to establish connection to %s within %d seconds",  # noqa: pycodestyle
                     base_url, timeout_connection)
         url = self._url("status")
         time_started = timer()
+        backoff = _BACKOFF_INITIAL
         connected = False
         while not connected:
             time_running = timer() - time_started
@@ -56,24 +89,35 @@ class APIClient(object):
             if time_left <= 0.0:
                 logger.error("Failed to establish connection to server: %s",
                              base_url)
+                self.close()
                 raise ConnectionFailure
 
             r = None
             try:
-                r = requests.get(url, timeout=time_left)
+                r = self.__session.get(url, timeout=time_left)
                 connected = r.status_code == 204
             except requests.exceptions.ConnectionError:
-                time.sleep(1.0)
+                pass
             except requests.exceptions.Timeout:
                 logger.error("Failed to establish connection to server: %s",
                              base_url)
+                self.close()
                 raise ConnectionFailure
             finally:
                 if r:
                     r.close()
-            time.sleep(0.05)
+            if not connected:
+                time.sleep(min(backoff, max(time_left, 0.0)))
+                backoff = min(backoff * 2, _BACKOFF_MAX)
         logger.info("Established connection to server: %s", base_url)
 
+    def close(self) -> None:
+        """
+        Closes all pooled connections to the server. Connections are
+        transparently re-established if the client is used again.
+        """
+        self.__session.close()
+
     def _url(self, path: str) -> str:
         """Computes the URL for a given resource on the server."""
         url = "{}/{}".format(self.__base_url, path)
@@ -103,40 +147,41 @@ class APIClient(object):
     def get(self, path: str, **kwargs) -> Iterator[requests.Response]:
         url = self._url(path)
         logger.debug('GET: %s', url)
-        with contextlib.closing(requests.get(url, **kwargs)) as r:
+        with contextlib.closing(self.__session.get(url, **kwargs)) as r:
             yield r
 
     @contextlib.contextmanager
     def post(self, path: str, **kwargs) -> Iterator[requests.Response]:
         url = self._url(path)
         logger.debug('POST: %s', url)
-        with contextlib.closing(requests.post(url, **kwargs)) as r:
+        with contextlib.closing(self.__session.post(url, **kwargs)) as r:
             yield r
 
     @contextlib.contextmanager
     def put(self, path: str, **kwargs) -> Iterator[requests.Response]:
         url = self._url(path)
         logger.debug('PUT: %s', url)
-        with contextlib.closing(requests.put(url, **kwargs)) as r:
+        with contextlib.closing(self.__session.put(url, **kwargs)) as r:
             yield r
 
     @contextlib.contextmanager
     def head(self, path: str, **kwargs) -> Iterator[requests.Response]:
         url = self._url(path)
         logger.debug('HEAD: %s', url)
-        with contextlib.closing(requests.head(url, **kwargs)) as r:
+        with contextlib.closing(self.__session.head(url, **kwargs)) as r:
             yield r
 
     @contextlib.contextmanager
     def patch(self, path: str, data, **kwargs ) -> Iterator[requests.Response]:
         url = self._url(path)
         logger.debug('PATCH: %s', url)
-        with contextlib.closing(requests.patch(url, data=data, **kwargs)) as r:
+        r = self.__session.patch(url, data=data, **kwargs)
+        with contextlib.closing(r):
             yield r
 
     @contextlib.contextmanager
     def delete(self, path: str, **kwargs) -> Iterator[requests.Response]:
         url = self._url(path)
         logger.debug('DELETE: %s', url)
-        with contextlib.closing(requests.delete(url, **kwargs)) as r:
+        with contextlib.closing(self.__session.delete(url, **kwargs)) as r:
             yield r
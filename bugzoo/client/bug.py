@@ -1,9 +1,19 @@
-from typing import Iterator
+from typing import Iterator, Iterable, Optional, Sequence, Dict, Any, \
+    List, Tuple
+from collections import OrderedDict
+import json
 import logging
 
 from .api import APIClient
 from ..core.bug import Bug
+from ..core.candidate import CandidateOutcome
+from ..core.container import Container
 from ..core.coverage import TestSuiteCoverage
+from ..core.fileline import FileLine
+from ..core.job import Job
+from ..core.patch import Patch
+from ..core.test import TestCase, TestOutcome
+from ..exceptions import BugZooException
 
 logger = logging.getLogger(__name__)  # type: logging.Logger
 logger.setLevel(logging.DEBUG)
@@ -121,6 +131,176 @@ class BugManager(object):
                          bug.name)
             self.__api.handle_erroneous_response(r)
 
+    def submit_coverage(self, bug: Bug) -> Job:
+        """
+        Starts a background job on the server that computes the coverage
+        for a given bug. The result of the job (see `JobManager.wait`) can
+        be decoded via `TestSuiteCoverage.from_dict`.
+
+        Raises:
+            KeyError: if the bug was not found.
+        """
+        path = 'bugs/{}/coverage'.format(bug.name)
+        with self.__api.get(path, params={'async': 'yes'}) as r:
+            if r.status_code == 202:
+                return Job.from_dict(r.json())
+            if r.status_code == 404:
+                m = "no bug found with given name: {}".format(bug.name)
+                raise KeyError(m)
+            self.__api.handle_erroneous_response(r)
+
+    def localize(self,
+                 bug: Bug,
+                 formula: str = 'ochiai',
+                 limit: Optional[int] = None,
+                 *,
+                 files: Optional[List[str]] = None
+                 ) -> List[Tuple[FileLine, float]]:
+        """
+        Ranks the lines in the program for a given bug by their
+        suspiciousness on the server, without transferring its coverage.
+
+        Parameters:
+            bug: the bug.
+            formula: the name of the fault localization formula that should
+                be used (e.g., 'ochiai', 'tarantula', 'dstar', 'jaccard').
+            limit: the maximum number of lines that should be returned.
+            files: an optional list of files to which the ranking should be
+                restricted.
+
+        Returns:
+            a list of lines and their suspiciousness, in descending order of
+            suspiciousness.
+
+        Raises:
+            KeyError: if the bug was not found.
+            FormulaNotFound: if the server does not provide the given formula.
+        """
+        params = {'formula': formula}  # type: Dict[str, Any]
+        if limit is not None:
+            params['limit'] = limit
+        if files is not None:
+            params['file'] = files
+        path = 'bugs/{}/localize'.format(bug.name)
+        with self.__api.get(path, params=params) as r:
+            if r.status_code == 200:
+                return [(FileLine.from_string(d['line']), float(d['score']))
+                        for d in r.json()]
+            if r.status_code == 404 \
+               and r.json()['error']['kind'] == 'BugNotFound':
+                raise KeyError(bug.name)
+            self.__api.handle_erroneous_response(r)
+
+    def test(self,
+             bug: Bug,
+             tests: Optional[Iterable[TestCase]] = None,
+             *,
+             containers: Optional[Sequence[Container]] = None,
+             workers: int = 1
+             ) -> Dict[str, TestOutcome]:
+        """
+        Executes a given set of tests for a bug on the server, sharding the
+        tests across a fleet of containers.
+
+        Parameters:
+            bug: the bug whose tests should be executed.
+            tests: the tests that should be executed. If unspecified, the
+                entire test suite for the bug will be executed.
+            containers: the containers for the bug that should be used to
+                execute the tests. If unspecified, the server will provision
+                a fleet of fresh containers for the duration of the call.
+            workers: the number of fresh containers that should be
+                provisioned if no containers are given.
+
+        Returns:
+            an ordered mapping from the names of the tests to their outcomes,
+            in the order in which the tests were given.
+
+        Raises:
+            KeyError: if the bug, or any of the given tests or containers,
+                could not be found.
+        """
+        payload = {'workers': workers}  # type: Dict[str, Any]
+        if tests is not None:
+            payload['tests'] = [t.name for t in tests]
+        if containers:
+            payload['containers'] = [c.uid for c in containers]
+
+        with self.__api.post('bugs/{}/test'.format(bug.name),
+                             json=payload) as r:
+            if r.status_code == 200:
+                return OrderedDict((d['test'],
+                                    TestOutcome.from_dict(d['outcome']))
+                                   for d in r.json())
+            if r.status_code == 404:
+                err = r.json()['error']
+                raise KeyError(err['message'])
+            self.__api.handle_erroneous_response(r)
+
+    def evaluate(self,
+                 bug: Bug,
+                 patches: Iterable[Patch],
+                 tests: Optional[Iterable[TestCase]] = None,
+                 *,
+                 workers: int = 1,
+                 in_process: bool = True,
+                 stop_early: bool = True,
+                 cache: bool = False,
+                 ccache: bool = False
+                 ) -> Iterator[CandidateOutcome]:
+        """
+        Evaluates a sequence of candidate patches for a bug on the server,
+        which applies, compiles, and tests each candidate in a container
+        that is reset between candidates. Outcomes are streamed back from the
+        server as soon as each evaluation completes.
+
+        Parameters:
+            bug: the bug.
+            patches: the candidate patches.
+            tests: the tests that should be used to evaluate each candidate.
+                If unspecified, the entire test suite for the bug is used.
+            workers: the maximum number of candidates that the server should
+                evaluate at once.
+            in_process: if set to True, the server applies patches itself
+                rather than running `patch` inside the container.
+            stop_early: if set to True, the tests for each candidate are
+                executed until the first failing test.
+            cache: if set to True, the server's test outcome cache is used.
+            ccache: if set to True, the containers used by the server share a
+                ccache volume for the bug's image.
+
+        Returns:
+            an iterator over the outcomes of the candidates, in the order in
+            which their evaluations are completed.
+
+        Raises:
+            KeyError: if the bug, or any of the given tests, could not be
+                found.
+        """
+        payload = {'patches': [str(p) for p in patches],
+                   'workers': workers,
+                   'in-process': in_process,
+                   'stop-early': stop_early,
+                   'cache': cache,
+                   'ccache': ccache}  # type: Dict[str, Any]
+        if tests is not None:
+            payload['tests'] = [t.name for t in tests]
+
+        path = 'bugs/{}/evaluate'.format(bug.name)
+        with self.__api.post(path, json=payload, stream=True) as r:
+            if r.status_code == 404:
+                err = r.json()['error']
+                raise KeyError(err['message'])
+            if r.status_code != 200:
+                self.__api.handle_erroneous_response(r)
+            for line in r.iter_lines():
+                if not line:
+                    continue
+                jsn = json.loads(line.decode('utf-8'))
+                if 'error' in jsn:
+                    raise BugZooException.from_dict(jsn)
+                yield CandidateOutcome.from_dict(jsn)
+
     def uninstall(self, bug: Bug) -> bool:
         """Uninstalls the Docker image associated with a given bug."""
         with self.__api.post('bugs/{}/uninstall'.format(bug.name)) as r:
@@ -142,6 +322,24 @@ class BugManager(object):
         with self.__api.post('bugs/{}/download'.format(bug.name)) as r:
             raise NotImplementedError
 
+    def submit_build(self, bug: Bug) -> Job:
+        """
+        Starts a background job on the server that builds the Docker image
+        associated with a given bug.
+
+        Raises:
+            KeyError: if the bug was not found.
+            BugAlreadyBuilt: if the image has already been built.
+        """
+        path = 'bugs/{}/build'.format(bug.name)
+        with self.__api.post(path, params={'async': 'yes'}) as r:
+            if r.status_code == 202:
+                return Job.from_dict(r.json())
+            if r.status_code == 404:
+                m = "no bug found with given name: {}".format(bug.name)
+                raise KeyError(m)
+            self.__api.handle_erroneous_response(r)
+
     def build(self, bug: Bug):
         """
         Instructs the server to build the Docker image associated with a given
@@ -1,5 +1,6 @@
-from typing import Iterator, Optional, Dict, Any, List, Union
+from typing import Iterator, Optional, Dict, Any, List, Tuple, Union
 from ipaddress import IPv4Address, IPv6Address
+import json
 import logging
 
 from .api import APIClient
@@ -10,9 +11,10 @@ from ..core.patch import Patch
 from ..core.fileline import FileLineSet
 from ..core.bug import Bug
 from ..core.container import Container
+from ..core.job import Job
 from ..core.coverage import TestSuiteCoverage
 from ..core.test import TestCase, TestOutcome
-from ..cmd import ExecResponse
+from ..cmd import ExecResponse, ExecStream
 
 logger = logging.getLogger(__name__)  # type: logging.Logger
 logger.setLevel(logging.DEBUG)
@@ -104,16 +106,26 @@ class ContainerManager(object):
     def provision(self,
                   bug: Bug,
                   *,
-                  plugins: Optional[List[Tool]] = None
+                  plugins: Optional[List[Tool]] = None,
+                  ccache: bool = False
                   ) -> Container:
-        """Provisions a container for a given bug."""
+        """
+        Provisions a container for a given bug.
+
+        Parameters:
+            bug: the bug.
+            plugins: the plugins that should be attached to the container.
+            ccache: if set to True, the container shares a ccache volume with
+                all other containers for the bug's image.
+        """
         if plugins is None:
             plugins = []
 
         logger.info("provisioning container for bug: %s", bug.name)
         endpoint = 'bugs/{}/provision'.format(bug.name)
         payload = {
-            'plugins': [p.to_dict() for p in plugins]
+            'plugins': [p.to_dict() for p in plugins],
+            'ccache': ccache
         }  # type: Dict[str, Any]
         with self.__api.post(endpoint, json=payload) as r:
             if r.status_code == 200:
@@ -129,6 +141,92 @@ class ContainerManager(object):
 
             self.__api.handle_erroneous_response(r)
 
+    def submit_provision(self,
+                         bug: Bug,
+                         *,
+                         plugins: Optional[List[Tool]] = None,
+                         ccache: bool = False
+                         ) -> Job:
+        """
+        Starts a background job on the server that provisions a container
+        for a given bug. The result of the job (see `JobManager.wait`) can be
+        decoded via `Container.from_dict`.
+
+        Raises:
+            KeyError: if the bug was not found.
+        """
+        if plugins is None:
+            plugins = []
+        endpoint = 'bugs/{}/provision'.format(bug.name)
+        payload = {
+            'plugins': [p.to_dict() for p in plugins],
+            'ccache': ccache
+        }  # type: Dict[str, Any]
+        params = {'async': 'yes'}
+        with self.__api.post(endpoint, json=payload, params=params) as r:
+            if r.status_code == 202:
+                return Job.from_dict(r.json())
+            if r.status_code == 404:
+                m = "no bug registered with given name: {}".format(bug.name)
+                raise KeyError(m)
+            self.__api.handle_erroneous_response(r)
+
+    def create_pool(self,
+                    bug: Bug,
+                    *,
+                    min_size: int = 1,
+                    max_size: int = 4,
+                    idle_timeout: float = 300.0
+                    ) -> None:
+        """
+        Creates a warm pool of ready-to-use containers for a given bug on the
+        server. Subsequent calls to `provision` for that bug will be served
+        by the pool whenever possible. Any existing pool for the bug is
+        replaced.
+
+        Parameters:
+            bug: the bug for which a pool should be created.
+            min_size: the minimum number of idle containers that should be
+                kept warm.
+            max_size: the maximum number of idle containers that should be
+                kept warm.
+            idle_timeout: the number of seconds that a surplus container may
+                sit idle before it is evicted from the pool.
+
+        Raises:
+            KeyError: if no bug is registered under the given name.
+        """
+        path = 'bugs/{}/pool'.format(bug.name)
+        payload = {
+            'min-size': min_size,
+            'max-size': max_size,
+            'idle-timeout': idle_timeout
+        }  # type: Dict[str, Any]
+        with self.__api.put(path, json=payload) as r:
+            if r.status_code == 204:
+                return
+            if r.status_code == 404:
+                m = "no bug registered with given name: {}".format(bug.name)
+                raise KeyError(m)
+            self.__api.handle_erroneous_response(r)
+
+    def destroy_pool(self, bug: Bug) -> None:
+        """
+        Destroys the warm pool of containers for a given bug, along with all
+        of its idle containers.
+
+        Raises:
+            KeyError: if there is no pool for the given bug.
+        """
+        path = 'bugs/{}/pool'.format(bug.name)
+        with self.__api.delete(path) as r:
+            if r.status_code == 204:
+                return
+            if r.status_code == 404:
+                m = "no pool found for given bug: {}".format(bug.name)
+                raise KeyError(m)
+            self.__api.handle_erroneous_response(r)
+
     def mktemp(self, container: Container) -> str:
         """Generates a temporary file for a given container.
 
@@ -192,7 +290,9 @@ class ContainerManager(object):
 
     def compile(self,
                 container: Container,
-                verbose: bool = False
+                verbose: bool = False,
+                *,
+                force: bool = False
                 ) -> CompilationOutcome:
         """Attempts to compile the program inside a given container.
 
@@ -201,6 +301,8 @@ class ContainerManager(object):
             verbose: specifies whether to print the stdout and stderr produced
                 by the compilation command to the stdout. If `True`, then the
                 stdout and stderr will be printed.
+            force: if set to True, the program is compiled even if it has
+                not changed since it was last successfully compiled.
 
         Returns:
             a summary of the outcome of the attempted compilation.
@@ -212,6 +314,8 @@ class ContainerManager(object):
         params = {}
         if verbose:
             params['verbose'] = 'yes'
+        if force:
+            params['force'] = 'yes'
         with self.__api.post(path, params=params) as r:
             if r.status_code == 200:
                 return CompilationOutcome.from_dict(r.json())
@@ -219,15 +323,36 @@ class ContainerManager(object):
 
     build = compile
 
+    def reset(self, container: Container) -> None:
+        """
+        Restores every file that has been changed inside a given container,
+        via a patch or a file write, to its original state.
+
+        Raises:
+            KeyError: if the container no longer exists.
+        """
+        path = "containers/{}/reset".format(container.uid)
+        with self.__api.post(path) as r:
+            if r.status_code == 204:
+                return
+            if r.status_code == 404:
+                m = "no container found with given UID: {}"
+                raise KeyError(m.format(container.uid))
+            self.__api.handle_erroneous_response(r)
+
     def test(self,
              container: Container,
-             test: TestCase
+             test: TestCase,
+             *,
+             cache: bool = False
              ) -> TestOutcome:
         """Executes a given test inside a container.
 
         Parameters:
             container: the container in which the test should be conducted.
             test: the test that should be executed.
+            cache: if set to True, the outcome may be served from, and will
+                be added to, the server's test outcome cache.
 
         Returns:
             a summary of the outcome of the test execution.
@@ -237,11 +362,22 @@ class ContainerManager(object):
                 doesn't exist.
         """
         path = "containers/{}/test/{}".format(container.uid, test.name)
-        with self.__api.post(path) as r:
+        params = {'cache': 'yes' if cache else 'no'}
+        with self.__api.post(path, params=params) as r:
             if r.status_code == 200:
                 return TestOutcome.from_dict(r.json())
             self.__api.handle_erroneous_response(r)
 
+    def outcome_cache_stats(self) -> Dict[str, Any]:
+        """
+        Returns a summary of the hits and misses for the server's test
+        outcome cache.
+        """
+        with self.__api.get('cache/outcomes/stats') as r:
+            if r.status_code == 200:
+                return r.json()
+            self.__api.handle_erroneous_response(r)
+
     def coverage(self,
                  container: Container,
                  *,
@@ -275,6 +411,30 @@ class ContainerManager(object):
                 logger.exception("Failed to fetch coverage information for container %s due to unexpected failure: %s", uid, err)  # noqa: pycodestyle
                 raise
 
+    def submit_coverage(self,
+                        container: Container,
+                        *,
+                        instrument: bool = True
+                        ) -> Job:
+        """
+        Starts a background job on the server that computes complete test
+        suite coverage for a given container. The result of the job (see
+        `JobManager.wait`) can be decoded via `TestSuiteCoverage.from_dict`.
+
+        Raises:
+            KeyError: if the container no longer exists.
+        """
+        uri = 'containers/{}/coverage'.format(container.uid)
+        params = {'instrument': 'yes' if instrument else 'no',
+                  'async': 'yes'}
+        with self.__api.post(uri, params=params) as r:
+            if r.status_code == 202:
+                return Job.from_dict(r.json())
+            if r.status_code == 404:
+                m = "no container found with given UID: {}"
+                raise KeyError(m.format(container.uid))
+            self.__api.handle_erroneous_response(r)
+
     def exec(self,
              container: Container,
              command: str,
@@ -324,20 +484,145 @@ class ContainerManager(object):
 
     command = exec
 
-    def patch(self, container: Container, patch: Patch) -> bool:
+    def exec_stream(self,
+                    container: Container,
+                    command: str,
+                    context: Optional[str] = None,
+                    stdout: bool = True,
+                    stderr: bool = False,
+                    time_limit: Optional[int] = None
+                    ) -> ExecStream:
+        """
+        Executes a given command inside a provided container, and returns a
+        stream that yields chunks of its output as soon as they are sent by
+        the server. Unlike `exec`, the output of the command is never held
+        in memory in its entirety.
+
+        Parameters:
+            container: the container to which the command should be issued.
+            command: the command that should be executed.
+            context: the working directory that should be used to perform the
+                execution.
+            stdout: specifies whether or not output to the stdout should be
+                included in the stream.
+            stderr: specifies whether or not output to the stderr should be
+                included in the stream.
+            time_limit: an optional time limit that is applied to the
+                execution.
+
+        Returns:
+            a stream over the output of the command. Once the stream has been
+            exhausted, it provides the exit code and duration of the command.
+
+        Raises:
+            KeyError: if the container no longer exists on the server. This
+                error is raised when the stream is first consumed.
+        """
+        payload = {
+            'command': command,
+            'context': context,
+            'stdout': stdout,
+            'stderr': stderr,
+            'time-limit': time_limit
+        }
+        path = "containers/{}/exec".format(container.uid)
+        summary = {}  # type: Dict[str, Any]
+
+        def chunks() -> Iterator[str]:
+            with self.__api.post(path,
+                                 json=payload,
+                                 params={'stream': 'yes'},
+                                 stream=True) as r:
+                if r.status_code == 404:
+                    m = "no container found with given UID: {}"
+                    raise KeyError(m.format(container.uid))
+                if r.status_code != 200:
+                    self.__api.handle_erroneous_response(r)
+                for line in r.iter_lines():
+                    if not line:
+                        continue
+                    jsn = json.loads(line.decode('utf-8'))
+                    if 'error' in jsn:
+                        raise exceptions.BugZooException.from_dict(jsn)
+                    if 'output' in jsn:
+                        yield jsn['output']
+                    else:
+                        summary.update(jsn)
+
+        def finish() -> Tuple[int, float]:
+            if 'code' not in summary:
+                m = "stream ended before the command finished: {}"
+                raise exceptions.UnexpectedServerError('IncompleteStream',
+                                                       m.format(command))
+            return summary['code'], summary['duration']
+
+        return ExecStream(chunks(), finish)
+
+    command_stream = exec_stream
+
+    def open_session(self, container: Container) -> None:
+        """
+        Opens a persistent shell session inside a given container. Whilst the
+        session is open, commands that are issued to the container via `exec`
+        are executed over that session, avoiding the overhead of creating a
+        new Docker exec object for each command. Note that commands executed
+        over a session are not attached to a TTY.
+
+        Raises:
+            KeyError: if the container no longer exists.
+        """
+        path = "containers/{}/session".format(container.uid)
+        with self.__api.put(path) as r:
+            if r.status_code == 204:
+                return
+            if r.status_code == 404:
+                m = "no container found with given UID: {}"
+                raise KeyError(m.format(container.uid))
+            self.__api.handle_erroneous_response(r)
+
+    def close_session(self, container: Container) -> None:
+        """
+        Closes the persistent shell session for a given container.
+
+        Raises:
+            KeyError: if the container no longer exists, or if there is no
+                session open for the container.
+        """
+        path = "containers/{}/session".format(container.uid)
+        with self.__api.delete(path) as r:
+            if r.status_code == 204:
+                return
+            if r.status_code == 404:
+                m = "no session found for container with given UID: {}"
+                raise KeyError(m.format(container.uid))
+            self.__api.handle_erroneous_response(r)
+
+    def patch(self,
+              container: Container,
+              patch: Patch,
+              *,
+              in_process: bool = False
+              ) -> bool:
         """
         Attempts to apply a given patch to the source code for a program inside
         a given container. All patch applications are guaranteed to be atomic;
         if the patch fails to apply, no changes will be made to the relevant
         source code files.
 
+        Parameters:
+            container: the container.
+            patch: the patch that should be applied.
+            in_process: if set to True, the server will apply the patch
+                itself rather than running `patch` inside the container.
+
         Returns:
             true if patch application was successful, and false if the attempt
             was unsuccessful.
         """
         path = "containers/{}".format(container.uid)
+        params = {'in-process': 'yes' if in_process else 'no'}
         payload = str(patch)
-        with self.__api.patch(path, payload) as r:
+        with self.__api.patch(path, payload, params=params) as r:
             return r.status_code == 204
 
     def persist(self, container: Container, image_name: str) -> None:
@@ -1,4 +1,4 @@
-from typing import Iterator, Optional
+from typing import Iterator, Iterable, Optional, Dict, Mapping
 import logging
 import os
 
@@ -108,3 +108,52 @@ class FileManager(object):
                 logger.exception("failed to read contents of file [%s] in container [%s]: %s",  # noqa: pycodestyle
                                  filepath, container.uid, err)
                 raise
+
+    def read_many(self,
+                  container: Container,
+                  filepaths: Iterable[str]
+                  ) -> Dict[str, Optional[str]]:
+        """
+        Retrieves the contents of a number of files in a running container
+        using a single request.
+
+        Parameters:
+            container: the container from which the files should be fetched.
+            filepaths: the paths to the files. Relative paths are interpreted
+                as being relative to the source directory for the program
+                under test inside the container.
+
+        Returns:
+            a mapping from each of the given file paths to the contents of
+            that file, or None if the file was not found.
+        """
+        filepaths = list(filepaths)
+        resolved = {fn: self.resolve(container, fn) for fn in filepaths}
+        payload = {'paths': list(resolved.values())}
+        path = "files/{}".format(container.uid)
+        with self.__api.post(path, json=payload) as response:
+            if response.status_code != 200:
+                self.__api.handle_erroneous_response(response)
+            contents = response.json()
+        return {fn: contents[fn_abs] for (fn, fn_abs) in resolved.items()}
+
+    def write_many(self,
+                   container: Container,
+                   files: Mapping[str, str]
+                   ) -> None:
+        """
+        Writes the contents of a number of files inside a running container
+        using a single request.
+
+        Parameters:
+            container: the container to which the files should be written.
+            files: a mapping from file paths to their new contents. Relative
+                paths are interpreted as being relative to the source
+                directory for the program under test inside the container.
+        """
+        payload = {self.resolve(container, fn): contents
+                   for (fn, contents) in files.items()}
+        path = "files/{}".format(container.uid)
+        with self.__api.put(path, json=payload) as response:
+            if response.status_code != 204:
+                self.__api.handle_erroneous_response(response)
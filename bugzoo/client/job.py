@@ -0,0 +1,135 @@
+from typing import Any, Iterator, Optional
+from timeit import default_timer as timer
+import logging
+
+from .api import APIClient
+from ..core.job import Job
+from ..exceptions import JobNotFinished
+
+logger = logging.getLogger(__name__)  # type: logging.Logger
+logger.setLevel(logging.DEBUG)
+
+__all__ = ['JobManager']
+
+# the maximum number of seconds that the server is asked to wait for a job
+# to finish within a single request
+_MAX_WAIT_PER_REQUEST = 30.0
+
+
+class JobManager(object):
+    """
+    Provides access to the background jobs on the server, which are used to
+    perform long-running operations, such as building images and computing
+    coverage, without occupying a request for the duration of the operation.
+    Jobs are started by the `submit_*` methods of the other managers.
+    """
+    def __init__(self, api: APIClient) -> None:
+        self.__api = api
+
+    def __getitem__(self, uid: str) -> Job:
+        """Describes the current state of a given job.
+
+        Raises:
+            KeyError: if no job exists with the given UID.
+        """
+        with self.__api.get('jobs/{}'.format(uid)) as r:
+            if r.status_code == 200:
+                return Job.from_dict(r.json())
+            if r.status_code == 404:
+                raise KeyError("no job found with given UID: {}".format(uid))
+            self.__api.handle_erroneous_response(r)
+
+    def __delitem__(self, uid: str) -> None:
+        """Cancels a given job, if it has not finished, and discards it.
+
+        Raises:
+            KeyError: if no job exists with the given UID.
+        """
+        with self.__api.delete('jobs/{}'.format(uid)) as r:
+            if r.status_code == 204:
+                return
+            if r.status_code == 404:
+                raise KeyError("no job found with given UID: {}".format(uid))
+            self.__api.handle_erroneous_response(r)
+
+    def __iter__(self) -> Iterator[Job]:
+        """Returns an iterator over the jobs that are held by the server."""
+        with self.__api.get('jobs') as r:
+            if r.status_code == 200:
+                return iter([Job.from_dict(d) for d in r.json()])
+            self.__api.handle_erroneous_response(r)
+
+    def cancel(self, job: Job) -> Job:
+        """
+        Cancels a given job. Queued jobs are cancelled immediately, whereas
+        running jobs may run to completion.
+
+        Returns:
+            a description of the state of the job after the request.
+
+        Raises:
+            KeyError: if the job no longer exists.
+        """
+        with self.__api.post('jobs/{}/cancel'.format(job.uid)) as r:
+            if r.status_code == 200:
+                return Job.from_dict(r.json())
+            if r.status_code == 404:
+                m = "no job found with given UID: {}".format(job.uid)
+                raise KeyError(m)
+            self.__api.handle_erroneous_response(r)
+
+    def result(self, job: Job, *, wait: Optional[float] = None) -> Any:
+        """
+        Retrieves the result of a given job, as a JSON-based description.
+
+        Parameters:
+            job: the job.
+            wait: the maximum number of seconds that the server should wait
+                for the job to finish. If unspecified, the server does not
+                wait.
+
+        Raises:
+            KeyError: if the job no longer exists.
+            JobNotFinished: if the job has not finished.
+            JobCancelled: if the job was cancelled.
+            BugZooException: the exception that caused the job to fail.
+        """
+        params = {}
+        if wait is not None:
+            params['wait'] = wait
+        path = 'jobs/{}/result'.format(job.uid)
+        with self.__api.get(path, params=params) as r:
+            if r.status_code == 200:
+                return r.json()
+            if r.status_code == 404:
+                m = "no job found with given UID: {}".format(job.uid)
+                raise KeyError(m)
+            self.__api.handle_erroneous_response(r)
+
+    def wait(self, job: Job, timeout: Optional[float] = None) -> Any:
+        """
+        Blocks until a given job has finished, and returns its result. The
+        server is long-polled, so the result is returned as soon as the job
+        finishes.
+
+        Parameters:
+            job: the job.
+            timeout: the maximum number of seconds to wait. If unspecified,
+                this method waits indefinitely.
+
+        Raises:
+            KeyError: if the job no longer exists.
+            JobNotFinished: if the job did not finish within the timeout.
+            JobCancelled: if the job was cancelled.
+            BugZooException: the exception that caused the job to fail.
+        """
+        time_stop = None if timeout is None else timer() + timeout
+        while True:
+            wait = _MAX_WAIT_PER_REQUEST
+            if time_stop is not None:
+                wait = max(min(wait, time_stop - timer()), 0.0)
+            try:
+                return self.result(job, wait=wait)
+            except JobNotFinished:
+                if time_stop is not None and timer() >= time_stop:
+                    raise
@@ -1,20 +1,39 @@
-from typing import Optional
+from typing import (Any, AsyncIterator, Callable, Dict, Iterator, Optional,
+                    Tuple)
+from timeit import default_timer as timer
+import codecs
 import sys
+import time
 
 import docker
 
-__all__ = ['PendingExecResponse', 'ExecResponse']
+__all__ = ['PendingExecResponse', 'ExecResponse', 'ExecStream',
+           'AsyncExecStream']
 
 
 class PendingExecResponse(object):
-    def __init__(self, exec_response, output) -> None:
+    """
+    Used to hold the response from a non-blocking command execution, whose
+    output may be consumed as it is produced.
+    """
+    def __init__(self,
+                 exec_response,
+                 output,
+                 api_docker: Optional[docker.APIClient] = None,
+                 time_start: Optional[float] = None
+                 ) -> None:
+        if api_docker is None:
+            api_docker = docker.from_env().api
+        if time_start is None:
+            time_start = timer()
         self.__exec_response = exec_response
         self.__output = output
+        self.__api_docker = api_docker
+        self.__time_start = time_start
 
     @property
     def running(self) -> bool:
-        client = docker.from_env()
-        return client.api.exec_inspect(self.exec_response)['Running']
+        return self.__inspect()['Running']
 
     @property
     def exec_response(self):
@@ -22,15 +41,191 @@ class PendingExecResponse(object):
 
     @property
     def output(self):
+        """
+        An iterator over the raw chunks of output produced by the execution.
+        """
         return self.__output
 
     @property
     def exit_code(self) -> Optional[int]:
-        if self.running:
+        """
+        The exit code of the execution, or None if it is still running.
+        """
+        info = self.__inspect()
+        if info['Running']:
             return None
-        client = docker.from_env()
-        id = self.exec_response['Id']
-        return client.api.exec_inspect(id)
+        return info['ExitCode']
+
+    def wait(self) -> int:
+        """
+        Blocks until the execution has finished, and returns its exit code.
+        Docker may briefly report that an execution is still running after
+        its output has been closed, and so it is polled until it is not.
+        """
+        delay = 0.001
+        while True:
+            info = self.__inspect()
+            if not info['Running']:
+                return info['ExitCode']
+            time.sleep(delay)
+            delay = min(delay * 2, 0.1)
+
+    @property
+    def pid(self) -> int:
+        """
+        The ID of the process that was started by the execution, as seen
+        from the Docker host. Since this ID belongs to the PID namespace of
+        the host, it cannot be used to signal the process from inside the
+        container.
+        """
+        return self.__inspect()['Pid']
+
+    @property
+    def time_start(self) -> float:
+        """The time at which the execution was started."""
+        return self.__time_start
+
+    def chunks(self) -> Iterator[str]:
+        """
+        Returns an iterator over the decoded chunks of output produced by the
+        execution, as they are produced. Multi-byte characters that are split
+        across chunks are decoded once they are complete.
+        """
+        decoder = codecs.getincrementaldecoder('utf-8')('backslashreplace')
+        for chunk in self.__output:
+            text = decoder.decode(chunk)
+            if text:
+                yield text
+        text = decoder.decode(b'', final=True)
+        if text:
+            yield text
+
+    def __inspect(self) -> Dict[str, Any]:
+        return self.__api_docker.exec_inspect(self.__exec_response['Id'])
+
+
+class ExecStream(object):
+    """
+    Provides an iterator over the output of a command execution, which yields
+    chunks of output as soon as they are produced. The exit code and the
+    duration of the execution become available once the iterator has been
+    exhausted.
+
+    If the stream is closed, or its iteration is abandoned, before it has
+    been exhausted, the execution is aborted.
+    """
+    def __init__(self,
+                 chunks: Iterator[str],
+                 finish: Callable[[], Tuple[int, float]],
+                 abort: Optional[Callable[[], None]] = None
+                 ) -> None:
+        """
+        Parameters:
+            chunks: an iterator over the chunks of output.
+            finish: called once all chunks have been consumed to obtain the
+                exit code and duration of the execution.
+            abort: called if the stream is closed before all chunks have
+                been consumed.
+        """
+        self.__chunks = chunks
+        self.__finish = finish
+        self.__abort = abort
+        self.__closed = False
+        self.__code = None  # type: Optional[int]
+        self.__duration = None  # type: Optional[float]
+
+    def __iter__(self) -> Iterator[str]:
+        if self.__closed:
+            return
+        try:
+            yield from self.__chunks
+            self.__code, self.__duration = self.__finish()
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        """
+        Closes the stream. If the stream has not been exhausted, the
+        execution is aborted.
+        """
+        if self.__closed:
+            return
+        self.__closed = True
+        close_chunks = getattr(self.__chunks, 'close', None)
+        if close_chunks:
+            close_chunks()
+        if not self.finished and self.__abort:
+            self.__abort()
+
+    @property
+    def finished(self) -> bool:
+        """True if all of the output of the execution has been consumed."""
+        return self.__code is not None
+
+    @property
+    def code(self) -> Optional[int]:
+        """
+        The exit code of the execution, or None if the output has not been
+        consumed.
+        """
+        return self.__code
+
+    @property
+    def duration(self) -> Optional[float]:
+        """
+        The length of time taken to complete the execution, or None if the
+        output has not been consumed.
+        """
+        return self.__duration
+
+
+class AsyncExecStream(object):
+    """
+    Provides an asynchronous iterator over the output of a command execution.
+
+    See: `ExecStream`
+    """
+    def __init__(self,
+                 chunks: AsyncIterator[str],
+                 finish: Callable[[], Tuple[int, float]]
+                 ) -> None:
+        self.__chunks = chunks
+        self.__finish = finish
+        self.__code = None  # type: Optional[int]
+        self.__duration = None  # type: Optional[float]
+
+    def __aiter__(self) -> 'AsyncExecStream':
+        return self
+
+    async def __anext__(self) -> str:
+        if self.finished:
+            raise StopAsyncIteration
+        try:
+            return await self.__chunks.__anext__()
+        except StopAsyncIteration:
+            self.__code, self.__duration = self.__finish()
+            raise
+
+    @property
+    def finished(self) -> bool:
+        """True if all of the output of the execution has been consumed."""
+        return self.__code is not None
+
+    @property
+    def code(self) -> Optional[int]:
+        """
+        The exit code of the execution, or None if the output has not been
+        consumed.
+        """
+        return self.__code
+
+    @property
+    def duration(self) -> Optional[float]:
+        """
+        The length of time taken to complete the execution, or None if the
+        output has not been consumed.
+        """
+        return self.__duration
 
 
 class ExecResponse(object):
@@ -161,7 +161,8 @@ class Compiler:
         cmd_outcome = manager_container.command(container,
                                                 command,
                                                 context=context,
-                                                stderr=True)
+                                                stderr=True,
+                                                modifies_source=False)
         logger.debug("compiled container [%s]", container.uid)
         return CompilationOutcome(cmd_outcome)
 
@@ -5,6 +5,8 @@ from .patch import Patch
 from .fileline import FileLine, FileLineSet, FileLineMap
 from .filechar import FileChar, FileCharRange
 from .test import TestCase, TestOutcome, TestSuite
+from .candidate import CandidateOutcome
+from .job import Job, JobStatus
 from .coverage import CoverageInstructions, TestCoverage, TestSuiteCoverage
 from .tool import Tool
 from .source import Source, SourceContents, RemoteSource, LocalSource
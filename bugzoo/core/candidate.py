@@ -0,0 +1,56 @@
+__all__ = ['CandidateOutcome']
+
+from typing import Any, Dict, Optional
+from collections import OrderedDict
+
+import attr
+
+from .test import TestOutcome
+from ..compiler import CompilationOutcome
+
+
+@attr.s(frozen=True)
+class CandidateOutcome(object):
+    """
+    Describes the outcome of evaluating a candidate patch, which is applied,
+    compiled and tested in that order. Evaluation stops at the first stage
+    that fails.
+    """
+    # the position of the candidate within the sequence of evaluated patches
+    index = attr.ib(type=int)
+    applied = attr.ib(type=bool)
+    build = attr.ib(type=Optional[CompilationOutcome], default=None)
+    tests = attr.ib(type=Dict[str, TestOutcome],
+                    default=attr.Factory(OrderedDict))
+
+    @staticmethod
+    def from_dict(d: Dict[str, Any]) -> 'CandidateOutcome':
+        build = None  # type: Optional[CompilationOutcome]
+        if d.get('build') is not None:
+            build = CompilationOutcome.from_dict(d['build'])
+        tests = OrderedDict((t['test'], TestOutcome.from_dict(t['outcome']))
+                            for t in d.get('tests', []))
+        return CandidateOutcome(d['index'], d['applied'], build, tests)
+
+    @property
+    def compiled(self) -> bool:
+        """
+        True if the candidate was successfully applied and compiled.
+        """
+        return self.build is not None and self.build.successful
+
+    @property
+    def successful(self) -> bool:
+        """
+        True if the candidate was successfully applied and compiled, and
+        passed every test that was executed.
+        """
+        return self.applied and self.compiled and \
+            all(outcome.passed for outcome in self.tests.values())
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'index': self.index,
+                'applied': self.applied,
+                'build': self.build.to_dict() if self.build else None,
+                'tests': [{'test': name, 'outcome': outcome.to_dict()}
+                          for (name, outcome) in self.tests.items()]}
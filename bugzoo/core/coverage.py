@@ -199,15 +199,51 @@ class TestSuiteCoverage(Mapping[str, TestCoverage]):
 
     @staticmethod
     def from_file(fn: str) -> 'TestSuiteCoverage':
+        """
+        Loads a test suite coverage report from a given file, which may
+        either be a YAML file or a binary coverage file. Binary coverage
+        files are read lazily, and remain open until the returned report is
+        closed.
+        """
+        from .covfile import is_coverage_file, read_coverage_file
+        if is_coverage_file(fn):
+            return read_coverage_file(fn)
         with open(fn, 'r') as f:
             d = yaml.safe_load(f)
             return TestSuiteCoverage.from_dict(d)
 
     def __init__(self, test_coverage: Mapping[str, TestCoverage]) -> None:
-        self.__test_coverage = \
-            OrderedDict()  # type: OrderedDict[str, TestCoverage]
-        for test_name in sorted(test_coverage):
-            self.__test_coverage[test_name] = test_coverage[test_name]
+        """
+        Constructs a test suite coverage report from a mapping between test
+        names and their coverage. Coverage for individual tests is only
+        retrieved from the given mapping when it is accessed.
+        """
+        if isinstance(test_coverage, dict):
+            test_coverage = dict(test_coverage)
+        self.__tests = sorted(test_coverage)  # type: List[str]
+        self.__test_coverage = test_coverage
+
+    def close(self) -> None:
+        """
+        Releases any resources that are held by the mapping from which this
+        report retrieves the coverage of each test (e.g., an open binary
+        coverage file). Coverage that has not yet been retrieved may no
+        longer be accessible once the report has been closed.
+        """
+        close = getattr(self.__test_coverage, 'close', None)
+        if close:
+            close()
+
+    def __enter__(self) -> 'TestSuiteCoverage':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def to_file(self, fn: str) -> None:
+        """Writes this coverage report to a given binary coverage file."""
+        from .covfile import write_coverage_file
+        write_coverage_file(self, fn)
 
     def __repr__(self) -> str:
         output = [repr(self[name_test]) for name_test in self]
@@ -215,15 +251,14 @@ class TestSuiteCoverage(Mapping[str, TestCoverage]):
 
     def covering_tests(self, line: FileLine) -> Set[str]:
         """Returns the names of all test cases that cover a given line."""
-        return set(test for (test, cov) in self.__test_coverage.items() \
-                   if line in cov)
+        return set(test for test in self if line in self[test])
 
     def __iter__(self) -> Iterator[str]:
         """
         Returns an iterator over the names of the test cases that are
         represented by this coverage report.
         """
-        return self.__test_coverage.keys().__iter__()
+        return iter(self.__tests)
 
     def __getitem__(self, name: str) -> TestCoverage:
         """Retrieves coverage information for a given test case.
@@ -238,8 +273,7 @@ class TestSuiteCoverage(Mapping[str, TestCoverage]):
         return self.__test_coverage[name]
 
     def to_dict(self) -> dict:
-        return {test: cov.to_dict() \
-                for (test, cov) in self.__test_coverage.items()}
+        return {test: self[test].to_dict() for test in self}
 
     def restricted_to_files(self,
                             filenames: List[str]
@@ -259,9 +293,8 @@ class TestSuiteCoverage(Mapping[str, TestCoverage]):
         Returns a variant of this coverage report that only contains coverage
         for failing test executions.
         """
-        return TestSuiteCoverage({t: cov \
-                                  for (t, cov) in self.__test_coverage.items() \
-                                  if not cov.outcome.passed})
+        return TestSuiteCoverage({t: self[t] for t in self
+                                  if not self[t].outcome.passed})
 
     @property
     def passing(self) -> 'TestSuiteCoverage':
@@ -269,22 +302,18 @@ class TestSuiteCoverage(Mapping[str, TestCoverage]):
         Returns a variant of this coverage report that only contains coverage
         for failing test executions.
         """
-        return TestSuiteCoverage({t: cov \
-                                  for (t, cov) in self.__test_coverage.items() \
-                                  if cov.outcome.passed})
+        return TestSuiteCoverage({t: self[t] for t in self
+                                  if self[t].outcome.passed})
 
     def __len__(self) -> int:
         """
         Returns a count of the number of test executions that are included
         within this coverage report.
         """
-        return len(self.__test_coverage)
+        return len(self.__tests)
 
     @property
     def lines(self) -> Set[FileLine]:
         """Returns the set of all file lines that were covered."""
         assert len(self) > 0
-        output = FileLineSet()  # type: Set[FileLine]
-        for coverage in self.__test_coverage.values():
-            output = output.union(coverage.lines)
-        return output
+        return FileLineSet().union(*(self[test].lines for test in self))
@@ -0,0 +1,256 @@
+"""
+This module implements a compact binary file format for test suite coverage
+reports, which can be memory-mapped and read lazily, one test at a time.
+
+All integers are little-endian. A file has the following layout:
+
+* header: the magic bytes `BZCOV\\0`, a uint16 format version, a uint32
+  count of files, a uint32 count of tests, and a uint64 offset to the index.
+* blocks: one block per test, consisting of a uint32-prefixed UTF-8 JSON
+  encoding of the test outcome, a uint32 count of file entries, and for each
+  file entry, a uint32 file number, a uint32 count of line ranges, and that
+  many pairs of uint32 (first, last) line numbers.
+* index: a uint32-prefixed UTF-8 name for each file, followed by a
+  uint32-prefixed UTF-8 name, a uint64 block offset, and a uint32 block size
+  for each test.
+"""
+__all__ = ('MAGIC', 'VERSION', 'is_coverage_file', 'read_coverage_file',
+           'write_coverage_file', 'CoverageFileReader')
+
+from typing import Dict, Iterator, List, Mapping, Tuple
+import json
+import mmap
+import os
+import struct
+import tempfile
+
+import numpy
+
+from .coverage import TestCoverage, TestSuiteCoverage
+from .fileline import FileLineSet
+from .test import TestOutcome
+
+MAGIC = b'BZCOV\x00'
+VERSION = 1
+
+_HEADER = struct.Struct('<6sHIIQ')
+_UINT32 = struct.Struct('<I')
+_UINT32_PAIR = struct.Struct('<II')
+_BLOCK_ENTRY = struct.Struct('<QI')
+
+
+def is_coverage_file(fn: str) -> bool:
+    """
+    Determines whether a given file is a binary coverage file, based on its
+    leading magic bytes.
+    """
+    with open(fn, 'rb') as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def _encode_string(s: str) -> bytes:
+    b = s.encode('utf-8')
+    return _UINT32.pack(len(b)) + b
+
+
+def _encode_lines(lines: numpy.ndarray) -> bytes:
+    """Range-encodes an ascending array of line numbers."""
+    breaks = numpy.flatnonzero(numpy.diff(lines) != 1)
+    firsts = lines[numpy.concatenate(([0], breaks + 1))]
+    lasts = lines[numpy.concatenate((breaks, [len(lines) - 1]))]
+    ranges = numpy.empty(2 * len(firsts), dtype='<u4')
+    ranges[0::2] = firsts
+    ranges[1::2] = lasts
+    return _UINT32.pack(len(firsts)) + ranges.tobytes()
+
+
+def _decode_bitset(ranges: numpy.ndarray) -> int:
+    """Decodes an array of (first, last) line ranges into an integer bitset."""
+    firsts = ranges[0::2].astype(numpy.int64)
+    lasts = ranges[1::2].astype(numpy.int64)
+    delta = numpy.zeros(int(lasts.max()) + 2, dtype=numpy.int64)
+    numpy.add.at(delta, firsts, 1)
+    numpy.add.at(delta, lasts + 1, -1)
+    bits = numpy.cumsum(delta[:-1]) > 0
+    packed = numpy.packbits(bits, bitorder='little')
+    return int.from_bytes(packed.tobytes(), 'little')
+
+
+def write_coverage_file(coverage: TestSuiteCoverage, fn: str) -> None:
+    """
+    Writes a given test suite coverage report to a binary coverage file. The
+    file is written atomically, by first writing to a temporary file in the
+    same directory.
+    """
+    files = {}  # type: Dict[str, int]
+    tests = []  # type: List[Tuple[str, int, int]]
+
+    dir_fn = os.path.dirname(os.path.abspath(fn))
+    fd, fn_tmp = tempfile.mkstemp(dir=dir_fn, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(b'\x00' * _HEADER.size)
+            offset = _HEADER.size
+            for name in coverage:
+                test_coverage = coverage[name]
+                outcome = json.dumps(test_coverage.outcome.to_dict())
+                block = [_encode_string(outcome)]
+                lines = test_coverage.lines
+                block.append(_UINT32.pack(len(lines.files)))
+                for filename in lines.files:
+                    if filename not in files:
+                        files[filename] = len(files)
+                    block.append(_UINT32.pack(files[filename]))
+                    block.append(_encode_lines(lines.lines_array(filename)))
+                data = b''.join(block)
+                f.write(data)
+                tests.append((name, offset, len(data)))
+                offset += len(data)
+
+            offset_index = offset
+            for filename in sorted(files, key=files.__getitem__):
+                f.write(_encode_string(filename))
+            for (name, offset, size) in tests:
+                f.write(_encode_string(name))
+                f.write(_BLOCK_ENTRY.pack(offset, size))
+
+            f.seek(0)
+            f.write(_HEADER.pack(MAGIC, VERSION, len(files), len(tests),
+                                 offset_index))
+        os.replace(fn_tmp, fn)
+    except BaseException:
+        os.remove(fn_tmp)
+        raise
+
+
+class CoverageFileReader(Mapping[str, TestCoverage]):
+    """
+    Provides lazy, read-only access to the contents of a binary coverage
+    file. Only the index of the file is read upon construction; the coverage
+    for each test is decoded upon its first access.
+
+    The file remains memory-mapped until the reader is closed, either
+    explicitly, via `close`, or by using the reader as a context manager.
+    Once closed, coverage can no longer be decoded, but coverage that was
+    previously decoded remains accessible.
+    """
+    def __init__(self, fn: str) -> None:
+        """
+        Opens a given binary coverage file.
+
+        Raises:
+            ValueError: if the file is not a binary coverage file, or if it
+                uses an unsupported version of the format.
+        """
+        with open(fn, 'rb') as f:
+            self.__buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.__cache = {}  # type: Dict[str, TestCoverage]
+        try:
+            self.__read_index(fn)
+        except BaseException:
+            self.close()
+            raise
+
+    def __read_index(self, fn: str) -> None:
+        buff = self.__buffer
+        if len(buff) < _HEADER.size:
+            raise ValueError("not a coverage file: {}".format(fn))
+        magic, version, num_files, num_tests, offset = \
+            _HEADER.unpack_from(buff, 0)
+        if magic != MAGIC:
+            raise ValueError("not a coverage file: {}".format(fn))
+        if version != VERSION:
+            m = "unsupported coverage file version [{}]: {}"
+            raise ValueError(m.format(version, fn))
+
+        self.__files = []  # type: List[str]
+        for _ in range(num_files):
+            filename, offset = self.__read_string(offset)
+            self.__files.append(filename)
+
+        self.__blocks = {}  # type: Dict[str, Tuple[int, int]]
+        for _ in range(num_tests):
+            name, offset = self.__read_string(offset)
+            self.__blocks[name] = _BLOCK_ENTRY.unpack_from(buff, offset)
+            offset += _BLOCK_ENTRY.size
+
+    @property
+    def closed(self) -> bool:
+        """True if this reader has been closed."""
+        return self.__buffer.closed
+
+    def close(self) -> None:
+        """
+        Closes the underlying memory map of the coverage file. Closing a
+        reader more than once has no effect.
+        """
+        self.__buffer.close()
+
+    def __enter__(self) -> 'CoverageFileReader':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def __read_string(self, offset: int) -> Tuple[str, int]:
+        (size,) = _UINT32.unpack_from(self.__buffer, offset)
+        offset += _UINT32.size
+        s = self.__buffer[offset:offset + size].decode('utf-8')
+        return s, offset + size
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.__blocks)
+
+    def __len__(self) -> int:
+        return len(self.__blocks)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.__blocks
+
+    def __getitem__(self, name: str) -> TestCoverage:
+        """
+        Decodes the coverage for a given test.
+
+        Raises:
+            KeyError: if the file contains no coverage for the given test.
+            ValueError: if the coverage for the given test has not yet been
+                decoded and the reader has been closed.
+        """
+        if name in self.__cache:
+            return self.__cache[name]
+
+        buff = self.__buffer
+        offset, _ = self.__blocks[name]
+        if self.closed:
+            raise ValueError("coverage file has been closed")
+        outcome_json, offset = self.__read_string(offset)
+        outcome = TestOutcome.from_dict(json.loads(outcome_json))
+
+        (num_entries,) = _UINT32.unpack_from(buff, offset)
+        offset += _UINT32.size
+        bitsets = {}  # type: Dict[str, int]
+        for _ in range(num_entries):
+            file_num, num_ranges = _UINT32_PAIR.unpack_from(buff, offset)
+            offset += _UINT32_PAIR.size
+            ranges = numpy.frombuffer(buff, dtype='<u4',
+                                      count=2 * num_ranges, offset=offset)
+            offset += ranges.nbytes
+            if num_ranges > 0:
+                bitsets[self.__files[file_num]] = _decode_bitset(ranges)
+
+        lines = FileLineSet._from_bitsets(bitsets)
+        test_coverage = TestCoverage(name, outcome, lines)
+        self.__cache[name] = test_coverage
+        return test_coverage
+
+
+def read_coverage_file(fn: str) -> TestSuiteCoverage:
+    """
+    Lazily reads the test suite coverage report stored in a given binary
+    coverage file. The file remains open until the returned report is
+    closed (e.g., by using it as a context manager).
+
+    Raises:
+        ValueError: if the file is not a supported binary coverage file.
+    """
+    return TestSuiteCoverage(CoverageFileReader(fn))
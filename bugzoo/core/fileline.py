@@ -9,6 +9,7 @@ from typing import (Dict, List, Set, Iterator, Iterable, Any, FrozenSet,
 
 from deprecated import deprecated
 import attr
+import numpy
 
 T = TypeVar('T')
 
@@ -101,12 +102,56 @@ class FileLineMap(BaseMap):
         self.__length -= 1
 
 
+def _lines_to_bitset(nums: Iterable[int]) -> int:
+    """
+    Encodes a collection of non-negative line numbers as an integer bitset,
+    in which the n-th bit is set if and only if line n is in the collection.
+    """
+    nums = numpy.fromiter(nums, dtype=numpy.int64)
+    if nums.size == 0:
+        return 0
+    assert nums.min() >= 0, "expected non-negative line numbers"
+    bits = numpy.zeros(int(nums.max()) + 1, dtype=numpy.bool_)
+    bits[nums] = True
+    packed = numpy.packbits(bits, bitorder='little')
+    return int.from_bytes(packed.tobytes(), 'little')
+
+
+def _bitset_to_array(bits: int) -> numpy.ndarray:
+    """Decodes an integer bitset into an ascending array of line numbers."""
+    buff = bits.to_bytes((bits.bit_length() + 7) >> 3, 'little')
+    unpacked = numpy.unpackbits(numpy.frombuffer(buff, dtype=numpy.uint8),
+                                bitorder='little')
+    return numpy.flatnonzero(unpacked)
+
+
+def _bitset_to_lines(bits: int) -> List[int]:
+    """Decodes an integer bitset into an ascending list of line numbers."""
+    return _bitset_to_array(bits).tolist()
+
+
+def _popcount(bits: int) -> int:
+    """Returns the number of set bits in a given integer bitset."""
+    return bin(bits).count('1')
+
+
+if hasattr(int, 'bit_count'):
+    _popcount = int.bit_count  # type: ignore  # noqa: F811
+
+
 class FileLineSet(BaseSet):
-    """A set of file lines."""
+    """
+    A set of file lines.
+
+    Internally, the lines belonging to each file are stored as an integer
+    bitset, in which the n-th bit is set if and only if the n-th line of that
+    file is in the set. Unions, intersections, and restrictions between
+    FileLineSet objects are computed via bitwise operations over those
+    bitsets, without materialising individual FileLine objects.
+    """
     @staticmethod
     def from_dict(d: Dict[str, List[int]]) -> 'FileLineSet':
-        contents = {fn: set(lines) for (fn, lines) in d.items()}
-        return FileLineSet(contents)
+        return FileLineSet(d)
 
     @staticmethod
     def from_list(lst: List[FileLine]) -> 'FileLineSet':
@@ -115,6 +160,8 @@ class FileLineSet(BaseSet):
 
     @staticmethod
     def from_iter(itr: Iterable[FileLine]) -> 'FileLineSet':
+        if isinstance(itr, FileLineSet):
+            return itr
         d = {} # type: Dict[str, Set[int]]
         for line in itr:
             if not line.filename in d:
@@ -122,27 +169,38 @@ class FileLineSet(BaseSet):
             d[line.filename].add(line.num)
         return FileLineSet(d)
 
+    @staticmethod
+    def _from_bitsets(bitsets: Dict[str, int]) -> 'FileLineSet':
+        lines = FileLineSet()
+        lines.__contents = {fn: bits for (fn, bits) in bitsets.items() if bits}
+        return lines
+
+    @classmethod
+    def _from_iterable(cls, itr: Iterable[FileLine]) -> 'FileLineSet':
+        return FileLineSet.from_iter(itr)
+
     def __init__(self,
-                 contents: Optional[Dict[str, Set[int]]] = None
+                 contents: Optional[Mapping[str, Iterable[int]]] = None
                  ) -> None:
         if contents is None:
             contents = {}
-        self.__contents = \
-            {fn: frozenset(line_nums) for (fn, line_nums) in contents.items()} # type: Dict[str, FrozenSet[int]]
+        self.__contents = {}  # type: Dict[str, int]
+        self.__length = None  # type: Optional[int]
+        for (fn, line_nums) in contents.items():
+            bits = _lines_to_bitset(line_nums)
+            if bits:
+                self.__contents[fn] = bits
 
     def __iter__(self) -> Iterator[FileLine]:
         """Returns an iterator over the lines contained in this set."""
-        for fn in self.__contents:
-            for num in self.__contents[fn]:
+        for (fn, bits) in self.__contents.items():
+            for num in _bitset_to_lines(bits):
                 yield FileLine(fn, num)
 
     def __repr__(self) -> str:
         output = []
-        for (fn, set_lines) in self.__contents.items():
-            lines = sorted(set_lines)
-            if lines == []:
-                continue
-
+        for fn in self.__contents:
+            lines = self.lines(fn)
             ranges = [[lines[0], lines[0]]]
             for num in lines[1:]:
                 if num == ranges[-1][1] + 1:
@@ -162,24 +220,52 @@ class FileLineSet(BaseSet):
 
     def __len__(self) -> int:
         """Returns a count of the number of file lines in the set."""
-        return sum(len(lines) for lines in self.__contents.values())
+        if self.__length is None:
+            self.__length = \
+                sum(_popcount(bits) for bits in self.__contents.values())
+        return self.__length
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, FileLineSet):
+            return self.__contents == other.__contents
+        return super().__eq__(other)
+
+    __hash__ = None  # type: ignore
 
     def __getitem__(self, fn: str) -> Iterator[FileLine]:
         """
         Returns an iterator over all lines contained in this set that belong
         to a given file.
         """
-        if not fn in self.__contents:
-            raise StopIteration
-        for num in self.__contents[fn]:
+        for num in self.lines(fn):
             yield FileLine(fn, num)
 
     def __contains__(self, elem: object) -> bool:
         """Determines whether this set contains a given element."""
         if not isinstance(elem, FileLine):
             return False
-        return elem.filename in self.__contents and \
-               elem.num in self.__contents[elem.filename]
+        bits = self.__contents.get(elem.filename, 0)
+        return elem.num >= 0 and bool((bits >> elem.num) & 1)
+
+    def __or__(self, other: Iterable[FileLine]) -> 'FileLineSet':
+        return self.union(other)
+
+    def __and__(self, other: Iterable[FileLine]) -> 'FileLineSet':
+        return self.intersection(other)
+
+    def lines(self, fn: str) -> List[int]:
+        """
+        Returns an ascending list of the numbers of the lines in this set
+        that belong to a given file.
+        """
+        return _bitset_to_lines(self.__contents.get(fn, 0))
+
+    def lines_array(self, fn: str) -> numpy.ndarray:
+        """
+        Returns an ascending array of the numbers of the lines in this set
+        that belong to a given file.
+        """
+        return _bitset_to_array(self.__contents.get(fn, 0))
 
     def filter(self,
                predicate: Callable[[FileLine], 'FileLineSet']
@@ -191,36 +277,39 @@ class FileLineSet(BaseSet):
         filtered = [fileline for fileline in self if predicate(fileline)]
         return FileLineSet.from_list(filtered)
 
-    def union(self, *others: Iterable[FileLine]) -> Set[FileLine]:
+    def union(self, *others: Iterable[FileLine]) -> 'FileLineSet':
         """
         Returns a set that contains the union of the file lines contained
         within this set and the given collections of file lines.
         """
-        sources = (self,)  # type: Tuple[Iterable[FileLine], ...]
-        sources = sources + others
-        return FileLineSet.from_iter(l for src in sources for l in src)
+        bitsets = dict(self.__contents)
+        for other in others:
+            for (fn, bits) in FileLineSet.from_iter(other).__contents.items():
+                bitsets[fn] = bitsets.get(fn, 0) | bits
+        return FileLineSet._from_bitsets(bitsets)
 
-    def intersection(self, *others: Iterable[FileLine]) -> Set[FileLine]:
+    def intersection(self, *others: Iterable[FileLine]) -> 'FileLineSet':
         """
         Returns a set of file lines that contains the intersection of the lines
         within this set and a given set.
         """
-        lines = set(self)
-        for src in others:
-            lines &= set(src)
-        return FileLineSet.from_iter(lines)
-
-    def restricted_to_files(self, filenames: List[str]) -> 'FileLineSet':
+        bitsets = dict(self.__contents)
+        for other in others:
+            contents_other = FileLineSet.from_iter(other).__contents
+            bitsets = {fn: bits & contents_other[fn]
+                       for (fn, bits) in bitsets.items()
+                       if fn in contents_other}
+        return FileLineSet._from_bitsets(bitsets)
+
+    def restricted_to_files(self, filenames: Iterable[str]) -> 'FileLineSet':
         """
         Returns a variant of this set that only contains lines that occur in
         any one of the given files. (I.e., returns the intersection of this set
         and the set of all lines from a given set of files.)
         """
-        restricted = {} # type: Dict[str, Set[int]]
-        for fn in filenames:
-            if fn in self.__contents:
-                restricted[fn] = set(self.__contents[fn])
-        return FileLineSet(restricted)
+        return FileLineSet._from_bitsets({fn: self.__contents[fn]
+                                          for fn in filenames
+                                          if fn in self.__contents})
 
     @property
     def files(self) -> List[str]:
@@ -234,5 +323,4 @@ class FileLineSet(BaseSet):
         """
         Returns the contents of this set as a JSON/YAML-ready dictionary.
         """
-        return {fn: list(lines)
-                for (fn, lines) in self.__contents.items()}
+        return {fn: self.lines(fn) for fn in self.__contents}
@@ -0,0 +1,61 @@
+__all__ = ['Job', 'JobStatus']
+
+from typing import Any, Dict, Optional
+import enum
+
+import attr
+
+
+class JobStatus(enum.Enum):
+    """Describes the stage of the lifecycle of a job."""
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    SUCCEEDED = 'succeeded'
+    FAILED = 'failed'
+    CANCELLED = 'cancelled'
+
+    @property
+    def finished(self) -> bool:
+        """True if a job with this status will not change status again."""
+        return self in (JobStatus.SUCCEEDED,
+                        JobStatus.FAILED,
+                        JobStatus.CANCELLED)
+
+
+@attr.s(frozen=True)
+class Job(object):
+    """
+    Describes a snapshot of the state of a long-running operation (e.g.,
+    building an image or computing coverage) that is executed in the
+    background by a server.
+    """
+    uid = attr.ib(type=str)
+    # a short description of the operation performed by the job
+    # (e.g., 'coverage')
+    kind = attr.ib(type=str)
+    status = attr.ib(type=JobStatus)
+    # the fraction of the job that has been completed, if known
+    progress = attr.ib(type=Optional[float], default=None)
+    # the description of the exception raised by a failed job, given by the
+    # 'error' entry of `BugZooException.to_dict`
+    error = attr.ib(type=Optional[Dict[str, Any]], default=None)
+
+    @property
+    def finished(self) -> bool:
+        """True if the job has succeeded, failed, or been cancelled."""
+        return self.status.finished
+
+    @staticmethod
+    def from_dict(d: Dict[str, Any]) -> 'Job':
+        return Job(d['uid'],
+                   d['kind'],
+                   JobStatus(d['status']),
+                   d.get('progress'),
+                   d.get('error'))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'uid': self.uid,
+                'kind': self.kind,
+                'status': self.status.value,
+                'progress': self.progress,
+                'error': self.error}
@@ -0,0 +1,160 @@
+"""
+This module provides spectrum-based fault localization formulas, which
+compute a suspiciousness score for every line in a program at once from the
+arrays of a Spectra object.
+
+Additional formulas may be registered via the `formula` decorator:
+
+.. code: python
+
+    from bugzoo.core.localization import formula
+
+    @formula('myformula')
+    def my_formula(ep, ef, np, nf):
+        return ef - ep
+"""
+__all__ = ('formula', 'formulas', 'find_formula', 'suspiciousness',
+           'top_k')
+
+from typing import Callable, Dict, List, Optional
+import typing
+
+import numpy
+
+from ..exceptions import FormulaNotFound
+
+# spectra imports this module
+if typing.TYPE_CHECKING:
+    from .spectra import Spectra
+
+Formula = Callable[[numpy.ndarray, numpy.ndarray, numpy.ndarray,
+                    numpy.ndarray], numpy.ndarray]
+
+_NAME_TO_FORMULA = {}  # type: Dict[str, Formula]
+
+
+def formula(name: str):
+    """
+    Registers a suspiciousness formula under a given name. Formulas are
+    given the `ep`, `ef`, `np`, and `nf` arrays of a spectra, and should
+    return an array containing the suspiciousness of each line.
+    """
+    def register_formula(func: Formula) -> Formula:
+        _NAME_TO_FORMULA[name] = func
+        return func
+    return register_formula
+
+
+def formulas() -> List[str]:
+    """Returns the names of all registered formulas."""
+    return sorted(_NAME_TO_FORMULA.keys())
+
+
+def find_formula(name: str) -> Formula:
+    """
+    Retrieves the formula that is registered under a given name.
+
+    Raises:
+        FormulaNotFound: if no formula is registered under the given name.
+    """
+    try:
+        return _NAME_TO_FORMULA[name]
+    except KeyError:
+        raise FormulaNotFound(name)
+
+
+def _divide(numerator: numpy.ndarray,
+            denominator: numpy.ndarray
+            ) -> numpy.ndarray:
+    """
+    Divides two arrays element-wise, treating division by zero as zero.
+    """
+    numerator = numpy.asarray(numerator, dtype=numpy.float64)
+    denominator = numpy.asarray(denominator, dtype=numpy.float64)
+    out = numpy.zeros(numpy.broadcast(numerator, denominator).shape)
+    return numpy.divide(numerator, denominator, out=out,
+                        where=denominator != 0)
+
+
+@formula('ochiai')
+def ochiai(ep, ef, np, nf):
+    return _divide(ef, numpy.sqrt((ef + nf) * (ef + ep)))
+
+
+@formula('tarantula')
+def tarantula(ep, ef, np, nf):
+    ratio_failing = _divide(ef, ef + nf)
+    ratio_passing = _divide(ep, ep + np)
+    return _divide(ratio_failing, ratio_failing + ratio_passing)
+
+
+@formula('dstar')
+def dstar(ep, ef, np, nf):
+    # lines that are covered by every failing test and no passing test are
+    # assigned an infinite score
+    numerator = numpy.asarray(ef, dtype=numpy.float64) ** 2
+    denominator = ep + nf
+    score = _divide(numerator, denominator)
+    score[(denominator == 0) & (numerator > 0)] = numpy.inf
+    return score
+
+
+@formula('jaccard')
+def jaccard(ep, ef, np, nf):
+    return _divide(ef, ef + nf + ep)
+
+
+@formula('op2')
+def op2(ep, ef, np, nf):
+    num_passing = ep + np
+    return ef - _divide(ep, num_passing + 1)
+
+
+@formula('barinel')
+def barinel(ep, ef, np, nf):
+    return 1.0 - _divide(ep, ep + ef)
+
+
+def suspiciousness(spectra: 'Spectra', name: str) -> numpy.ndarray:
+    """
+    Computes the suspiciousness of every line in a given spectra according to
+    a named formula.
+
+    Returns:
+        an array containing the suspiciousness of each line, aligned with the
+        line index of the spectra.
+
+    Raises:
+        FormulaNotFound: if no formula is registered under the given name.
+    """
+    func = find_formula(name)
+    return func(spectra.ep, spectra.ef, spectra.np, spectra.nf)
+
+
+def top_k(scores: numpy.ndarray, limit: Optional[int] = None) -> numpy.ndarray:
+    """
+    Returns the indices of the highest-scoring entries in a given array of
+    scores, in descending order of score. Ties are broken in favour of the
+    entry with the lower index.
+
+    Parameters:
+        scores: the array of scores.
+        limit: the maximum number of indices that should be returned. If
+            unspecified, the indices of all entries are returned.
+    """
+    size = len(scores)
+    if limit is None or limit >= size:
+        candidates = numpy.arange(size)
+    elif limit <= 0:
+        return numpy.zeros(0, dtype=numpy.int64)
+    else:
+        # find the k-th highest score, and select every entry that scores at
+        # least as high, so that ties at the boundary are broken by index
+        threshold = numpy.partition(scores, size - limit)[size - limit]
+        candidates = numpy.flatnonzero(scores >= threshold)
+
+    order = numpy.lexsort((candidates, -scores[candidates]))
+    ranked = candidates[order]
+    if limit is not None:
+        ranked = ranked[:max(limit, 0)]
+    return ranked
@@ -0,0 +1,214 @@
+"""
+This module provides a dense, array-based representation of the coverage
+information for a test suite, which is used to compute coverage statistics
+(e.g., fault spectra) for every line in a program at once.
+"""
+__all__ = ('LineIndex', 'CoverageMatrix')
+
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy
+
+from .coverage import TestSuiteCoverage
+from .fileline import FileLine, FileLineSet
+
+
+class LineIndex(object):
+    """
+    Assigns a unique, contiguous column to each line in a set of file lines.
+    Columns are ordered by file, and then by line number within each file, so
+    that the lines belonging to a single file occupy a contiguous range of
+    columns.
+    """
+    @staticmethod
+    def from_file_lines(lines: FileLineSet) -> 'LineIndex':
+        """Constructs an index for a given set of file lines."""
+        return LineIndex({fn: lines.lines_array(fn)
+                          for fn in sorted(lines.files)})
+
+    def __init__(self, files: Dict[str, numpy.ndarray]) -> None:
+        """
+        Constructs an index from a mapping between file names and ascending
+        arrays of line numbers. Files are assigned columns in the iteration
+        order of the given mapping.
+        """
+        self.__files = {}  # type: Dict[str, Tuple[int, numpy.ndarray]]
+        offset = 0
+        for (fn, nums) in files.items():
+            if len(nums) == 0:
+                continue
+            self.__files[fn] = (offset, nums)
+            offset += len(nums)
+        self.__size = offset
+        self.__names = list(self.__files.keys())
+        self.__offsets = numpy.array([o for (o, _) in self.__files.values()],
+                                     dtype=numpy.int64)
+
+    def __len__(self) -> int:
+        """The number of lines in this index."""
+        return self.__size
+
+    def __iter__(self) -> Iterator[FileLine]:
+        """Returns an iterator over the lines in this index, in column order."""
+        for (fn, (_, nums)) in self.__files.items():
+            for num in nums.tolist():
+                yield FileLine(fn, num)
+
+    def __getitem__(self, column: int) -> FileLine:
+        """Returns the line that is assigned to a given column."""
+        if not -self.__size <= column < self.__size:
+            raise IndexError("column out of range: {}".format(column))
+        return self.lines_at([column % self.__size])[0]
+
+    def lines_at(self, columns: Iterable[int]) -> List[FileLine]:
+        """Returns the lines that are assigned to a given sequence of columns."""
+        columns = numpy.asarray(columns, dtype=numpy.int64)
+        positions = numpy.searchsorted(self.__offsets, columns, side='right')
+        lines = []  # type: List[FileLine]
+        for (column, position) in zip(columns.tolist(),
+                                      (positions - 1).tolist()):
+            fn = self.__names[position]
+            offset, nums = self.__files[fn]
+            lines.append(FileLine(fn, int(nums[column - offset])))
+        return lines
+
+    def __contains__(self, line: object) -> bool:
+        return isinstance(line, FileLine) and self.index(line) is not None
+
+    @property
+    def files(self) -> List[str]:
+        """The names of the files in this index, in column order."""
+        return list(self.__files.keys())
+
+    def index(self, line: FileLine) -> Optional[int]:
+        """
+        Returns the column that is assigned to a given line, or None if the
+        line does not belong to this index.
+        """
+        if line.filename not in self.__files:
+            return None
+        offset, nums = self.__files[line.filename]
+        i = int(numpy.searchsorted(nums, line.num))
+        if i < len(nums) and nums[i] == line.num:
+            return offset + i
+        return None
+
+    def columns(self, lines: FileLineSet) -> numpy.ndarray:
+        """
+        Returns an array of the columns that are assigned to each line in a
+        given set of file lines. Lines that do not belong to this index are
+        ignored.
+        """
+        columns = []  # type: List[numpy.ndarray]
+        for fn in lines.files:
+            if fn not in self.__files:
+                continue
+            offset, nums = self.__files[fn]
+            wanted = lines.lines_array(fn)
+            i = numpy.searchsorted(nums, wanted)
+            found = i < len(nums)
+            i, wanted = i[found], wanted[found]
+            columns.append(i[nums[i] == wanted] + offset)
+        if not columns:
+            return numpy.zeros(0, dtype=numpy.int64)
+        return numpy.concatenate(columns)
+
+    def restricted_to_files(self,
+                            filenames: Iterable[str]
+                            ) -> Tuple['LineIndex', numpy.ndarray]:
+        """
+        Returns a variant of this index that only contains lines from a given
+        set of files, along with an array of the columns in this index that
+        correspond to each column in the restricted index.
+        """
+        filenames = set(filenames)
+        files = {fn: nums for (fn, (_, nums)) in self.__files.items()
+                 if fn in filenames}
+        columns = [numpy.arange(offset, offset + len(nums))
+                   for (fn, (offset, nums)) in self.__files.items()
+                   if fn in filenames]
+        if columns:
+            selected = numpy.concatenate(columns)
+        else:
+            selected = numpy.zeros(0, dtype=numpy.int64)
+        return LineIndex(files), selected
+
+
+class CoverageMatrix(object):
+    """
+    A dense tests-by-lines boolean matrix, in which the entry for a given
+    test and line is True if and only if that line was covered by that test.
+    Only lines that are covered by at least one test are included.
+    """
+    @staticmethod
+    def from_coverage(coverage: TestSuiteCoverage) -> 'CoverageMatrix':
+        """Builds a coverage matrix for a given test suite coverage report."""
+        tests = list(coverage)
+        lines = FileLineSet().union(*(coverage[t].lines for t in tests))
+        index = LineIndex.from_file_lines(lines)
+
+        matrix = numpy.zeros((len(tests), len(index)), dtype=numpy.bool_)
+        passed = numpy.zeros(len(tests), dtype=numpy.bool_)
+        for (row, test) in enumerate(tests):
+            test_coverage = coverage[test]
+            passed[row] = test_coverage.outcome.passed
+            matrix[row, index.columns(test_coverage.lines)] = True
+
+        return CoverageMatrix(tests, index, matrix, passed)
+
+    def __init__(self,
+                 tests: List[str],
+                 lines: LineIndex,
+                 matrix: numpy.ndarray,
+                 passed: numpy.ndarray
+                 ) -> None:
+        assert matrix.shape == (len(tests), len(lines))
+        assert passed.shape == (len(tests),)
+        self.__tests = list(tests)
+        self.__lines = lines
+        self.__matrix = matrix
+        self.__passed = passed
+
+    @property
+    def tests(self) -> List[str]:
+        """The names of the tests for each row, in row order."""
+        return list(self.__tests)
+
+    @property
+    def lines(self) -> LineIndex:
+        """The index of the lines for each column."""
+        return self.__lines
+
+    @property
+    def matrix(self) -> numpy.ndarray:
+        """The underlying tests-by-lines boolean matrix."""
+        return self.__matrix
+
+    @property
+    def passed(self) -> numpy.ndarray:
+        """A boolean array that indicates whether each test passed."""
+        return self.__passed
+
+    @property
+    def num_passing(self) -> int:
+        """The number of passing tests in this matrix."""
+        return int(self.__passed.sum())
+
+    @property
+    def num_failing(self) -> int:
+        """The number of failing tests in this matrix."""
+        return len(self.__tests) - self.num_passing
+
+    def tally_passing(self) -> numpy.ndarray:
+        """
+        Returns an array that counts the number of passing tests that cover
+        each line.
+        """
+        return self.__matrix[self.__passed].sum(axis=0, dtype=numpy.int64)
+
+    def tally_failing(self) -> numpy.ndarray:
+        """
+        Returns an array that counts the number of failing tests that cover
+        each line.
+        """
+        return self.__matrix[~self.__passed].sum(axis=0, dtype=numpy.int64)
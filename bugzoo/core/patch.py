@@ -1,115 +1,164 @@
 from copy import copy
-from typing import List, Iterator
+from typing import Dict, List, Iterable, Iterator, Mapping, Optional, \
+    Tuple
+import re
+
+from ..exceptions import FailedToApplyPatch
 
 # See following for details about unified diff format:
 #   https://www.artima.com/weblogs/viewpost.jsp?thread=164293
 #   https://www.gnu.org/software/diffutils/manual/html_node/Detailed-Unified.html#Detailed-Unified
 
-class HunkLine(object):
-    pass
+# the maximum number of context lines that may be ignored at either end of a
+# hunk when attempting to locate it, consistent with GNU patch
+MAX_FUZZ = 2
 
+_WHITESPACE = re.compile(r'\s+')
 
-class InsertedLine(HunkLine):
-    def __init__(self, line: str) -> None:
-        """
-        Constructs a new InsertedLine instance.
 
-        Params:
-            line:   The contents of the line that was inserted (with any
-                    trailing line endings removed).
-        """
-        self.__line = line
+def _normalize_whitespace(line: str) -> str:
+    """
+    Normalises the whitespace within a line such that any two lines that
+    only differ by the amount of whitespace between tokens, or by trailing
+    whitespace, are equal. This matches the semantics of the
+    `--ignore-whitespace` option of GNU patch.
+    """
+    return _WHITESPACE.sub(' ', line).rstrip()
 
-    def __str__(self) -> str:
-        return "+{}".format(self.__line)
 
+def _search_order(expected: int, first: int, last: int) -> Iterator[int]:
+    """
+    Yields the positions within a given range in increasing distance from an
+    expected position.
+    """
+    if last < first:
+        return
+    expected = min(max(expected, first), last)
+    yield expected
+    for distance in range(1, max(expected - first, last - expected) + 1):
+        if expected + distance <= last:
+            yield expected + distance
+        if expected - distance >= first:
+            yield expected - distance
+
+
+class HunkLine(object):
+    """
+    Describes a single line within a hunk.
+    """
+    __slots__ = ('__line',)
+    _prefix = ''
 
-class DeletedLine(HunkLine):
     def __init__(self, line: str) -> None:
         """
-        Constructs a new DeletedLine instance.
+        Constructs a new hunk line.
 
         Params:
-            line:   The contents of the line that was removed (with any
-                    trailing line endings removed).
+            line:   The contents of the line (with any trailing line endings
+                    removed).
         """
         self.__line = line
 
+    @property
+    def line(self) -> str:
+        return self.__line
+
     def __str__(self) -> str:
-        return "-{}".format(self.__line)
+        return self._prefix + self.__line
+
+
+class InsertedLine(HunkLine):
+    """
+    A line that was inserted by a hunk.
+    """
+    __slots__ = ()
+    _prefix = '+'
+
+
+class DeletedLine(HunkLine):
+    """
+    A line that was removed by a hunk.
+    """
+    __slots__ = ()
+    _prefix = '-'
 
 
 class ContextLine(HunkLine):
-    def __init__(self, line: str) -> None:
-        """
-        Constructs a new ContextLine instance.
+    """
+    A line that is left unchanged by a hunk.
+    """
+    __slots__ = ()
+    _prefix = ' '
 
-        Params:
-            line:   The contents of the line.
-        """
-        self.__line = line
 
-    def __str__(self) -> str:
-        return " {}".format(self.__line)
+_LINE_TYPES = {'+': InsertedLine, '-': DeletedLine, ' ': ContextLine}
+
+
+def _read_hunk_range(s: str) -> Tuple[int, int]:
+    """
+    Reads a range (e.g., "12,7" or "12") from a hunk header, and returns its
+    start and length.
+    """
+    start, _, length = s.partition(',')
+    return int(start), int(length) if length else 1
 
 
 class Hunk(object):
     @classmethod
     def _read_next(cls, lines: List[str]) -> 'Hunk':
         """
-        Constructs a hunk from a supplied fragment of a unified format diff.
+        Destructively constructs a hunk from a supplied fragment of a unified
+        format diff. The lines of the hunk are removed from the buffer.
         """
-        header = lines[0]
-        assert header.startswith('@@ -')
+        hunk, end = cls._parse(lines, 0)
+        del lines[:end]
+        return hunk
 
-        # sometimes the first line can occur on the same line as the header.
-        # in that case, we inject a new line into the buffer
-        end_header_at = header.index(' @@')
-        bonus_line = header[end_header_at+3:]
-        if bonus_line != "":
-            lines.insert(1, bonus_line)
-
-        header = header[4:end_header_at]
-        left, _, right = header.partition(' +')
-        old_start_at = int(left.split(',')[0])
-        new_start_at = int(right.split(',')[0])
+    @classmethod
+    def _parse(cls, lines: List[str], start: int) -> Tuple['Hunk', int]:
+        """
+        Constructs a hunk from the lines of a unified format diff, beginning
+        with the header of the hunk at a given index.
 
-        old_line_num = old_start_at
-        new_line_num = new_start_at
-        last_insertion_at = old_start_at
+        Returns:
+            a tuple of the hunk and the index of the first line that follows
+            it.
+        """
+        header = lines[start]
+        assert header.startswith('@@ -')
+        end_header_at = header.index(' @@')
+        left, _, right = header[4:end_header_at].partition(' +')
+        old_start_at, num_old_left = _read_hunk_range(left)
+        new_start_at, num_new_left = _read_hunk_range(right)
 
+        hunk_lines = []  # type: List[HunkLine]
 
-        hunk_lines = [] # type: List[HunkLine]
-        while True:
-            # discarding the previous line ensures that we only consume lines
-            # from the line buffer that belong to the hunk
-            lines.pop(0)
-            if not lines:
+        # sometimes the first line can occur on the same line as the header
+        bonus_line = header[end_header_at+3:]
+        if bonus_line != "" and bonus_line[0] in _LINE_TYPES:
+            hunk_lines.append(_LINE_TYPES[bonus_line[0]](bonus_line[1:]))
+
+        # the hunk ends at the first line that doesn't belong to a hunk, or,
+        # once all of the lines described by its header have been read, at
+        # the start of the next file patch
+        index = start + 1
+        num_lines = len(lines)
+        while index < num_lines:
+            line = lines[index]
+            line_type = _LINE_TYPES.get(line[:1])
+            if line_type is None:
                 break
-
-            line = lines[0]
-
-            # inserted line
-            if line.startswith('+'):
-                hunk_lines.append(InsertedLine(line[1:]))
-                new_line_num += 1
-
-            # deleted line
-            elif line.startswith('-'):
-                hunk_lines.append(DeletedLine(line[1:]))
-                old_line_num += 1
-
-            # context line
-            elif line.startswith(' '):
-                hunk_lines.append(ContextLine(line[1:]))
-                new_line_num += 1
-                old_line_num += 1
-
-            # end of hunk
-            else:
+            if num_old_left <= 0 and num_new_left <= 0 \
+                    and line.startswith('---'):
                 break
+            if line_type is not InsertedLine:
+                num_old_left -= 1
+            if line_type is not DeletedLine:
+                num_new_left -= 1
+            hunk_lines.append(line_type(line[1:]))
+            index += 1
 
-        return Hunk(old_start_at, new_start_at, hunk_lines)
+        return Hunk(old_start_at, new_start_at, hunk_lines), index
 
     def __init__(self,
                  old_start_at: int,
@@ -119,25 +168,105 @@ class Hunk(object):
         self.__old_start_at = old_start_at
         self.__new_start_at = new_start_at
         self.__lines = lines
+        self.__num_old_lines = \
+            sum(1 for l in lines if not isinstance(l, InsertedLine))
+        self.__num_new_lines = \
+            sum(1 for l in lines if not isinstance(l, DeletedLine))
+
+    @property
+    def old_start_at(self) -> int:
+        return self.__old_start_at
+
+    @property
+    def new_start_at(self) -> int:
+        return self.__new_start_at
+
+    @property
+    def lines(self) -> List[HunkLine]:
+        return self.__lines[:]
+
+    def _context(self) -> Tuple[int, int]:
+        """
+        Returns the number of leading and trailing context lines in this hunk.
+        """
+        num_prefix = 0
+        for line in self.__lines:
+            if not isinstance(line, ContextLine):
+                break
+            num_prefix += 1
+        num_suffix = 0
+        for line in reversed(self.__lines[num_prefix:]):
+            if not isinstance(line, ContextLine):
+                break
+            num_suffix += 1
+        return (num_prefix, num_suffix)
+
+    def _locate(self,
+                lines: List[str],
+                expected: int,
+                first: int,
+                fuzz: int
+                ) -> Optional[Tuple[int, List[HunkLine]]]:
+        """
+        Attempts to find the lines that are changed by this hunk within a
+        given file.
+
+        Parameters:
+            lines: the whitespace-normalised lines of the file.
+            expected: the index of the line at which the hunk is expected to
+                begin.
+            first: the index of the first line at which the hunk may begin.
+            fuzz: the maximum number of context lines that may be ignored at
+                the start and end of the hunk.
+
+        Returns:
+            a tuple of the index of the first line that is changed by this
+            hunk, and the lines of the hunk that were matched, or None if
+            the hunk could not be located.
+        """
+        hunk_lines = self.__lines
+        num_prefix, num_suffix = self._context()
+
+        # as in GNU patch, a hunk with less leading (or trailing) context
+        # than the other end is anchored to the start (or end) of the file
+        context = max(num_prefix, num_suffix)
+        skip_prefix = fuzz + num_prefix - context
+        skip_suffix = fuzz + num_suffix - context
+        anchored_start = skip_prefix < 0 and self.__old_start_at <= 1
+        anchored_end = skip_suffix < 0
+        skip_prefix = max(skip_prefix, 0)
+        skip_suffix = max(skip_suffix, 0)
+        hunk_lines = hunk_lines[skip_prefix:len(hunk_lines) - skip_suffix]
+
+        old = [_normalize_whitespace(l.line) for l in hunk_lines
+               if not isinstance(l, InsertedLine)]
+        size = len(old)
+        if anchored_start and anchored_end:
+            positions = \
+                [0] if size == len(lines) else []  # type: Iterable[int]
+        elif anchored_start:
+            positions = [0]
+        elif anchored_end:
+            positions = [len(lines) - size]
+        else:
+            positions = _search_order(expected + skip_prefix,
+                                      first,
+                                      len(lines) - size)
+        for position in positions:
+            if position < first:
+                continue
+            if lines[position:position + size] == old:
+                return (position, hunk_lines)
+        return None
 
     def __str__(self) -> str:
         """
         Returns the contents of this hunk as part of a unified format diff.
         """
-        num_deleted = \
-            sum(1 for l in self.__lines if isinstance(l, DeletedLine))
-        num_inserted = \
-            sum(1 for l in self.__lines if isinstance(l, InsertedLine))
-        num_context = \
-            sum(1 for l in self.__lines if isinstance(l, ContextLine))
-
-        num_old_lines = num_context + num_deleted
-        num_new_lines = num_context + num_inserted
-
         header = '@@ -{},{} +{},{} @@'.format(self.__old_start_at,
-                                              num_old_lines,
+                                              self.__num_old_lines,
                                               self.__new_start_at,
-                                              num_new_lines)
+                                              self.__num_new_lines)
         body = [str(line) for line in self.__lines]
         return '\n'.join([header] + body)
 
@@ -151,27 +280,41 @@ class FilePatch(object):
         """
         Destructively extracts the next file patch from the line buffer.
         """
+        file_patch, end = cls._parse(lines, 0)
+        del lines[:end]
+        return file_patch
+
+    @classmethod
+    def _parse(cls, lines: List[str], start: int) -> Tuple['FilePatch', int]:
+        """
+        Constructs the next file patch that occurs in the lines of a unified
+        format diff at or after a given index.
+
+        Returns:
+            a tuple of the file patch and the index of the first line that
+            follows it.
+        """
         # keep munching lines until we hit one starting with '---'
+        index = start
+        num_lines = len(lines)
         while True:
-            if not lines:
+            if index >= num_lines:
                 raise Exception("illegal file patch format: couldn't find line starting with '---'")
-            line = lines[0]
-            if line.startswith('---'):
+            if lines[index].startswith('---'):
                 break
-            lines.pop(0)
+            index += 1
 
-        assert lines[0].startswith('---')
-        assert lines[1].startswith('+++')
-        old_fn = lines.pop(0)[4:].strip()
-        new_fn = lines.pop(0)[4:].strip()
+        assert lines[index + 1].startswith('+++')
+        old_fn = lines[index][4:].strip()
+        new_fn = lines[index + 1][4:].strip()
+        index += 2
 
         hunks = []
-        while lines:
-            if not lines[0].startswith('@@'):
-                break
-            hunks.append(Hunk._read_next(lines))
+        while index < num_lines and lines[index].startswith('@@'):
+            hunk, index = Hunk._parse(lines, index)
+            hunks.append(hunk)
 
-        return FilePatch(old_fn, new_fn, hunks)
+        return FilePatch(old_fn, new_fn, hunks), index
 
     def __init__(self,
                  old_fn: str,
@@ -190,6 +333,124 @@ class FilePatch(object):
     def new_fn(self) -> str:
         return self.__new_fn
 
+    @property
+    def hunks(self) -> List[Hunk]:
+        return self.__hunks[:]
+
+    @property
+    def filename(self) -> str:
+        """
+        The name of the file that is changed by this patch, as it would be
+        determined by `patch -p0`: the old file name, unless the file is
+        created by this patch.
+        """
+        fn = self.__new_fn if self.__old_fn == '/dev/null' else self.__old_fn
+        # discard any timestamp that follows the file name
+        return fn.split('\t')[0]
+
+    @property
+    def creates_file(self) -> bool:
+        """
+        Indicates whether this patch creates a new file.
+        """
+        return self.__old_fn == '/dev/null'
+
+    @property
+    def deletes_file(self) -> bool:
+        """
+        Indicates whether this patch deletes its file.
+        """
+        return self.__new_fn == '/dev/null'
+
+    def apply(self,
+              contents: Optional[str],
+              max_fuzz: int = MAX_FUZZ
+              ) -> Optional[str]:
+        """
+        Applies this patch to the contents of its file. Hunks are matched
+        whilst ignoring differences in whitespace (as per `patch
+        --ignore-whitespace`), and are located by searching outwards from
+        their expected position, first without fuzz and then by ignoring up
+        to `max_fuzz` context lines at either end of the hunk.
+
+        Parameters:
+            contents: the contents of the file, or None if the file does not
+                exist.
+            max_fuzz: the maximum number of context lines that may be ignored
+                when locating a hunk.
+
+        Returns:
+            the patched contents of the file, or None if the file is deleted
+            by this patch.
+
+        Raises:
+            FailedToApplyPatch: if the file does not exist (or, for patches
+                that create a file, if it already exists), or if a hunk
+                could not be located.
+        """
+        filename = self.filename
+        if contents is None and not self.creates_file:
+            raise FailedToApplyPatch(filename, "file does not exist")
+        if contents and self.creates_file:
+            raise FailedToApplyPatch(filename, "file already exists")
+
+        lines = contents.split('\n') if contents else []
+        ends_with_newline = not lines or lines[-1] == ''
+        if lines and lines[-1] == '':
+            lines.pop()
+        crlf = bool(lines) and lines[0].endswith('\r')
+        normalized = [_normalize_whitespace(l) for l in lines]
+
+        # locate each hunk, in order, within the original file
+        changes = []  # type: List[Tuple[int, List[HunkLine]]]
+        first = 0
+        offset = 0
+        for (i, hunk) in enumerate(self.__hunks):
+            has_old_lines = any(not isinstance(l, InsertedLine)
+                                for l in hunk.lines)
+            expected = hunk.old_start_at - (1 if has_old_lines else 0)
+            expected = max(expected, 0)
+            for fuzz in range(min(max_fuzz, max(hunk._context())) + 1):
+                change = hunk._locate(normalized,
+                                      expected + offset,
+                                      first,
+                                      fuzz)
+                if change:
+                    break
+            else:
+                m = "hunk #{} could not be located".format(i + 1)
+                raise FailedToApplyPatch(filename, m)
+            position, hunk_lines = change
+            changes.append(change)
+            offset = position - expected
+            first = position + sum(1 for l in hunk_lines
+                                   if not isinstance(l, InsertedLine))
+
+        # rebuild the file, retaining the original form of each context line
+        patched = []  # type: List[str]
+        last = 0
+        for (position, hunk_lines) in changes:
+            patched += lines[last:position]
+            last = position
+            for hunk_line in hunk_lines:
+                if isinstance(hunk_line, InsertedLine):
+                    line = hunk_line.line
+                    patched.append(line + '\r' if crlf else line)
+                    continue
+                if isinstance(hunk_line, ContextLine):
+                    patched.append(lines[last])
+                last += 1
+        patched += lines[last:]
+
+        if self.deletes_file:
+            if patched:
+                m = "file is not empty after removing its contents"
+                raise FailedToApplyPatch(filename, m)
+            return None
+        if not patched:
+            return ''
+        return '\n'.join(patched) + ('\n' if ends_with_newline else '')
+
     def __str__(self) -> str:
         """
         Returns a string encoding of this file patch in the unified diff
@@ -212,17 +473,56 @@ class Patch(object):
         """
         lines = diff.split('\n')
         file_patches = []
-        while lines:
-            if lines[0] == '' or lines[0].isspace():
-                lines.pop(0)
+        index = 0
+        num_lines = len(lines)
+        while index < num_lines:
+            if lines[index] == '' or lines[index].isspace():
+                index += 1
                 continue
-            file_patches.append(FilePatch._read_next(lines))
+            file_patch, index = FilePatch._parse(lines, index)
+            file_patches.append(file_patch)
 
         return Patch(file_patches)
 
     def __init__(self, file_patches: List[FilePatch]) -> None:
         self.__file_patches = file_patches[:]
 
+    @property
+    def file_patches(self) -> List[FilePatch]:
+        """
+        Returns a list of the file patches that belong to this patch.
+        """
+        return self.__file_patches[:]
+
+    def apply(self,
+              files: Mapping[str, Optional[str]],
+              max_fuzz: int = MAX_FUZZ
+              ) -> Dict[str, Optional[str]]:
+        """
+        Applies this patch to the contents of a set of files. Either every
+        file patch is applied, or none are.
+
+        Parameters:
+            files: a mapping from the name of each file that is changed by
+                this patch (see `FilePatch.filename`) to its contents, or
+                None if the file does not exist.
+            max_fuzz: the maximum number of context lines that may be ignored
+                when locating a hunk.
+
+        Returns:
+            a mapping from the name of each file that is changed by this
+            patch to its patched contents, or None if that file is deleted.
+
+        Raises:
+            FailedToApplyPatch: if any file patch could not be applied.
+        """
+        patched = dict(files)
+        for file_patch in self.__file_patches:
+            fn = file_patch.filename
+            patched[fn] = file_patch.apply(patched.get(fn), max_fuzz)
+        return {fp.filename: patched[fp.filename]
+                for fp in self.__file_patches}
+
     @property
     def files(self) -> List[str]:
         """
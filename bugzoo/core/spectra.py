@@ -1,8 +1,12 @@
-from typing import List, Dict, Iterator
+from typing import List, Dict, Iterator, Optional, Tuple
 import logging
 
+import numpy
+
 from .coverage import TestSuiteCoverage
 from .fileline import FileLine
+from .matrix import CoverageMatrix, LineIndex
+from .localization import suspiciousness, top_k
 
 logger = logging.getLogger(__name__)  # type: logging.Logger
 logger.setLevel(logging.DEBUG)
@@ -61,51 +65,96 @@ class Spectra(object):
     """
     Contains a summary of the number of passing and failing tests that cover
     each line in a given project.
+
+    The spectra for all lines are stored as arrays that are aligned with a
+    LineIndex, such that the i-th entry of each array describes the line
+    that is assigned to the i-th column of the index.
     """
     @staticmethod
     def from_coverage(coverage: TestSuiteCoverage) -> 'Spectra':
-        # tally the number of times that each line is touched by a passing
-        # or failing test
-        tally_failing = {}  # type: Dict[FileLine, int]
-        tally_passing = {}  # type: Dict[FileLine, int]
-
-        for test in coverage.passing:
-            for line in coverage[test].lines:
-                tally_passing[line] = tally_passing.get(line, 0) + 1
+        return Spectra.from_matrix(CoverageMatrix.from_coverage(coverage))
 
-        for test in coverage.failing:
-            for line in coverage[test].lines:
-                tally_failing[line] = tally_failing.get(line, 0) + 1
-
-        return Spectra(len(coverage.passing),
-                       len(coverage.failing),
-                       FileLine.compactify(tally_passing),
-                       FileLine.compactify(tally_failing))
+    @staticmethod
+    def from_matrix(matrix: CoverageMatrix) -> 'Spectra':
+        return Spectra(matrix.num_passing,
+                       matrix.num_failing,
+                       matrix.lines,
+                       matrix.tally_passing(),
+                       matrix.tally_failing())
 
     def __init__(self,
                  num_passing: int,
                  num_failing: int,
-                 tally_passing: Dict[str, Dict[int, int]],
-                 tally_failing: Dict[str, Dict[int, int]]
+                 lines: LineIndex,
+                 tally_passing: numpy.ndarray,
+                 tally_failing: numpy.ndarray
                  ) -> None:
+        assert tally_passing.shape == (len(lines),)
+        assert tally_failing.shape == (len(lines),)
         self.__num_passing = num_passing
         self.__num_failing = num_failing
+        self.__lines = lines
         self.__tally_passing = tally_passing
         self.__tally_failing = tally_failing
 
+    @property
+    def num_passing(self) -> int:
+        """The number of passing tests."""
+        return self.__num_passing
+
+    @property
+    def num_failing(self) -> int:
+        """The number of failing tests."""
+        return self.__num_failing
+
+    @property
+    def lines(self) -> LineIndex:
+        """The index of the lines that are described by this spectra."""
+        return self.__lines
+
+    @property
+    def ep(self) -> numpy.ndarray:
+        """
+        An array that counts the number of passing tests that cover each line.
+        """
+        return self.__tally_passing
+
+    @property
+    def ef(self) -> numpy.ndarray:
+        """
+        An array that counts the number of failing tests that cover each line.
+        """
+        return self.__tally_failing
+
+    @property
+    def np(self) -> numpy.ndarray:
+        """
+        An array that counts the number of passing tests that do not cover
+        each line.
+        """
+        return self.__num_passing - self.__tally_passing
+
+    @property
+    def nf(self) -> numpy.ndarray:
+        """
+        An array that counts the number of failing tests that do not cover
+        each line.
+        """
+        return self.__num_failing - self.__tally_failing
+
+    def __len__(self) -> int:
+        return len(self.__lines)
+
     def __getitem__(self, line: FileLine) -> LineSpectra:
         """
         Retrieves the spectra information for a given line.
         """
-        if not line.filename in self.__tally_passing:
-            ep = 0
+        column = self.__lines.index(line)
+        if column is None:
+            ep = ef = 0
         else:
-            ep = self.__tally_passing[line.filename].get(line.num, 0)
-
-        if not line.filename in self.__tally_failing:
-            ef = 0
-        else:
-            ef = self.__tally_failing[line.filename].get(line.num, 0)
+            ep = int(self.__tally_passing[column])
+            ef = int(self.__tally_failing[column])
 
         np = self.__num_passing - ep
         nf = self.__num_failing - ef
@@ -117,18 +166,51 @@ class Spectra(object):
         Returns an iterator over the source code lines that are represented
         in this spectra.
         """
-        passing_lines = \
-            set(FileLine.decompactify(self.__tally_passing).keys())
-        failing_lines = \
-            set(FileLine.decompactify(self.__tally_failing).keys())
-        lines = passing_lines.union(failing_lines)
-        for line in lines:
-            yield line
+        return iter(self.__lines)
 
     def __repr__(self) -> str:
         bfr = ["{}: {}".format(line, repr(self[line])) for line in self]
         return 'Spectra({})'.format('\n'.join(bfr))
 
+    def suspiciousness(self, formula: str = 'ochiai') -> numpy.ndarray:
+        """
+        Computes the suspiciousness of every line in this spectra using a
+        given fault localization formula.
+
+        Returns:
+            an array containing the suspiciousness of each line, aligned with
+            the line index of this spectra.
+
+        Raises:
+            FormulaNotFound: if no formula is registered under the given name.
+        """
+        return suspiciousness(self, formula)
+
+    def rank(self,
+             formula: str = 'ochiai',
+             limit: Optional[int] = None
+             ) -> List[Tuple[FileLine, float]]:
+        """
+        Ranks the lines in this spectra by their suspiciousness according to
+        a given fault localization formula.
+
+        Parameters:
+            formula: the name of the formula that should be used.
+            limit: the maximum number of lines that should be returned. If
+                unspecified, all lines are returned.
+
+        Returns:
+            a list of lines and their suspiciousness, in descending order of
+            suspiciousness.
+
+        Raises:
+            FormulaNotFound: if no formula is registered under the given name.
+        """
+        scores = self.suspiciousness(formula)
+        columns = top_k(scores, limit)
+        lines = self.__lines.lines_at(columns)
+        return list(zip(lines, scores[columns].tolist()))
+
     def restricted_to_files(self,
                             filenames: List[str]
                             ) -> 'Spectra':
@@ -137,13 +219,9 @@ class Spectra(object):
         lines that appear in any of the files whose name appear in the
         given list.
         """
-        tally_passing = \
-            {fn: entries for (fn, entries) in self.__tally_passing.items() \
-             if fn in filenames}
-        tally_failing = \
-            {fn: entries for (fn, entries) in self.__tally_failing.items() \
-             if fn in filenames}
+        lines, columns = self.__lines.restricted_to_files(filenames)
         return Spectra(self.__num_passing,
                        self.__num_failing,
-                       tally_passing,
-                       tally_failing)
+                       lines,
+                       self.__tally_passing[columns],
+                       self.__tally_failing[columns])
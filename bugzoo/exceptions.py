@@ -23,15 +23,20 @@ __all__ = (
     'BugNotInstalledError',
     'ImageBuildFailed',
     'FailedToComputeCoverage',
+    'FormulaNotFound',
     'ContainerNotFound',
     'FileNotFound',
+    'FailedToApplyPatch',
     'ArgumentNotSpecified',
     'ImageNotInstalled',
     'ImageAlreadyExists',
     'TestNotFound',
     'ToolNotFound',
     'NoCoverageInstructions',
-    'PortInUseError'
+    'PortInUseError',
+    'JobNotFound',
+    'JobCancelled',
+    'JobNotFinished'
 )
 
 
@@ -670,3 +675,147 @@ class FailedToComputeCoverage(BugZooException):
     @property
     def data(self) -> Dict[str, Any]:
         return {'reason': self.reason}
+
+
+class FormulaNotFound(BugZooException):
+    """
+    No fault localization formula was found with the given name.
+    """
+    @classmethod
+    def from_message_and_data(cls,
+                              message: str,
+                              data: Dict[str, Any]
+                              ) -> 'FormulaNotFound':
+        return FormulaNotFound(data['name'])
+
+    def __init__(self, name: str) -> None:
+        self.__name = name
+        super().__init__("no formula found with name: {}".format(name))
+
+    @property
+    def name(self) -> str:
+        """
+        The name of the formula.
+        """
+        return self.__name
+
+    @property
+    def data(self) -> Dict[str, Any]:
+        return {'name': self.name}
+
+
+class FailedToApplyPatch(BugZooException):
+    """
+    A patch could not be applied to a given file.
+    """
+    @classmethod
+    def from_message_and_data(cls,
+                              message: str,
+                              data: Dict[str, Any]
+                              ) -> 'FailedToApplyPatch':
+        return FailedToApplyPatch(data['filename'], data['reason'])
+
+    def __init__(self, filename: str, reason: str) -> None:
+        self.__filename = filename
+        self.__reason = reason
+        m = "failed to apply patch to file [{}]: {}".format(filename, reason)
+        super().__init__(m)
+
+    @property
+    def filename(self) -> str:
+        """
+        The name of the file to which the patch could not be applied.
+        """
+        return self.__filename
+
+    @property
+    def reason(self) -> str:
+        """
+        The reason that the patch could not be applied.
+        """
+        return self.__reason
+
+    @property
+    def data(self) -> Dict[str, Any]:
+        return {'filename': self.filename, 'reason': self.reason}
+
+
+class JobNotFound(BugZooException):
+    """
+    No job was found with a given identifier.
+    """
+    @classmethod
+    def from_message_and_data(cls,
+                              message: str,
+                              data: Dict[str, Any]
+                              ) -> 'JobNotFound':
+        return JobNotFound(data['uid'])
+
+    def __init__(self, uid: str) -> None:
+        self.__uid = uid
+        super().__init__("no job found with uid: {}".format(uid))
+
+    @property
+    def uid(self) -> str:
+        """
+        The uid of the job.
+        """
+        return self.__uid
+
+    @property
+    def data(self) -> Dict[str, Any]:
+        return {'uid': self.uid}
+
+
+class JobCancelled(BugZooException):
+    """
+    A job was cancelled before it could produce a result.
+    """
+    @classmethod
+    def from_message_and_data(cls,
+                              message: str,
+                              data: Dict[str, Any]
+                              ) -> 'JobCancelled':
+        return JobCancelled(data['uid'])
+
+    def __init__(self, uid: str) -> None:
+        self.__uid = uid
+        super().__init__("job was cancelled: {}".format(uid))
+
+    @property
+    def uid(self) -> str:
+        """
+        The uid of the job.
+        """
+        return self.__uid
+
+    @property
+    def data(self) -> Dict[str, Any]:
+        return {'uid': self.uid}
+
+
+class JobNotFinished(BugZooException):
+    """
+    The result of a job was requested before the job had finished.
+    """
+    @classmethod
+    def from_message_and_data(cls,
+                              message: str,
+                              data: Dict[str, Any]
+                              ) -> 'JobNotFinished':
+        return JobNotFinished(data['uid'])
+
+    def __init__(self, uid: str) -> None:
+        self.__uid = uid
+        super().__init__("job has not finished: {}".format(uid))
+
+    @property
+    def uid(self) -> str:
+        """
+        The uid of the job.
+        """
+        return self.__uid
+
+    @property
+    def data(self) -> Dict[str, Any]:
+        return {'uid': self.uid}
@@ -13,6 +13,7 @@ from .mgr.tool import ToolManager
 from .mgr.bug import BugManager
 from .mgr.container import ContainerManager
 from .mgr.file import FileManager
+from .mgr.job import JobManager
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
@@ -82,9 +83,11 @@ class BugZoo:
         self.__sources = SourceManager(self)
         self.__containers = ContainerManager(self)
         self.__files = FileManager(self.__bugs, self.__containers)
+        self.__jobs = JobManager()
 
     def shutdown(self) -> None:
         logger.info("Shutting down daemon...")
+        self.__jobs.shutdown()
         self.__containers.clear()
         logger.info("Shut down daemon")
 
@@ -114,6 +117,14 @@ class BugZoo:
         """
         return os.path.join(self.path, "coverage")
 
+    @property
+    def outcomes_path(self) -> str:
+        """
+        The absolute path to the directory used to store cached test
+        outcomes (see `TestOutcomeCache`).
+        """
+        return os.path.join(self.path, "outcomes")
+
     def rescan(self):
         self.__sources.scan()
 
@@ -145,3 +156,8 @@ class BugZoo:
     def containers(self) -> ContainerManager:
         """The containers that are running on this server."""
         return self.__containers
+
+    @property
+    def jobs(self) -> JobManager:
+        """The background jobs that have been submitted to this server."""
+        return self.__jobs
@@ -0,0 +1,87 @@
+"""
+This module provides helpers for building and reading the in-memory tar
+streams that are exchanged with the Docker archive API (i.e., `put_archive`
+and `get_archive`), which are used to transfer files to and from containers
+without spawning a `docker cp` process or writing to the host filesystem.
+"""
+__all__ = ['pack', 'unpack']
+
+from typing import Dict, Iterable, Mapping, Optional, Tuple, Union
+import io
+import tarfile
+import time
+
+# the contents of a file, optionally accompanied by its permission bits
+FileContents = Union[bytes, Tuple[bytes, int]]
+
+DEFAULT_MODE = 0o644
+
+
+def pack(files: Mapping[str, FileContents],
+         uid: int = 0,
+         gid: int = 0
+         ) -> bytes:
+    """
+    Builds an uncompressed tar archive in memory.
+
+    Parameters:
+        files: a mapping from the paths of the files within the archive to
+            their contents. The contents of each file may be optionally
+            accompanied by its permission bits, given as a (contents, mode)
+            tuple; otherwise, the file is given the default mode, 0644.
+        uid: the numeric ID of the user that should own each file.
+        gid: the numeric ID of the group that should own each file.
+
+    Returns:
+        the contents of the archive.
+    """
+    buff = io.BytesIO()
+    mtime = time.time()
+    with tarfile.open(fileobj=buff, mode='w', format=tarfile.PAX_FORMAT) as tar:
+        for (name, contents) in files.items():
+            if isinstance(contents, tuple):
+                data, mode = contents
+            else:
+                data, mode = contents, DEFAULT_MODE
+            info = tarfile.TarInfo(name.lstrip('/'))
+            info.size = len(data)
+            info.mode = mode
+            info.uid = uid
+            info.gid = gid
+            info.mtime = mtime
+            tar.addfile(info, io.BytesIO(data))
+    return buff.getvalue()
+
+
+def unpack(chunks: Iterable[bytes],
+           strip: Optional[str] = None
+           ) -> Dict[str, Tuple[bytes, int]]:
+    """
+    Reads the regular files that are contained within a tar archive.
+
+    Parameters:
+        chunks: the contents of the archive, given as a sequence of chunks
+            (e.g., as returned by `get_archive`).
+        strip: an optional prefix that should be removed from the name of
+            each file.
+
+    Returns:
+        a mapping from the name of each regular file in the archive to its
+        contents and permission bits.
+    """
+    data = b''.join(chunks)
+    files = {}  # type: Dict[str, Tuple[bytes, int]]
+    if not data:
+        return files
+    buff = io.BytesIO(data)
+    with tarfile.open(fileobj=buff, mode='r:') as tar:
+        for member in tar:
+            if not member.isfile():
+                continue
+            name = member.name
+            if strip and name.startswith(strip):
+                name = name[len(strip):]
+            fh = tar.extractfile(member)
+            assert fh is not None
+            files[name] = (fh.read(), member.mode)
+    return files
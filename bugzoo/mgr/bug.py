@@ -1,15 +1,32 @@
-from typing import Iterator, Optional, List
+from typing import Iterator, Optional, List, Iterable, Sequence, Dict, \
+    Tuple
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 import os
+import logging
+import struct
 
 import docker
 import textwrap
-import yaml
 
+from .evaluate import PatchEvaluator
+from .job import JobHandle
+from .scheduler import TestScheduler
 from ..core.coverage import TestSuiteCoverage
+from ..core.covfile import read_coverage_file, write_coverage_file
 from ..core.bug import Bug
+from ..core.candidate import CandidateOutcome
+from ..core.container import Container
+from ..core.fileline import FileLine
+from ..core.patch import Patch
+from ..core.test import TestCase, TestOutcome
 from ..core.spectra import Spectra
+from ..core.localization import find_formula
 from ..util import print_task_start, print_task_end
 
+logger = logging.getLogger(__name__)  # type: logging.Logger
+logger.setLevel(logging.DEBUG)
+
 
 class BugManager(object):
     """
@@ -82,7 +99,9 @@ class BugManager(object):
     def build(self,
               bug: Bug,
               force: bool = True,
-              quiet: bool = False
+              quiet: bool = False,
+              *,
+              job: Optional[JobHandle] = None
               ) -> None:
         """
         Builds the Docker image associated with a given bug.
@@ -91,7 +110,8 @@ class BugManager(object):
         """
         self.__installation.build.build(bug.image,
                                         force=force,
-                                        quiet=quiet)
+                                        quiet=quiet,
+                                        job=job)
 
     def uninstall(self,
                   bug: Bug,
@@ -126,7 +146,127 @@ class BugManager(object):
         """
         return self.__installation.build.upload(bug.image)
 
-    def validate(self, bug: Bug, verbose: bool = True) -> bool:
+    def provision_fleet(self, bug: Bug, size: int) -> List[Container]:
+        """
+        Provisions a fleet of containers for a given bug in parallel.
+
+        Parameters:
+            bug: the bug for which containers should be provisioned.
+            size: the number of containers that should be provisioned.
+
+        Returns:
+            the provisioned containers.
+        """
+        assert size > 0
+        mgr_ctr = self.__installation.containers
+        with ThreadPoolExecutor(max_workers=size) as executor:
+            futures = [executor.submit(mgr_ctr.provision, bug)
+                       for _ in range(size)]
+        containers = [f.result() for f in futures if not f.exception()]
+        if len(containers) < size:
+            for container in containers:
+                del mgr_ctr[container.uid]
+            for future in futures:
+                future.result()
+        return containers
+
+    def test(self,
+             bug: Bug,
+             tests: Optional[Iterable[TestCase]] = None,
+             *,
+             containers: Optional[Sequence[Container]] = None,
+             workers: int = 1,
+             verbose: bool = False
+             ) -> Dict[str, TestOutcome]:
+        """
+        Executes a given set of tests for a bug, sharding the tests across a
+        fleet of containers.
+
+        Parameters:
+            bug: the bug whose tests should be executed.
+            tests: the tests that should be executed. If unspecified, the
+                entire test suite for the bug will be executed.
+            containers: the containers that should be used to execute the
+                tests. If unspecified, a fleet of fresh containers will be
+                provisioned for the duration of the call.
+            workers: the number of fresh containers that should be
+                provisioned if no containers are given.
+
+        Returns:
+            an ordered mapping from the names of the tests to their outcomes,
+            in the order in which the tests were given.
+        """
+        if tests is None:
+            tests = bug.tests
+        tests = list(tests)
+
+        mgr_ctr = self.__installation.containers
+        fleet = list(containers) if containers else []
+        try:
+            if not containers:
+                fleet = self.provision_fleet(bug, workers)
+            scheduler = TestScheduler(self.__installation, fleet)
+            outcomes = scheduler.execute(tests, verbose=verbose)
+        finally:
+            if not containers:
+                for container in fleet:
+                    del mgr_ctr[container.uid]
+
+        return OrderedDict((t.name, o) for (t, o) in zip(tests, outcomes))
+
+    def evaluate(self,
+                 bug: Bug,
+                 patches: Iterable[Patch],
+                 tests: Optional[Iterable[TestCase]] = None,
+                 *,
+                 workers: int = 1,
+                 in_process: bool = True,
+                 stop_early: bool = True,
+                 cache: bool = False,
+                 ccache: bool = False
+                 ) -> Iterator[CandidateOutcome]:
+        """
+        Evaluates a sequence of candidate patches for a given bug by
+        applying, compiling, and testing each candidate in a container that
+        is reset between candidates.
+
+        Parameters:
+            bug: the bug.
+            patches: the candidate patches.
+            tests: the tests that should be used to evaluate each candidate.
+                If unspecified, the entire test suite for the bug is used.
+            workers: the maximum number of candidates that should be
+                evaluated at once.
+            in_process: if set to True, patches are applied in process
+                rather than by running `patch` inside the container.
+            stop_early: if set to True, the tests for each candidate are
+                executed until the first failing test.
+            cache: if set to True, test outcomes are served from, and added
+                to, the test outcome cache.
+            ccache: if set to True, containers share a ccache volume for the
+                bug's image, so that object files are reused across them.
+
+        Returns:
+            an iterator over the outcomes of the candidates, in the order in
+            which their evaluations are completed.
+
+        See: `PatchEvaluator`
+        """
+        evaluator = PatchEvaluator(self.__installation,
+                                   bug,
+                                   tests,
+                                   workers=workers,
+                                   in_process=in_process,
+                                   stop_early=stop_early,
+                                   cache=cache,
+                                   ccache=ccache)
+        return evaluator.evaluate(patches)
+
+    def validate(self,
+                 bug: Bug,
+                 verbose: bool = True,
+                 workers: int = 1
+                 ) -> bool:
         """
         Checks that a given bug successfully builds, and that it produces an
         expected set of test suite outcomes.
@@ -134,6 +274,8 @@ class BugManager(object):
         Parameters:
             verbose: toggles verbosity of output. If set to `True`, the
                 outcomes of each test will be printed to the standard output.
+            workers: the number of containers across which the test suite
+                should be executed.
 
         Returns:
             `True` if bug behaves as expected, else `False`.
@@ -146,95 +288,151 @@ class BugManager(object):
             print("failed to build bug: {}".format(self.identifier))
             return False
 
-        # provision a container
+        # provision a fleet of containers
         validated = True
+        mgr_ctr = self.__installation.containers
+        fleet = []  # type: List[Container]
         try:
-            c = None
-            c = self.__installation.containers.provision(bug)
+            fleet = self.provision_fleet(bug, workers)
 
             # ensure we can compile the bug
             # TODO: check compilation status!
             print_task_start('Compiling')
-            self.__installation.containers.compile(c)
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                list(executor.map(mgr_ctr.compile, fleet))
             print_task_end('Compiling', 'OK')
 
-            for t in bug.tests:
-                if t.expected_outcome is True:
-                    task = 'Running test: {}'.format(t.name)
-                    print_task_start(task)
-
-                    outcome = \
-                        self.__installation.containers.execute(c, t,
-                                                               verbose=verbose)
-                    if not outcome.passed:
-                        validated = False
-                        print_task_end(task, 'UNEXPECTED: FAIL')
-                        response = textwrap.indent(outcome.response.output,
-                                                   ' ' * 4)
-                        print('\n' + response)
-                    else:
-                        print_task_end(task, 'OK')
-
-                if t.expected_outcome is False:
-                    task = 'Running test: {}'.format(t.name)
-                    print_task_start(task)
-
-                    outcome = \
-                        self.__installation.containers.execute(c, t,
-                                                               verbose=verbose)
+            tests = [t for t in bug.tests if t.expected_outcome is not None]
+            scheduler = TestScheduler(self.__installation, fleet)
+            execute = lambda c, t: mgr_ctr.execute(c, t, verbose=verbose)
+            outcomes = scheduler.imap(execute, tests)
+            for t in tests:
+                task = 'Running test: {}'.format(t.name)
+                print_task_start(task)
+                outcome = next(outcomes)
+
+                if outcome.passed != t.expected_outcome:
+                    validated = False
                     if outcome.passed:
-                        validated = False
                         print_task_end(task, 'UNEXPECTED: PASS')
-                        response = textwrap.indent(outcome.response.output,
-                                                   ' ' * 4)
-                        print('\n' + response)
                     else:
-                        print_task_end(task, 'OK')
+                        print_task_end(task, 'UNEXPECTED: FAIL')
+                    response = textwrap.indent(outcome.response.output,
+                                               ' ' * 4)
+                    print('\n' + response)
+                else:
+                    print_task_end(task, 'OK')
 
-        # ensure that the container is destroyed!
+        # ensure that the containers are destroyed!
         finally:
-            if c:
-                del self.__installation.containers[c.uid]
+            for container in fleet:
+                del mgr_ctr[container.uid]
 
         return validated
 
-    def coverage(self, bug: Bug) -> TestSuiteCoverage:
+    def coverage(self,
+                 bug: Bug,
+                 workers: int = 1,
+                 *,
+                 job: Optional[JobHandle] = None
+                 ) -> TestSuiteCoverage:
         """
         Provides coverage information for each test within the test suite
         for the program associated with this bug.
 
         Parameters:
             bug: the bug for which to compute coverage.
+            workers: the number of containers across which the test suite
+                should be executed if coverage has not yet been computed.
+            job: the background job, if any, that is computing the coverage.
+                Progress is reported after each test, and the computation
+                is abandoned if the job is cancelled.
 
         Returns:
-            a test suite coverage report for the given bug.
+            a test suite coverage report for the given bug. Reports that are
+            loaded from the cache are read lazily, and should be closed
+            (e.g., by using them as context managers) once they are no
+            longer needed.
         """
         # determine the location of the coverage map on disk
-        fn = os.path.join(self.__installation.coverage_path,
-                          "{}.coverage.yml".format(bug.name))
+        dir_coverage = self.__installation.coverage_path
+        fn = os.path.join(dir_coverage, "{}.coverage".format(bug.name))
+        fn_yml = os.path.join(dir_coverage,
+                              "{}.coverage.yml".format(bug.name))
 
         # is the coverage already cached? if so, load.
         if os.path.exists(fn):
-            return TestSuiteCoverage.from_file(fn)
+            try:
+                return read_coverage_file(fn)
+            except (ValueError, struct.error, IndexError):
+                logger.warning("ignoring unreadable coverage cache: %s", fn)
+
+        # migrate legacy YAML caches to the binary format
+        if os.path.exists(fn_yml):
+            logger.info("migrating coverage cache to binary format: %s",
+                        fn_yml)
+            with TestSuiteCoverage.from_file(fn_yml) as coverage:
+                write_coverage_file(coverage, fn)
+            os.remove(fn_yml)
+            return read_coverage_file(fn)
 
         # if we don't have coverage information, compute it
         mgr_ctr = self.__installation.containers
-        container = None
+        fleet = []  # type: List[Container]
         try:
-            container = mgr_ctr.provision(bug)
-            coverage = mgr_ctr.coverage(container)
+            fleet = self.provision_fleet(bug, workers)
+            if job:
+                job.check()
+            scheduler = TestScheduler(self.__installation, fleet)
+            coverage = scheduler.coverage(bug.tests, job=job)
 
             # save to disk
-            with open(fn, 'w') as f:
-                yaml.dump(coverage.to_dict(), f, default_flow_style=False)
+            write_coverage_file(coverage, fn)
         finally:
-            if container:
+            for container in fleet:
                 del mgr_ctr[container.id]
 
         return coverage
 
-    def spectra(self, bug: Bug) -> Spectra:
+    def spectra(self, bug: Bug, workers: int = 1) -> Spectra:
         """
         Computes and returns the fault spectra for a given bug.
         """
-        return Spectra.from_coverage(self.coverage)
+        with self.coverage(bug, workers=workers) as coverage:
+            return Spectra.from_coverage(coverage)
+
+    def localize(self,
+                 bug: Bug,
+                 formula: str = 'ochiai',
+                 limit: Optional[int] = None,
+                 *,
+                 files: Optional[List[str]] = None,
+                 workers: int = 1
+                 ) -> List[Tuple[FileLine, float]]:
+        """
+        Ranks the lines in the program for a given bug by their
+        suspiciousness, according to a given spectrum-based fault
+        localization formula.
+
+        Parameters:
+            bug: the bug.
+            formula: the name of the formula that should be used.
+            limit: the maximum number of lines that should be returned. If
+                unspecified, all covered lines are returned.
+            files: an optional list of files to which the ranking should be
+                restricted.
+            workers: the number of containers that should be used to compute
+                coverage, if coverage for the bug has not been cached.
+
+        Returns:
+            a list of lines and their suspiciousness, in descending order of
+            suspiciousness.
+
+        Raises:
+            FormulaNotFound: if no formula is registered under the given name.
+        """
+        find_formula(formula)
+        spectra = self.spectra(bug, workers=workers)
+        if files is not None:
+            spectra = spectra.restricted_to_files(files)
+        return spectra.rank(formula, limit)
@@ -1,17 +1,22 @@
-from typing import Iterator
+from typing import Iterator, Optional
 import os
 import shutil
 import json
 import logging
+import re
 
 import docker
 
 from ..core.build import BuildInstructions
+from .job import JobHandle
 from ..exceptions import ImageBuildFailed
 
 logger = logging.getLogger(__name__)  # type: logging.Logger
 logger.setLevel(logging.DEBUG)
 
+# matches the line that announces each step of a Docker build
+_STEP = re.compile(r'^Step (\d+)/(\d+) :')
+
 
 class BuildManager(object):
     def __init__(self, client_docker: docker.DockerClient):
@@ -75,7 +80,9 @@ class BuildManager(object):
     def build(self,
               name: str,
               force: bool = False,
-              quiet: bool = False
+              quiet: bool = False,
+              *,
+              job: Optional[JobHandle] = None
               ) -> None:
         """
         Constructs a Docker image, given by its name, using the set of build
@@ -89,6 +96,10 @@ class BuildManager(object):
                 built, then the build will be skipped.
             quiet: used to enable and disable output from the Docker build
                 process.
+            job: the background job, if any, that is performing the build.
+                The progress of the job is reported at the start of each step
+                of the Dockerfile, and the build is abandoned if the job is
+                cancelled.
         """
         logger.debug("request to build image: %s", name)
         instructions = self[name]
@@ -97,6 +108,8 @@ class BuildManager(object):
             logger.info("building dependent image: %s",
                         instructions.depends_on)
             self.build(instructions.depends_on, force=force, quiet=quiet)
+            if job:
+                job.check()
 
         if not force and self.is_installed(instructions.name):
             return
@@ -127,6 +140,10 @@ class BuildManager(object):
                         print(line_msg)
                     if line_msg.startswith('Successfully built'):
                         success = True
+                    step = _STEP.match(line_msg)
+                    if job and step:
+                        num, total = int(step.group(1)), int(step.group(2))
+                        job.report((num - 1) / total)
 
             if not success:
                 raise ImageBuildFailed(name, log)
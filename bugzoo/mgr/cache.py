@@ -0,0 +1,296 @@
+"""
+This module provides caches for the decoded contents of files inside
+containers, which avoid repeatedly transferring and decoding the same,
+unchanged files, and for the outcomes of tests, which avoid re-executing
+a test against a program state for which it has already been executed.
+"""
+__all__ = ['FileCache', 'TestOutcomeCache']
+
+from typing import Any, Dict, Optional, Set, Tuple
+from collections import OrderedDict
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+
+from ..core.container import Container
+from ..core.test import TestCase, TestOutcome
+
+logger = logging.getLogger(__name__)  # type: logging.Logger
+logger.setLevel(logging.DEBUG)
+
+DEFAULT_MAX_SIZE = 64 * 1024 * 1024
+
+_Key = Tuple[str, str]
+# the stamp and contents of a cached file
+_Entry = Tuple[str, str]
+
+
+class FileCache(object):
+    """
+    A least-recently-used cache of file contents, keyed by container and
+    file path, and bounded by the total length of the cached contents.
+
+    Each entry is stored alongside a stamp for the file (e.g., its inode,
+    size and modification time), which is cheap to obtain from inside the
+    container (see `ContainerManager.file_stamps`). An entry is only served
+    if the stamp given by the caller matches the stored stamp, so changes
+    that are made to a file by any means (e.g., by commands or interactive
+    sessions) are detected without the need to invalidate the cache.
+
+    Operations on instances of this class are thread safe.
+    """
+    def __init__(self, max_size: int = DEFAULT_MAX_SIZE) -> None:
+        """
+        Constructs an empty cache.
+
+        Parameters:
+            max_size: the maximum total number of characters that may be
+                held by the cache.
+        """
+        self.__max_size = max_size
+        self.__size = 0
+        self.__lock = threading.Lock()
+        self.__entries = OrderedDict()  # type: OrderedDict[_Key, _Entry]
+        self.__keys_by_container = {}  # type: Dict[str, Set[_Key]]
+        self.__hits = 0
+        self.__misses = 0
+
+    @property
+    def max_size(self) -> int:
+        """The maximum total number of characters held by the cache."""
+        return self.__max_size
+
+    @property
+    def size(self) -> int:
+        """The total number of characters currently held by the cache."""
+        return self.__size
+
+    @property
+    def hits(self) -> int:
+        """The number of lookups that were served by the cache."""
+        return self.__hits
+
+    @property
+    def misses(self) -> int:
+        """The number of lookups that were not served by the cache."""
+        return self.__misses
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def __remove(self, key: _Key) -> None:
+        _, contents = self.__entries.pop(key)
+        self.__size -= len(contents)
+        keys = self.__keys_by_container.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+
+    def contains(self, container: Container, path: str) -> bool:
+        """
+        Determines whether contents are cached for a given file inside a
+        container, regardless of whether those contents are still valid.
+        This can be used to avoid computing the stamp of a file whose
+        contents are not cached.
+        """
+        with self.__lock:
+            return (container.uid, path) in self.__entries
+
+    def get(self,
+            container: Container,
+            path: str,
+            stamp: Optional[str]
+            ) -> Optional[str]:
+        """
+        Retrieves the cached contents of a given file inside a container.
+
+        Parameters:
+            container: the container.
+            path: the absolute path to the file.
+            stamp: the current stamp of the file, or None if the file does
+                not exist.
+
+        Returns:
+            the cached contents of the file, or None if they are not cached
+            or if the file has changed since its contents were cached.
+        """
+        with self.__lock:
+            key = (container.uid, path)
+            entry = self.__entries.get(key)
+            if entry is not None and entry[0] != stamp:
+                self.__remove(key)
+                entry = None
+            if entry is None:
+                self.__misses += 1
+                return None
+            self.__hits += 1
+            self.__entries.move_to_end(key)
+            return entry[1]
+
+    def put(self,
+            container: Container,
+            path: str,
+            contents: str,
+            stamp: Optional[str]
+            ) -> None:
+        """
+        Caches the contents of a given file inside a container, evicting the
+        least recently used entries if the cache exceeds its maximum size.
+        Contents that are larger than the cache itself, or that have no
+        stamp, are not cached.
+
+        Parameters:
+            container: the container.
+            path: the absolute path to the file.
+            contents: the contents of the file.
+            stamp: the stamp of the file at or before the time at which its
+                contents were read.
+        """
+        if stamp is None or len(contents) > self.__max_size:
+            return
+        with self.__lock:
+            key = (container.uid, path)
+            if key in self.__entries:
+                self.__remove(key)
+            self.__entries[key] = (stamp, contents)
+            self.__size += len(contents)
+            self.__keys_by_container.setdefault(container.uid, set()).add(key)
+
+            while self.__size > self.__max_size:
+                key_evicted = next(iter(self.__entries))
+                self.__remove(key_evicted)
+
+    def invalidate(self, container: Container) -> None:
+        """
+        Discards all cached contents for a given container.
+        """
+        self.forget(container.uid)
+
+    def forget(self, uid: str) -> None:
+        """
+        Discards all cached contents for the container with a given UID
+        (e.g., after the container has been destroyed).
+        """
+        with self.__lock:
+            for key in self.__keys_by_container.pop(uid, set()):
+                if key in self.__entries:
+                    _, contents = self.__entries.pop(key)
+                    self.__size -= len(contents)
+
+
+class TestOutcomeCache(object):
+    """
+    A content-addressed cache of test outcomes, keyed by the Docker image
+    of a bug, a hash of the state of the program (see
+    `ContainerManager.state_hash`), and the name and time limit of a test.
+
+    Outcomes are held in memory and, if a directory is given, are also
+    persisted to that directory as one JSON file per outcome, so that they
+    survive across sessions. Operations on instances of this class are
+    thread safe.
+    """
+    def __init__(self, path: Optional[str] = None) -> None:
+        """
+        Constructs a cache.
+
+        Parameters:
+            path: the directory that should be used to persist outcomes. If
+                unspecified, outcomes are only held in memory.
+        """
+        self.__path = path
+        self.__lock = threading.Lock()
+        self.__outcomes = {}  # type: Dict[str, TestOutcome]
+        self.__hits = 0
+        self.__misses = 0
+
+    @property
+    def path(self) -> Optional[str]:
+        """The directory used to persist outcomes, if any."""
+        return self.__path
+
+    @property
+    def hits(self) -> int:
+        """The number of lookups that were served by the cache."""
+        return self.__hits
+
+    @property
+    def misses(self) -> int:
+        """The number of lookups that were not served by the cache."""
+        return self.__misses
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns a summary of the hits and misses for this cache.
+        """
+        with self.__lock:
+            lookups = self.__hits + self.__misses
+            ratio = self.__hits / lookups if lookups else 0.0
+            return {'hits': self.__hits,
+                    'misses': self.__misses,
+                    'hit-ratio': ratio}
+
+    @staticmethod
+    def key(image: str, state: str, test: TestCase) -> str:
+        """
+        Computes the key for the outcome of a given test when executed
+        against a given program state.
+
+        Parameters:
+            image: the ID of the Docker image for the bug.
+            state: the hash of the state of the program.
+            test: the test.
+        """
+        description = [image, state, test.name, str(test.time_limit)]
+        description_bytes = '\0'.join(description).encode('utf-8')
+        return hashlib.sha256(description_bytes).hexdigest()
+
+    def __filename(self, key: str) -> str:
+        assert self.__path is not None
+        return os.path.join(self.__path, key[:2], '{}.json'.format(key))
+
+    def get(self, key: str) -> Optional[TestOutcome]:
+        """
+        Retrieves the cached outcome for a given key.
+
+        Returns:
+            the cached outcome, or None if no outcome is cached for the key.
+        """
+        with self.__lock:
+            outcome = self.__outcomes.get(key)
+            if outcome is None and self.__path is not None:
+                fn = self.__filename(key)
+                try:
+                    with open(fn, 'r') as f:
+                        outcome = TestOutcome.from_dict(json.load(f))
+                    self.__outcomes[key] = outcome
+                except FileNotFoundError:
+                    pass
+                except (ValueError, KeyError):
+                    logger.warning("ignoring corrupt test outcome: %s", fn)
+            if outcome is None:
+                self.__misses += 1
+            else:
+                self.__hits += 1
+            return outcome
+
+    def put(self, key: str, outcome: TestOutcome) -> None:
+        """
+        Caches the outcome for a given key.
+        """
+        with self.__lock:
+            self.__outcomes[key] = outcome
+            if self.__path is None:
+                return
+            fn = self.__filename(key)
+            dir_fn = os.path.dirname(fn)
+            os.makedirs(dir_fn, exist_ok=True)
+            fd, fn_tmp = tempfile.mkstemp(dir=dir_fn, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'w') as f:
+                    json.dump(outcome.to_dict(), f)
+                os.replace(fn_tmp, fn)
+            except BaseException:
+                os.remove(fn_tmp)
+                raise
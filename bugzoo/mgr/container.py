@@ -1,6 +1,6 @@
-from typing import Iterator, List, Optional, Dict, Union, Iterable
+from typing import Iterator, List, Optional, Dict, Union, Iterable, Tuple, \
+    Mapping, Set, Callable
 from ipaddress import IPv4Address, IPv6Address
-from tempfile import NamedTemporaryFile
 from timeit import default_timer as timer
 import sys
 import time
@@ -8,18 +8,26 @@ import subprocess
 import ipaddress
 import tempfile
 import os
+import hashlib
+import shlex
 import uuid
 import copy
 import logging
 
 import docker
 
+from . import archive
 from .coverage import CoverageExtractor
+from .cache import FileCache, TestOutcomeCache
+from .coverage.index import SourceFileIndex, SOURCE_FILE_ENDINGS
+from .job import JobHandle
+from .pool import ContainerPool
+from .session import ShellSession
 from ..exceptions import *
 from ..core import FileLineSet, Tool, Patch, Container, TestCase, \
     TestOutcome, TestSuiteCoverage, Bug
 from ..compiler import CompilationOutcome
-from ..cmd import ExecResponse, PendingExecResponse
+from ..cmd import ExecResponse, ExecStream, PendingExecResponse
 from ..util import indent
 
 logger = logging.getLogger(__name__)  # type: logging.DEBUG
@@ -27,6 +35,99 @@ logger.setLevel(logging.DEBUG)
 
 __all__ = ['ContainerManager']
 
+# the maximum number of symbolic links that will be followed when reading a
+# file from a container
+_MAX_SYMLINK_DEPTH = 8
+
+# the format of the stamps that are computed for files by `stat`, which
+# comprise their inode, size and modification time
+_STAMP_FORMAT = '%i:%s:%y'
+
+# reads a number of files given as arguments relative to the root directory
+# via a tar stream on the stdout, having first printed their stamps, in the
+# same order, to the stderr
+_STAMPED_TAR_SCRIPT = (
+    'for f in "$@"; do '
+    'printf "stamp:%s\\n" "$(stat -L -c "{}" -- "/$f" 2>/dev/null)" >&2; '
+    'done; '
+    'exec tar -C / -chf - -- "$@"'
+).format(_STAMP_FORMAT)
+
+# the location at which the shared ccache volume for a bug is mounted
+_CCACHE_DIR = '/.ccache'
+
+# the directory that contains the ccache compiler wrappers on Debian-based
+# images
+_CCACHE_WRAPPERS_DIR = '/usr/lib/ccache'
+
+
+def _file_digest(contents: bytes, mode: int) -> str:
+    """
+    Computes a digest of the contents and permission bits of a file.
+    """
+    h = hashlib.sha256(contents)
+    h.update(mode.to_bytes(4, 'little'))
+    return h.hexdigest()
+
+
+def _only_missing_files(code: int, stderr: str) -> bool:
+    """
+    Determines whether a `tar` command that was used to read files from a
+    container either succeeded or failed only because some of the requested
+    files do not exist.
+    """
+    if code == 0:
+        return True
+    if code not in (1, 2):
+        return False
+    lines = [line for line in stderr.splitlines() if line.strip()]
+    return bool(lines) and all(
+        line.endswith('No such file or directory')
+        or 'Exiting with failure status' in line
+        for line in lines)
+
+
+# prefixed to streamed commands so that they report the ID of their process
+# group inside the container on their first line of output. Since commands
+# are executed with a TTY, each exec leads its own session and process group.
+_REPORT_PROCESS_GROUP = 'echo $(cut -d" " -f5 /proc/$$/stat)'
+
+
+def _split_process_group(chunks: Iterator[str]
+                         ) -> Tuple[Optional[int], Iterator[str]]:
+    """
+    Reads the process group ID that is reported on the first line of output
+    of a streamed command, and returns it together with an iterator over the
+    remaining output. If the first line is not an ID (e.g., because the
+    command failed before it could report its ID), it is treated as output.
+    """
+    buff = ''
+    for chunk in chunks:
+        buff += chunk
+        if '\n' in buff:
+            break
+    (line, _, rest) = buff.partition('\n')
+    try:
+        pgid = int(line.strip())  # type: Optional[int]
+    except ValueError:
+        (pgid, rest) = (None, buff)
+
+    def remaining() -> Iterator[str]:
+        if rest:
+            yield rest
+        yield from chunks
+
+    return pgid, remaining()
+
+
+def _ccache_volume_name(image: str) -> str:
+    """
+    Determines the name of the Docker volume that is used to share a ccache
+    between the containers for a given image.
+    """
+    digest = hashlib.sha256(image.encode('utf-8')).hexdigest()
+    return 'bugzoo-ccache-{}'.format(digest[:16])
+
 
 class ContainerManager(object):
     def __init__(self, installation: 'BugZoo') -> None:
@@ -42,13 +143,46 @@ class ContainerManager(object):
         self.__dockerc = {}
         self.__env_files = {}
         self.__dockerc_tools = {}
+        self.__pools = {}  # type: Dict[str, ContainerPool]
+        self.__sessions = {}  # type: Dict[str, ShellSession]
+        self.__source_indices = {}  # type: Dict[str, SourceFileIndex]
+        self.__owners = {}  # type: Dict[str, Tuple[int, int]]
+        self.__file_cache = FileCache()
+        # maps the UID of each container to the original contents and
+        # permission bits of each file that has been changed in that
+        # container, or None if the file did not exist
+        self.__undo_logs = \
+            {}  # type: Dict[str, Dict[str, Optional[Tuple[bytes, int]]]]
+        # maps the UID of each container to the digest of the current
+        # contents of each file that has been changed in that container (or
+        # None if it has been removed), and to the set of changed files whose
+        # current contents are unknown
+        self.__digests = {}  # type: Dict[str, Dict[str, Optional[str]]]
+        self.__dirty = {}  # type: Dict[str, Set[str]]
+        # maps the UID of each container whose source files may have been
+        # changed by a command to a nonce that is incorporated into its
+        # state hash, since such changes cannot be described
+        self.__tainted = {}  # type: Dict[str, str]
+        self.__outcome_cache = TestOutcomeCache(installation.outcomes_path)
+        # maps the UID of each container to the kind (i.e., whether it was
+        # instrumented), program state hash, and outcome of its last
+        # successful build
+        self.__builds = \
+            {}  # type: Dict[str, Tuple[bool, str, CompilationOutcome]]
         logger.debug("initialised container manager")
 
     def clear(self) -> None:
         """
-        Closes all running containers.
+        Closes all running containers, including those that are held by warm
+        container pools.
         """
         logger.debug("clearing all running containers")
+        for name in list(self.__pools.keys()):
+            try:
+                self.destroy_pool(name)
+            except KeyError:
+                # Already destroyed
+                pass
         all_uids = [uid for uid in self.__containers.keys()]
         for uid in all_uids:
             try:
@@ -86,24 +220,44 @@ class ContainerManager(object):
         logger.debug("deleting container: %s", uid)
         try:
             container = self.__containers[uid]
-            self.__dockerc[uid].remove(force=True)
-
-            for container_tool in self.__dockerc_tools[uid]:
-                container_tool.remove(force=True)
-
-            if uid in self.__env_files:
-                self.__env_files[uid].close()
-                del self.__env_files[uid]
-
-            del self.__dockerc[uid]
-            del self.__dockerc_tools[uid]
+            self.__destroy(uid)
             del self.__containers[uid]
-
         except KeyError:
             logger.error("failed to delete container: %s [not found]", uid)
             raise
         logger.debug("deleted container: %s", uid)
 
+    def __destroy(self, uid: str) -> None:
+        """
+        Destroys the Docker containers and temporary files that belong to a
+        given BugZoo container.
+
+        Raises:
+            KeyError: if no Docker container was found with the given UID.
+        """
+        if uid in self.__sessions:
+            self.__sessions.pop(uid).close()
+        self.__source_indices.pop(uid, None)
+        self.__owners.pop(uid, None)
+        self.__undo_logs.pop(uid, None)
+        self.__digests.pop(uid, None)
+        self.__dirty.pop(uid, None)
+        self.__tainted.pop(uid, None)
+        self.__builds.pop(uid, None)
+        self.__file_cache.forget(uid)
+
+        self.__dockerc[uid].remove(force=True)
+
+        for container_tool in self.__dockerc_tools[uid]:
+            container_tool.remove(force=True)
+
+        if uid in self.__env_files:
+            self.__env_files[uid].close()
+            del self.__env_files[uid]
+
+        del self.__dockerc[uid]
+        del self.__dockerc_tools[uid]
+
     delete = __delitem__
 
     def bug(self, container: Container) -> Bug:
@@ -120,19 +274,62 @@ class ContainerManager(object):
                   volumes: Optional[Dict[str, str]] = None,
                   network_mode: str = 'bridge',
                   ports: Optional[Dict[int, int]] = None,
-                  interactive: bool = False
+                  interactive: bool = False,
+                  *,
+                  ccache: bool = False
                   ) -> Container:
         """
-        Provisions and returns a container for a given bug.
+        Provisions and returns a container for a given bug. If a warm pool of
+        containers has been created for the bug, and neither a UID nor any
+        tools, volumes, ports, a ccache, or a non-default network mode are
+        requested, the container will be handed out by that pool whenever
+        possible.
 
         Parameters:
             bug: the bug that should be used to provision a container.
             uid: a unique identifier (UID) for the container. If no UID is
                 provided then one will be automatically generated.
+            ccache: if set to True, a Docker volume that is shared by all
+                containers for the bug's image is mounted at `/.ccache`, and
+                the container is configured to compile via ccache, so that
+                object files are reused across containers. This requires
+                ccache to be installed within the image; otherwise, the
+                volume is simply unused.
 
         Returns:
             a description of the provisioned container.
         """
+        poolable = uid is None and not tools and not volumes and not ports \
+            and network_mode == 'bridge' and not ccache
+        pool = self.__pools.get(bug.name) if poolable else None
+        container = pool.take() if pool else None
+        if container:
+            logger.debug("provisioned container for bug %s from pool: %s",
+                         bug.name, container.uid)
+        else:
+            container = self.__create(bug,
+                                      uid=uid,
+                                      tools=tools,
+                                      volumes=volumes,
+                                      network_mode=network_mode,
+                                      ports=ports,
+                                      ccache=ccache)
+        self.__containers[container.uid] = container
+        return container
+
+    def __create(self,
+                 bug: Bug,
+                 uid: Optional[str] = None,
+                 tools: Optional[List[Tool]] = None,
+                 volumes: Optional[Dict[str, str]] = None,
+                 network_mode: str = 'bridge',
+                 ports: Optional[Dict[int, int]] = None,
+                 ccache: bool = False
+                 ) -> Container:
+        """
+        Creates and starts a ready-to-use container for a given bug without
+        registering it with this manager.
+        """
         if tools is None:
             tools = []
         if volumes is None:
@@ -153,7 +350,13 @@ class ContainerManager(object):
         logger.debug("creating temporary environment file for container %s",
                      uid)
         env = [(k, v) for t in tools for (k, v) in t.environment.items()]
-        env = ["{}=\"{}\"".format(k, v) for (k, v) in env]
+        if ccache:
+            env += [('CCACHE_DIR', _CCACHE_DIR),
+                    ('CCACHE_BASEDIR', bug.source_dir),
+                    ('CCACHE_UMASK', '002'),
+                    ('PATH', '{}:$PATH'.format(_CCACHE_WRAPPERS_DIR))]
+        # only exported variables are saved to /.environment
+        env = ["export {}=\"{}\"".format(k, v) for (k, v) in env]
         env = "\n".join(env)
         env_file = tempfile.NamedTemporaryFile(mode='w', suffix='.bugzoo.env')
         env_file.write(env)
@@ -165,6 +368,11 @@ class ContainerManager(object):
         volumes = copy.deepcopy(volumes)
         volumes[env_file.name] = \
             {'bind': '/.environment.host', 'mode': 'ro'}
+        if ccache:
+            volume_ccache = _ccache_volume_name(bug.image)
+            logger.debug("mounting ccache volume for container %s: %s",
+                         uid, volume_ccache)
+            volumes[volume_ccache] = {'bind': _CCACHE_DIR, 'mode': 'rw'}
 
         # we copy the environment variables from the host machine, load them,
         # and save the complete set of environment variables to /.environment.
@@ -180,6 +388,10 @@ class ContainerManager(object):
             "echo 'BUGZOO IS READY TO GO!' && "
             "/bin/bash"
         )
+        if ccache:
+            # Docker creates the shared volume with root as its owner
+            cmd = "sudo chown $(whoami):$(whoami) {} && {}".format(_CCACHE_DIR,
+                                                                   cmd)
         cmd = '/bin/bash -c "{}"'.format(cmd)
 
         logger.debug("creating Docker container for BugZoo container: %s", uid)  # noqa: pycodestyle
@@ -225,13 +437,64 @@ class ContainerManager(object):
         container = Container(bug=bug.name,
                               uid=uid,
                               tools=[t.name for t in tools])
-        self.__containers[uid] = container
         logger.debug("provisioned container for bug %s: %s",
                      bug.name, uid)
 
         logger.debug("STATUS OF CONTAINER: %s", dockerc.status)
         return container
 
+    def create_pool(self,
+                    bug: Bug,
+                    *,
+                    min_size: int = 1,
+                    max_size: int = 4,
+                    idle_timeout: float = 300.0
+                    ) -> ContainerPool:
+        """
+        Creates a warm pool of ready-to-use containers for a given bug, which
+        will subsequently be used to serve calls to `provision` for that bug.
+        If a pool already exists for the bug, it is replaced.
+
+        Parameters:
+            bug: the bug for which a pool should be created.
+            min_size: the minimum number of idle containers that should be
+                kept warm.
+            max_size: the maximum number of idle containers that should be
+                kept warm.
+            idle_timeout: the number of seconds that a surplus container may
+                sit idle before it is evicted from the pool.
+
+        Returns:
+            the newly created pool.
+        """
+        if bug.name in self.__pools:
+            self.destroy_pool(bug.name)
+
+        logger.debug("creating container pool for bug: %s", bug.name)
+        pool = ContainerPool(bug,
+                             provision=lambda: self.__create(bug),
+                             destroy=lambda c: self.__destroy(c.uid),
+                             min_size=min_size,
+                             max_size=max_size,
+                             idle_timeout=idle_timeout)
+        self.__pools[bug.name] = pool
+        logger.debug("created container pool for bug: %s", bug.name)
+        return pool
+
+    def destroy_pool(self, name: str) -> None:
+        """
+        Destroys the warm container pool for a bug with a given name, along
+        with all of its idle containers. Containers that have already been
+        handed out by the pool are unaffected.
+
+        Raises:
+            KeyError: if there is no pool for the given bug.
+        """
+        logger.debug("destroying container pool for bug: %s", name)
+        pool = self.__pools.pop(name)
+        pool.close()
+        logger.debug("destroyed container pool for bug: %s", name)
+
     def mktemp(self, container: Container) -> str:
         """
         Creates a named temporary file within a given container.
@@ -241,7 +504,7 @@ class ContainerManager(object):
         """
         logger.debug("creating a temporary file inside container %s",
                      container.uid)
-        response = self.command(container, "mktemp")
+        response = self.command(container, "mktemp", modifies_source=False)
 
         if response.code != 0:
             msg = "failed to create temporary file for container {}: [{}] {}"
@@ -289,40 +552,62 @@ class ContainerManager(object):
                     raise
                 return None
 
-    def patch(self, container: Container, p: Patch) -> bool:
+    def patch(self,
+              container: Container,
+              p: Patch,
+              *,
+              in_process: bool = False
+              ) -> bool:
         """
         Attempts to apply a given patch to the source code for a program inside
         a given container. All patch applications are guaranteed to be atomic;
         if the patch fails to apply, no changes will be made to the relevant
         source code files.
 
+        Parameters:
+            container: the container.
+            p: the patch that should be applied.
+            in_process: if set to True, the patch will be applied by BugZoo
+                itself to the contents of the affected files, which are
+                transferred via the Docker archive API, rather than by
+                running `patch` inside the container. Hunks are matched in
+                the same way as `patch --ignore-whitespace`.
+
         Returns true if the patch application was successful, and false if
         the attempt was unsuccessful.
         """
         assert isinstance(p, Patch)
+        if in_process:
+            return self.__patch_in_process(container, p)
+
         file_container = None
         dockerc = self.__dockerc[container.uid]
         bug = self.__installation.bugs[container.bug]
         logger.debug("Applying patch to container [%s]:\n%s",
                      container.uid,
                      str(p))
+        paths = [os.path.normpath(os.path.join(bug.source_dir, fp.filename))
+                 for fp in p.file_patches]
+        self.__record_originals(container, paths)
 
         try:
-            file_host = NamedTemporaryFile(mode='w', suffix='bugzoo')
-            file_host.write(str(p))
-            file_host.flush()
-
-            # copy contents to a temporary file on the container
+            # write the patch to a temporary file inside the container. the
+            # temporary file is not recorded in the undo log, since it is
+            # removed once the patch has been applied.
             (retcode, file_container) = dockerc.exec_run('mktemp')
             assert retcode == 0
             file_container = file_container.decode(sys.stdout.encoding).strip()
-
-            self.copy_to(container, file_host.name, file_container)
+            self.__put_files(container,
+                             {file_container: str(p).encode('utf-8')})
 
             # run patch command inside the source directory
-            cmd = 'sudo chown $(whoami) "{}" && patch --ignore-whitespace -p0 < "{}"'
-            cmd = cmd.format(file_container, file_container)
-            outcome = self.command(container, cmd, context=bug.source_dir)
+            cmd = 'patch --ignore-whitespace -p0 < "{}"'
+            cmd = cmd.format(file_container)
+            # the changed files are tracked via the dirty set
+            outcome = self.command(container,
+                                   cmd,
+                                   context=bug.source_dir,
+                                   modifies_source=False)
             logger.debug("Patch application outcome [%s]: (retcode=%d)\n%s",
                          container.uid,
                          outcome.code,
@@ -330,9 +615,315 @@ class ContainerManager(object):
             return outcome.code == 0
 
         finally:
+            self.__dirty.setdefault(container.uid, set()).update(paths)
+            self.invalidate_source_index(container)
+            self.__file_cache.invalidate(container)
             if file_container:
                 dockerc.exec_run('rm "{}"'.format(file_container))
 
+    def __patch_in_process(self, container: Container, p: Patch) -> bool:
+        """
+        Applies a given patch to the files inside a container by fetching
+        the affected files in a single tar stream, applying the patch in
+        memory, and uploading the patched files in a single tar stream. No
+        files are written unless every hunk applies, and any files that are
+        deleted by the patch are restored if they cannot all be deleted.
+        """
+        bug = self.__installation.bugs[container.bug]
+        logger.debug("Applying patch in process to container [%s]:\n%s",
+                     container.uid,
+                     str(p))
+        paths = {fp.filename: os.path.join(bug.source_dir, fp.filename)
+                 for fp in p.file_patches}
+        originals = self.__read_many_files(container, paths.values())
+
+        # file contents are decoded such that they can be re-encoded without
+        # loss, regardless of their original encoding
+        contents = {}  # type: Dict[str, Optional[str]]
+        for (fn, path) in paths.items():
+            original = originals[path]
+            if original is None:
+                contents[fn] = None
+            else:
+                contents[fn] = original[0].decode('utf-8', 'surrogateescape')
+        try:
+            patched = p.apply(contents)
+        except FailedToApplyPatch:
+            logger.debug("Failed to apply patch to container [%s]",
+                         container.uid, exc_info=True)
+            return False
+
+        writes = {}  # type: Dict[str, archive.FileContents]
+        deletions = []  # type: List[str]
+        for (fn, new_contents) in patched.items():
+            path = paths[fn]
+            if new_contents is None:
+                deletions.append(path)
+                continue
+            blob = new_contents.encode('utf-8', 'surrogateescape')
+            original = originals[path]
+            mode = original[1] if original else archive.DEFAULT_MODE
+            writes[path] = (blob, mode)
+
+        self.__record_originals(container, paths.values(), originals)
+        try:
+            # files are deleted before any are written, so that a failed
+            # deletion leaves the container in its original state
+            if deletions:
+                cmd = 'rm -f {}'.format(' '.join(shlex.quote(path)
+                                                 for path in deletions))
+                outcome = self.command(container, cmd, context='/')
+                if outcome.code != 0:
+                    logger.error("Failed to delete files in container [%s]: %s",  # noqa: pycodestyle
+                                 container.uid, outcome.output)
+                    self.__dirty.setdefault(container.uid, set()).update(deletions)  # noqa: pycodestyle
+                    self.__put_files(container,
+                                     {path: originals[path]
+                                      for path in deletions})
+                    return False
+                digests = self.__digests.setdefault(container.uid, {})
+                for path in deletions:
+                    digests[os.path.normpath(path)] = None
+            self.write_many_bytes(container, writes)
+        finally:
+            self.invalidate_source_index(container)
+            self.__file_cache.invalidate(container)
+
+        logger.debug("Applied patch in process to container [%s]",
+                     container.uid)
+        return True
+
+    def reset(self, container: Container) -> None:
+        """
+        Restores every file that has been changed inside a given container,
+        since it was provisioned or last reset, to its original state. Files
+        that did not previously exist are removed. This is considerably
+        cheaper than provisioning a fresh container.
+
+        Only changes that are made via `patch`, `write_bytes`,
+        `write_many_bytes`, and `copy_to` (and hence the file manager) are
+        recorded. Changes that are made by commands, such as the artifacts
+        produced by compilation, are not reverted. If the files cannot be
+        restored, the changes remain recorded, so that the reset may be
+        retried.
+        """
+        uid = container.uid
+        log = self.__undo_logs.get(uid)
+        if not log:
+            self.__digests.pop(uid, None)
+            self.__dirty.pop(uid, None)
+            return
+        restore = {path: original for (path, original) in log.items()
+                   if original is not None
+                   }  # type: Dict[str, archive.FileContents]
+        created = [path for (path, original) in log.items()
+                   if original is None]
+        logger.debug("resetting %d files in container [%s]",
+                     len(log), container.uid)
+        try:
+            if restore:
+                self.__put_files(container, restore)
+            if created:
+                cmd = 'rm -f {}'.format(' '.join(shlex.quote(path)
+                                                 for path in created))
+                outcome = self.command(container, cmd, context='/')
+                if outcome.code != 0:
+                    m = "failed to remove files inside container [{}]: {}"
+                    m = m.format(container.uid, outcome.output)
+                    raise BugZooException(m)
+        except Exception:
+            # the undo log is kept so that the reset may be retried, but the
+            # files may have been partially restored
+            self.__dirty.setdefault(uid, set()).update(log)
+            raise
+        finally:
+            self.invalidate_source_index(container)
+            self.__file_cache.invalidate(container)
+        del self.__undo_logs[uid]
+        self.__digests.pop(uid, None)
+        self.__dirty.pop(uid, None)
+        logger.debug("reset container [%s]", uid)
+
+    def state_hash(self, container: Container) -> str:
+        """
+        Computes a hash of the state of the program inside a given container,
+        which is determined by the contents of the files within its source
+        directory that differ from those of its image. Only changes that are
+        made via `patch` and file writes (i.e., those that can be undone by
+        `reset`) can be described. Once a command that may have modified the
+        source directory has been executed (see the `modifies_source`
+        argument of `command`), the state hash of the container differs from
+        every state hash that was previously computed, for the lifetime of
+        the container.
+        """
+        uid = container.uid
+        bug = self.__installation.bugs[container.bug]
+        dir_source = os.path.normpath(bug.source_dir) + os.sep
+        log = self.__undo_logs.get(uid, {})
+        digests = self.__digests.setdefault(uid, {})
+
+        # determine the contents of any files that were changed by commands
+        dirty = self.__dirty.pop(uid, set())
+        if dirty:
+            currents = self.__read_many_files(container, dirty)
+            for (path, current) in currents.items():
+                digests[path] = _file_digest(*current) if current else None
+
+        h = hashlib.sha256()
+        if uid in self.__tainted:
+            h.update('tainted\0{}\n'.format(self.__tainted[uid]).encode())
+        for path in sorted(log):
+            if not path.startswith(dir_source):
+                continue
+            original = log[path]
+            digest_original = _file_digest(*original) if original else None
+            digest = digests.get(path, digest_original)
+            if digest != digest_original:
+                entry = '{}\0{}\n'.format(path, digest or '')
+                h.update(entry.encode('utf-8'))
+        return h.hexdigest()
+
+    @property
+    def outcome_cache(self) -> TestOutcomeCache:
+        """
+        The cache of test outcomes that is used by `execute` when caching is
+        requested.
+        """
+        return self.__outcome_cache
+
+    def __record_originals(self,
+                           container: Container,
+                           paths: Iterable[str],
+                           originals: Optional[Mapping[str, Optional[Tuple[bytes, int]]]] = None  # noqa: pycodestyle
+                           ) -> None:
+        """
+        Records the original state of any of the given files that have not
+        already been recorded in the undo log for a given container, so that
+        they may later be restored by `reset`.
+
+        Parameters:
+            container: the container.
+            paths: the absolute paths of the files that are about to change.
+            originals: the current contents and permission bits of the given
+                files, if they are already known. If unspecified, the files
+                are read from the container.
+        """
+        log = self.__undo_logs.setdefault(container.uid, {})
+        paths = [path for path in paths if os.path.normpath(path) not in log]
+        if not paths:
+            return
+        if originals is None:
+            originals = self.__read_many_files(container, paths)
+        for path in paths:
+            log[os.path.normpath(path)] = originals.get(path)
+
+    def source_index(self,
+                     container: Container,
+                     *,
+                     rebuild: bool = False
+                     ) -> SourceFileIndex:
+        """
+        Retrieves an index of the C/C++ source files (see
+        `SOURCE_FILE_ENDINGS`) within the source directory of a given
+        container, which can be used to resolve the file paths that
+        are reported by coverage tools. The index is built on first use and
+        is cached until it is invalidated by a change to the files inside
+        the container (e.g., via a patch or a write through the file
+        manager).
+
+        Parameters:
+            container: the container whose source files should be indexed.
+            rebuild: if set to True, the index will be rebuilt even if a
+                cached index exists.
+        """
+        uid = container.uid
+        if not rebuild and uid in self.__source_indices:
+            return self.__source_indices[uid]
+
+        bug = self.__installation.bugs[container.bug]
+        dir_source = bug.source_dir
+        logger.debug("indexing source files in container: %s", uid)
+        cmd = ' -o '.join(["-name \\*{}".format(e)
+                           for e in SOURCE_FILE_ENDINGS])
+        cmd = "find {} -type f \\( {} \\)".format(dir_source, cmd)
+        response = self.command(container, cmd, context='/')
+        index = SourceFileIndex(dir_source, response.output.split('\n'))
+        logger.debug("indexed %d source files in container: %s",
+                     len(index), uid)
+        self.__source_indices[uid] = index
+        return index
+
+    def invalidate_source_index(self, container: Container) -> None:
+        """
+        Discards the cached index of source files, if any, for a given
+        container.
+        """
+        self.__source_indices.pop(container.uid, None)
+
+    @property
+    def file_cache(self) -> FileCache:
+        """
+        The cache of file contents for the containers managed by this
+        object. Cached contents are validated against the stamp of each file
+        (see `file_stamps`) whenever they are retrieved, and are discarded
+        whenever the files inside a container are known to have changed
+        (i.e., after a patch, a write, or a command executed within the
+        source directory).
+        """
+        return self.__file_cache
+
+    def __invalidate_for_command(self,
+                                 container: Container,
+                                 context: Optional[str],
+                                 modifies_source: bool = True
+                                 ) -> None:
+        """
+        Invalidates the cached file contents for a given container if a
+        command executed within a given context may modify its source
+        directory, and, unless the command is known not to modify the source
+        files of the program, marks the state of the container as unknown
+        (see `state_hash`). Commands that use the default context, or whose
+        context lies within the source directory, are assumed to modify the
+        source directory.
+        """
+        if context is not None:
+            bug = self.__installation.bugs[container.bug]
+            dir_source = os.path.normpath(bug.source_dir)
+            context = os.path.normpath(context)
+            if context != dir_source and \
+               not context.startswith(dir_source + os.sep):
+                return
+        self.__file_cache.invalidate(container)
+        if modifies_source:
+            self.__tainted[container.uid] = uuid.uuid4().hex
+
+    def open_session(self, container: Container) -> None:
+        """
+        Opens a persistent shell session inside a given container. Whilst the
+        session is open, blocking calls to `command` for that container are
+        executed over the session rather than via a new Docker exec object,
+        avoiding the overhead of creating, starting, and inspecting an exec
+        object for each command. Commands that are issued whilst the session
+        is busy fall back to using a new exec object.
+
+        Note that commands executed over a session are not attached to a TTY.
+        If a session is already open for the container, this method has no
+        effect.
+        """
+        uid = container.uid
+        if uid in self.__sessions and not self.__sessions[uid].closed:
+            return
+        self.__sessions[uid] = ShellSession(self.__api_docker, container.id)
+
+    def close_session(self, container: Container) -> None:
+        """
+        Closes the persistent shell session for a given container.
+
+        Raises:
+            KeyError: if there is no session open for the given container.
+        """
+        self.__sessions.pop(container.uid).close()
+
     def interact(self, container: Container) -> None:
         """
         Connects to the PTY (pseudo-TTY) for a given container.
@@ -341,6 +932,7 @@ class ContainerManager(object):
         cmd = "/bin/bash -c 'source /.environment && /bin/bash'"
         cmd = "docker exec -it {} {}".format(container.id, cmd)
         subprocess.call(cmd, shell=True)
+        self.__invalidate_for_command(container, None)
 
     def coverage_extractor(self, container: Container) -> CoverageExtractor:
         """
@@ -361,30 +953,60 @@ class ContainerManager(object):
                  container: Container,
                  tests: Optional[Iterable[TestCase]] = None,
                  *,
-                 instrument: bool = True
+                 instrument: bool = True,
+                 job: Optional[JobHandle] = None
                  ) -> TestSuiteCoverage:
         """
         Computes line coverage information over a provided set of tests for
         the program inside a given container.
+
+        See: `CoverageExtractor.run`
         """
         extractor = self.coverage_extractor(container)
         if tests is None:
             bugs = self.__installation.bugs
             bug = bugs[container.bug]
             tests = bug.tests
-        return extractor.run(tests, instrument=instrument)
+        return extractor.run(tests, instrument=instrument, job=job)
 
     def execute(self,
                 container: Container,
                 test: TestCase,
-                verbose: bool = False
+                verbose: bool = False,
+                *,
+                cache: bool = False
                 ) -> TestOutcome:
         """
         Runs a specified test inside a given container.
 
+        Parameters:
+            container: the container.
+            test: the test that should be executed.
+            verbose: if set to True, the output of the test is printed to
+                the standard output.
+            cache: if set to True, the outcome of the test is retrieved from
+                the test outcome cache if the same test has previously been
+                executed against the same program state (see `state_hash`),
+                and is otherwise added to that cache. The cache is only used
+                if the program was successfully compiled inside the
+                container (via `compile` or `compile_with_instrumentation`)
+                in its current state.
+
         Returns:
             the outcome of the test execution.
         """
+        key = None  # type: Optional[str]
+        state = self.state_hash(container) if cache else None
+        build = self.__builds.get(container.uid)
+        if state is not None and build and build[1] == state:
+            image = self.__dockerc[container.uid].attrs['Image']
+            key = TestOutcomeCache.key(image, state, test)
+            outcome = self.__outcome_cache.get(key)
+            if outcome is not None:
+                logger.debug("using cached outcome for test [%s] in container [%s]",  # noqa: pycodestyle
+                             test.name, container.uid)
+                return outcome
+
         bug = self.__installation.bugs[container.bug]  # type: Bug
         response = self.command(container,
                                 cmd=test.command,
@@ -392,38 +1014,59 @@ class ContainerManager(object):
                                 stderr=True,
                                 time_limit=test.time_limit,
                                 kill_after=test.kill_after,
-                                verbose=verbose)
+                                verbose=verbose,
+                                modifies_source=False)
         passed = test.oracle.check(response)
-        return TestOutcome(response, passed)
+        outcome = TestOutcome(response, passed)
+        if key is not None:
+            self.__outcome_cache.put(key, outcome)
+        return outcome
 
     test = execute
 
     # TODO decouple
     def compile(self,
                 container: Container,
-                verbose: bool = False
+                verbose: bool = False,
+                *,
+                force: bool = False
                 ) -> CompilationOutcome:
         """
         Attempts to compile the program inside a given container.
 
+        If the program was previously compiled successfully inside the same
+        container, and its state (see `state_hash`) has not changed since,
+        the outcome of that compilation is returned without rebuilding the
+        program.
+
         Params:
             verbose: specifies whether to print the stdout and stderr produced
                 by the compilation command to the stdout. If `True`, then the
                 stdout and stderr will be printed.
+            force: if set to True, the program is compiled even if its state
+                has not changed since its last successful compilation (e.g.,
+                because the build artifacts were altered by a command).
 
         Returns:
             a summary of the outcome of the compilation attempt.
         """
         # TODO use container name
         bug = self.__installation.bugs[container.bug]
-        return bug.compiler.compile(self, container, verbose=verbose)
+        return self.__compile(container,
+                              False,
+                              lambda: bug.compiler.compile(self,
+                                                           container,
+                                                           verbose=verbose),
+                              force)
 
     build = compile
 
     # TODO decouple
     def compile_with_instrumentation(self,
                                      container: Container,
-                                     verbose: bool = False
+                                     verbose: bool = False,
+                                     *,
+                                     force: bool = False
                                      ) -> CompilationOutcome:
         """
         Attempts to compile the program inside a given container with
@@ -432,13 +1075,324 @@ class ContainerManager(object):
         See: `Container.compile`
         """
         bug = self.__installation.bugs[container.bug]
-        bug.compiler.clean(self, container, verbose=verbose) # TODO port
-        return bug.compiler.compile_with_coverage_instrumentation(self,
-                                                                  container,
-                                                                  verbose=verbose)
+
+        def build() -> CompilationOutcome:
+            bug.compiler.clean(self, container, verbose=verbose) # TODO port
+            return bug.compiler.compile_with_coverage_instrumentation(self,
+                                                                      container,
+                                                                      verbose=verbose)  # noqa: pycodestyle
+
+        return self.__compile(container, True, build, force)
+
+    def __compile(self,
+                  container: Container,
+                  instrumented: bool,
+                  build: Callable[[], CompilationOutcome],
+                  force: bool
+                  ) -> CompilationOutcome:
+        """
+        Compiles the program inside a given container using a given build
+        function, unless the same kind of build has previously succeeded for
+        the current state of the program inside that container.
+        """
+        uid = container.uid
+        state = self.state_hash(container)
+        previous = self.__builds.get(uid)
+        if not force and previous and previous[:2] == (instrumented, state):
+            logger.debug("skipping compilation of unchanged program in container [%s]",  # noqa: pycodestyle
+                         uid)
+            return previous[2]
+
+        self.__builds.pop(uid, None)
+        outcome = build()
+        if outcome.successful:
+            self.__builds[uid] = (instrumented, state, outcome)
+        return outcome
 
     build_with_instrumentation = compile_with_instrumentation
 
+    def __owner(self, container: Container) -> Tuple[int, int]:
+        """
+        Determines the numeric user and group IDs of the default user inside
+        a given container. The result is cached for the lifetime of the
+        container.
+        """
+        uid = container.uid
+        if uid not in self.__owners:
+            r = self.command(container, 'id -u && id -g', context='/')
+            if r.code != 0:
+                m = "failed to determine user inside container [{}] (exit code: {}): {}"  # noqa: pycodestyle
+                m = m.format(uid, r.code, r.output)
+                raise BugZooException(m)
+            id_user, id_group = r.output.split()
+            self.__owners[uid] = (int(id_user), int(id_group))
+        return self.__owners[uid]
+
+    def read_bytes(self, container: Container, path: str) -> bytes:
+        """
+        Reads the contents of a given file inside a container via the Docker
+        archive API. Symbolic links are followed.
+
+        Parameters:
+            container: the container.
+            path: the absolute path to the file inside the container.
+
+        Raises:
+            FileNotFound: if no regular file was found at the given path.
+        """
+        path_orig = path
+        for _ in range(_MAX_SYMLINK_DEPTH):
+            try:
+                stream, stat = self.__api_docker.get_archive(container.id,
+                                                             path)
+            except docker.errors.NotFound:
+                raise FileNotFound(path_orig)
+
+            link = stat.get('linkTarget')
+            if link:
+                path = os.path.join(os.path.dirname(path), link)
+                continue
+
+            files = archive.unpack(stream)
+            try:
+                contents, _ = files[stat['name']]
+            except KeyError:
+                raise FileNotFound(path_orig)
+            return contents
+        raise FileNotFound(path_orig)
+
+    def write_bytes(self,
+                    container: Container,
+                    path: str,
+                    contents: bytes,
+                    mode: int = archive.DEFAULT_MODE
+                    ) -> None:
+        """
+        Writes the given contents to a file inside a container via the Docker
+        archive API. The file is created if it does not exist, and is owned
+        by the default user of the container.
+
+        Parameters:
+            container: the container.
+            path: the absolute path to the file inside the container.
+            contents: the contents that should be written to the file.
+            mode: the permission bits for the file.
+
+        Raises:
+            FileNotFound: if the parent directory of the file does not exist.
+        """
+        self.__record_originals(container, [path])
+        id_user, id_group = self.__owner(container)
+        dirname, basename = os.path.split(path)
+        data = archive.pack({basename: (contents, mode)}, id_user, id_group)
+        try:
+            self.__api_docker.put_archive(container.id, dirname, data)
+        except docker.errors.NotFound:
+            raise FileNotFound(path)
+        finally:
+            self.invalidate_source_index(container)
+            self.__file_cache.invalidate(container)
+        digests = self.__digests.setdefault(container.uid, {})
+        digests[os.path.normpath(path)] = _file_digest(contents, mode)
+
+    def file_stamps(self,
+                    container: Container,
+                    paths: Iterable[str]
+                    ) -> Dict[str, Optional[str]]:
+        """
+        Computes a stamp for each of a number of files inside a container,
+        using a single command. The stamp of a file is given by its inode,
+        size and modification time, and changes whenever the file is
+        modified. Symbolic links are followed.
+
+        Returns:
+            a mapping from each of the given paths to the stamp of the file
+            at that path, or None if no file exists at that path.
+        """
+        paths = list(paths)
+        if not paths:
+            return {}
+        script = ('for f in "$@"; do '
+                  'stat -L -c "{}" -- "$f" 2>/dev/null || echo; '
+                  'done').format(_STAMP_FORMAT)
+        cmd = ['sh', '-c', script, 'sh'] + paths
+        response = self.__api_docker.exec_create(container.id,
+                                                 cmd,
+                                                 stdout=True,
+                                                 stderr=False,
+                                                 tty=False)
+        output, _ = self.__api_docker.exec_start(response['Id'], demux=True)
+        lines = (output or b'').decode('utf-8', 'replace').split('\n')
+        stamps = {}  # type: Dict[str, Optional[str]]
+        for (i, path) in enumerate(paths):
+            stamp = lines[i].strip() if i < len(lines) else ''
+            stamps[path] = stamp or None
+        return stamps
+
+    def read_many_bytes(self,
+                        container: Container,
+                        paths: Iterable[str]
+                        ) -> Dict[str, Optional[bytes]]:
+        """
+        Reads the contents of a number of files inside a container at once,
+        by streaming a single tar archive of those files out of the container.
+        Symbolic links are followed.
+
+        Parameters:
+            container: the container.
+            paths: the absolute paths to the files inside the container.
+
+        Returns:
+            a mapping from each of the given paths to the contents of the file
+            at that path, or None if no regular file exists at that path.
+        """
+        files = self.__read_many_files(container, paths)
+        return {path: f[0] if f else None for (path, f) in files.items()}
+
+    def read_many_bytes_with_stamps(self,
+                                    container: Container,
+                                    paths: Iterable[str]
+                                    ) -> Tuple[Dict[str, Optional[bytes]],
+                                               Dict[str, Optional[str]]]:
+        """
+        Reads the contents of a number of files inside a container at once,
+        together with their stamps (see `file_stamps`), using a single
+        command. The stamp of each file is computed before it is read.
+
+        Returns:
+            a mapping from each of the given paths to the contents of the file
+            at that path, and a mapping from each of the given paths to the
+            stamp of the file at that path. The contents and the stamp of a
+            file are None if no file exists at that path.
+        """
+        files, stamps = self.__read_archive(container, paths, stamped=True)
+        contents = {path: f[0] if f else None for (path, f) in files.items()}
+        return contents, stamps
+
+    def __read_many_files(self,
+                          container: Container,
+                          paths: Iterable[str]
+                          ) -> Dict[str, Optional[Tuple[bytes, int]]]:
+        """
+        Reads the contents and permission bits of a number of files inside
+        a container using a single tar stream.
+
+        See: `read_many_bytes`
+
+        Raises:
+            BugZooException: if the files could not be read for any reason
+                other than their absence (e.g., if `tar` is not installed
+                inside the container, or a file is not readable).
+        """
+        files, _ = self.__read_archive(container, paths, stamped=False)
+        return files
+
+    def __read_archive(self,
+                       container: Container,
+                       paths: Iterable[str],
+                       stamped: bool
+                       ) -> Tuple[Dict[str, Optional[Tuple[bytes, int]]],
+                                  Dict[str, Optional[str]]]:
+        """
+        Reads the contents and permission bits of a number of files inside
+        a container using a single tar stream, and, if requested, computes
+        their stamps within the same command.
+
+        See: `__read_many_files`
+        """
+        paths = list(paths)
+        if not paths:
+            return {}, {}
+        names = {path: os.path.normpath(path).lstrip('/') for path in paths}
+        args = sorted(set(names.values()))
+        if stamped:
+            cmd = ['sh', '-c', _STAMPED_TAR_SCRIPT, 'sh'] + args
+        else:
+            cmd = ['tar', '-C', '/', '-chf', '-', '--'] + args
+        logger.debug("reading %d files from container [%s]",
+                     len(names), container.uid)
+        response = self.__api_docker.exec_create(container.id,
+                                                 cmd,
+                                                 stdout=True,
+                                                 stderr=True,
+                                                 tty=False)
+        output, err = self.__api_docker.exec_start(response['Id'], demux=True)
+        code = self.__api_docker.exec_inspect(response['Id'])['ExitCode']
+        err = (err or b'').decode('utf-8', 'backslashreplace')
+
+        # separate the stamps from any errors reported by tar
+        stamp_by_name = {}  # type: Dict[str, Optional[str]]
+        if stamped:
+            lines = err.splitlines()
+            stamps = [line[6:].strip() for line in lines
+                      if line.startswith('stamp:')]
+            err = '\n'.join(line for line in lines
+                            if not line.startswith('stamp:'))
+            for (name, stamp) in zip(args, stamps):
+                stamp_by_name[name] = stamp or None
+
+        if not _only_missing_files(code, err):
+            m = "failed to read files inside container [{}] ({}): {}"
+            m = m.format(container.uid, code, err.strip())
+            logger.error(m)
+            raise BugZooException(m)
+        files = archive.unpack([output or b''])
+        return ({path: files.get(name) for (path, name) in names.items()},
+                {path: stamp_by_name.get(name)
+                 for (path, name) in names.items()})
+
+    def write_many_bytes(self,
+                         container: Container,
+                         files: Mapping[str, archive.FileContents]
+                         ) -> None:
+        """
+        Writes a number of files inside a container at once, using a single
+        tar archive. Files are created if they do not exist, and are owned
+        by the default user of the container.
+
+        Unlike `write_bytes`, which raises `FileNotFound` if the parent
+        directory of the file does not exist, any missing parent directories
+        are created (and are owned by root), since the archive is extracted
+        at the root of the container.
+
+        Parameters:
+            container: the container.
+            files: a mapping from the absolute paths of the files inside the
+                container to their contents. The contents of each file may be
+                accompanied by its permission bits, given as a
+                (contents, mode) tuple; otherwise, the file is given mode
+                0644.
+        """
+        if not files:
+            return
+        self.__record_originals(container, files.keys())
+        logger.debug("writing %d files to container [%s]",
+                     len(files), container.uid)
+        try:
+            self.__put_files(container, files)
+        finally:
+            self.invalidate_source_index(container)
+            self.__file_cache.invalidate(container)
+        digests = self.__digests.setdefault(container.uid, {})
+        for (path, contents) in files.items():
+            if isinstance(contents, tuple):
+                data, mode = contents
+            else:
+                data, mode = contents, archive.DEFAULT_MODE
+            digests[os.path.normpath(path)] = _file_digest(data, mode)
+
+    def __put_files(self,
+                    container: Container,
+                    files: Mapping[str, archive.FileContents]
+                    ) -> None:
+        """
+        Uploads a number of files, given by their absolute paths, to a
+        container in a single tar archive.
+        """
+        id_user, id_group = self.__owner(container)
+        data = archive.pack(files, id_user, id_group)
+        self.__api_docker.put_archive(container.id, '/', data)
+
     def copy_to(self,
                 container: Container,
                 fn_host: str,
@@ -446,12 +1400,12 @@ class ContainerManager(object):
                 ) -> None:
         """
         Copies a file from the host machine to a specified location inside a
-        container.
+        container. The copied file retains its permission bits and is owned
+        by the default user of the container.
 
         Raises:
-            FileNotFound: if the host file wasn't found.
-            subprocess.CalledProcessError: if the file could not be copied to
-                the container.
+            FileNotFound: if the host file wasn't found, or if the parent
+                directory of the destination doesn't exist.
         """
         logger.debug("Copying file to container, %s: %s -> %s",
                      container.uid, fn_host, fn_container)
@@ -461,23 +1415,12 @@ class ContainerManager(object):
                          fn_host, fn_container, container.uid)
             raise FileNotFound(fn_host)
 
-        cmd = "docker cp '{}' '{}:{}'".format(fn_host, container.id, fn_container)
-        try:
-            subprocess.check_output(cmd, shell=True)
-            logger.debug("Copied file to container, %s: %s -> %s",
-                         container.uid, fn_host, fn_container)
-
-            r = self.command(container,
-                             "sudo chown $(whoami) '{}'".format(fn_container))
-            if r.code != 0:
-                m = "failed to update permissions for container file [{}] (exit code: {}): {}"  # noqa: pycodestyle
-                m = m.format(fn_container, r.code, r.output)
-                raise BugZooException(m)
-        # TODO implement error handling
-        except subprocess.CalledProcessError:
-            logger.exception("Failed to copy file to container, %s: %s -> %s",
-                             container.uid, fn_host, fn_container)
-            raise
+        with open(fn_host, 'rb') as fh:
+            contents = fh.read()
+        mode = os.stat(fn_host).st_mode & 0o7777
+        self.write_bytes(container, fn_container, contents, mode)
+        logger.debug("Copied file to container, %s: %s -> %s",
+                     container.uid, fn_host, fn_container)
 
     def copy_from(self,
                   container: Container,
@@ -487,19 +1430,17 @@ class ContainerManager(object):
         """
         Copies a given file from the container to a specified location on the
         host machine.
+
+        Raises:
+            FileNotFound: if the file wasn't found inside the container.
         """
         logger.debug("Copying file from container, %s: %s -> %s",
                      container.uid, fn_container, fn_host)
-        cmd = "docker cp '{}:{}' '{}'".format(container.id, fn_container, fn_host)
-        try:
-            subprocess.check_output(cmd, shell=True)
-            logger.debug("Copied file from container, %s: %s -> %s",
-                         container.uid, fn_container, fn_host)
-        # TODO implement error handling
-        except subprocess.CalledProcessError:
-            logger.exception("Failed to copy file from container, %s: %s -> %s",  # noqa: pycodestyle
-                             container.uid, fn_container, fn_host)
-            raise
+        contents = self.read_bytes(container, fn_container)
+        with open(fn_host, 'wb') as fh:
+            fh.write(contents)
+        logger.debug("Copied file from container, %s: %s -> %s",
+                     container.uid, fn_container, fn_host)
 
     def command(self,
                 container: Container,
@@ -510,16 +1451,27 @@ class ContainerManager(object):
                 block: bool = True,
                 verbose: bool = False,
                 time_limit: Optional[int] = None,
-                kill_after: Optional[int] = 1
+                kill_after: Optional[int] = 1,
+                *,
+                modifies_source: bool = True
                 ) -> Union[ExecResponse, PendingExecResponse]:
         """
         Executes a provided shell command inside a given container.
 
+        If a shell session has been opened for the container via
+        `open_session`, blocking calls are executed over that session.
+
         Parameters:
             time_limit: an optional parameter that is used to specify the
                 number of seconds that the command should be allowed to run
                 without completing before it is aborted. Only supported by
                 blocking calls.
+            modifies_source: should be set to False if the command is known
+                not to modify the source files of the program (e.g., it
+                builds or tests the program). Otherwise, if the command is
+                executed within the source directory, the program is assumed
+                to have changed in a way that cannot be described by
+                `state_hash`.
 
         Returns:
             a description of the response.
@@ -532,12 +1484,34 @@ class ContainerManager(object):
         logger_c = logger.getChild(container.uid)
         logger_c.debug('executing command "%s"', cmd)
         bug = self.__installation.bugs[container.bug]
+        context_original = context
+        self.__invalidate_for_command(container, context, modifies_source)
 
         # TODO: we need a better long-term alternative
         if context is None:
             context = os.path.join(bug.source_dir, '..')
         logger_c.debug('using execution context: %s', context)
 
+        session = self.__sessions.get(container.uid) if block else None
+        if session:
+            response = session.try_execute(cmd,
+                                           context,
+                                           stdout=stdout,
+                                           stderr=stderr,
+                                           time_limit=time_limit,
+                                           kill_after=kill_after)
+            if response:
+                if verbose:
+                    print(response.output, flush=True)
+                logger_c.debug('finished executing command over session: %s. (exited with code %d and took %.2f seconds.)\n%s',  # noqa: pycodestyle
+                               cmd_original, response.code,
+                               response.duration, response.output)
+                self.__invalidate_for_command(container,
+                                              context_original,
+                                              modifies_source)
+                return response
+            logger_c.debug('session is busy: executing command via new exec object')  # noqa: pycodestyle
+
         cmd = 'source /.environment && cd {} && {}'.format(context, cmd)
         cmd_wrapped = "/bin/bash -c '{}'".format(cmd)
         if time_limit is not None and time_limit > 0:
@@ -568,7 +1542,10 @@ class ContainerManager(object):
         out = self.__api_docker.exec_start(exec_id, stream=True)
 
         if not block:
-            return PendingExecResponse(response, out)
+            return PendingExecResponse(response,
+                                       out,
+                                       api_docker=self.__api_docker,
+                                       time_start=time_start)
 
         output = []
         for line in out:
@@ -582,10 +1559,91 @@ class ContainerManager(object):
         logger_c.debug('finished executing command: %s. (exited with code %d and took %.2f seconds.)\n%s',  # noqa: pycodestyle
                        cmd_original, code, time_running, output)
 
+        # discard any contents that were cached whilst the command was running
+        self.__invalidate_for_command(container,
+                                      context_original,
+                                      modifies_source)
         return ExecResponse(code, time_running, output)
 
     exec = command
 
+    def command_stream(self,
+                       container: Container,
+                       cmd: str,
+                       context: Optional[str] = None,
+                       stdout: bool = True,
+                       stderr: bool = False,
+                       time_limit: Optional[int] = None,
+                       kill_after: Optional[int] = 1,
+                       *,
+                       modifies_source: bool = True
+                       ) -> ExecStream:
+        """
+        Executes a provided shell command inside a given container, and
+        returns a stream that yields its output as it is produced, rather
+        than holding the entire output in memory until the command has
+        finished. Commands are always executed via a new exec object, even
+        if a shell session has been opened for the container.
+
+        Parameters:
+            time_limit: an optional parameter that is used to specify the
+                number of seconds that the command should be allowed to run
+                without completing before it is aborted.
+            modifies_source: see `command`.
+
+        Returns:
+            a stream over the output of the command. Once the stream has been
+            exhausted, it provides the exit code and duration of the command.
+            If the stream is closed before it has been exhausted, the
+            process group of the command is killed.
+        """
+        cmd_reported = '{} && {}'.format(_REPORT_PROCESS_GROUP, cmd)
+        pending = self.command(container,
+                               cmd_reported,
+                               context=context,
+                               stdout=stdout,
+                               stderr=stderr,
+                               block=False,
+                               time_limit=time_limit,
+                               kill_after=kill_after,
+                               modifies_source=modifies_source)
+        assert isinstance(pending, PendingExecResponse)
+
+        logger_c = logger.getChild(container.uid)
+        (pgid, chunks) = _split_process_group(pending.chunks())
+        logger_c.debug('streaming command in process group %s: %s',
+                       pgid, cmd)
+
+        def finish() -> Tuple[int, float]:
+            code = pending.wait()
+            duration = timer() - pending.time_start
+            logger_c.debug('finished streaming command: %s. (exited with code %d and took %.2f seconds.)',  # noqa: pycodestyle
+                           cmd, code, duration)
+            # discard any contents that were cached whilst the command was
+            # running
+            self.__invalidate_for_command(container, context, modifies_source)
+            return code, duration
+
+        # the output is no longer wanted (e.g., because the client has
+        # disconnected): the process group of the command is killed
+        def abort() -> None:
+            logger_c.debug('aborting streamed command: %s', cmd)
+            try:
+                if pgid is not None and pending.running:
+                    kill = 'kill -s KILL -- -{}'.format(pgid)
+                    response = self.__api_docker.exec_create(
+                        container.id, ['sh', '-c', kill], user='root')
+                    self.__api_docker.exec_start(response['Id'])
+            except docker.errors.APIError:
+                logger_c.exception('failed to abort streamed command: %s',
+                                   cmd)
+            finally:
+                self.__invalidate_for_command(container,
+                                              context,
+                                              modifies_source)
+
+        return ExecStream(chunks, finish, abort)
+
     def persist(self, container: Container, image: str) -> None:
         """
         Persists the state of a given container to a BugZoo image on this
@@ -1,2 +1,3 @@
 from .extractor import CoverageExtractor, register, register_as_default
 from .gcov import GcovExtractor
+from .gcov_json import GcovJSONExtractor
@@ -11,6 +11,7 @@ import logging
 
 from ...core import FileLineSet, Container, TestSuiteCoverage, TestCoverage, \
     CoverageInstructions, TestCase, Language, Bug, FileLineSet
+from ..job import JobHandle
 from ... import exceptions
 
 logger = logging.getLogger(__name__)  # type: logging.Logger
@@ -190,6 +191,14 @@ class CoverageExtractor(abc.ABC):
         """
         return self.__container
 
+    @abc.abstractmethod
+    def prepare(self) -> None:
+        """
+        Responsible for adding any instrumentation that is required to
+        compute coverage to the program, and then rebuilding it.
+        """
+        raise NotImplementedError
+
     @abc.abstractmethod
     def extract(self) -> FileLineSet:
         """
@@ -209,7 +218,8 @@ class CoverageExtractor(abc.ABC):
     def run(self,
             tests: Iterable[TestCase],
             *,
-            instrument: bool = True
+            instrument: bool = True,
+            job: Optional[JobHandle] = None
             ) -> TestSuiteCoverage:
         """
         Computes line coverage information for a given set of tests.
@@ -220,6 +230,9 @@ class CoverageExtractor(abc.ABC):
                 after running the tests. If set to False, prepare
                 and cleanup are not called, and the responsibility of calling
                 those methods is left to the user.
+            job: the background job, if any, that is computing the coverage.
+                Progress is reported after each test, and the computation
+                is abandoned if the job is cancelled.
         """
         container = self.container
         logger.debug("computing coverage for container: %s", container.uid)
@@ -234,18 +247,24 @@ class CoverageExtractor(abc.ABC):
             msg = "failed to instrument container."
             raise exceptions.FailedToComputeCoverage(msg)
 
+        tests = list(tests)
         cov = {}
-        for test in tests:
-            logger.debug("Generating coverage for test %s in container %s",
-                         test.name, container.uid)
-            outcome = self.__installation.containers.execute(container, test)
-            filelines = self.extract()
-            test_coverage = TestCoverage(test.name, outcome, filelines)
-            logger.debug("Generated coverage for test %s in container %s",
-                         test.name, container.uid)
-            cov[test.name] = test_coverage
-
-        self.cleanup()
+        try:
+            for i, test in enumerate(tests, 1):
+                logger.debug("Generating coverage for test %s in container %s",
+                             test.name, container.uid)
+                outcome = self.__installation.containers.execute(container,
+                                                                 test)
+                filelines = self.extract()
+                test_coverage = TestCoverage(test.name, outcome, filelines)
+                logger.debug("Generated coverage for test %s in container %s",
+                             test.name, container.uid)
+                cov[test.name] = test_coverage
+                if job:
+                    job.report(i / len(tests))
+        finally:
+            if instrument:
+                self.cleanup()
 
         coverage = TestSuiteCoverage(cov)
         logger.debug("Computed coverage for container: %s", container.uid)
@@ -1,4 +1,5 @@
-from typing import FrozenSet, Optional, Iterable, Dict, Any, List
+from typing import FrozenSet, Optional, Iterable, Iterator, Dict, Any, \
+    List, Set, Tuple, Union, BinaryIO
 from timeit import default_timer as timer
 import xml.etree.ElementTree as ET
 import os
@@ -52,6 +53,50 @@ INSTRUMENTATION = (
 )
 
 
+def _read_gcovr_report(report: Union[str, BinaryIO]
+                       ) -> Iterator[Tuple[str, Set[int]]]:
+    """
+    Incrementally parses a gcovr XML report, yielding the name of each file
+    in the report along with the set of lines in that file that were covered.
+    Files without any covered lines are skipped. Elements are discarded as
+    soon as they have been read, and so the report is never loaded into
+    memory in its entirety.
+
+    Parameters:
+        report: the path to, or a binary file object for, the report.
+    """
+    tags = []  # type: List[str]
+    elements = []  # type: List[ET.Element]
+    filename = None  # type: Optional[str]
+    lines = set()  # type: Set[int]
+
+    for (event, elem) in ET.iterparse(report, events=('start', 'end')):
+        if event == 'start':
+            tags.append(elem.tag)
+            elements.append(elem)
+            if elem.tag == 'class':
+                filename = elem.attrib['filename']
+                lines = set()
+            continue
+
+        tags.pop()
+        elements.pop()
+        if elem.tag == 'line':
+            # only consider the lines that belong directly to the class, and
+            # ignore those that are listed beneath its methods
+            if tags[-2:] == ['class', 'lines'] \
+               and int(elem.attrib['hits']) > 0:
+                lines.add(int(elem.attrib['number']))
+            elem.clear()
+        elif elem.tag == 'class':
+            if lines:
+                yield (filename, lines)
+            filename = None
+            lines = set()
+            # discard the class and any of its already-processed siblings
+            del elements[-1][:]
+
+
 def _convert_files_to_instrument(files: Iterable[str]) -> FrozenSet[str]:
     return frozenset(files)
 
@@ -94,84 +139,59 @@ class GcovExtractor(CoverageExtractor):
             assert not os.path.isabs(path), "expected relative file paths"
         self.__files_to_instrument = files_to_instrument
 
-    def _parse_report(self, s: str) -> FileLineSet:
+    def _parse_report(self,
+                      report: Union[str, BinaryIO]
+                      ) -> FileLineSet:
         """
         Determines the set of files that are covered in a gcovr report.
 
         Parameters:
-            s: a string-encoding of an XML document containing a gcovr report.
+            report: the path to, or a binary file object for, an XML document
+                containing a gcovr report.
 
         Returns:
             the set of file-lines that are stated as covered by the given
             report.
         """
+        return self._to_file_line_set(_read_gcovr_report(report))
+
+    def _to_file_line_set(self,
+                          report: Iterable[Tuple[str, Set[int]]]
+                          ) -> FileLineSet:
+        """
+        Transforms a stream of reported files and their covered lines into a
+        set of file-lines. Reported file paths are resolved against the
+        source file index for the container, and the lines for instrumented
+        files are adjusted to account for the instrumentation.
+        """
         container = self.container
         logger_c = logger.getChild(container.id)
-        mgr_ctr = self.__installation.containers
-        mgr_bug = self.__installation.bugs
-        bug = mgr_bug[container.bug]
-
-        # compute a list of all source files
-        dir_source = bug.source_dir
-        endings = ['.cpp', '.cc', '.c', '.h', '.hh', '.hpp', '.cxx']
-        cmd = ' -o '.join(["-name \*{}".format(e) for e in endings])
-        cmd = "find {} -type f \( {} \)".format(dir_source, cmd)
-        resp = mgr_ctr.command(container, cmd)
-        all_files = set(fn.strip() for fn in resp.output.split('\n'))
-
-        def has_file(fn_rel: str) -> bool:
-            fn_abs = os.path.join(dir_source, fn_rel)
-            return (fn_abs in all_files)
-
-        def read_line_coverage(cobertura_class) -> List[int]:
-            lines = cobertura_class.find('lines').findall('line')
-            return set(int(l.attrib['number']) for l in lines
-                    if int(l.attrib['hits']) > 0)
-
-        # FIXME is this a general solution?
-        def resolve_path(fn_rel: str) -> str:
-            assert fn_rel != '', "failed to resolve path"
-            if has_file(fn_rel):
-                return fn_rel
-
-            fn_rel_child = '/'.join(fn_rel.split('/')[1:])
-            return resolve_path(fn_rel_child)
-
-        # read the output of gcovr
-        root = ET.fromstring(s)
-        packages = root.find('packages').findall('package')
-        classes = [c for p in packages for c in p.find('classes').findall('class')]
-        report = [(cls.attrib['filename'], read_line_coverage(cls))
-                  for cls in classes]
-        report = [(fn, lines) for (fn, lines) in report if lines]
+        index = self.__installation.containers.source_index(container)
 
         t_start = timer()
-        logger_c.debug("Starting to traverse all files reported by gcovr.")
-        files_to_lines = {}
+        logger_c.debug("Starting to traverse all files in coverage report.")
+        files_to_lines = {}  # type: Dict[str, Set[int]]
         for (filename, lines) in report:
-            try:
-                filename = resolve_path(filename)
-            except AssertionError:
+            resolved = index.resolve(filename)
+            if resolved is None:
                 logger_c.warning("failed to resolve file: %s", filename)
                 continue
-            if lines:
-                files_to_lines[filename] = lines
+            if resolved in files_to_lines:
+                files_to_lines[resolved] |= lines
+            else:
+                files_to_lines[resolved] = lines
+        logger_c.debug("Traversing all files finished. Seconds passed: %.2f", timer() - t_start)  # noqa: pycodestyle
 
-        logger_c.debug("Traversing all files finished. Seconds passed: %.2f", timer() - t_start)
         # modify coverage information for all of the instrumented files
         num_instrumentation_lines = INSTRUMENTATION.count('\n')
-        lines_to_remove = set(range(1, num_instrumentation_lines))
         for path in self.__files_to_instrument:
             if not path in files_to_lines:
                 continue
 
-            logger_c.debug("Removing coverage lines due to instrumentation: %s", path)
-            lines = files_to_lines[path]
-            lines -= lines_to_remove
-            tmp = set()
-            for line in lines:
-                tmp.add(line - num_instrumentation_lines)
-            files_to_lines[path] = tmp
+            logger_c.debug("Removing coverage lines due to instrumentation: %s", path)  # noqa: pycodestyle
+            files_to_lines[path] = set(line - num_instrumentation_lines
+                                       for line in files_to_lines[path]
+                                       if line > num_instrumentation_lines)
 
         file_line_set = FileLineSet(files_to_lines)
         logger_c.debug("Lines in coverage report: %s", file_line_set)
@@ -195,13 +215,17 @@ class GcovExtractor(CoverageExtractor):
         dir_source = bug.source_dir
 
         # add instrumentation to each file
-        for fn_src in self.__files_to_instrument:
-            fn_src = os.path.join(dir_source, fn_src)
-            logger.debug("instrumenting file [%s] in container [%s]",
-                         fn_src, container.uid)
-            contents_original = mgr_file.read(container, fn_src)
-            contents_instrumented = INSTRUMENTATION + contents_original
-            mgr_file.write(container, fn_src, contents_instrumented)
+        fns_src = [os.path.join(dir_source, fn_src)
+                   for fn_src in self.__files_to_instrument]
+        logger.debug("instrumenting files [%s] in container [%s]",
+                     ', '.join(fns_src), container.uid)
+        contents_original = mgr_file.read_many(container, fns_src)
+        contents_instrumented = {}  # type: Dict[str, str]
+        for (fn_src, contents) in contents_original.items():
+            if contents is None:
+                raise exceptions.FileNotFound(fn_src)
+            contents_instrumented[fn_src] = INSTRUMENTATION + contents
+        mgr_file.write_many(container, contents_instrumented)
 
         # recompile with instrumentation options
         outcome = mgr_ctr.compile_with_instrumentation(container)
@@ -211,6 +235,9 @@ class GcovExtractor(CoverageExtractor):
             logger.debug("failed build output: %s", outcome.response.output)
             raise Exception(msg)
 
+        # index the source files once, so that they need not be found again
+        # each time that coverage is extracted
+        mgr_ctr.source_index(container, rebuild=True)
         logger.debug("instrumented container: %s", container.uid)
 
     def cleanup(self) -> None:
@@ -220,7 +247,7 @@ class GcovExtractor(CoverageExtractor):
         """
         logger.debug("cleanup method for gcov extractor does nothing.")
 
-    def extract(self) -> None:
+    def extract(self) -> FileLineSet:
         """
         Uses gcovr to extract coverage information for all of the C/C++ source
         code files within the project. Destroys '.gcda' files upon computing
@@ -241,22 +268,21 @@ class GcovExtractor(CoverageExtractor):
         response = mgr_ctr.command(container,
                                    cmd,
                                    context=dir_source,
-                                   verbose=True)
+                                   verbose=True,
+                                   modifies_source=False)
         logger_c.debug("Finished running gcovr (took %.2f seconds).", timer() - t_start)  # noqa: pycodestyle
         assert response.code == 0, "failed to run gcovr"
 
-        # copy the contents of the temporary file to the host machine
+        # copy the report to the host machine and stream it into the parser
         (_, fn_temp_host) = tempfile.mkstemp(suffix='.bugzoo')
         try:
             mgr_ctr.copy_from(container, fn_temp_ctr, fn_temp_host)
-            with open(fn_temp_host, 'r') as fh:
-                report = fh.read()
+            t_start = timer()
+            logger_c.debug("Parsing gcovr XML report.")
+            with open(fn_temp_host, 'rb') as fh:
+                res = self._parse_report(fh)
+            logger_c.debug("Finished parsing gcovr XML report (took %.2f seconds).", timer() - t_start)  # noqa: pycodestyle
         finally:
             os.remove(fn_temp_host)
-
-        t_start = timer()
-        logger_c.debug("Parsing gcovr XML report.")
-        res = self._parse_report(report)
-        logger_c.debug("Finished parsing gcovr XML report (took %.2f seconds).", timer() - t_start)  # noqa: pycodestyle
         logger_c.debug("Finished extracting coverage information")
         return res
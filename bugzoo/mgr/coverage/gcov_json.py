@@ -0,0 +1,135 @@
+from typing import FrozenSet, Iterator, Dict, Any, Set, Tuple
+from timeit import default_timer as timer
+import json
+import os
+import logging
+
+import attr
+
+from .extractor import register
+from .gcov import GcovExtractor
+from ...core import FileLineSet, Container
+
+logger = logging.getLogger(__name__)  # type: logging.Logger
+logger.setLevel(logging.DEBUG)
+
+
+def _read_gcov_json(output: str,
+                    dir_source: str
+                    ) -> Iterator[Tuple[str, Set[int]]]:
+    """
+    Parses the JSON documents that are written to the stdout by
+    `gcov --json-format --stdout`, yielding the absolute path of each file
+    within the source directory along with its set of covered lines. Files
+    that lie outside of the source directory (e.g., system headers) and
+    files without any covered lines are skipped, as are any diagnostics that
+    gcov wrote to the stderr between documents.
+
+    Parameters:
+        output: the concatenated JSON documents produced by gcov.
+        dir_source: the absolute path to the source directory.
+    """
+    prefix = dir_source.rstrip('/') + '/'
+    decoder = json.JSONDecoder()
+    end = len(output)
+    pos = 0
+    while True:
+        while pos < end and output[pos].isspace():
+            pos += 1
+        if pos >= end:
+            return
+        if output[pos] != '{':
+            eol = output.find('\n', pos)
+            eol = end if eol < 0 else eol
+            logger.debug("gcov diagnostic: %s", output[pos:eol].rstrip())
+            pos = eol
+            continue
+        (doc, pos) = decoder.raw_decode(output, pos)
+
+        cwd = doc.get('current_working_directory', dir_source)
+        for entry in doc.get('files', []):
+            filename = os.path.normpath(os.path.join(cwd, entry['file']))
+            if not filename.startswith(prefix):
+                continue
+            lines = set(line['line_number'] for line in entry['lines']
+                        if line['count'] > 0)
+            if lines:
+                yield (filename, lines)
+
+
+@register('gcov-json')
+class GcovJSONExtractor(GcovExtractor):
+    """
+    Computes line coverage for C/C++ programs by reading the '.gcda'
+    counters that are produced by the instrumented program directly via
+    `gcov --json-format --stdout`. Unlike the gcovr-based extractor, coverage
+    is extracted using a single command, without writing a report to disk
+    inside the container or copying it to the host. Requires GCC 10 or
+    later to be installed inside the container.
+
+    Programs are instrumented in exactly the same way as they are for the
+    gcovr-based extractor.
+    """
+    @attr.s(frozen=True)
+    class Instructions(GcovExtractor.Instructions):
+        @staticmethod
+        def from_dict(d: Dict[str, Any]
+                      ) -> 'GcovJSONExtractor.Instructions':
+            files_to_instrument = d.get('files-to-instrument', [])
+            return GcovJSONExtractor.Instructions(files_to_instrument)
+
+    @staticmethod
+    def from_instructions(installation: 'BugZoo',
+                          container: Container,
+                          instructions: Instructions
+                          ) -> 'GcovJSONExtractor':
+        return GcovJSONExtractor(installation,
+                                 container,
+                                 instructions.files_to_instrument)
+
+    def __init__(self,
+                 installation: 'BugZoo',
+                 container: Container,
+                 files_to_instrument: FrozenSet[str]
+                 ) -> None:
+        super().__init__(installation, container, files_to_instrument)
+        self.__installation = installation  # type: BugZoo
+
+    def extract(self) -> FileLineSet:
+        """
+        Uses gcov to extract coverage information for all of the C/C++ source
+        code files within the project. Destroys '.gcda' files upon computing
+        coverage.
+
+        Raises:
+            Exception: if gcov fails to process the '.gcda' files, in which
+                case they are left intact.
+        """
+        container = self.container
+        logger_c = logger.getChild(container.id)  # type: logging.Logger
+        mgr_ctr = self.__installation.containers
+        bug = self.__installation.bugs[container.bug]
+        dir_source = bug.source_dir
+        logger_c.debug("Extracting coverage information")
+
+        t_start = timer()
+        cmd = ("find . -name '*.gcda' "
+               "-exec gcov --json-format --stdout {} + && "
+               "find . -name '*.gcda' -delete")
+        response = mgr_ctr.command(container,
+                                   cmd,
+                                   context=dir_source,
+                                   modifies_source=False)
+        logger_c.debug("Finished running gcov (took %.2f seconds).", timer() - t_start)  # noqa: pycodestyle
+        if response.code != 0:
+            msg = "failed to extract coverage for container ({}): gcov exited with code {}."  # noqa: pycodestyle
+            msg = msg.format(container.id, response.code)
+            logger_c.debug("failed gcov output: %s", response.output)
+            raise Exception(msg)
+
+        t_start = timer()
+        report = _read_gcov_json(response.output, dir_source)
+        res = self._to_file_line_set(report)
+        logger_c.debug("Finished parsing gcov output (took %.2f seconds).", timer() - t_start)  # noqa: pycodestyle
+        logger_c.debug("Finished extracting coverage information")
+        return res
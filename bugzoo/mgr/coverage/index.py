@@ -0,0 +1,93 @@
+"""
+This module provides an index over the source files of a program, which is
+used to map the (often mangled) file paths that appear in coverage reports to
+the files that they describe.
+"""
+__all__ = ['SourceFileIndex', 'SOURCE_FILE_ENDINGS']
+
+from typing import Dict, FrozenSet, Iterable, Optional
+import os
+
+SOURCE_FILE_ENDINGS = ('.cpp', '.cc', '.c', '.h', '.hh', '.hpp', '.cxx')
+
+
+class SourceFileIndex(object):
+    """
+    An index of the source files within the source directory of a program.
+
+    Paths within coverage reports are resolved by finding the longest suffix
+    of the reported path (measured in path components) that matches the path
+    of an indexed file, relative to the source directory. Resolved paths are
+    memoised, and so each distinct reported path is only resolved once.
+    """
+    def __init__(self,
+                 dir_source: str,
+                 files: Iterable[str]
+                 ) -> None:
+        """
+        Constructs an index.
+
+        Parameters:
+            dir_source: the absolute path to the source directory.
+            files: the paths of the files that belong to the index, given
+                either as absolute paths or relative to the source directory.
+        """
+        self.__dir_source = dir_source
+        paths = set()
+        for fn in files:
+            fn = fn.strip()
+            if not fn:
+                continue
+            if os.path.isabs(fn):
+                fn = os.path.relpath(fn, dir_source)
+            paths.add(os.path.normpath(fn))
+        self.__files = frozenset(paths)  # type: FrozenSet[str]
+        self.__resolved = {}  # type: Dict[str, Optional[str]]
+
+    @property
+    def source_dir(self) -> str:
+        """The absolute path to the indexed source directory."""
+        return self.__dir_source
+
+    @property
+    def files(self) -> FrozenSet[str]:
+        """
+        The paths of the files in this index, relative to the source
+        directory.
+        """
+        return self.__files
+
+    def __contains__(self, fn_rel: str) -> bool:
+        return fn_rel in self.__files
+
+    def __len__(self) -> int:
+        return len(self.__files)
+
+    def resolve(self, fn: str) -> Optional[str]:
+        """
+        Resolves a file path that was reported by a coverage tool to the path
+        of an indexed file.
+
+        Returns:
+            the path of the matching file, relative to the source directory,
+            or None if no indexed file matches the given path.
+        """
+        try:
+            return self.__resolved[fn]
+        except KeyError:
+            pass
+
+        resolved = None  # type: Optional[str]
+        fn_norm = fn
+        if os.path.isabs(fn_norm) \
+           and fn_norm.startswith(self.__dir_source.rstrip('/') + '/'):
+            fn_norm = os.path.relpath(fn_norm, self.__dir_source)
+        parts = [p for p in os.path.normpath(fn_norm).split('/') if p]
+        for i in range(len(parts)):
+            candidate = '/'.join(parts[i:])
+            if candidate in self.__files:
+                resolved = candidate
+                break
+
+        self.__resolved[fn] = resolved
+        return resolved
@@ -0,0 +1,154 @@
+"""
+This module provides a pipeline that evaluates a sequence of candidate
+patches for a bug by applying, compiling, and testing each candidate inside
+its own container.
+"""
+__all__ = ['PatchEvaluator']
+
+from typing import Iterable, Iterator, List, Optional
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+import logging
+import queue
+
+from ..core import Bug, CandidateOutcome, Container, Patch, TestCase, \
+    TestOutcome
+
+logger = logging.getLogger(__name__)  # type: logging.Logger
+logger.setLevel(logging.DEBUG)
+
+
+class PatchEvaluator(object):
+    """
+    Evaluates candidate patches for a given bug in parallel across a given
+    number of workers. Each worker provisions a container (served by the warm
+    pool for the bug, if one exists) upon its first use, and resets that
+    container (see `ContainerManager.reset`) after evaluating each candidate.
+    Containers are destroyed once all candidates have been evaluated.
+
+    Evaluation of a candidate proceeds through three stages -- patch
+    application, compilation, and testing -- and stops at the first stage
+    that fails. If `stop_early` is enabled, testing also stops at the first
+    failing test.
+    """
+    def __init__(self,
+                 installation: 'BugZoo',
+                 bug: Bug,
+                 tests: Optional[Iterable[TestCase]] = None,
+                 *,
+                 workers: int = 1,
+                 in_process: bool = True,
+                 stop_early: bool = True,
+                 cache: bool = False,
+                 ccache: bool = False
+                 ) -> None:
+        """
+        Parameters:
+            installation: the BugZoo installation.
+            bug: the bug for which candidates should be evaluated.
+            tests: the tests that should be used to evaluate each candidate.
+                If unspecified, the entire test suite for the bug is used.
+            workers: the maximum number of candidates that should be
+                evaluated at once.
+            in_process: if set to True, patches are applied in process (see
+                `ContainerManager.patch`).
+            stop_early: if set to True, the tests for a candidate are
+                executed until the first failing test.
+            cache: if set to True, test outcomes are served from, and added
+                to, the test outcome cache (see `ContainerManager.execute`).
+            ccache: if set to True, each container is provisioned with the
+                shared ccache for the bug (see `ContainerManager.provision`).
+        """
+        assert workers > 0
+        self.__installation = installation
+        self.__bug = bug
+        self.__tests = list(bug.tests if tests is None else tests)
+        self.__workers = workers
+        self.__in_process = in_process
+        self.__stop_early = stop_early
+        self.__cache = cache
+        self.__ccache = ccache
+
+    @property
+    def tests(self) -> List[TestCase]:
+        """The tests that are used to evaluate each candidate."""
+        return list(self.__tests)
+
+    def evaluate_one(self,
+                     container: Container,
+                     index: int,
+                     patch: Patch
+                     ) -> CandidateOutcome:
+        """
+        Evaluates a single candidate patch inside a given container. The
+        container is not reset afterwards.
+
+        Parameters:
+            container: the container.
+            index: the position of the candidate within its sequence.
+            patch: the candidate patch.
+        """
+        mgr_ctr = self.__installation.containers
+        logger.debug("evaluating candidate #%d in container [%s]",
+                     index, container.uid)
+        if not mgr_ctr.patch(container, patch, in_process=self.__in_process):
+            return CandidateOutcome(index, False)
+
+        build = mgr_ctr.compile(container)
+        if not build.successful:
+            return CandidateOutcome(index, True, build)
+
+        tests = OrderedDict()  # type: OrderedDict[str, TestOutcome]
+        for test in self.__tests:
+            outcome = mgr_ctr.execute(container, test, cache=self.__cache)
+            tests[test.name] = outcome
+            if self.__stop_early and not outcome.passed:
+                break
+        logger.debug("evaluated candidate #%d", index)
+        return CandidateOutcome(index, True, build, tests)
+
+    def evaluate(self, patches: Iterable[Patch]) -> Iterator[CandidateOutcome]:
+        """
+        Evaluates a sequence of candidate patches, yielding the outcome of
+        each candidate as soon as its evaluation is complete. Outcomes are
+        therefore not necessarily yielded in the order in which the
+        candidates were given; the `index` of each outcome identifies its
+        candidate.
+
+        Any candidates that have not begun their evaluation are cancelled
+        if the returned iterator is closed before it has been exhausted.
+        """
+        mgr_ctr = self.__installation.containers
+        free = queue.Queue()  # type: queue.Queue
+
+        def run(index: int, patch: Patch) -> CandidateOutcome:
+            try:
+                container = free.get_nowait()
+            except queue.Empty:
+                container = mgr_ctr.provision(self.__bug, ccache=self.__ccache)
+            try:
+                return self.evaluate_one(container, index, patch)
+            finally:
+                try:
+                    mgr_ctr.reset(container)
+                except Exception:
+                    logger.exception("failed to reset container [%s]",
+                                     container.uid)
+                    del mgr_ctr[container.uid]
+                else:
+                    free.put(container)
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.__workers) as executor:
+                futures = [executor.submit(run, i, p)
+                           for (i, p) in enumerate(patches)
+                           ]  # type: List[Future]
+                try:
+                    for future in as_completed(futures):
+                        yield future.result()
+                finally:
+                    for future in futures:
+                        future.cancel()
+        finally:
+            while not free.empty():
+                del mgr_ctr[free.get_nowait().uid]
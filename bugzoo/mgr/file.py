@@ -4,19 +4,24 @@ filesystems (e.g., reading, writing, and deleting files).
 """
 __all__ = ['FileManager']
 
+from typing import Dict, Iterable, Mapping, Optional, Tuple
 import os
 import logging
-import tempfile
 
 import chardet
 
 from .bug import BugManager
 from .container import ContainerManager
 from ..core.container import Container
+from ..exceptions import FileNotFound
 
 logger = logging.getLogger(__name__)  # type: logging.Logger
 logger.setLevel(logging.DEBUG)
 
+# the maximum number of leading bytes that are used to detect the encoding of
+# a file whose contents are neither ASCII nor UTF-8
+_DETECT_PREFIX_SIZE = 64 * 1024
+
 
 class FileManager(object):
     def __init__(self,
@@ -25,6 +30,7 @@ class FileManager(object):
                  ) -> None:
         self.__mgr_bug = mgr_bug
         self.__mgr_ctr = mgr_ctr
+        self.__encodings = {}  # type: Dict[Tuple[str, str], str]
 
     def _resolve_path(self, container: Container, filepath: str) -> str:
         """
@@ -42,35 +48,106 @@ class FileManager(object):
 
     def read(self, container: Container, filepath: str) -> str:
         """
-        Reads the contents of a given file belonging to a container.
+        Reads the contents of a given file belonging to a container. Contents
+        are served from the file cache of the container manager, where
+        possible.
+
+        Raises:
+            FileNotFound: if the given file does not exist.
         """
-        logger.debug("reading contents of file [%s] inside container [%s]",
-                     filepath, container.id)
-        filepath_orig = filepath
-        filepath = self._resolve_path(container, filepath)
+        contents = self.read_many(container, [filepath])[filepath]
+        if contents is None:
+            raise FileNotFound(filepath)
+        return contents
 
-        # TODO what if the file doesn't exist?
-        # TODO what if we encounter a permissions problem?
+    def read_many(self,
+                  container: Container,
+                  filepaths: Iterable[str]
+                  ) -> Dict[str, Optional[str]]:
+        """
+        Reads the contents of a number of files belonging to a container
+        using a single transfer. Contents are served from the file cache of
+        the container manager, where possible: the stamps of any files with
+        cached contents are computed using a single command, and the
+        remaining files are read together with their stamps.
+
+        Returns:
+            a mapping from each of the given file paths to the contents of
+            that file, or None if the file does not exist.
+        """
+        filepaths = list(filepaths)
+        logger.debug("reading contents of %d files inside container [%s]",
+                     len(filepaths), container.id)
+        resolved = {fn: self._resolve_path(container, fn) for fn in filepaths}
+        cache = self.__mgr_ctr.file_cache
+        cached = [fn_abs for fn_abs in resolved.values()
+                  if cache.contains(container, fn_abs)]
+        stamps = self.__mgr_ctr.file_stamps(container, cached)
+        contents = {}  # type: Dict[str, Optional[str]]
+        for (fn, fn_abs) in resolved.items():
+            if fn_abs in stamps:
+                text = cache.get(container, fn_abs, stamps[fn_abs])
+                if text is not None:
+                    contents[fn] = text
+
+        missing = [fn_abs for (fn, fn_abs) in resolved.items()
+                   if fn not in contents]
+        if not missing:
+            logger.debug("read cached contents of %d files inside container [%s]",  # noqa: pycodestyle
+                         len(filepaths), container.id)
+            return contents
+        blobs, stamps = \
+            self.__mgr_ctr.read_many_bytes_with_stamps(container, missing)
+        for (fn, fn_abs) in resolved.items():
+            if fn in contents:
+                continue
+            blob = blobs[fn_abs]
+            if blob is None:
+                contents[fn] = None
+                continue
+            text = self._decode(container, fn_abs, blob)
+            stamp = stamps[fn_abs]
+            if stamp is not None:
+                cache.put(container, fn_abs, text, stamp)
+            contents[fn] = text
+        logger.debug("read contents of %d files inside container [%s]",
+                     len(filepaths), container.id)
+        return contents
 
-        # copy the contents the file to a temporary file on the host machine
-        # TODO ensure correct permissions
-        (_, fn_host) = tempfile.mkstemp(suffix='.bugzoo')
+    def _decode(self, container: Container, filepath: str, blob: bytes) -> str:
+        """
+        Decodes the contents of a given file belonging to a container.
+
+        Contents are first decoded as ASCII or strict UTF-8. Should that fail,
+        the encoding that was previously detected for the same file of the
+        same bug is used, if any; otherwise, the encoding is detected by
+        `chardet` from a bounded prefix of the contents, and is remembered
+        for subsequent reads of that file in any container for the bug.
+        """
+        # ASCII is a subset of UTF-8
         try:
-            # TODO we can probably move 'copy_from' to this manager
-            self.__mgr_ctr.copy_from(container, filepath, fn_host)
-            with open(fn_host, 'rb') as fh:
-                blob = fh.read()
-        finally:
-            os.remove(fn_host)
+            return blob.decode('utf-8')
+        except UnicodeDecodeError:
+            pass
+
+        key = (container.bug, filepath)
+        encoding = self.__encodings.get(key)
+        if encoding is not None:
+            try:
+                return blob.decode(encoding)
+            except UnicodeDecodeError:
+                logger.debug("remembered encoding of file [%s] is no longer valid: %s",  # noqa: pycodestyle
+                             filepath, encoding)
+                self.__encodings.pop(key, None)
 
         # detect encoding
         logger.debug("detecting encoding for file [%s] in container [%s]",
-                     filepath_orig, container.id)
-        chardet_res = chardet.detect(blob)
+                     filepath, container.id)
+        chardet_res = chardet.detect(blob[:_DETECT_PREFIX_SIZE])
         encoding = chardet_res['encoding']
         confidence = chardet_res['confidence']
         logger.debug("detected encoding of file [%s] in container [%s]: %s (%.3f confidence)",  # noqa: pycodestyle
-                     filepath_orig, container.id, encoding, confidence)
+                     filepath, container.id, encoding, confidence)
 
         # if no encoding is detected, return an empty file
         if encoding is None:
@@ -78,18 +155,16 @@ class FileManager(object):
 
         # decode file
         logger.debug("decoding file [%s] in container [%s]",
-                     filepath_orig, container.id)
+                     filepath, container.id)
         try:
             contents = blob.decode(encoding)
         except UnicodeDecodeError:
             logger.exception("failed to decode contents of file [%s] in container [%s]",  # noqa: pycodestyle
-                             filepath_orig, container.id)
+                             filepath, container.id)
             raise
+        self.__encodings[key] = encoding
         logger.debug("decoded file [%s] in container [%s]",
-                     filepath_orig, container.id)
-
-        logger.debug("read contents of file [%s] inside container [%s]",
-                     filepath_orig, container.id)
+                     filepath, container.id)
         return contents
 
     def delete(self,
@@ -103,23 +178,41 @@ class FileManager(object):
               container: Container,
               filepath: str,
               contents: str
-              ) -> str:
+              ) -> None:
         """
-        Reads the contents of a given file belonging to a container.
+        Writes the given contents to a file belonging to a container, using
+        a UTF-8 encoding. Since the stamp of the written file is unknown
+        until it is next read, its contents are not cached.
+
+        Raises:
+            FileNotFound: if the directory of the given file does not exist.
         """
         logger.debug("writing to file [%s] inside container [%s]",
                      filepath, container.id)
         filepath = self._resolve_path(container, filepath)
 
-        # write the file contents to a temporary file on the host before
-        # copying that file to the container
-        (_, fn_host) = tempfile.mkstemp(suffix='.bugzoo')
-        try:
-            with open(fn_host, 'w') as fh:
-                fh.write(contents)
-            self.__mgr_ctr.copy_to(container, fn_host, filepath)
-        finally:
-            os.remove(fn_host)
+        self.__mgr_ctr.write_bytes(container, filepath,
+                                   contents.encode('utf-8'))
 
         logger.debug("wrote to file [%s] inside container [%s]",
                      filepath, container.id)
+
+    def write_many(self,
+                   container: Container,
+                   files: Mapping[str, str]
+                   ) -> None:
+        """
+        Writes the contents of a number of files belonging to a container,
+        using a single transfer and a UTF-8 encoding.
+
+        Parameters:
+            container: the container.
+            files: a mapping from file paths to their new contents.
+        """
+        logger.debug("writing to %d files inside container [%s]",
+                     len(files), container.id)
+        blobs = {self._resolve_path(container, fn): contents.encode('utf-8')
+                 for (fn, contents) in files.items()}
+        self.__mgr_ctr.write_many_bytes(container, blobs)
+        logger.debug("wrote to %d files inside container [%s]",
+                     len(files), container.id)
@@ -0,0 +1,372 @@
+"""
+This module provides a manager for jobs: long-running operations, such as
+building images and computing coverage, that are executed in the background
+by a bounded pool of worker threads, so that the server can respond to the
+request that started the operation immediately, and clients can poll the
+job for its progress and result.
+"""
+__all__ = ['JobHandle', 'JobManager']
+
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from collections import OrderedDict, deque
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+import concurrent.futures
+import logging
+import threading
+import uuid
+
+from ..core import Job, JobStatus
+from ..exceptions import BugZooException, JobCancelled, JobNotFinished, \
+    UnexpectedServerError
+
+logger = logging.getLogger(__name__)  # type: logging.Logger
+logger.setLevel(logging.DEBUG)
+
+
+class _JobRecord(object):
+    """Holds the mutable state of a job."""
+    def __init__(self,
+                 uid: str,
+                 kind: str,
+                 discard: Optional[Callable[[Any], None]] = None
+                 ) -> None:
+        self.uid = uid
+        self.kind = kind
+        self.discard = discard
+        # set once the result of the job has been retrieved, at which point
+        # responsibility for the result passes to the caller
+        self.claimed = False
+        self.status = JobStatus.QUEUED
+        self.progress = None  # type: Optional[float]
+        self.result = None  # type: Any
+        self.exception = None  # type: Optional[BugZooException]
+        self.cancel_requested = False
+        self.future = None  # type: Optional[Future]
+
+    def snapshot(self) -> Job:
+        error = None  # type: Optional[Dict[str, Any]]
+        if self.exception:
+            error = self.exception.to_dict()['error']
+        return Job(self.uid, self.kind, self.status, self.progress, error)
+
+
+class JobHandle(object):
+    """
+    Provided to the function that implements a job, allowing it to report
+    its progress and to respond to requests for its cancellation.
+    """
+    def __init__(self, record: _JobRecord, lock: threading.Lock) -> None:
+        self.__record = record
+        self.__lock = lock
+
+    @property
+    def uid(self) -> str:
+        """The UID of the job."""
+        return self.__record.uid
+
+    @property
+    def cancelled(self) -> bool:
+        """True if the cancellation of the job has been requested."""
+        return self.__record.cancel_requested
+
+    def report(self, progress: float) -> None:
+        """
+        Reports the fraction of the job that has been completed. This is also
+        a cancellation point.
+
+        Raises:
+            JobCancelled: if the cancellation of the job has been requested,
+                in which case the job should stop immediately.
+        """
+        assert 0.0 <= progress <= 1.0
+        with self.__lock:
+            self.__record.progress = progress
+        self.check()
+
+    def check(self) -> None:
+        """
+        Stops the job if its cancellation has been requested.
+
+        Raises:
+            JobCancelled: if the cancellation of the job has been requested.
+        """
+        if self.__record.cancel_requested:
+            raise JobCancelled(self.uid)
+
+
+class JobManager(object):
+    """
+    Executes jobs in the background using a bounded pool of worker threads.
+    Jobs that are submitted whilst all workers are busy are queued.
+
+    Finished jobs, along with their results, are retained until they are
+    explicitly removed or until more than a given number of jobs have
+    finished since, at which point the oldest finished jobs are discarded.
+
+    Operations on instances of this class are thread safe.
+    """
+    def __init__(self,
+                 workers: int = 4,
+                 max_finished: int = 256
+                 ) -> None:
+        """
+        Parameters:
+            workers: the maximum number of jobs that may run at once.
+            max_finished: the maximum number of finished jobs that should be
+                retained.
+        """
+        assert workers > 0
+        assert max_finished > 0
+        self.__workers = workers
+        self.__max_finished = max_finished
+        self.__executor = ThreadPoolExecutor(max_workers=workers)
+        self.__lock = threading.Lock()
+        self.__jobs = OrderedDict()  # type: OrderedDict[str, _JobRecord]
+        self.__finished = deque()  # type: deque
+
+    def __discard(self, records: List[_JobRecord]) -> None:
+        """
+        Disposes of the unclaimed results of given jobs (e.g., by destroying
+        the container that was provisioned by the job). Must be called
+        whilst not holding the lock.
+        """
+        for record in records:
+            if record.status == JobStatus.SUCCEEDED and not record.claimed:
+                self.__dispose(record, record.result)
+
+    def __dispose(self, record: _JobRecord, result: Any) -> None:
+        """Disposes of a given result of a job."""
+        if record.discard is None:
+            return
+        logger.debug("discarding result of %s job: %s",
+                     record.kind, record.uid)
+        try:
+            record.discard(result)
+        except Exception:
+            logger.exception("failed to discard result of %s job: %s",
+                             record.kind, record.uid)
+
+    @property
+    def workers(self) -> int:
+        """The maximum number of jobs that may run at once."""
+        return self.__workers
+
+    def __iter__(self) -> Iterator[Job]:
+        """
+        Returns an iterator over the jobs that are held by this manager, in
+        the order in which they were submitted.
+        """
+        with self.__lock:
+            jobs = [r.snapshot() for r in self.__jobs.values()]
+        return iter(jobs)
+
+    def __getitem__(self, uid: str) -> Job:
+        """
+        Returns a description of the current state of a given job.
+
+        Raises:
+            KeyError: if no job exists with the given UID.
+        """
+        with self.__lock:
+            return self.__jobs[uid].snapshot()
+
+    def __delitem__(self, uid: str) -> None:
+        """
+        Cancels a given job, if it has not finished, and discards it.
+
+        Raises:
+            KeyError: if no job exists with the given UID.
+        """
+        self.cancel(uid)
+        with self.__lock:
+            record = self.__jobs.pop(uid)
+            if record.status.finished:
+                self.__finished.remove(uid)
+        self.__discard([record])
+
+    def submit(self,
+               kind: str,
+               func: Callable[[JobHandle], Any],
+               discard: Optional[Callable[[Any], None]] = None
+               ) -> Job:
+        """
+        Submits a job for execution.
+
+        Parameters:
+            kind: a short description of the operation performed by the
+                job (e.g., 'coverage').
+            func: the function that implements the job. The function is
+                given a handle, which may be used to report progress and to
+                check for cancellation, and should return a JSON-serialisable
+                result.
+            discard: an optional function that is used to dispose of the
+                result of the job if that result is thrown away before it
+                has been retrieved: when the job is cancelled after it has
+                produced its result, or when the job is removed or pruned.
+
+        Returns:
+            a description of the submitted job.
+        """
+        record = _JobRecord(str(uuid.uuid4()), kind, discard)
+        handle = JobHandle(record, self.__lock)
+        with self.__lock:
+            self.__jobs[record.uid] = record
+            record.future = self.__executor.submit(self.__run, record,
+                                                   handle, func)
+            logger.debug("submitted %s job: %s", kind, record.uid)
+            return record.snapshot()
+
+    def __run(self,
+              record: _JobRecord,
+              handle: JobHandle,
+              func: Callable[[JobHandle], Any]
+              ) -> None:
+        with self.__lock:
+            if record.status != JobStatus.QUEUED:
+                return
+            record.status = JobStatus.RUNNING
+        logger.debug("started %s job: %s", record.kind, record.uid)
+
+        status = JobStatus.SUCCEEDED
+        result = None  # type: Any
+        exception = None  # type: Optional[BugZooException]
+        try:
+            result = func(handle)
+        except JobCancelled:
+            status = JobStatus.CANCELLED
+        except BugZooException as err:
+            logger.exception("%s job failed: %s", record.kind, record.uid)
+            status = JobStatus.FAILED
+            exception = err
+        except Exception as err:
+            logger.exception("%s job failed: %s", record.kind, record.uid)
+            status = JobStatus.FAILED
+            exception = UnexpectedServerError.from_exception(err)
+
+        with self.__lock:
+            # if the job was cancelled after it had passed its last
+            # cancellation point, its result is thrown away
+            orphaned = status == JobStatus.SUCCEEDED \
+                and record.cancel_requested
+            if orphaned:
+                status = JobStatus.CANCELLED
+            record.status = status
+            record.result = None if orphaned else result
+            record.exception = exception
+            if status == JobStatus.SUCCEEDED:
+                record.progress = 1.0
+            pruned = self.__finish(record)
+        logger.debug("finished %s job [%s]: %s",
+                     record.kind, record.uid, status.value)
+        if orphaned:
+            self.__dispose(record, result)
+        self.__discard(pruned)
+
+    def __finish(self, record: _JobRecord) -> List[_JobRecord]:
+        """
+        Records that a given job has finished, and removes the oldest
+        finished jobs if too many have accumulated. Must be called whilst
+        holding the lock.
+
+        Returns:
+            the jobs that were removed, whose results should be discarded
+            once the lock has been released.
+        """
+        pruned = []  # type: List[_JobRecord]
+        self.__finished.append(record.uid)
+        while len(self.__finished) > self.__max_finished:
+            uid_oldest = self.__finished.popleft()
+            record_oldest = self.__jobs.pop(uid_oldest, None)
+            if record_oldest:
+                pruned.append(record_oldest)
+        return pruned
+
+    def cancel(self, uid: str) -> Job:
+        """
+        Cancels a given job. Queued jobs are cancelled immediately. Running
+        jobs are cancelled at their next cancellation point (see
+        `JobHandle.check`); jobs that pass their last cancellation point run
+        to completion, but are then treated as cancelled and their results
+        are discarded. Finished jobs are unaffected.
+
+        Returns:
+            a description of the state of the job after the request.
+
+        Raises:
+            KeyError: if no job exists with the given UID.
+        """
+        pruned = []  # type: List[_JobRecord]
+        with self.__lock:
+            record = self.__jobs[uid]
+            if record.status == JobStatus.QUEUED:
+                assert record.future is not None
+                record.future.cancel()
+                record.status = JobStatus.CANCELLED
+                pruned = self.__finish(record)
+                logger.debug("cancelled queued job: %s", uid)
+            elif record.status == JobStatus.RUNNING:
+                record.cancel_requested = True
+                logger.debug("requested cancellation of running job: %s",
+                             uid)
+            job = record.snapshot()
+        self.__discard(pruned)
+        return job
+
+    def result(self, uid: str) -> Any:
+        """
+        Retrieves the result of a given job. Once the result of a job has
+        been retrieved, it is no longer discarded when the job is removed.
+
+        Raises:
+            KeyError: if no job exists with the given UID.
+            JobNotFinished: if the job has not finished.
+            JobCancelled: if the job was cancelled.
+            BugZooException: the exception that caused the job to fail.
+        """
+        with self.__lock:
+            record = self.__jobs[uid]
+            status = record.status
+            if not status.finished:
+                raise JobNotFinished(uid)
+            if status == JobStatus.CANCELLED:
+                raise JobCancelled(uid)
+            if status == JobStatus.FAILED:
+                assert record.exception is not None
+                raise record.exception
+            record.claimed = True
+            return record.result
+
+    def wait(self, uid: str, timeout: Optional[float] = None) -> Any:
+        """
+        Blocks until a given job has finished, and returns its result.
+
+        Raises:
+            KeyError: if no job exists with the given UID.
+            JobNotFinished: if the job did not finish within the timeout.
+            JobCancelled: if the job was cancelled.
+            BugZooException: the exception that caused the job to fail.
+        """
+        with self.__lock:
+            future = self.__jobs[uid].future
+        assert future is not None
+        try:
+            future.exception(timeout=timeout)
+        except CancelledError:
+            pass
+        except concurrent.futures.TimeoutError:
+            raise JobNotFinished(uid)
+        return self.result(uid)
+
+    def shutdown(self) -> None:
+        """
+        Cancels all jobs and stops accepting new jobs. Running jobs without
+        cancellation points are not interrupted.
+        """
+        with self.__lock:
+            uids = list(self.__jobs)
+        for uid in uids:
+            try:
+                self.cancel(uid)
+            except KeyError:
+                pass
+        self.__executor.shutdown(wait=False)
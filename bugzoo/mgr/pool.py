@@ -0,0 +1,210 @@
+"""
+This module provides warm pools of pre-provisioned containers, allowing
+containers for a given bug to be handed out without having to wait for them to
+be created, started, and prepared.
+"""
+__all__ = ['ContainerPool']
+
+from typing import Callable, Deque, List, Optional, Tuple
+from collections import deque
+from timeit import default_timer as timer
+import logging
+import threading
+
+from ..core.bug import Bug
+from ..core.container import Container
+
+logger = logging.getLogger(__name__)  # type: logging.Logger
+logger.setLevel(logging.DEBUG)
+
+
+class ContainerPool(object):
+    """
+    Maintains a pool of ready-to-use containers for a single bug.
+
+    A background thread keeps at least :code:`min_size` idle containers warm.
+    Whenever a request for a container cannot be served from the pool, the
+    number of containers that the pool tries to keep warm is increased, up to
+    a maximum of :code:`max_size`. Idle containers that have not been handed
+    out within :code:`idle_timeout` seconds are evicted until the pool shrinks
+    back to its minimum size.
+    """
+    def __init__(self,
+                 bug: Bug,
+                 provision: Callable[[], Container],
+                 destroy: Callable[[Container], None],
+                 *,
+                 min_size: int = 1,
+                 max_size: int = 4,
+                 idle_timeout: float = 300.0,
+                 check_interval: float = 1.0
+                 ) -> None:
+        """
+        Constructs and starts a warm pool of containers for a given bug.
+
+        Parameters:
+            bug: the bug whose containers should be kept in the pool.
+            provision: creates a new, ready-to-use container for the bug.
+            destroy: destroys a container that was created by the pool.
+            min_size: the minimum number of idle containers that should be
+                kept warm.
+            max_size: the maximum number of idle containers that should be
+                kept warm.
+            idle_timeout: the number of seconds that a surplus container may
+                sit idle before it is evicted from the pool.
+            check_interval: the number of seconds between checks for idle
+                containers.
+        """
+        assert min_size >= 0
+        assert max_size >= max(min_size, 1)
+        assert idle_timeout > 0
+        assert check_interval > 0
+
+        self.__bug = bug
+        self.__provision = provision
+        self.__destroy = destroy
+        self.__min_size = min_size
+        self.__max_size = max_size
+        self.__idle_timeout = idle_timeout
+        self.__check_interval = check_interval
+
+        self.__target = min_size
+        self.__idle = deque()  # type: Deque[Tuple[Container, float]]
+        self.__num_pending = 0
+        self.__closed = False
+        self.__cond = threading.Condition()
+
+        self.__thread = threading.Thread(target=self.__run, daemon=True)
+        self.__thread.start()
+        logger.debug("started container pool for bug: %s", bug.name)
+
+    @property
+    def bug(self) -> Bug:
+        """The bug whose containers are held by this pool."""
+        return self.__bug
+
+    @property
+    def min_size(self) -> int:
+        """The minimum number of idle containers kept warm by this pool."""
+        return self.__min_size
+
+    @property
+    def max_size(self) -> int:
+        """The maximum number of idle containers kept warm by this pool."""
+        return self.__max_size
+
+    @property
+    def idle_timeout(self) -> float:
+        """
+        The number of seconds that a surplus container may sit idle before it
+        is evicted from this pool.
+        """
+        return self.__idle_timeout
+
+    def __len__(self) -> int:
+        """Returns the number of idle containers that are ready to use."""
+        with self.__cond:
+            return len(self.__idle)
+
+    def take(self) -> Optional[Container]:
+        """
+        Hands out a ready-to-use container from this pool.
+
+        Returns:
+            a ready-to-use container, or None if the pool is empty. Once a
+            container has been handed out, it is no longer managed by this
+            pool.
+        """
+        with self.__cond:
+            if self.__idle:
+                container, _ = self.__idle.popleft()
+                logger.debug("took container [%s] from pool for bug: %s",
+                             container.uid, self.__bug.name)
+            else:
+                container = None
+                self.__target = min(self.__target + 1, self.__max_size)
+                logger.debug("pool for bug [%s] is empty: increasing target size to %d",  # noqa: pycodestyle
+                             self.__bug.name, self.__target)
+            self.__cond.notify_all()
+        return container
+
+    def close(self) -> None:
+        """
+        Stops refilling this pool and destroys all of its idle containers.
+        """
+        logger.debug("closing container pool for bug: %s", self.__bug.name)
+        with self.__cond:
+            self.__closed = True
+            self.__cond.notify_all()
+        self.__thread.join()
+
+        with self.__cond:
+            containers = [c for (c, _) in self.__idle]
+            self.__idle.clear()
+        for container in containers:
+            self.__destroy_quietly(container)
+        logger.debug("closed container pool for bug: %s", self.__bug.name)
+
+    def __destroy_quietly(self, container: Container) -> None:
+        try:
+            self.__destroy(container)
+        except Exception:
+            logger.exception("failed to destroy pooled container: %s",
+                             container.uid)
+
+    def __evict(self) -> List[Container]:
+        """
+        Removes surplus containers that have sat idle for too long. Must be
+        called whilst holding the lock.
+        """
+        evicted = []  # type: List[Container]
+        time_now = timer()
+        while len(self.__idle) > self.__min_size:
+            container, time_ready = self.__idle[0]
+            if time_now - time_ready < self.__idle_timeout:
+                break
+            self.__idle.popleft()
+            self.__target = max(self.__target - 1, self.__min_size)
+            evicted.append(container)
+        return evicted
+
+    def __run(self) -> None:
+        while True:
+            with self.__cond:
+                if self.__closed:
+                    return
+                evicted = self.__evict()
+                deficit = \
+                    self.__target - len(self.__idle) - self.__num_pending
+                if not evicted and deficit <= 0:
+                    self.__cond.wait(timeout=self.__check_interval)
+                    continue
+                if deficit > 0:
+                    self.__num_pending += 1
+
+            for container in evicted:
+                logger.debug("evicting idle container [%s] from pool for bug: %s",  # noqa: pycodestyle
+                             container.uid, self.__bug.name)
+                self.__destroy_quietly(container)
+            if deficit <= 0:
+                continue
+
+            try:
+                container = self.__provision()
+            except Exception:
+                logger.exception("failed to provision container for pool: %s",
+                                 self.__bug.name)
+                with self.__cond:
+                    self.__num_pending -= 1
+                    self.__cond.wait(timeout=self.__check_interval)
+                continue
+
+            with self.__cond:
+                self.__num_pending -= 1
+                if not self.__closed:
+                    self.__idle.append((container, timer()))
+                    self.__cond.notify_all()
+                    logger.debug("added container [%s] to pool for bug: %s",
+                                 container.uid, self.__bug.name)
+                    continue
+            self.__destroy_quietly(container)
@@ -0,0 +1,179 @@
+"""
+This module provides a scheduler that distributes the execution of a test
+suite across a fleet of containers for the same bug.
+"""
+__all__ = ['TestScheduler']
+
+from typing import (Callable, Dict, Generator, Iterable, List, Optional,
+                    Sequence, TypeVar)
+from concurrent.futures import Future, ThreadPoolExecutor
+import logging
+import queue
+
+from .coverage import CoverageExtractor
+from .job import JobHandle
+from ..core import Container, TestCase, TestOutcome, TestCoverage, \
+    TestSuiteCoverage
+from .. import exceptions
+
+logger = logging.getLogger(__name__)  # type: logging.Logger
+logger.setLevel(logging.DEBUG)
+
+T = TypeVar('T')
+
+
+class TestScheduler(object):
+    """
+    Distributes the tests of a suite across a fleet of containers for the
+    same bug, using one worker thread per container. Tests are handed to
+    whichever container becomes free first, and their results are reported
+    in the order in which the tests were given.
+
+    Each container executes at most one test at a time. It is the
+    responsibility of the caller to ensure that all containers contain the
+    same version of the program.
+    """
+    def __init__(self,
+                 installation: 'BugZoo',
+                 containers: Sequence[Container]
+                 ) -> None:
+        assert containers, "expected at least one container"
+        bugs = set(c.bug for c in containers)
+        assert len(bugs) == 1, "expected containers for the same bug"
+
+        self.__installation = installation
+        self.__containers = list(containers)
+
+    @property
+    def containers(self) -> List[Container]:
+        """The containers used by this scheduler."""
+        return list(self.__containers)
+
+    def imap(self,
+             func: Callable[[Container, TestCase], T],
+             tests: Iterable[TestCase]
+             ) -> Generator[T, None, None]:
+        """
+        Applies a function to each test using a free container from the
+        fleet, and yields the results in the order in which the tests were
+        given.
+
+        Parameters:
+            func: the function that should be applied to each test, given
+                the container in which the test should be executed.
+            tests: the tests to which the function should be applied.
+        """
+        free = queue.Queue()  # type: queue.Queue
+        for container in self.__containers:
+            free.put(container)
+
+        def run(test: TestCase) -> T:
+            container = free.get()
+            try:
+                return func(container, test)
+            finally:
+                free.put(container)
+
+        num_workers = len(self.__containers)
+        with ThreadPoolExecutor(max_workers=num_workers) as executor:
+            futures = [executor.submit(run, t) for t in tests]
+            try:
+                for future in futures:
+                    yield future.result()
+            finally:
+                for future in futures:
+                    future.cancel()
+
+    def map(self,
+            func: Callable[[Container, TestCase], T],
+            tests: Iterable[TestCase]
+            ) -> List[T]:
+        """
+        Applies a function to each test using a free container from the
+        fleet, and returns the results in the order in which the tests were
+        given.
+        """
+        return list(self.imap(func, tests))
+
+    def execute(self,
+                tests: Iterable[TestCase],
+                verbose: bool = False
+                ) -> List[TestOutcome]:
+        """
+        Executes a given sequence of tests across the fleet.
+
+        Returns:
+            the outcomes of the tests, in the order in which the tests were
+            given.
+        """
+        mgr_ctr = self.__installation.containers
+        return self.map(lambda c, t: mgr_ctr.execute(c, t, verbose=verbose),
+                        tests)
+
+    def coverage(self,
+                 tests: Iterable[TestCase],
+                 *,
+                 instrument: bool = True,
+                 job: Optional[JobHandle] = None
+                 ) -> TestSuiteCoverage:
+        """
+        Computes line coverage information for a given set of tests across
+        the fleet.
+
+        Parameters:
+            tests: the tests for which coverage should be computed.
+            instrument: if set to True, each container is instrumented before
+                the tests are executed, and its instrumentation is cleaned up
+                afterwards. If set to False, the responsibility of
+                instrumenting the containers, and of cleaning them up, is
+                left to the user.
+            job: the background job, if any, that is computing the coverage.
+                Progress is reported as each test completes, and the
+                computation is abandoned if the job is cancelled.
+
+        Raises:
+            FailedToComputeCoverage: if a container could not be
+                instrumented.
+        """
+        installation = self.__installation
+        mgr_ctr = installation.containers
+        extractors = {c.uid: CoverageExtractor.build(installation, c)
+                      for c in self.__containers
+                      }  # type: Dict[str, CoverageExtractor]
+        num_workers = len(self.__containers)
+
+        if instrument:
+            logger.debug("instrumenting %d containers", num_workers)
+            with ThreadPoolExecutor(max_workers=num_workers) as executor:
+                futures = [executor.submit(e.prepare)
+                           for e in extractors.values()
+                           ]  # type: List[Future]
+            try:
+                for future in futures:
+                    future.result()
+            except Exception:
+                msg = "failed to instrument container."
+                raise exceptions.FailedToComputeCoverage(msg)
+
+        def run(container: Container, test: TestCase) -> TestCoverage:
+            logger.debug("Generating coverage for test %s in container %s",
+                         test.name, container.uid)
+            outcome = mgr_ctr.execute(container, test)
+            lines = extractors[container.uid].extract()
+            return TestCoverage(test.name, outcome, lines)
+
+        tests = list(tests)
+        cov = {}  # type: Dict[str, TestCoverage]
+        results = self.imap(run, tests)
+        try:
+            for i, coverage in enumerate(results, 1):
+                cov[coverage.test] = coverage
+                if job:
+                    job.report(i / len(tests))
+        finally:
+            results.close()
+            if instrument:
+                for extractor in extractors.values():
+                    extractor.cleanup()
+
+        return TestSuiteCoverage(cov)
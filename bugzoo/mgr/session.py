@@ -0,0 +1,199 @@
+"""
+This module provides persistent shell sessions, which allow many short
+commands to be executed inside a container over a single, long-lived shell
+rather than creating a new Docker exec object for each command.
+"""
+__all__ = ['ShellSession']
+
+from typing import Optional, Tuple
+from timeit import default_timer as timer
+import logging
+import shlex
+import threading
+import uuid
+
+import docker
+from docker.utils.socket import next_frame_header, read_exactly, \
+    SocketError, STDOUT
+
+from ..cmd import ExecResponse
+from ..exceptions import BugZooException
+
+logger = logging.getLogger(__name__)  # type: logging.Logger
+logger.setLevel(logging.DEBUG)
+
+
+class ShellSession(object):
+    """
+    A long-lived shell inside a container. Commands are written to the
+    standard input of the shell, and their output is read back from its
+    standard output until a session-specific sentinel line, which also
+    carries the exit code of the command, is encountered.
+
+    Each command is executed inside its own subshell, and so commands cannot
+    affect the state of the session (e.g., its working directory or its
+    environment variables). Note that, unlike commands that are executed via
+    `ContainerManager.command` without a session, commands are not attached
+    to a TTY.
+
+    Only one command may be executed over a session at a time.
+    """
+    def __init__(self,
+                 api_docker: docker.APIClient,
+                 container_id: str
+                 ) -> None:
+        """
+        Opens a new shell session inside a given container.
+
+        Parameters:
+            api_docker: the low-level Docker API client.
+            container_id: the ID of the Docker container.
+        """
+        self.__container_id = container_id
+        self.__sentinel = 'BUGZOO-SESSION-{}'.format(uuid.uuid4().hex)
+        self.__marker = '\n{} '.format(self.__sentinel).encode('utf-8')
+        self.__lock = threading.Lock()
+        self.__buffer = bytearray()
+        self.__closed = False
+
+        logger.debug("opening shell session in container: %s", container_id)
+        response = api_docker.exec_create(container_id,
+                                          ['/bin/bash', '--noprofile',
+                                           '--norc'],
+                                          stdin=True,
+                                          stdout=True,
+                                          stderr=True,
+                                          tty=False)
+        self.__socket = api_docker.exec_start(response['Id'],
+                                              tty=False,
+                                              socket=True)
+        self.__write('source /.environment\n')
+        logger.debug("opened shell session in container: %s", container_id)
+
+    @property
+    def closed(self) -> bool:
+        """Indicates whether this session has been closed."""
+        return self.__closed
+
+    def __write(self, data: str) -> None:
+        sock = getattr(self.__socket, '_sock', self.__socket)
+        sock.sendall(data.encode('utf-8'))
+
+    def __read_until_sentinel(self) -> Tuple[bytes, int]:
+        """
+        Reads the output of the current command up to (and including) its
+        sentinel line, and returns that output along with the exit code.
+        Occurrences of the sentinel within the output of the command that
+        are not followed by an exit code are treated as ordinary output.
+        """
+        start = 0
+        while True:
+            at = self.__buffer.find(self.__marker, start)
+            if at >= 0:
+                end = self.__buffer.find(b'\n', at + len(self.__marker))
+                if end >= 0:
+                    trailer = bytes(self.__buffer[at + len(self.__marker):end])
+                    if not trailer.isdigit():
+                        start = at + 1
+                        continue
+                    output = bytes(self.__buffer[:at])
+                    del self.__buffer[:end + 1]
+                    return output, int(trailer)
+
+            stream, size = next_frame_header(self.__socket)
+            if size < 0:
+                raise SocketError("shell session closed")
+            data = read_exactly(self.__socket, size) if size else b''
+            if stream == STDOUT:
+                self.__buffer += data
+
+    def try_execute(self,
+                    command: str,
+                    context: str,
+                    stdout: bool = True,
+                    stderr: bool = False,
+                    time_limit: Optional[int] = None,
+                    kill_after: Optional[int] = 1
+                    ) -> Optional[ExecResponse]:
+        """
+        Attempts to execute a given shell command over this session.
+
+        Parameters:
+            command: the shell command that should be executed.
+            context: the directory in which the command should be executed.
+            stdout: specifies whether or not output to the stdout should be
+                included in the response.
+            stderr: specifies whether or not output to the stderr should be
+                included in the response.
+            time_limit: an optional number of seconds that the command should
+                be allowed to run before it is aborted.
+            kill_after: the number of seconds to wait before killing a command
+                that has exceeded its time limit.
+
+        Returns:
+            the response to the command, or None if the session is busy
+            executing another command.
+
+        Raises:
+            BugZooException: if the session was closed unexpectedly.
+        """
+        if not self.__lock.acquire(blocking=False):
+            return None
+        try:
+            if self.__closed:
+                return None
+
+            cmd = 'cd {} && {}'.format(context, command)
+            cmd = '/bin/bash -c {}'.format(shlex.quote(cmd))
+            if time_limit is not None and time_limit > 0:
+                cmd_template = "timeout --kill-after={} --signal=SIGTERM {} {}"
+                cmd = cmd_template.format(kill_after, time_limit, cmd)
+            cmd += ' < /dev/null'
+            cmd += ' 2>&1' if stderr else ' 2> /dev/null'
+            if not stdout:
+                cmd += ' > /dev/null'
+            cmd = "{}; printf '\\n%s %d\\n' {} $?\n".format(cmd,
+                                                            self.__sentinel)
+
+            time_start = timer()
+            try:
+                self.__write(cmd)
+                output, code = self.__read_until_sentinel()
+            except (OSError, SocketError, ValueError) as err:
+                logger.exception("shell session in container [%s] closed unexpectedly",  # noqa: pycodestyle
+                                 self.__container_id)
+                self.__close()
+                m = "shell session in container [{}] closed unexpectedly: {}"
+                m = m.format(self.__container_id, err)
+                raise BugZooException(m)
+            time_running = timer() - time_start
+
+            output_s = output.decode('utf-8', 'backslashreplace').rstrip('\n')
+            return ExecResponse(code, time_running, output_s)
+        finally:
+            self.__lock.release()
+
+    def __close(self) -> None:
+        if self.__closed:
+            return
+        self.__closed = True
+        try:
+            self.__write('exit\n')
+        except OSError:
+            pass
+        try:
+            self.__socket.close()
+        except OSError:
+            pass
+
+    def close(self) -> None:
+        """
+        Closes this session. Blocks until any command that is currently being
+        executed over the session has finished.
+        """
+        logger.debug("closing shell session in container: %s",
+                     self.__container_id)
+        with self.__lock:
+            self.__close()
+        logger.debug("closed shell session in container: %s",
+                     self.__container_id)
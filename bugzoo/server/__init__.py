@@ -1,11 +1,13 @@
-from typing import Dict, Any, Iterator, Optional, List
+from typing import Dict, Any, Iterator, Optional, List, Callable
 from functools import wraps
+import json
 from contextlib import contextmanager
 import argparse
 import os
 import signal
 import subprocess
 import logging
+import math
 import sys
 import threading
 import time
@@ -15,15 +17,20 @@ import docker
 import psutil
 import git
 
+from . import wsgi
 from ..version import __version__
 from ..core.tool import Tool as Plugin
 from ..core.bug import Bug
+from ..core.container import Container
 from ..core.patch import Patch
+from ..core.test import TestCase
+from ..core.localization import find_formula
 from ..compiler import CompilationOutcome
 from ..manager import BugZoo
 from ..exceptions import *
 from ..client import Client
 from ..mgr.container import ContainerManager
+from ..mgr.job import JobHandle
 from ..util import (indent, report_resource_limits, report_system_resources,
                     is_port_in_use)
 
@@ -64,6 +71,29 @@ def throws_errors(func):
     return wrapper
 
 
+def is_async_request() -> bool:
+    """
+    Determines whether the client has requested that the operation for the
+    current request should be performed by a background job (via the
+    `async=yes` query parameter).
+    """
+    return flask.request.args.get('async', default='no', type=str) == 'yes'
+
+
+def submit_job(kind: str,
+               func: Callable[[JobHandle], Any],
+               discard: Optional[Callable[[Any], None]] = None):
+    """
+    Submits a background job, and produces a response that describes that
+    job and gives its location.
+
+    See: `JobManager.submit`
+    """
+    job = daemon.jobs.submit(kind, func, discard)
+    headers = {'Location': flask.url_for('get_job', uid=job.uid)}
+    return (flask.jsonify(job.to_dict()), 202, headers)
+
+
 @contextmanager
 def ephemeral(*,
               port: int = 6060,
@@ -160,7 +190,6 @@ def interact_with_bug(uid: str):
         return '', 204
 
 
-# TODO return a job ID
 @app.route('/bugs/<path:uid>/build', methods=['POST'])
 @throws_errors
 def build_bug(uid: str):
@@ -174,6 +203,11 @@ def build_bug(uid: str):
     if daemon.bugs.is_installed(bug):
         return BugAlreadyBuilt(uid), 409
 
+    if is_async_request():
+        def build(job: JobHandle) -> None:
+            daemon.bugs.build(bug, job=job)
+        return submit_job('build', build)
+
     try:
         daemon.bugs.build(bug)
     except ImageBuildFailed as err:
@@ -199,12 +233,174 @@ def provision_bug(uid: str):
     if not daemon.bugs.is_installed(bug):
         return ImageNotInstalled(bug.image), 400
 
-    container = daemon.containers.provision(bug, tools=plugins)
-    jsn = flask.jsonify(container.to_dict())
+    def provision(job: Optional[JobHandle] = None) -> Dict[str, Any]:
+        if job:
+            job.check()
+        container = \
+            daemon.containers.provision(bug,
+                                        tools=plugins,
+                                        ccache=args.get('ccache', False))
+        return container.to_dict()
+
+    # destroys the container provisioned by a job whose result is thrown
+    # away before it has been retrieved by the client
+    def destroy(jsn: Dict[str, Any]) -> None:
+        try:
+            del daemon.containers[jsn['uid']]
+        except KeyError:
+            pass
+
+    if is_async_request():
+        return submit_job('provision', provision, destroy)
+
+    jsn = flask.jsonify(provision())
 
     return (jsn, 200)
 
 
+@app.route('/bugs/<path:uid>/pool', methods=['PUT', 'DELETE'])
+@throws_errors
+def pool_bug(uid: str):
+    try:
+        bug = daemon.bugs[uid]
+    except KeyError:
+        return BugNotFound(uid), 404
+
+    if flask.request.method == 'DELETE':
+        try:
+            daemon.containers.destroy_pool(bug.name)
+        except KeyError:
+            return '', 404
+        return '', 204
+
+    if not daemon.bugs.is_installed(bug):
+        return ImageNotInstalled(bug.image), 400
+
+    args = flask.request.get_json() or {}  # type: Dict[str, Any]
+    min_size = args.get('min-size', 1)
+    if not isinstance(min_size, int) or isinstance(min_size, bool) \
+       or min_size < 0:
+        return ArgumentNotSpecified("min-size"), 400
+    max_size = args.get('max-size', max(min_size, 4))
+    if not isinstance(max_size, int) or isinstance(max_size, bool) \
+       or max_size < max(min_size, 1):
+        return ArgumentNotSpecified("max-size"), 400
+    idle_timeout = args.get('idle-timeout', 300.0)
+    if not isinstance(idle_timeout, (int, float)) \
+       or isinstance(idle_timeout, bool) or not idle_timeout > 0:
+        return ArgumentNotSpecified("idle-timeout"), 400
+
+    daemon.containers.create_pool(bug,
+                                  min_size=min_size,
+                                  max_size=max_size,
+                                  idle_timeout=idle_timeout)
+    return '', 204
+
+
+@app.route('/bugs/<path:uid>/test', methods=['POST'])
+@throws_errors
+def test_bug(uid: str):
+    try:
+        bug = daemon.bugs[uid]
+    except KeyError:
+        return BugNotFound(uid), 404
+
+    args = flask.request.get_json() or {}  # type: Dict[str, Any]
+    workers = args.get('workers', 1)
+    if not isinstance(workers, int) or workers < 1:
+        return ArgumentNotSpecified("workers"), 400
+
+    tests = None  # type: Optional[List[TestCase]]
+    if args.get('tests') is not None:
+        tests = []
+        for name in args['tests']:
+            try:
+                tests.append(bug.tests[name])
+            except KeyError:
+                return TestNotFound(name), 404
+
+    containers = None  # type: Optional[List[Container]]
+    if args.get('containers'):
+        containers = []
+        for id_container in args['containers']:
+            try:
+                container = daemon.containers[id_container]
+            except KeyError:
+                return ContainerNotFound(id_container), 404
+            if container.bug != bug.name:
+                return ContainerNotFound(id_container), 404
+            containers.append(container)
+    elif not daemon.bugs.is_installed(bug):
+        return ImageNotInstalled(bug.image), 400
+
+    outcomes = daemon.bugs.test(bug,
+                                tests,
+                                containers=containers,
+                                workers=workers)
+    jsn = [{'test': name, 'outcome': outcome.to_dict()}
+           for (name, outcome) in outcomes.items()]
+    return (flask.jsonify(jsn), 200)
+
+
+@app.route('/bugs/<path:uid>/evaluate', methods=['POST'])
+@throws_errors
+def evaluate_candidates(uid: str):
+    """
+    Evaluates a list of candidate patches for a bug, and streams the outcome
+    of each candidate back to the client as a line of JSON (i.e., NDJSON) as
+    soon as its evaluation completes. If an unexpected error occurs during
+    the evaluation, an error description is sent as the final line.
+    """
+    try:
+        bug = daemon.bugs[uid]
+    except KeyError:
+        return BugNotFound(uid), 404
+    if not daemon.bugs.is_installed(bug):
+        return ImageNotInstalled(bug.image), 400
+
+    args = flask.request.get_json() or {}  # type: Dict[str, Any]
+    workers = args.get('workers', 1)
+    if not isinstance(workers, int) or workers < 1:
+        return ArgumentNotSpecified("workers"), 400
+    if not isinstance(args.get('patches'), list):
+        return ArgumentNotSpecified("patches"), 400
+    patches = [Patch.from_unidiff(diff) for diff in args['patches']]
+
+    tests = None  # type: Optional[List[TestCase]]
+    if args.get('tests') is not None:
+        tests = []
+        for name in args['tests']:
+            try:
+                tests.append(bug.tests[name])
+            except KeyError:
+                return TestNotFound(name), 404
+
+    outcomes = daemon.bugs.evaluate(bug,
+                                    patches,
+                                    tests,
+                                    workers=workers,
+                                    in_process=args.get('in-process', True),
+                                    stop_early=args.get('stop-early', True),
+                                    cache=args.get('cache', False),
+                                    ccache=args.get('ccache', False))
+
+    def stream() -> Iterator[str]:
+        try:
+            for outcome in outcomes:
+                yield json.dumps(outcome.to_dict()) + '\n'
+        except BugZooException as err:
+            logger.exception("failed to evaluate candidates for bug: %s", uid)
+            yield json.dumps(err.to_dict()) + '\n'
+        except Exception as err:
+            logger.exception("failed to evaluate candidates for bug: %s", uid)
+            err = UnexpectedServerError.from_exception(err)
+            yield json.dumps(err.to_dict()) + '\n'
+        finally:
+            outcomes.close()
+
+    return flask.Response(stream(), mimetype='application/x-ndjson')
+
+
 @app.route('/bugs/<uid>/coverage', methods=['GET'])
 @throws_errors
 def coverage_bug(uid: str):
@@ -222,19 +418,67 @@ def coverage_bug(uid: str):
         logger.error("%s: snapshot not installed.", msg_prefix_fail)
         return ImageNotInstalled(bug.image), 400
 
+    def coverage(job: Optional[JobHandle] = None) -> Dict[str, Any]:
+        try:
+            with daemon.bugs.coverage(bug, job=job) as coverage:
+                return coverage.to_dict()
+        except JobCancelled:
+            raise
+        # TODO: work on this
+        except Exception:
+            logger.exception("%s: failed to compute coverage.",
+                             msg_prefix_fail)
+            raise FailedToComputeCoverage("unknown reason")
+
+    if is_async_request():
+        return submit_job('coverage', coverage)
+
     try:
-        coverage = daemon.bugs.coverage(bug)
-    # TODO: work on this
-    except Exception:
-        logger.error("%s: failed to compute coverage.", msg_prefix_fail)
-        return FailedToComputeCoverage("unknown reason"), 500
+        jsn_coverage = coverage()
+    except FailedToComputeCoverage as err:
+        return err, 500
 
     logger.debug("Converting coverage information to JSON.")
-    jsn = flask.jsonify(coverage.to_dict())
+    jsn = flask.jsonify(jsn_coverage)
     logger.debug("Converted coverage information to JSON.")
     return (jsn, 200)
 
 
+@app.route('/bugs/<path:uid>/localize', methods=['GET'])
+@throws_errors
+def localize_bug(uid: str):
+    try:
+        bug = daemon.bugs[uid]
+    except KeyError:
+        return BugNotFound(uid), 404
+
+    formula = flask.request.args.get('formula', 'ochiai')
+    limit = flask.request.args.get('limit', None, type=int)
+    files = flask.request.args.getlist('file') or None
+    try:
+        find_formula(formula)
+    except FormulaNotFound as err:
+        return err, 404
+
+    if not daemon.bugs.is_installed(bug):
+        return ImageNotInstalled(bug.image), 400
+
+    try:
+        ranking = daemon.bugs.localize(bug, formula, limit, files=files)
+    except BugZooException:
+        raise
+    except Exception:
+        logger.exception("failed to compute coverage for bug: %s", uid)
+        return FailedToComputeCoverage("unknown reason"), 500
+
+    # non-finite scores (e.g., those assigned by dstar to lines that are
+    # only covered by failing tests) cannot be represented in standard JSON
+    jsn = [{'line': str(line),
+            'score': score if math.isfinite(score) else str(score)}
+           for (line, score) in ranking]
+    return (flask.jsonify(jsn), 200)
+
+
 @app.route('/containers/<id_container>/test/<id_test>', methods=['POST'])
 @throws_errors
 def test_container(id_container: str, id_test: str):
@@ -253,12 +497,19 @@ def test_container(id_container: str, id_test: str):
     except KeyError:
         return TestNotFound(id_test), 404
 
-    outcome = daemon.containers.test(container, test)
+    cache = flask.request.args.get('cache', 'no') == 'yes'
+    outcome = daemon.containers.test(container, test, cache=cache)
 
     jsn = flask.jsonify(outcome.to_dict())
     return (jsn, 200)
 
 
+@app.route('/cache/outcomes/stats', methods=['GET'])
+def outcome_cache_stats():
+    jsn = daemon.containers.outcome_cache.stats()
+    return flask.jsonify(jsn), 200
+
+
 @app.route('/containers/<uid>/instrument', methods=['POST'])
 @throws_errors
 def instrument_container(uid: str):
@@ -319,14 +570,25 @@ def coverage_container(id_container: str):
     else:
         logger.debug("skipping instrumentation step")
 
-    try:
-        coverage = mgr_ctr.coverage(container, instrument=instrument)
-    except Exception as err:
-        logger.exception("failed to compute coverage for container [%s]: %s",
-                     id_container, err)
-        return FailedToComputeCoverage("unknown reason"), 500
+    def coverage(job: Optional[JobHandle] = None) -> Dict[str, Any]:
+        try:
+            return mgr_ctr.coverage(container,
+                                    instrument=instrument,
+                                    job=job).to_dict()
+        except JobCancelled:
+            raise
+        except Exception as err:
+            logger.exception("failed to compute coverage for container [%s]: %s",  # noqa: pycodestyle
+                             id_container, err)
+            raise FailedToComputeCoverage("unknown reason")
+
+    if is_async_request():
+        return submit_job('coverage', coverage)
 
-    jsn = flask.jsonify(coverage.to_dict())
+    try:
+        jsn = flask.jsonify(coverage())
+    except FailedToComputeCoverage as err:
+        return err, 500
     return (jsn, 200)
 
 
@@ -342,6 +604,36 @@ def is_installed_bug(uid: str):
     return (flask.jsonify(status), 200)
 
 
+@app.route('/files/<id_container>', methods=['POST'])
+@throws_errors
+def read_many_files(id_container: str):
+    try:
+        container = daemon.containers[id_container]
+    except KeyError:
+        return ContainerNotFound(id_container), 404
+
+    args = flask.request.get_json() or {}  # type: Dict[str, Any]
+    if 'paths' not in args:
+        return ArgumentNotSpecified('paths'), 400
+    contents = daemon.files.read_many(container, args['paths'])
+    return flask.jsonify(contents), 200
+
+
+@app.route('/files/<id_container>', methods=['PUT'])
+@throws_errors
+def write_many_files(id_container: str):
+    try:
+        container = daemon.containers[id_container]
+    except KeyError:
+        return ContainerNotFound(id_container), 404
+
+    files = flask.request.get_json()  # type: Optional[Dict[str, str]]
+    if files is None:
+        return ArgumentNotSpecified('files'), 400
+    daemon.files.write_many(container, files)
+    return '', 204
+
+
 @app.route('/files/<id_container>/<path:filepath>', methods=['GET'])
 @throws_errors
 def interact_with_file(id_container: str, filepath: str):
@@ -356,8 +648,8 @@ def interact_with_file(id_container: str, filepath: str):
 
     try:
         return daemon.files.read(container, filepath)
-    except KeyError:
-        return FileNotFound(filepath), 404
+    except FileNotFound as err:
+        return err, 404
 
 
 @app.route('/files/<id_container>/<path:filepath>', methods=['PUT'])
@@ -373,7 +665,10 @@ def write_to_file(id_container: str, filepath: str):
     filepath = '/' + filepath
 
     contents = flask.request.data.decode('utf-8')  # type: str
-    daemon.files.write(container, filepath, contents)
+    try:
+        daemon.files.write(container, filepath, contents)
+    except FileNotFound as err:
+        return err, 404
     return '', 204
 
 
@@ -407,7 +702,10 @@ def interact_with_container(uid: str):
         # TODO send character encoding in headers
         s = flask.request.data.decode('utf-8')
         patch = Patch.from_unidiff(s)
-        outcome = daemon.containers.patch(container, patch)
+        in_process = flask.request.args.get('in-process', 'no') == 'yes'
+        outcome = daemon.containers.patch(container,
+                                          patch,
+                                          in_process=in_process)
         if outcome:
             return '', 204
         else:
@@ -481,6 +779,7 @@ def get_ip_address(uid: str):
 def build_container(uid: str):
     verbose = \
         flask.request.args.get('verbose', default='no', type=str) == 'yes'
+    force = flask.request.args.get('force', default='no', type=str) == 'yes'
     mgr_ctr = daemon.containers  # type: ContainerManager
     try:
         container = mgr_ctr[uid]
@@ -488,12 +787,25 @@ def build_container(uid: str):
         return ContainerNotFound(uid), 404
 
     logger.debug("building project in container: %s", container.uid)
-    outcome = mgr_ctr.compile(container, verbose=verbose)
+    outcome = mgr_ctr.compile(container, verbose=verbose, force=force)
     logger.debug("built project in container: %s", container.uid)
     jsn = flask.jsonify(outcome.to_dict())
     return (jsn, 200)
 
 
+@app.route('/containers/<uid>/reset', methods=['POST'])
+@throws_errors
+def reset_container(uid: str):
+    mgr_ctr = daemon.containers  # type: ContainerManager
+    try:
+        container = mgr_ctr[uid]
+    except KeyError:
+        return ContainerNotFound(uid), 404
+
+    mgr_ctr.reset(container)
+    return '', 204
+
+
 @app.route('/containers/<uid>/tempfile', methods=['POST'])
 @throws_errors
 def generate_temporary_file(uid: str):
@@ -537,6 +849,36 @@ def exec_container(uid: str):
         isinstance(time_limit, int) or \
         isinstance(time_limit, float)
 
+    if flask.request.args.get('stream', default='no', type=str) == 'yes':
+        output = daemon.containers.command_stream(container,
+                                                  cmd=cmd,
+                                                  context=context,
+                                                  stdout=stdout,
+                                                  stderr=stderr,
+                                                  time_limit=time_limit)
+
+        # each chunk of output is sent as a line of JSON as soon as it is
+        # produced, followed by a line that describes the exit code and
+        # duration of the command
+        def stream() -> Iterator[str]:
+            try:
+                for chunk in output:
+                    yield json.dumps({'output': chunk}) + '\n'
+                yield json.dumps({'code': output.code,
+                                  'duration': output.duration}) + '\n'
+            except BugZooException as err:
+                logger.exception("failed to stream command: %s", cmd)
+                yield json.dumps(err.to_dict()) + '\n'
+            except Exception as err:
+                logger.exception("failed to stream command: %s", cmd)
+                err = UnexpectedServerError.from_exception(err)
+                yield json.dumps(err.to_dict()) + '\n'
+            finally:
+                # kills the command if the client has disconnected
+                output.close()
+
+        return flask.Response(stream(), mimetype='application/x-ndjson')
+
     response = daemon.containers.command(container,
                                          cmd=cmd,
                                          context=context,
@@ -550,6 +892,26 @@ def exec_container(uid: str):
     return (jsn, 200)
 
 
+@app.route('/containers/<uid>/session', methods=['PUT', 'DELETE'])
+@throws_errors
+def session_container(uid: str):
+    mgr_ctr = daemon.containers  # type: ContainerManager
+    try:
+        container = mgr_ctr[uid]
+    except KeyError:
+        return ContainerNotFound(uid), 404
+
+    if flask.request.method == 'PUT':
+        mgr_ctr.open_session(container)
+        return '', 204
+
+    try:
+        mgr_ctr.close_session(container)
+    except KeyError:
+        return '', 404
+    return '', 204
+
+
 # TODO: deal with race condition
 @app.route('/containers/<uid>', methods=['DELETE'])
 @throws_errors
@@ -575,7 +937,7 @@ def provision_container():
     except KeyError:
         return BugNotFound(bug_uid), 404
 
-    c = daemon.containers.provision(bug)
+    c = daemon.containers.provision(bug, ccache=args.get('ccache', False))
     return (flask.jsonify(c.uid), 201)
 
 
@@ -613,15 +975,90 @@ def deregister_bug(uid: str):
         return UnexpectedServerError.from_exception(ex), 500
 
 
+@app.route('/jobs', methods=['GET'])
+def list_jobs():
+    jsn = [job.to_dict() for job in daemon.jobs]
+    return flask.jsonify(jsn)
+
+
+@app.route('/jobs/<uid>', methods=['GET', 'DELETE'])
+@throws_errors
+def get_job(uid: str):
+    try:
+        if flask.request.method == 'DELETE':
+            del daemon.jobs[uid]
+            return '', 204
+        job = daemon.jobs[uid]
+    except KeyError:
+        return JobNotFound(uid), 404
+    return flask.jsonify(job.to_dict()), 200
+
+
+@app.route('/jobs/<uid>/cancel', methods=['POST'])
+@throws_errors
+def cancel_job(uid: str):
+    try:
+        job = daemon.jobs.cancel(uid)
+    except KeyError:
+        return JobNotFound(uid), 404
+    return flask.jsonify(job.to_dict()), 200
+
+
+@app.route('/jobs/<uid>/result', methods=['GET'])
+@throws_errors
+def get_job_result(uid: str):
+    """
+    Retrieves the result of a finished job. If a `wait` parameter is given,
+    the server waits up to that number of seconds for the job to finish.
+    """
+    wait = flask.request.args.get('wait', default=None, type=float)
+    try:
+        if wait is not None:
+            result = daemon.jobs.wait(uid, timeout=wait)
+        else:
+            result = daemon.jobs.result(uid)
+    except KeyError:
+        return JobNotFound(uid), 404
+    except (JobNotFinished, JobCancelled) as err:
+        return err, 409
+    except BugZooException as err:
+        return err, 500
+    return flask.jsonify(result), 200
+
+
 def run(*,
     port: int = 6060,
     host: str = '0.0.0.0',
     debug: bool = True,
     log_filename: Optional[str] = None,
     log_level: str = 'info',
-    docker_client_api_version: Optional[str] = None
+    docker_client_api_version: Optional[str] = None,
+    server: str = 'flask',
+    threads: int = 16,
+    connection_limit: int = 100,
+    channel_timeout: int = 300,
+    backlog: int = 1024,
+    drain_timeout: float = 30.0
     ) -> None:
+    """
+    Launches a BugZoo server.
+
+    Parameters:
+        server: the HTTP server that should be used to serve requests: either
+            'flask', which uses Flask's development server, or 'waitress',
+            which uses a production-grade, multi-threaded WSGI server that
+            drains in-progress requests upon shutdown (see `wsgi.serve`).
+        threads: the number of threads used by waitress.
+        connection_limit: the maximum number of simultaneous connections
+            accepted by waitress.
+        channel_timeout: the number of seconds after which waitress closes
+            an inactive connection.
+        backlog: the maximum number of pending connections for waitress.
+        drain_timeout: the maximum number of seconds that waitress waits for
+            in-progress requests to complete upon shutdown.
+    """
     global daemon, log_to_file
+    assert server in ('flask', 'waitress')
 
     if not log_filename:
         log_filename = "bugzood.log"
@@ -684,11 +1121,21 @@ def run(*,
         logger.info("launched BugZoo daemon")
         report_resource_limits(logger)
         report_system_resources(logger)
-        app.run(port=port,
-                host=host,
-                debug=debug,
-                threaded=True,
-                use_reloader=False)
+        if server == 'waitress':
+            wsgi.serve(app,
+                       host=host,
+                       port=port,
+                       threads=threads,
+                       connection_limit=connection_limit,
+                       channel_timeout=channel_timeout,
+                       backlog=backlog,
+                       drain_timeout=drain_timeout)
+        else:
+            app.run(port=port,
+                    host=host,
+                    debug=debug,
+                    threaded=True,
+                    use_reloader=False)
     finally:
         if daemon:
             daemon.shutdown()
@@ -724,10 +1171,41 @@ def main() -> None:
     parser.add_argument('--debug',
                         action='store_true',
                         help='enables debugging mode.')
+    parser.add_argument('--server',
+                        type=str,
+                        choices=['flask', 'waitress'],
+                        default='flask',
+                        help='the HTTP server that should be used to serve requests (waitress must be installed to use waitress).')  # noqa: pycodestyle
+    parser.add_argument('--threads',
+                        type=int,
+                        default=16,
+                        help='the number of threads used to serve requests (waitress only).')  # noqa: pycodestyle
+    parser.add_argument('--connection-limit',
+                        type=int,
+                        default=100,
+                        help='the maximum number of simultaneous connections (waitress only).')  # noqa: pycodestyle
+    parser.add_argument('--channel-timeout',
+                        type=int,
+                        default=300,
+                        help='the number of seconds after which inactive connections are closed (waitress only).')  # noqa: pycodestyle
+    parser.add_argument('--backlog',
+                        type=int,
+                        default=1024,
+                        help='the maximum number of pending connections (waitress only).')  # noqa: pycodestyle
+    parser.add_argument('--drain-timeout',
+                        type=float,
+                        default=30.0,
+                        help='the maximum number of seconds to wait for in-progress requests upon shutdown (waitress only).')  # noqa: pycodestyle
     args = parser.parse_args()
     run(port=args.port,
         host=args.host,
         log_filename=args.log_file,
         log_level=args.log_level,
         debug=args.debug,
-        docker_client_api_version=args.docker_client_api_version)
+        docker_client_api_version=args.docker_client_api_version,
+        server=args.server,
+        threads=args.threads,
+        connection_limit=args.connection_limit,
+        channel_timeout=args.channel_timeout,
+        backlog=args.backlog,
+        drain_timeout=args.drain_timeout)
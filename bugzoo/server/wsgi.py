@@ -0,0 +1,171 @@
+"""
+This module serves the BugZoo API via waitress, a production-grade,
+multi-threaded WSGI server, as an alternative to Flask's development server.
+
+All requests are served by a single process, since the state of the server
+(e.g., its running containers) is held in memory. Concurrency is therefore
+provided by a pool of threads, which may be tuned along with the maximum
+number of connections, the time after which idle keep-alive connections are
+closed, and the size of the listen backlog.
+
+Upon receiving SIGTERM (e.g., via `/shutdown`), the server stops accepting
+connections and drains: it waits, for up to a given number of seconds, for
+the requests that are in progress or queued to be completed and for their
+responses to be sent, before it stops. SIGINT stops the server immediately.
+"""
+__all__ = ['serve']
+
+from timeit import default_timer as timer
+import logging
+import os
+import signal
+import threading
+import time
+
+import flask
+
+logger = logging.getLogger(__name__)  # type: logging.Logger
+logger.setLevel(logging.DEBUG)
+
+# the number of seconds between successive checks for in-progress requests
+# whilst draining
+_DRAIN_POLL_INTERVAL = 0.1
+
+
+def _socket_map(server) -> dict:
+    """
+    Returns the map of the listening sockets and connections of a given
+    waitress server. A server that listens on several sockets (e.g., because
+    its host resolves to both an IPv4 and an IPv6 address) is represented by
+    a MultiSocketServer, whose listeners share a single map.
+    """
+    from waitress.server import MultiSocketServer
+
+    if isinstance(server, MultiSocketServer):
+        return server.map
+    return server._map
+
+
+def _listeners(server) -> list:
+    """
+    Returns the listening sockets (i.e., the WSGI servers) that belong to a
+    given waitress server.
+    """
+    from waitress.server import BaseWSGIServer
+
+    return [d for d in list(_socket_map(server).values())
+            if isinstance(d, BaseWSGIServer)]
+
+
+def _stop_accepting(server) -> None:
+    """
+    Stops each of the listening sockets of a given waitress server from
+    accepting new connections.
+    """
+    listeners = _listeners(server)
+    for listener in listeners:
+        listener.accepting = False
+    # wake the main loop, so that it stops listening for connections
+    if listeners:
+        listeners[0].pull_trigger()
+
+
+def _is_idle(server) -> bool:
+    """
+    Determines whether a given waitress server has no requests that are in
+    progress, queued, or waiting for their responses to be sent.
+    """
+    from waitress.channel import HTTPChannel
+
+    dispatcher = server.task_dispatcher
+    if dispatcher.active_count > 0 or dispatcher.queue:
+        return False
+    for channel in list(_socket_map(server).values()):
+        if isinstance(channel, HTTPChannel) \
+           and (channel.requests or channel.total_outbufs_len):
+            return False
+    return True
+
+
+def _drain(server, timeout: float) -> None:
+    """
+    Stops a given waitress server from accepting new connections, waits up
+    to a given number of seconds for it to become idle, and then interrupts
+    the main thread, which stops the server.
+    """
+    logger.info("draining server (timeout: %.1f seconds)", timeout)
+    _stop_accepting(server)
+    time_stop = timer() + timeout
+    while not _is_idle(server):
+        if timer() >= time_stop:
+            logger.warning("stopping server before all requests were completed")  # noqa: pycodestyle
+            break
+        time.sleep(_DRAIN_POLL_INTERVAL)
+    else:
+        logger.info("drained server")
+    os.kill(os.getpid(), signal.SIGINT)
+
+
+def serve(app: flask.Flask,
+          *,
+          host: str,
+          port: int,
+          threads: int = 16,
+          connection_limit: int = 100,
+          channel_timeout: int = 300,
+          backlog: int = 1024,
+          drain_timeout: float = 30.0
+          ) -> None:
+    """
+    Serves a given WSGI application via waitress until the server is stopped
+    by a signal. This function must be called from the main thread.
+
+    No time limit is enforced on the handling of a request: the channel
+    timeout only closes inactive connections, and never closes a connection
+    whose request is still being handled (e.g., a streaming response from
+    `/bugs/<uid>/evaluate`). Long-running requests are instead bounded by
+    the time limits of the commands and tests that they execute.
+
+    Parameters:
+        app: the application.
+        host: the IP address of the host.
+        port: the port that should be used by the server.
+        threads: the number of threads that should be used to serve
+            requests.
+        connection_limit: the maximum number of simultaneous connections.
+            Connections beyond this limit wait in the listen backlog.
+        channel_timeout: the number of seconds after which an inactive
+            connection (e.g., an idle keep-alive connection) is closed.
+            This does not limit the time taken to handle a request.
+        backlog: the maximum number of pending connections.
+        drain_timeout: the maximum number of seconds to wait for in-progress
+            requests to complete upon receiving SIGTERM.
+
+    Raises:
+        ImportError: if waitress is not installed.
+    """
+    import waitress
+
+    server = waitress.create_server(app,
+                                    host=host,
+                                    port=port,
+                                    threads=threads,
+                                    connection_limit=connection_limit,
+                                    channel_timeout=channel_timeout,
+                                    backlog=backlog)
+
+    def on_sigterm(signum, frame) -> None:
+        drain = threading.Thread(target=_drain,
+                                 args=(server, drain_timeout),
+                                 daemon=True)
+        drain.start()
+
+    handler_previous = signal.signal(signal.SIGTERM, on_sigterm)
+    logger.info("serving on %s:%d via waitress with %d threads",
+                host, port, threads)
+    try:
+        server.run()
+    finally:
+        signal.signal(signal.SIGTERM, handler_previous)
+        server.close()
+        logger.info("stopped server")
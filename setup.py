@@ -28,13 +28,20 @@ setup(
         'deprecated~=1.2.6',
         'mypy-extensions>=0.3.0',
         'psutil>=5.0.0',
-        'chardet>=3.0.4'
+        'chardet>=3.0.4',
+        'numpy>=1.17'
     ],
+    extras_require={
+        # the asynchronous client requires Python 3.7 or later
+        'async': ['aiohttp>=3.5'],
+        'server': ['waitress>=1.4']
+    },
     setup_requires=['pytest-runner'],
     tests_require=['pytest'],
     packages=[
         'bugzoo',
         'bugzoo.client',
+        'bugzoo.client.aio',
         'bugzoo.server',
         'bugzoo.mgr',
         'bugzoo.mgr.coverage',
@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+import asyncio
+import json
+import unittest
+
+try:
+    from aiohttp import web
+    from bugzoo.client.aio import AsyncClient
+except ImportError:
+    web = None
+
+from bugzoo.core.container import Container
+from bugzoo.exceptions import ConnectionFailure
+
+# a chunk of output that is longer than the maximum line length of aiohttp
+LONG_CHUNK = 'x' * (2 ** 21)
+
+
+def build_app(state: dict) -> 'web.Application':
+    async def status(request):
+        return web.Response(status=204)
+
+    async def containers(request):
+        return web.json_response(['c1', 'c2'])
+
+    async def execute(request):
+        uid = request.match_info['uid']
+        if uid != 'c1':
+            return web.json_response({'error': {'kind': 'ContainerNotFound',
+                                                'message': uid,
+                                                'data': {'uid': uid}}},
+                                     status=404)
+        if request.query.get('stream') == 'yes':
+            response = web.StreamResponse(
+                headers={'Content-Type': 'application/x-ndjson'})
+            await response.prepare(request)
+            for chunk in ['foo\n', 'bar', '\n', LONG_CHUNK]:
+                line = json.dumps({'output': chunk}) + '\n'
+                await response.write(line.encode('utf-8'))
+            line = json.dumps({'code': 3, 'duration': 0.5}) + '\n'
+            await response.write(line.encode('utf-8'))
+            await response.write_eof()
+            return response
+        state['active'] += 1
+        state['peak'] = max(state['peak'], state['active'])
+        await asyncio.sleep(0.01)
+        state['active'] -= 1
+        jsn = await request.json()
+        return web.json_response({'code': 0,
+                                  'duration': 0.01,
+                                  'output': jsn['command']})
+
+    app = web.Application()
+    app.router.add_get('/status', status)
+    app.router.add_get('/containers', containers)
+    app.router.add_post('/containers/{uid}/exec', execute)
+    return app
+
+
+@unittest.skipIf(web is None, "requires aiohttp")
+class AsyncClientTestCase(unittest.TestCase):
+    def run_with_server(self, test) -> None:
+        async def run():
+            state = {'active': 0, 'peak': 0}
+            runner = web.AppRunner(build_app(state))
+            await runner.setup()
+            site = web.TCPSite(runner, '127.0.0.1', 0)
+            await site.start()
+            port = runner.addresses[0][1]
+            try:
+                await test('http://127.0.0.1:{}'.format(port), state)
+            finally:
+                await runner.cleanup()
+        asyncio.run(run())
+
+    def test_exec(self):
+        async def test(url, state):
+            async with AsyncClient(url, max_concurrency=4) as client:
+                self.assertEqual(await client.containers.uids(), ['c1', 'c2'])
+
+                container = Container(uid='c1', bug='foo', tools=[])
+                commands = ['echo {}'.format(i) for i in range(40)]
+                responses = await asyncio.gather(
+                    *[client.containers.exec(container, cmd)
+                      for cmd in commands])
+                self.assertEqual([r.output for r in responses], commands)
+                self.assertLessEqual(state['peak'], 4)
+
+                missing = Container(uid='c3', bug='foo', tools=[])
+                with self.assertRaises(KeyError):
+                    await client.containers.exec(missing, 'echo')
+        self.run_with_server(test)
+
+    def test_exec_stream(self):
+        async def test(url, state):
+            async with AsyncClient(url) as client:
+                container = Container(uid='c1', bug='foo', tools=[])
+                stream = client.containers.exec_stream(container, 'echo')
+                self.assertIsNone(stream.code)
+                chunks = [chunk async for chunk in stream]
+                self.assertEqual(chunks, ['foo\n', 'bar', '\n', LONG_CHUNK])
+                self.assertEqual(stream.code, 3)
+                self.assertEqual(stream.duration, 0.5)
+
+                missing = Container(uid='c3', bug='foo', tools=[])
+                with self.assertRaises(KeyError):
+                    async for _ in client.containers.exec_stream(missing,
+                                                                 'echo'):
+                        pass
+        self.run_with_server(test)
+
+    def test_connection_failure(self):
+        async def test(url, state):
+            client = AsyncClient(url + '/missing', timeout_connection=1)
+            with self.assertRaises(ConnectionFailure):
+                await client.open()
+        self.run_with_server(test)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+import socket
+import threading
+import unittest
+
+from bugzoo.client.api import APIClient
+from bugzoo.exceptions import ConnectionFailure
+
+
+class ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # send each response in a single write (see handle_one_request)
+    wbufsize = -1
+
+    def do_GET(self) -> None:
+        with self.server.lock:
+            self.server.clients.add(self.client_address)
+        if self.path == '/status':
+            self.send_response(204)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        body = self.path.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+class APIClientTestCase(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.server.lock = threading.Lock()
+        self.server.clients = set()
+        self.thread = threading.Thread(target=self.server.serve_forever,
+                                       kwargs={'poll_interval': 0.05})
+        self.thread.start()
+        port = self.server.server_address[1]
+        self.url = 'http://127.0.0.1:{}'.format(port)
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+
+    def test_keep_alive(self):
+        api = APIClient(self.url, timeout_connection=5)
+        for i in range(20):
+            with api.get('foo/{}'.format(i)) as r:
+                self.assertEqual(r.text, '/foo/{}'.format(i))
+        api.close()
+        # the readiness check and all requests share a single connection
+        self.assertEqual(len(self.server.clients), 1)
+
+    def test_threads(self):
+        api = APIClient(self.url, timeout_connection=5, pool_maxsize=4)
+
+        def fetch(i: int) -> str:
+            with api.get('bar/{}'.format(i)) as r:
+                return r.text
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            texts = list(executor.map(fetch, range(200)))
+        api.close()
+        self.assertEqual(texts, ['/bar/{}'.format(i) for i in range(200)])
+        self.assertLessEqual(len(self.server.clients), 4)
+
+    def test_connection_failure(self):
+        url = 'http://127.0.0.1:{}'.format(free_port())
+        with self.assertRaises(ConnectionFailure):
+            APIClient(url, timeout_connection=1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+#!/usr/bin/env python
+import io
+import tarfile
+import unittest
+
+from bugzoo.mgr import archive
+from bugzoo.mgr.container import _only_missing_files
+
+
+class ArchiveTestCase(unittest.TestCase):
+    def test_pack(self):
+        data = archive.pack({'foo.c': b'int x;\n',
+                             '/src/run.sh': (b'#!/bin/sh\n', 0o755)},
+                            uid=1000, gid=1001)
+        with tarfile.open(fileobj=io.BytesIO(data), mode='r:') as tar:
+            members = {m.name: m for m in tar}
+            self.assertEqual(set(members), {'foo.c', 'src/run.sh'})
+            self.assertEqual(members['foo.c'].mode, 0o644)
+            self.assertEqual(members['src/run.sh'].mode, 0o755)
+            self.assertEqual(members['foo.c'].uid, 1000)
+            self.assertEqual(members['foo.c'].gid, 1001)
+            self.assertEqual(tar.extractfile('foo.c').read(), b'int x;\n')
+
+    def test_unpack(self):
+        data = archive.pack({'src/foo.c': b'abc', 'src/bar.c': (b'', 0o600)})
+        chunks = [data[i:i + 100] for i in range(0, len(data), 100)]
+        files = archive.unpack(chunks, strip='src/')
+        self.assertEqual(files, {'foo.c': (b'abc', 0o644),
+                                 'bar.c': (b'', 0o600)})
+
+        self.assertEqual(archive.unpack([]), {})
+
+
+class ReadFailureTestCase(unittest.TestCase):
+    def test_only_missing_files(self):
+        missing = ("tar: src/foo.c: Cannot stat: No such file or directory\n"
+                   "tar: Exiting with failure status due to previous errors\n")
+        self.assertTrue(_only_missing_files(0, ''))
+        self.assertTrue(_only_missing_files(2, missing))
+
+        # failures for any other reason are errors
+        denied = "tar: src/foo.c: Cannot open: Permission denied\n"
+        self.assertFalse(_only_missing_files(2, missing + denied))
+        self.assertFalse(_only_missing_files(2, ''))
+        self.assertFalse(_only_missing_files(126, 'exec: "tar": executable '
+                                                  'file not found in $PATH'))
+
+
+if __name__ == '__main__':
+    unittest.main()
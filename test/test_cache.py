@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+import tempfile
+import unittest
+
+from bugzoo.cmd import ExecResponse
+from bugzoo.core.container import Container
+from bugzoo.core.test import TestCase, TestCaseOracle, TestOutcome
+from bugzoo.mgr.cache import FileCache, TestOutcomeCache
+
+
+def build_container(uid: str, bug: str = 'foo') -> Container:
+    return Container(uid=uid, bug=bug, tools=[])
+
+
+class FileCacheTestCase(unittest.TestCase):
+    def test_stamps(self):
+        cache = FileCache()
+        c1 = build_container('c1')
+        c2 = build_container('c2')
+
+        cache.put(c1, '/src/foo.c', 'int x;', '1:6:a')
+        self.assertEqual(cache.get(c1, '/src/foo.c', '1:6:a'), 'int x;')
+
+        # contents are private to each container, even if unmodified
+        self.assertIsNone(cache.get(c2, '/src/foo.c', '1:6:a'))
+
+        # contents are discarded once the file has changed
+        self.assertIsNone(cache.get(c1, '/src/foo.c', '2:6:b'))
+        self.assertIsNone(cache.get(c1, '/src/foo.c', '1:6:a'))
+        self.assertEqual(len(cache), 0)
+
+        # files without a stamp are never cached
+        cache.put(c1, '/src/bar.c', 'int y;', None)
+        self.assertIsNone(cache.get(c1, '/src/bar.c', None))
+        self.assertEqual(len(cache), 0)
+
+        cache.put(c1, '/src/foo.c', 'int y;', '2:6:b')
+        cache.put(c2, '/src/foo.c', 'int x;', '3:6:a')
+        cache.invalidate(c1)
+        self.assertIsNone(cache.get(c1, '/src/foo.c', '2:6:b'))
+        self.assertEqual(cache.get(c2, '/src/foo.c', '3:6:a'), 'int x;')
+        cache.forget(c2.uid)
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.size, 0)
+        self.assertEqual(cache.hits, 2)
+        self.assertEqual(cache.misses, 5)
+
+    def test_lru_eviction(self):
+        cache = FileCache(max_size=10)
+        c = build_container('c1')
+        cache.put(c, 'a', 'aaaa', 'a')
+        cache.put(c, 'b', 'bbbb', 'b')
+        self.assertEqual(cache.get(c, 'a', 'a'), 'aaaa')
+        cache.put(c, 'c', 'cccc', 'c')
+        self.assertIsNone(cache.get(c, 'b', 'b'))
+        self.assertEqual(cache.get(c, 'a', 'a'), 'aaaa')
+        self.assertEqual(cache.get(c, 'c', 'c'), 'cccc')
+        self.assertEqual(cache.size, 8)
+
+        # contents that exceed the budget are never cached
+        cache.put(c, 'd', 'd' * 11, 'd')
+        self.assertIsNone(cache.get(c, 'd', 'd'))
+        self.assertEqual(cache.size, 8)
+
+
+class TestOutcomeCacheTestCase(unittest.TestCase):
+    def test_persistence(self):
+        test = TestCase('p1', 10, './test.sh p1', '/', True, TestCaseOracle())
+        test_slow = TestCase('p1', 20, './test.sh p1', '/', True,
+                             TestCaseOracle())
+        outcome = TestOutcome(ExecResponse(0, 1.5, 'ok'), True)
+        key = TestOutcomeCache.key('sha256:abc', 'state', test)
+        self.assertNotEqual(key,
+                            TestOutcomeCache.key('sha256:abc', 'other', test))
+        self.assertNotEqual(key,
+                            TestOutcomeCache.key('sha256:abc', 'state',
+                                                 test_slow))
+
+        with tempfile.TemporaryDirectory() as dir_cache:
+            cache = TestOutcomeCache(dir_cache)
+            self.assertIsNone(cache.get(key))
+            cache.put(key, outcome)
+            self.assertEqual(cache.get(key), outcome)
+
+            # outcomes persist across instances
+            cache = TestOutcomeCache(dir_cache)
+            self.assertEqual(cache.get(key).to_dict(), outcome.to_dict())
+            self.assertEqual(cache.stats(),
+                             {'hits': 1, 'misses': 0, 'hit-ratio': 1.0})
+
+
+if __name__ == '__main__':
+    unittest.main()
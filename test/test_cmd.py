@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+import unittest
+
+from bugzoo.cmd import ExecStream, PendingExecResponse
+
+
+class FakeDockerAPI(object):
+    def __init__(self, running: bool, code: int) -> None:
+        self.running = running
+        self.code = code
+        # the number of inspections after which the exec stops running
+        self.running_for = None
+
+    def exec_inspect(self, uid):
+        assert uid == 'exec'
+        if self.running_for is not None:
+            self.running = self.running_for > 0
+            self.running_for -= 1
+        return {'Running': self.running, 'ExitCode': self.code}
+
+
+class PendingExecResponseTestCase(unittest.TestCase):
+    def test_exit_code(self):
+        api = FakeDockerAPI(running=True, code=0)
+        pending = PendingExecResponse({'Id': 'exec'}, iter([]), api_docker=api)
+        self.assertTrue(pending.running)
+        self.assertIsNone(pending.exit_code)
+        api.running = False
+        api.code = 2
+        self.assertEqual(pending.exit_code, 2)
+
+    def test_wait(self):
+        # docker may report that the exec is running after its output closes
+        api = FakeDockerAPI(running=True, code=3)
+        api.running_for = 2
+        pending = PendingExecResponse({'Id': 'exec'}, iter([]), api_docker=api)
+        self.assertEqual(pending.wait(), 3)
+
+    def test_chunks(self):
+        # the snowman (U+2603) is split across two chunks
+        output = iter([b'hello \xe2', b'\x98\x83\n', b'', b'bye\xff'])
+        pending = PendingExecResponse({'Id': 'exec'},
+                                      output,
+                                      api_docker=FakeDockerAPI(False, 0))
+        self.assertEqual(list(pending.chunks()),
+                         ['hello ', '☃\n', 'bye\\xff'])
+
+
+class ExecStreamTestCase(unittest.TestCase):
+    def test_stream(self):
+        stream = ExecStream(iter(['a', 'b']), lambda: (1, 0.25))
+        self.assertFalse(stream.finished)
+        self.assertIsNone(stream.code)
+        self.assertEqual(list(stream), ['a', 'b'])
+        self.assertTrue(stream.finished)
+        self.assertEqual(stream.code, 1)
+        self.assertEqual(stream.duration, 0.25)
+        self.assertEqual(list(stream), [])
+
+    def test_abort(self):
+        aborted = []
+        stream = ExecStream(iter(['a', 'b']),
+                            lambda: (0, 0.1),
+                            lambda: aborted.append(True))
+        chunks = iter(stream)
+        self.assertEqual(next(chunks), 'a')
+        chunks.close()
+        self.assertEqual(aborted, [True])
+        self.assertFalse(stream.finished)
+
+        # exhausted streams are not aborted
+        stream = ExecStream(iter(['a']),
+                            lambda: (0, 0.1),
+                            lambda: aborted.append(True))
+        self.assertEqual(list(stream), ['a'])
+        stream.close()
+        self.assertEqual(aborted, [True])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,562 @@
+#!/usr/bin/env python
+import io
+import os
+import re
+import shlex
+import subprocess
+import tarfile
+import unittest
+
+from bugzoo.cmd import ExecResponse
+from bugzoo.compiler import CompilationOutcome
+from bugzoo.core.container import Container
+from bugzoo.core.patch import Patch
+from bugzoo.mgr import archive
+from bugzoo.mgr.container import ContainerManager
+from bugzoo.util import dedent
+
+
+class FakeDockerAPI(object):
+    """Simulates the file system of a single container."""
+    def __init__(self) -> None:
+        self.files = {'/src/foo.c': (b'int x;\n', 0o644)}
+        self.execs = []
+        self.codes = {}
+        # the number of files that rm can delete before it fails
+        self.rm_limit = None
+
+    def ping(self):
+        return True
+
+    def exec_create(self, container, cmd, **kwargs):
+        self.execs.append(cmd)
+        return {'Id': len(self.execs) - 1}
+
+    def exec_start(self, exec_id, stream=False, demux=False):
+        cmd = self.execs[exec_id]
+        if demux and cmd[0] == 'sh':
+            # reads files together with their stamps
+            names = cmd[4:]
+            files = {name: self.files['/' + name] for name in names
+                     if '/' + name in self.files}
+            stamps = ['stamp:{}\n'.format(len(files[name][0]))
+                      if name in files else 'stamp:\n' for name in names]
+            return (archive.pack(files), ''.join(stamps).encode())
+        if demux:
+            assert cmd[0] == 'tar'
+            names = cmd[cmd.index('--') + 1:]
+            files = {name: self.files['/' + name] for name in names
+                     if '/' + name in self.files}
+            return (archive.pack(files), b'')
+        m = re.search(r"find (\S+) -type f \\\( (.+) \\\)'$", cmd)
+        if m:
+            endings = re.findall(r"-name \\\*(\S+)", m.group(2))
+            return iter([path.encode() + b'\n'
+                         for path in sorted(self.files)
+                         if path.startswith(m.group(1) + '/')
+                         and path.endswith(tuple(endings))])
+        m = re.search(r"rm -f (.+)'$", cmd)
+        if m:
+            for (i, path) in enumerate(m.group(1).split()):
+                if self.rm_limit is not None and i >= self.rm_limit:
+                    self.codes[exec_id] = 1
+                    return iter([b'rm: cannot remove file\n'])
+                self.files.pop(path, None)
+        return iter([])
+
+    def exec_inspect(self, exec_id):
+        return {'ExitCode': self.codes.get(exec_id, 0)}
+
+    def logs(self, container, stream=False):
+        return iter([b'BUGZOO IS READY TO GO!\n'])
+
+    def put_archive(self, container, dirname, data):
+        with tarfile.open(fileobj=io.BytesIO(data), mode='r:') as tar:
+            for member in tar:
+                contents = tar.extractfile(member).read()
+                path = os.path.join(dirname, member.name)
+                self.files[path] = (contents, member.mode)
+        return True
+
+
+class ProcessDockerAPI(FakeDockerAPI):
+    """Executes streamed commands as local processes."""
+    def __init__(self) -> None:
+        super().__init__()
+        self.processes = {}
+
+    def exec_start(self, exec_id, stream=False, demux=False):
+        cmd = self.execs[exec_id]
+        if isinstance(cmd, list):
+            subprocess.run(cmd, check=True)
+            return b''
+        cmd = cmd.replace('source /.environment', 'true')
+        # as with a TTY, each exec leads its own session
+        proc = subprocess.Popen(shlex.split(cmd),
+                                stdout=subprocess.PIPE,
+                                stderr=subprocess.STDOUT,
+                                start_new_session=True)
+        self.processes[exec_id] = proc
+        return iter(proc.stdout.readline, b'')
+
+    def exec_inspect(self, exec_id):
+        proc = self.processes[exec_id]
+        code = proc.poll()
+        return {'Running': code is None, 'ExitCode': code, 'Pid': proc.pid}
+
+
+class FakeDockerContainers(object):
+    def __init__(self) -> None:
+        self.created = []
+
+    def create(self, image, command, **kwargs):
+        self.created.append((image, command, kwargs))
+        return FakeDockerContainer()
+
+
+class FakeDocker(object):
+    def __init__(self) -> None:
+        self.api = FakeDockerAPI()
+        self.containers = FakeDockerContainers()
+
+
+class FakeCompiler(object):
+    def __init__(self) -> None:
+        self.builds = []
+        self.code = 0
+
+    def __build(self, kind):
+        self.builds.append(kind)
+        return CompilationOutcome(ExecResponse(self.code, 0.1, ''))
+
+    def clean(self, mgr, container, verbose=False):
+        pass
+
+    def compile(self, mgr, container, verbose=False):
+        return self.__build('plain')
+
+    def compile_with_coverage_instrumentation(self,
+                                              mgr,
+                                              container,
+                                              verbose=False):
+        return self.__build('instrumented')
+
+
+class FakeTest(object):
+    name = 't1'
+    command = './run t1'
+    context = '/src'
+    time_limit = 10
+    kill_after = 1
+
+    class oracle(object):
+        @staticmethod
+        def check(response):
+            return response.code == 0
+
+
+class FakeDockerContainer(object):
+    id = 'docker-c1'
+    status = 'running'
+    attrs = {'Image': 'sha256:image'}
+
+    def start(self):
+        pass
+
+    def exec_run(self, cmd):
+        assert cmd == 'mktemp' or cmd.startswith('rm ')
+        return (0, b'/tmp/tmp.patch\n' if cmd == 'mktemp' else b'')
+
+
+class FakeBug(object):
+    name = 'foo'
+    image = 'bugzoo/foo'
+    source_dir = '/src'
+
+    def __init__(self) -> None:
+        self.compiler = FakeCompiler()
+
+
+class FakeInstallation(object):
+    outcomes_path = None
+
+    def __init__(self) -> None:
+        self.docker = FakeDocker()
+        self.bugs = {'foo': FakeBug()}
+
+
+class ContainerManagerTestCase(unittest.TestCase):
+    def setUp(self):
+        installation = FakeInstallation()
+        self.mgr = ContainerManager(installation)
+        self.docker = installation.docker
+        self.api = installation.docker.api
+        self.compiler = installation.bugs['foo'].compiler
+        self.container = Container(uid='c1', bug='foo', tools=[])
+        # avoid having to determine the default user inside the container
+        self.mgr._ContainerManager__owners['c1'] = (0, 0)
+        self.mgr._ContainerManager__dockerc['c1'] = FakeDockerContainer()
+
+
+class ReadTestCase(ContainerManagerTestCase):
+    def test_read_with_stamps(self):
+        contents, stamps = self.mgr.read_many_bytes_with_stamps(
+            self.container, ['/src/foo.c', '/src/missing.c'])
+        self.assertEqual(contents, {'/src/foo.c': b'int x;\n',
+                                    '/src/missing.c': None})
+        self.assertEqual(stamps, {'/src/foo.c': '7',
+                                  '/src/missing.c': None})
+        self.assertEqual(len(self.api.execs), 1)
+
+
+class ProvisionTestCase(ContainerManagerTestCase):
+    def test_ccache_environment(self):
+        bug = FakeBug()
+        self.mgr.provision(bug, uid='c2', ccache=True)
+        (_, _, kwargs) = self.docker.containers.created[-1]
+        volumes = kwargs['volumes']
+        fn_env = next(fn for (fn, v) in volumes.items()
+                      if v['bind'] == '/.environment.host')
+        self.assertIn('/.ccache', [v['bind'] for v in volumes.values()])
+
+        # only exported variables survive into /.environment
+        script = 'source {} && env'.format(fn_env)
+        output = subprocess.check_output(['/bin/bash', '-c', script],
+                                         env={'PATH': '/usr/bin:/bin'})
+        env = dict(line.split('=', 1)
+                   for line in output.decode('utf-8').splitlines())
+        self.assertEqual(env['CCACHE_DIR'], '/.ccache')
+        self.assertEqual(env['CCACHE_BASEDIR'], '/src')
+        self.assertEqual(env['CCACHE_UMASK'], '002')
+        self.assertTrue(env['PATH'].startswith('/usr/lib/ccache:'))
+
+
+class CompileTestCase(ContainerManagerTestCase):
+
+    def test_skip_unchanged(self):
+        mgr, container = self.mgr, self.container
+        first = mgr.build(container)
+        self.assertTrue(first.successful)
+        self.assertIs(mgr.build(container), first)
+        self.assertEqual(self.compiler.builds, ['plain'])
+
+        mgr.build_with_instrumentation(container)
+        mgr.build_with_instrumentation(container)
+        self.assertEqual(self.compiler.builds, ['plain', 'instrumented'])
+
+    def test_rebuild_after_write(self):
+        mgr, container = self.mgr, self.container
+        mgr.build(container)
+        mgr.write_bytes(container, '/src/foo.c', b'int y;\n')
+        mgr.build(container)
+        mgr.build(container)
+        self.assertEqual(self.compiler.builds, ['plain', 'plain'])
+
+        # restoring the original contents restores the original state
+        mgr.write_bytes(container, '/src/foo.c', b'int x;\n')
+        mgr.build(container)
+        self.assertEqual(self.compiler.builds, ['plain', 'plain', 'plain'])
+
+        # changes outside the source directory are ignored
+        mgr.write_bytes(container, '/tmp/bar.txt', b'bar')
+        mgr.build(container)
+        self.assertEqual(len(self.compiler.builds), 3)
+
+    def test_rebuild_after_failure(self):
+        mgr, container = self.mgr, self.container
+        self.compiler.code = 1
+        self.assertFalse(mgr.build(container).successful)
+        self.compiler.code = 0
+        self.assertTrue(mgr.build(container).successful)
+        mgr.build(container)
+        self.assertEqual(self.compiler.builds, ['plain', 'plain'])
+
+    def test_force(self):
+        mgr, container = self.mgr, self.container
+        mgr.build(container)
+        mgr.build(container, force=True)
+        self.assertEqual(self.compiler.builds, ['plain', 'plain'])
+
+    def test_switch_kind(self):
+        mgr, container = self.mgr, self.container
+        mgr.build(container)
+        mgr.build_with_instrumentation(container)
+        mgr.build(container)
+        self.assertEqual(self.compiler.builds,
+                         ['plain', 'instrumented', 'plain'])
+
+    def test_command_in_source_dir(self):
+        mgr, container = self.mgr, self.container
+        mgr.build(container)
+        state = mgr.state_hash(container)
+
+        # commands that are known not to modify the program are ignored
+        mgr.command(container, 'ls', context='/src', modifies_source=False)
+        mgr.command(container, 'ls', context='/tmp')
+        self.assertEqual(mgr.state_hash(container), state)
+        mgr.build(container)
+        self.assertEqual(len(self.compiler.builds), 1)
+
+        mgr.command(container, 'touch foo.c', context='/src')
+        self.assertNotEqual(mgr.state_hash(container), state)
+        mgr.build(container)
+        mgr.build(container)
+        self.assertEqual(len(self.compiler.builds), 2)
+
+        # the default context is assumed to modify the program
+        mgr.command(container, 'make clean')
+        mgr.build(container)
+        self.assertEqual(len(self.compiler.builds), 3)
+
+
+
+class FakeSession(object):
+    def __init__(self, busy: bool) -> None:
+        self.busy = busy
+        self.commands = []
+
+    def try_execute(self, command, context, **kwargs):
+        if self.busy:
+            return None
+        self.commands.append(command)
+        return ExecResponse(0, 0.1, 'session')
+
+
+class CommandStreamTestCase(unittest.TestCase):
+    def setUp(self):
+        installation = FakeInstallation()
+        installation.docker.api = ProcessDockerAPI()
+        self.api = installation.docker.api
+        self.mgr = ContainerManager(installation)
+        self.container = Container(uid='c1', bug='foo', tools=[])
+
+    def tearDown(self):
+        for proc in self.api.processes.values():
+            if proc.poll() is None:
+                os.killpg(proc.pid, 9)
+            proc.communicate()
+
+    def stream(self, cmd: str):
+        return self.mgr.command_stream(self.container,
+                                       cmd,
+                                       context='/tmp',
+                                       modifies_source=False)
+
+    def test_stream(self):
+        stream = self.stream('echo hello && echo world && exit 3')
+        self.assertEqual(''.join(stream), 'hello\nworld\n')
+        self.assertEqual(stream.code, 3)
+
+    def test_abort(self):
+        # the command spawns a child that would keep its output open
+        stream = self.stream('echo started && sleep 60 && echo finished')
+        chunks = iter(stream)
+        self.assertEqual(next(chunks), 'started\n')
+        (proc,) = self.api.processes.values()
+        self.assertIsNone(proc.poll())
+        chunks.close()
+        (output, _) = proc.communicate(timeout=10)
+        self.assertEqual(proc.returncode, -9)
+        self.assertEqual(output, b'')
+        self.assertFalse(stream.finished)
+
+
+class SessionTestCase(ContainerManagerTestCase):
+    def test_session(self):
+        mgr, container = self.mgr, self.container
+        session = FakeSession(busy=False)
+        mgr._ContainerManager__sessions['c1'] = session
+        self.assertEqual(mgr.command(container, 'ls').output, 'session')
+        self.assertEqual(session.commands, ['ls'])
+        self.assertEqual(self.api.execs, [])
+
+    def test_busy_fallback(self):
+        mgr, container = self.mgr, self.container
+        mgr._ContainerManager__sessions['c1'] = FakeSession(busy=True)
+        response = mgr.command(container, 'ls')
+        self.assertEqual(response.code, 0)
+        self.assertEqual(len(self.api.execs), 1)
+        self.assertIn('ls', self.api.execs[0])
+
+
+class OutcomeCacheTestCase(ContainerManagerTestCase):
+    def num_tests(self) -> int:
+        return sum('./run t1' in cmd for cmd in self.api.execs
+                   if isinstance(cmd, str))
+
+    def test_requires_build(self):
+        mgr, container, test = self.mgr, self.container, FakeTest()
+
+        # outcomes are not cached until the program has been compiled
+        mgr.execute(container, test, cache=True)
+        mgr.execute(container, test, cache=True)
+        self.assertEqual(self.num_tests(), 2)
+        self.assertEqual(mgr.outcome_cache.stats()['misses'], 0)
+
+        mgr.build(container)
+        mgr.execute(container, test, cache=True)
+        mgr.execute(container, test, cache=True)
+        self.assertEqual(self.num_tests(), 3)
+
+        # nor are they used once the program has been changed
+        mgr.write_bytes(container, '/src/foo.c', b'int y;\n')
+        mgr.execute(container, test, cache=True)
+        self.assertEqual(self.num_tests(), 4)
+        self.assertEqual(mgr.outcome_cache.stats(),
+                         {'hits': 1, 'misses': 1, 'hit-ratio': 0.5})
+
+
+class SourceIndexTestCase(ContainerManagerTestCase):
+    def num_finds(self) -> int:
+        return sum('find /src' in cmd for cmd in self.api.execs
+                   if isinstance(cmd, str))
+
+    def test_index(self):
+        mgr, container = self.mgr, self.container
+        self.api.files['/src/README.md'] = (b'', 0o644)
+        self.api.files['/src/lib/util.h'] = (b'', 0o644)
+        index = mgr.source_index(container)
+        self.assertEqual(index.files, frozenset({'foo.c', 'lib/util.h'}))
+        self.assertIs(mgr.source_index(container), index)
+        self.assertEqual(self.num_finds(), 1)
+
+    def test_invalidate(self):
+        mgr, container = self.mgr, self.container
+        mgr.source_index(container)
+        mgr.write_bytes(container, '/src/bar.c', b'int a;\n')
+        self.assertIn('bar.c', mgr.source_index(container))
+        self.assertEqual(self.num_finds(), 2)
+
+        diff = """
+        --- bar.c
+        +++ /dev/null
+        @@ -1 +0,0 @@
+        -int a;
+        """
+        patch = Patch.from_unidiff(dedent(diff)[1:])
+        self.assertTrue(mgr.patch(container, patch, in_process=True))
+        self.assertNotIn('bar.c', mgr.source_index(container))
+        self.assertEqual(self.num_finds(), 3)
+
+
+class ResetTestCase(ContainerManagerTestCase):
+    def test_reset(self):
+        mgr, container = self.mgr, self.container
+        self.api.files['/src/bar.c'] = (b'int a;\n', 0o755)
+        files = dict(self.api.files)
+        state = mgr.state_hash(container)
+
+        mgr.write_bytes(container, '/src/foo.c', b'int y;\n')
+        mgr.write_many_bytes(container, {'/src/bar.c': (b'int b;\n', 0o644),
+                                         '/src/new.c': b'int c;\n'})
+        mgr.write_bytes(container, '/src/foo.c', b'int z;\n')
+        self.assertNotEqual(self.api.files, files)
+
+        mgr.reset(container)
+        self.assertEqual(self.api.files, files)
+        self.assertEqual(mgr.state_hash(container), state)
+
+        # nothing is done if the container is unchanged
+        num_execs = len(self.api.execs)
+        mgr.reset(container)
+        self.assertEqual(len(self.api.execs), num_execs)
+
+    def test_reset_patch(self):
+        mgr, container = self.mgr, self.container
+        files = dict(self.api.files)
+        diff = """
+        --- foo.c
+        +++ foo.c
+        @@ -1 +1 @@
+        -int x;
+        +int y;
+        --- /dev/null
+        +++ new.c
+        @@ -0,0 +1 @@
+        +int c;
+        """
+        patch = Patch.from_unidiff(dedent(diff)[1:])
+        self.assertTrue(mgr.patch(container, patch, in_process=True))
+        self.assertIn('/src/new.c', self.api.files)
+
+        mgr.reset(container)
+        self.assertEqual(self.api.files, files)
+
+    def test_failed_reset(self):
+        mgr, container = self.mgr, self.container
+        files = dict(self.api.files)
+        state = mgr.state_hash(container)
+        mgr.write_bytes(container, '/src/foo.c', b'int y;\n')
+
+        def fail(container, dirname, data):
+            raise OSError("connection reset")
+
+        put_archive = self.api.put_archive
+        self.api.put_archive = fail
+        with self.assertRaises(OSError):
+            mgr.reset(container)
+        self.assertNotEqual(mgr.state_hash(container), state)
+
+        # the original contents are kept until the reset succeeds
+        self.api.put_archive = put_archive
+        mgr.reset(container)
+        self.assertEqual(self.api.files, files)
+        self.assertEqual(mgr.state_hash(container), state)
+
+
+class PatchTestCase(ContainerManagerTestCase):
+    DIFF = """
+    --- foo.c
+    +++ foo.c
+    @@ -1 +1 @@
+    -int x;
+    +int y;
+    --- bar.c
+    +++ /dev/null
+    @@ -1 +0,0 @@
+    -int a;
+    --- baz.c
+    +++ /dev/null
+    @@ -1 +0,0 @@
+    -int b;
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.api.files['/src/bar.c'] = (b'int a;\n', 0o644)
+        self.api.files['/src/baz.c'] = (b'int b;\n', 0o600)
+        self.patch = Patch.from_unidiff(dedent(self.DIFF)[1:])
+
+    def test_patch_in_process(self):
+        mgr, container = self.mgr, self.container
+        state = mgr.state_hash(container)
+        self.assertTrue(mgr.patch(container, self.patch, in_process=True))
+        self.assertEqual(self.api.files, {'/src/foo.c': (b'int y;\n', 0o644)})
+        self.assertNotEqual(mgr.state_hash(container), state)
+
+    def test_patch(self):
+        mgr, container = self.mgr, self.container
+        self.assertTrue(mgr.patch(container, self.patch))
+        self.assertIn('patch --ignore-whitespace -p0 < "/tmp/tmp.patch"',
+                      self.api.execs[-1])
+
+        # only the patched files are read and recorded in the undo log
+        reads = [cmd for cmd in self.api.execs if cmd[0] == 'tar']
+        self.assertEqual(reads, [['tar', '-C', '/', '-chf', '-', '--',
+                                  'src/bar.c', 'src/baz.c', 'src/foo.c']])
+        num_execs = len(self.api.execs)
+        mgr.reset(container)
+        self.assertEqual(len(self.api.execs), num_execs)
+
+    def test_failed_deletion(self):
+        mgr, container = self.mgr, self.container
+        files = dict(self.api.files)
+        state = mgr.state_hash(container)
+        self.api.rm_limit = 1
+        self.assertFalse(mgr.patch(container, self.patch, in_process=True))
+        self.assertEqual(self.api.files, files)
+        self.assertEqual(mgr.state_hash(container), state)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+import os
+import shutil
+import struct
+import tempfile
+import unittest
+
+import yaml
+
+from bugzoo.cmd import ExecResponse
+from bugzoo.core import coverage as cov
+from bugzoo.core.covfile import CoverageFileReader, is_coverage_file, \
+    read_coverage_file, write_coverage_file
+from bugzoo.core.fileline import FileLineSet
+from bugzoo.core.test import TestOutcome as Outcome
+
+
+def build_coverage() -> cov.TestSuiteCoverage:
+    def build(name, passed, lines):
+        outcome = Outcome(ExecResponse(0 if passed else 1, 0.5, 'out'), passed)
+        return cov.TestCoverage(name, outcome, FileLineSet(lines))
+    return cov.TestSuiteCoverage({
+        'p1': build('p1', True, {'src/foo.c': [1, 2, 3, 7, 100, 101]}),
+        'n1': build('n1', False, {'src/foo.c': [2], 'bar.c': [0, 5, 6]}),
+        'empty': build('empty', True, {})})
+
+
+class CoverageFileTestCase(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_round_trip(self):
+        fn = os.path.join(self.dir, 'bug.coverage')
+        expected = build_coverage()
+        write_coverage_file(expected, fn)
+        self.assertTrue(is_coverage_file(fn))
+
+        actual = read_coverage_file(fn)
+        self.assertEqual(list(actual), ['empty', 'n1', 'p1'])
+        self.assertEqual(actual.to_dict(), expected.to_dict())
+        self.assertEqual(actual['p1'].lines.lines('src/foo.c'),
+                         [1, 2, 3, 7, 100, 101])
+        self.assertFalse(actual['n1'].outcome.passed)
+        self.assertEqual(len(actual.failing), 1)
+        with self.assertRaises(KeyError):
+            actual['missing']
+
+    def test_close(self):
+        fn = os.path.join(self.dir, 'bug.coverage')
+        write_coverage_file(build_coverage(), fn)
+        with read_coverage_file(fn) as coverage:
+            lines = coverage['p1'].lines
+        # previously decoded coverage remains accessible
+        self.assertEqual(coverage['p1'].lines, lines)
+        with self.assertRaises(ValueError):
+            coverage['n1']
+
+        reader = CoverageFileReader(fn)
+        self.assertFalse(reader.closed)
+        reader.close()
+        reader.close()
+        self.assertTrue(reader.closed)
+
+        # closing a report that is held in memory has no effect
+        with build_coverage() as coverage:
+            pass
+        self.assertEqual(len(coverage['p1'].lines), 6)
+
+    def test_truncated(self):
+        fn = os.path.join(self.dir, 'bug.coverage')
+        write_coverage_file(build_coverage(), fn)
+        with open(fn, 'rb') as f:
+            data = f.read()
+        for size in (0, 10, len(data) // 2, len(data) - 1):
+            with open(fn, 'wb') as f:
+                f.write(data[:size])
+            with self.assertRaises((ValueError, struct.error)):
+                read_coverage_file(fn)
+
+    def test_from_file_detects_format(self):
+        expected = build_coverage()
+        fn_yml = os.path.join(self.dir, 'bug.coverage.yml')
+        with open(fn_yml, 'w') as f:
+            yaml.dump(expected.to_dict(), f, default_flow_style=False)
+        self.assertFalse(is_coverage_file(fn_yml))
+        from_yml = cov.TestSuiteCoverage.from_file(fn_yml)
+
+        fn_bin = os.path.join(self.dir, 'bug.coverage')
+        from_yml.to_file(fn_bin)
+        from_bin = cov.TestSuiteCoverage.from_file(fn_bin)
+        self.assertEqual(from_bin.to_dict(), expected.to_dict())
+
+    def test_rejects_other_files(self):
+        fn = os.path.join(self.dir, 'junk')
+        with open(fn, 'wb') as f:
+            f.write(b'BZCOV\x00\x63\x00' + b'\x00' * 32)
+        with self.assertRaises(ValueError):
+            CoverageFileReader(fn)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+from typing import Optional
+import threading
+import unittest
+
+from bugzoo.cmd import ExecResponse
+from bugzoo.compiler import CompilationOutcome
+from bugzoo.core.candidate import CandidateOutcome
+from bugzoo.core.container import Container
+from bugzoo.core.patch import Patch
+from bugzoo.core.test import TestCase, TestCaseOracle, TestOutcome
+from bugzoo.mgr.evaluate import PatchEvaluator
+
+
+def build_patch(old: str, new: str) -> Patch:
+    diff = "--- foo.c\n+++ foo.c\n@@ -1,1 +1,1 @@\n-{}\n+{}\n"
+    return Patch.from_unidiff(diff.format(old, new))
+
+
+def build_test(name: str) -> TestCase:
+    return TestCase(name, 10, './test.sh {}'.format(name), '/', True,
+                    TestCaseOracle())
+
+
+class FakeBug(object):
+    name = 'fake:bug'
+    tests = [build_test('t1'), build_test('t2'), build_test('t3')]
+
+
+class FakeContainerManager(object):
+    """
+    Simulates a program whose patches replace the contents of a single line.
+    Candidates that write "broken" fail to compile, and candidates that
+    write "failN" fail test tN.
+    """
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.num_provisioned = 0
+        self.destroyed = []
+        self.contents = {}
+        self.ccache = []
+        # if given, each provision waits until the barrier has been reached
+        # by the given number of provisions
+        self.barrier = None  # type: Optional[threading.Barrier]
+
+    def provision(self, bug, ccache=False) -> Container:
+        if self.barrier:
+            self.barrier.wait(5)
+        with self.lock:
+            self.num_provisioned += 1
+            self.ccache.append(ccache)
+            uid = 'c{}'.format(self.num_provisioned)
+        self.contents[uid] = 'ok'
+        return Container(uid=uid, bug=bug.name, tools=[])
+
+    def __delitem__(self, uid: str) -> None:
+        with self.lock:
+            self.destroyed.append(uid)
+
+    def reset(self, container) -> None:
+        self.contents[container.uid] = 'ok'
+
+    def patch(self, container, patch, in_process=False) -> bool:
+        try:
+            patched = patch.apply({'foo.c': self.contents[container.uid]})
+        except Exception:
+            return False
+        self.contents[container.uid] = patched['foo.c'].strip()
+        return True
+
+    def compile(self, container) -> CompilationOutcome:
+        code = 1 if self.contents[container.uid] == 'broken' else 0
+        return CompilationOutcome(ExecResponse(code, 0.1, ''))
+
+    def execute(self, container, test, cache=False) -> TestOutcome:
+        passed = self.contents[container.uid] != 'fail' + test.name[1:]
+        return TestOutcome(ExecResponse(0 if passed else 1, 0.1, ''), passed)
+
+
+class FakeInstallation(object):
+    def __init__(self) -> None:
+        self.containers = FakeContainerManager()
+
+
+class PatchEvaluatorTestCase(unittest.TestCase):
+    def test_evaluate(self):
+        installation = FakeInstallation()
+        # ensure that both workers are busy at once
+        installation.containers.barrier = threading.Barrier(2)
+        patches = [build_patch('ok', 'fixed'),
+                   build_patch('missing', 'fixed'),
+                   build_patch('ok', 'broken'),
+                   build_patch('ok', 'fail2')]
+        evaluator = PatchEvaluator(installation, FakeBug(), workers=2)
+        outcomes = {o.index: o for o in evaluator.evaluate(patches)}
+
+        self.assertEqual(set(outcomes), {0, 1, 2, 3})
+        self.assertTrue(outcomes[0].successful)
+        self.assertEqual(list(outcomes[0].tests), ['t1', 't2', 't3'])
+        self.assertFalse(outcomes[1].applied)
+        self.assertIsNone(outcomes[1].build)
+        self.assertTrue(outcomes[2].applied)
+        self.assertFalse(outcomes[2].compiled)
+        self.assertEqual(outcomes[2].tests, {})
+        self.assertTrue(outcomes[3].compiled)
+        self.assertFalse(outcomes[3].successful)
+        self.assertEqual(list(outcomes[3].tests), ['t1', 't2'])
+
+        # each worker provisions a single container, which is reused across
+        # candidates and destroyed afterwards
+        mgr_ctr = installation.containers
+        self.assertEqual(mgr_ctr.num_provisioned, 2)
+        self.assertEqual(sorted(mgr_ctr.destroyed), ['c1', 'c2'])
+
+        # outcomes can be serialised
+        for outcome in outcomes.values():
+            d = outcome.to_dict()
+            self.assertEqual(CandidateOutcome.from_dict(d).to_dict(), d)
+
+    def test_evaluate_with_ccache(self):
+        installation = FakeInstallation()
+        patches = [build_patch('ok', 'fixed'), build_patch('ok', 'fail1')]
+        evaluator = PatchEvaluator(installation, FakeBug(), ccache=True)
+        outcomes = list(evaluator.evaluate(patches))
+        self.assertEqual(len(outcomes), 2)
+        self.assertEqual(installation.containers.ccache, [True])
+
+
+if __name__ == '__main__':
+    unittest.main()
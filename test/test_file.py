@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+import unittest
+from unittest import mock
+
+import chardet
+
+from bugzoo.core.container import Container
+from bugzoo.exceptions import FileNotFound
+from bugzoo.mgr import file as mgr_file
+from bugzoo.mgr.cache import FileCache
+from bugzoo.mgr.file import FileManager
+
+
+class FakeBug(object):
+    source_dir = '/src'
+
+
+class FakeContainerManager(object):
+    """Holds the contents and stamps of the files of a single container."""
+    def __init__(self) -> None:
+        self.file_cache = FileCache()
+        self.files = {}
+        self.num_reads = 0
+        self.num_stamps = 0
+
+    def file_stamps(self, container, paths):
+        paths = list(paths)
+        if paths:
+            self.num_stamps += 1
+        return {p: self.files[p][0] if p in self.files else None
+                for p in paths}
+
+    def read_many_bytes_with_stamps(self, container, paths):
+        self.num_reads += 1
+        return ({p: self.files[p][1] if p in self.files else None
+                 for p in paths},
+                {p: self.files[p][0] if p in self.files else None
+                 for p in paths})
+
+    def write_bytes(self, container, path, contents):
+        self.files[path] = (None, contents)
+
+
+class DecodeTestCase(unittest.TestCase):
+    def test_decode(self):
+        files = FileManager(None, None)
+        c1 = Container(uid='c1', bug='foo', tools=[])
+        c2 = Container(uid='c2', bug='foo', tools=[])
+
+        with mock.patch.object(mgr_file.chardet, 'detect',
+                               wraps=chardet.detect) as detect:
+            self.assertEqual(files._decode(c1, '/src/a.c', b''), '')
+            self.assertEqual(files._decode(c1, '/src/a.c', b'int x;\n'),
+                             'int x;\n')
+            self.assertEqual(files._decode(c1, '/src/a.c',
+                                           'é'.encode('utf-8')),
+                             'é')
+            # ASCII and UTF-8 contents are decoded without detection
+            self.assertEqual(detect.call_count, 0)
+
+            text = 'Ce fichier a été écrit en français.\n' * 2000
+            blob = text.encode('latin-1')
+            self.assertEqual(files._decode(c1, '/src/b.c', blob), text)
+            self.assertEqual(detect.call_count, 1)
+            # only a bounded prefix of the contents is inspected
+            (prefix,), _ = detect.call_args
+            self.assertLess(len(prefix), len(blob))
+            self.assertEqual(prefix, blob[:mgr_file._DETECT_PREFIX_SIZE])
+
+            # the detected encoding is reused for other containers of the bug
+            self.assertEqual(files._decode(c2, '/src/b.c', blob), text)
+            self.assertEqual(files._decode(c1, '/src/b.c', blob), text)
+            self.assertEqual(detect.call_count, 1)
+
+
+class CacheTestCase(unittest.TestCase):
+    def test_stamps(self):
+        mgr_ctr = FakeContainerManager()
+        files = FileManager({'foo': FakeBug()}, mgr_ctr)
+        c1 = Container(uid='c1', bug='foo', tools=[])
+        mgr_ctr.files['/src/a.c'] = ('1', b'int x;')
+
+        # stamps are obtained when files are read, rather than separately
+        self.assertEqual(files.read(c1, 'a.c'), 'int x;')
+        self.assertEqual(mgr_ctr.num_stamps, 0)
+        self.assertEqual(files.read(c1, '/src/a.c'), 'int x;')
+        self.assertEqual(mgr_ctr.num_reads, 1)
+        self.assertEqual(mgr_ctr.num_stamps, 1)
+
+        # changes made behind the back of the file manager (e.g., by a
+        # command) are detected via the stamp of the file
+        mgr_ctr.files['/src/a.c'] = ('2', b'int y;')
+        self.assertEqual(files.read_many(c1, ['a.c', 'b.c']),
+                         {'a.c': 'int y;', 'b.c': None})
+        self.assertEqual(files.read(c1, 'a.c'), 'int y;')
+        self.assertEqual(mgr_ctr.num_reads, 2)
+        with self.assertRaises(FileNotFound):
+            files.read(c1, 'b.c')
+
+    def test_unstamped(self):
+        # files whose stamps are unknown are not cached
+        mgr_ctr = FakeContainerManager()
+        files = FileManager({'foo': FakeBug()}, mgr_ctr)
+        c1 = Container(uid='c1', bug='foo', tools=[])
+        files.write(c1, 'a.c', 'int x;')
+        self.assertEqual(mgr_ctr.num_stamps, 0)
+        self.assertEqual(files.read(c1, 'a.c'), 'int x;')
+        self.assertEqual(files.read(c1, 'a.c'), 'int x;')
+        self.assertEqual(mgr_ctr.num_reads, 2)
+        self.assertEqual(mgr_ctr.num_stamps, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+#!/usr/bin/env python
+import unittest
+
+from bugzoo.core.fileline import FileLine, FileLineSet
+
+
+class FileLineSetTestCase(unittest.TestCase):
+    def test_contents(self):
+        lines = FileLineSet({'foo.c': [1, 3, 200], 'bar.c': {5}, 'baz.c': []})
+        self.assertEqual(len(lines), 4)
+        self.assertEqual(sorted(lines.files), ['bar.c', 'foo.c'])
+        self.assertEqual(lines.lines('foo.c'), [1, 3, 200])
+        self.assertEqual(lines.lines('qux.c'), [])
+        self.assertIn(FileLine('foo.c', 200), lines)
+        self.assertNotIn(FileLine('foo.c', 2), lines)
+        self.assertNotIn(FileLine('qux.c', 1), lines)
+        self.assertEqual(set(lines),
+                         {FileLine('foo.c', 1), FileLine('foo.c', 3),
+                          FileLine('foo.c', 200), FileLine('bar.c', 5)})
+        self.assertEqual(lines.to_dict(), {'foo.c': [1, 3, 200],
+                                           'bar.c': [5]})
+        self.assertEqual(FileLineSet.from_dict(lines.to_dict()), lines)
+
+    def test_union(self):
+        x = FileLineSet({'foo.c': [1, 2]})
+        y = FileLineSet({'foo.c': [2, 3], 'bar.c': [1]})
+        expected = FileLineSet({'foo.c': [1, 2, 3], 'bar.c': [1]})
+        self.assertEqual(x.union(y), expected)
+        self.assertEqual(x | y, expected)
+        self.assertEqual(x.union([FileLine('bar.c', 1)], y), expected)
+
+    def test_intersection(self):
+        x = FileLineSet({'foo.c': [1, 2], 'bar.c': [4]})
+        y = FileLineSet({'foo.c': [2, 3], 'baz.c': [4]})
+        expected = FileLineSet({'foo.c': [2]})
+        self.assertEqual(x.intersection(y), expected)
+        self.assertEqual(x & y, expected)
+        self.assertEqual(len(x.intersection(y, FileLineSet())), 0)
+
+    def test_restricted_to_files(self):
+        x = FileLineSet({'foo.c': [1, 2], 'bar.c': [4]})
+        self.assertEqual(x.restricted_to_files(['bar.c', 'qux.c']),
+                         FileLineSet({'bar.c': [4]}))
+
+    def test_repr(self):
+        x = FileLineSet({'foo.c': [1, 2, 3, 7]})
+        self.assertEqual(repr(x), 'foo.c: 1..3; 7')
+
+
+if __name__ == '__main__':
+    unittest.main()
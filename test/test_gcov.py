@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+import io
+import unittest
+
+from bugzoo.mgr.coverage.gcov import _read_gcovr_report
+from bugzoo.mgr.coverage.gcov_json import _read_gcov_json
+from bugzoo.mgr.coverage.index import SourceFileIndex
+
+REPORT = b"""<?xml version="1.0" ?>
+<coverage line-rate="0.5">
+  <packages>
+    <package name="src">
+      <classes>
+        <class filename="build/src/foo.c" name="foo_c">
+          <methods>
+            <method name="main">
+              <lines>
+                <line hits="1" number="99"/>
+              </lines>
+            </method>
+          </methods>
+          <lines>
+            <line hits="1" number="1"/>
+            <line hits="0" number="2"/>
+            <line hits="3" number="4"/>
+          </lines>
+        </class>
+        <class filename="src/unused.c" name="unused_c">
+          <lines>
+            <line hits="0" number="1"/>
+          </lines>
+        </class>
+      </classes>
+    </package>
+    <package name="lib">
+      <classes>
+        <class filename="lib/bar.h" name="bar_h">
+          <lines>
+            <line hits="2" number="7"/>
+          </lines>
+        </class>
+      </classes>
+    </package>
+  </packages>
+</coverage>
+"""
+
+
+class GcovrReportTestCase(unittest.TestCase):
+    def test_read_report(self):
+        report = list(_read_gcovr_report(io.BytesIO(REPORT)))
+        self.assertEqual(report, [('build/src/foo.c', {1, 4}),
+                                  ('lib/bar.h', {7})])
+
+
+GCOV_JSON = """{"format_version": "1", "current_working_directory": "/experiment/source/build", "files": [{"file": "../src/foo.c", "lines": [{"line_number": 2, "count": 1}, {"line_number": 3, "count": 0}]}, {"file": "/usr/include/stdio.h", "lines": [{"line_number": 10, "count": 4}]}]}
+{"format_version": "1", "current_working_directory": "/experiment/source", "files": [{"file": "lib/bar.h", "lines": [{"line_number": 7, "count": 0}]}]}
+"""
+
+
+class GcovJSONTestCase(unittest.TestCase):
+    def test_read_output(self):
+        report = list(_read_gcov_json(GCOV_JSON, '/experiment/source'))
+        self.assertEqual(report, [('/experiment/source/src/foo.c', {2})])
+
+    def test_read_output_with_diagnostics(self):
+        output = "foo.gcno:version '408*', prefer 'B33*'\r\n" + GCOV_JSON
+        report = list(_read_gcov_json(output, '/experiment/source'))
+        self.assertEqual(report, [('/experiment/source/src/foo.c', {2})])
+
+
+class SourceFileIndexTestCase(unittest.TestCase):
+    def test_resolve(self):
+        index = SourceFileIndex('/experiment/source',
+                                ['/experiment/source/src/foo.c',
+                                 '/experiment/source/lib/bar.h',
+                                 ''])
+        self.assertEqual(len(index), 2)
+        self.assertIn('src/foo.c', index)
+        self.assertEqual(index.resolve('build/src/foo.c'), 'src/foo.c')
+        self.assertEqual(index.resolve('src/foo.c'), 'src/foo.c')
+        self.assertEqual(index.resolve('/experiment/source/lib/bar.h'),
+                         'lib/bar.h')
+        self.assertIsNone(index.resolve('src/missing.c'))
+
+
+if __name__ == '__main__':
+    unittest.main()
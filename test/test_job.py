@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+import threading
+import unittest
+
+from bugzoo.core import JobStatus
+from bugzoo.mgr.job import JobManager
+from bugzoo.exceptions import JobCancelled, JobNotFinished, \
+    FailedToComputeCoverage
+
+
+class JobManagerTestCase(unittest.TestCase):
+    def setUp(self):
+        self.jobs = JobManager(workers=1, max_finished=2)
+
+    def tearDown(self):
+        self.jobs.shutdown()
+
+    def test_success(self):
+        job = self.jobs.submit('add', lambda handle: 1 + 2)
+        self.assertEqual(job.kind, 'add')
+        self.assertEqual(self.jobs.wait(job.uid, timeout=5), 3)
+        job = self.jobs[job.uid]
+        self.assertEqual(job.status, JobStatus.SUCCEEDED)
+        self.assertEqual(job.progress, 1.0)
+        self.assertEqual(self.jobs.result(job.uid), 3)
+
+    def test_failure(self):
+        def fail(handle):
+            raise FailedToComputeCoverage("no coverage")
+        job = self.jobs.submit('coverage', fail)
+        with self.assertRaises(FailedToComputeCoverage):
+            self.jobs.wait(job.uid, timeout=5)
+        job = self.jobs[job.uid]
+        self.assertEqual(job.status, JobStatus.FAILED)
+        self.assertEqual(job.error['kind'], 'FailedToComputeCoverage')
+
+    def test_cancel(self):
+        started = threading.Event()
+        release = threading.Event()
+
+        def block(handle):
+            started.set()
+            release.wait(5)
+            handle.report(0.5)
+            return 'finished'
+
+        running = self.jobs.submit('block', block)
+        queued = self.jobs.submit('block', block)
+        self.assertTrue(started.wait(5))
+
+        # queued jobs are cancelled immediately
+        job = self.jobs.cancel(queued.uid)
+        self.assertEqual(job.status, JobStatus.CANCELLED)
+        with self.assertRaises(JobCancelled):
+            self.jobs.result(queued.uid)
+
+        # running jobs are cancelled at their next cancellation point
+        job = self.jobs.cancel(running.uid)
+        self.assertEqual(job.status, JobStatus.RUNNING)
+        with self.assertRaises(JobNotFinished):
+            self.jobs.wait(running.uid, timeout=0.05)
+        release.set()
+        with self.assertRaises(JobCancelled):
+            self.jobs.wait(running.uid, timeout=5)
+        self.assertEqual(self.jobs[running.uid].status, JobStatus.CANCELLED)
+
+    def test_prune(self):
+        uids = [self.jobs.submit('noop', lambda handle: None).uid
+                for _ in range(3)]
+        self.jobs.wait(uids[-1], timeout=5)
+        self.assertEqual([j.uid for j in self.jobs], uids[1:])
+        with self.assertRaises(KeyError):
+            self.jobs[uids[0]]
+
+        del self.jobs[uids[1]]
+        self.assertEqual([j.uid for j in self.jobs], uids[2:])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,8 @@
 #!/usr/bin/env python
 import unittest
 import bugzoo
-from bugzoo.patch import Hunk, FilePatch, Patch
+from bugzoo.core.patch import Hunk, FilePatch, Patch
+from bugzoo.exceptions import FailedToApplyPatch
 from bugzoo.util import dedent
 
 
@@ -99,7 +100,7 @@ class PatchTestCase(unittest.TestCase):
         from_s = dedent(from_s)[1:-1]
         lines = from_s.split('\n')
         expected_s = \
-            '\n'.join(lines[3:8] + lines[10:])
+            '\n'.join(lines[3:8] + lines[10:] + [''])
 
         patch = Patch.from_unidiff(from_s)
         self.assertEqual(str(patch), expected_s)
@@ -145,11 +146,109 @@ class PatchTestCase(unittest.TestCase):
         from_s = dedent(from_s)[1:-1]
         lines = from_s.split('\n')
         expected_s = \
-            '\n'.join(lines[2:22] + lines[24:])
+            '\n'.join(lines[2:22] + lines[24:] + [''])
 
         patch = Patch.from_unidiff(from_s)
         self.assertEqual(str(patch), expected_s)
 
+    def test_from_unidiff_uses_hunk_lengths(self):
+        from_s = """
+        --- a.txt
+        +++ a.txt
+        @@ -1,2 +1,1 @@
+        --- removed
+         kept
+        --- b.txt
+        +++ b.txt
+        @@ -1,1 +1,1 @@
+        -old
+        +new
+        """
+        from_s = dedent(from_s)[1:]
+        patch = Patch.from_unidiff(from_s)
+        self.assertEqual(patch.files, ['a.txt', 'b.txt'])
+        self.assertEqual(str(patch), from_s)
+
+
+class ApplyTestCase(unittest.TestCase):
+    def test_apply(self):
+        diff = """
+        --- foo.c
+        +++ foo.c
+        @@ -2,4 +2,4 @@
+         int foo(int x) {
+        -  return x;
+        +  return x + 1;
+         }
+         int w;
+        @@ -10,3 +10,4 @@
+         int bar(int y) {
+           return y;
+        +  // unreachable
+         }
+        """
+        patch = Patch.from_unidiff(dedent(diff)[1:])
+
+        # hunks are located despite an offset and differences in whitespace
+        original = dedent("""
+        #include <stdio.h>
+        #include <stdlib.h>
+        int  foo(int x) {
+          return x;
+        }
+        int w;
+        int x;
+        int y;
+        int z;
+        int bar(int y) {\t
+          return y;
+        }
+        """)
+        expected = dedent("""
+        #include <stdio.h>
+        #include <stdlib.h>
+        int  foo(int x) {
+          return x + 1;
+        }
+        int w;
+        int x;
+        int y;
+        int z;
+        int bar(int y) {\t
+          return y;
+          // unreachable
+        }
+        """)
+        self.assertEqual(patch.apply({'foo.c': original}),
+                         {'foo.c': expected})
+
+        # no files are changed if any hunk fails to apply
+        broken = original.replace('return x;', 'return w;')
+        with self.assertRaises(FailedToApplyPatch):
+            patch.apply({'foo.c': broken})
+        with self.assertRaises(FailedToApplyPatch):
+            patch.apply({'foo.c': None})
+
+    def test_create_and_delete(self):
+        diff = """
+        diff new.txt
+        --- /dev/null
+        +++ new.txt
+        @@ -0,0 +1,2 @@
+        +one
+        +two
+        diff old.txt
+        --- old.txt
+        +++ /dev/null
+        @@ -1 +0,0 @@
+        -gone
+        """
+        patch = Patch.from_unidiff(dedent(diff)[1:])
+        self.assertEqual([fp.filename for fp in patch.file_patches],
+                         ['new.txt', 'old.txt'])
+        patched = patch.apply({'new.txt': None, 'old.txt': 'gone\n'})
+        self.assertEqual(patched, {'new.txt': 'one\ntwo\n', 'old.txt': None})
+
 
 if __name__ == '__main__':
     unittest.main()
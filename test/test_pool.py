@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+import threading
+import time
+import unittest
+
+from bugzoo.core.container import Container
+from bugzoo.mgr.pool import ContainerPool
+
+
+class FakeBug(object):
+    name = 'fake:bug'
+
+
+class ContainerPoolTestCase(unittest.TestCase):
+    def setUp(self):
+        self.lock = threading.Lock()
+        self.num_created = 0
+        self.destroyed = []
+
+    def provision(self) -> Container:
+        with self.lock:
+            self.num_created += 1
+            uid = 'c{}'.format(self.num_created)
+        return Container(uid=uid, bug=FakeBug.name, tools=[])
+
+    def destroy(self, container: Container) -> None:
+        with self.lock:
+            self.destroyed.append(container.uid)
+
+    def wait_for(self, predicate, timeout: float = 5.0) -> None:
+        time_stop = time.time() + timeout
+        while not predicate():
+            self.assertLess(time.time(), time_stop, "timed out")
+            time.sleep(0.01)
+
+    def test_refill_and_take(self):
+        pool = ContainerPool(FakeBug(), self.provision, self.destroy,
+                             min_size=2, max_size=3, check_interval=0.01)
+        try:
+            self.wait_for(lambda: len(pool) == 2)
+            container = pool.take()
+            self.assertEqual(container.bug, FakeBug.name)
+            self.wait_for(lambda: len(pool) == 2)
+        finally:
+            pool.close()
+        self.assertEqual(len(pool), 0)
+        self.assertEqual(len(self.destroyed), 2)
+        self.assertNotIn(container.uid, self.destroyed)
+
+    def test_grows_on_demand_and_evicts_idle(self):
+        pool = ContainerPool(FakeBug(), self.provision, self.destroy,
+                             min_size=0, max_size=2, idle_timeout=0.2,
+                             check_interval=0.01)
+        try:
+            self.assertIsNone(pool.take())
+            self.wait_for(lambda: len(pool) == 1)
+            self.wait_for(lambda: len(pool) == 0)
+            self.assertEqual(self.destroyed, ['c1'])
+        finally:
+            pool.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+import threading
+import time
+import unittest
+from unittest import mock
+
+from bugzoo.cmd import ExecResponse
+from bugzoo.core.container import Container
+from bugzoo.core.fileline import FileLineSet
+from bugzoo.core.test import TestCase, TestCaseOracle, TestOutcome
+from bugzoo.mgr.coverage import CoverageExtractor
+from bugzoo.mgr.scheduler import TestScheduler
+
+
+def build_test(name: str) -> TestCase:
+    return TestCase(name, 10, './test.sh {}'.format(name), '/', True,
+                    TestCaseOracle())
+
+
+class FakeContainerManager(object):
+    """Records the container in which each test is executed."""
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.busy = set()
+        self.executed = []
+
+    def execute(self, container, test, verbose=False) -> TestOutcome:
+        with self.lock:
+            assert container.uid not in self.busy, "container already busy"
+            self.busy.add(container.uid)
+        try:
+            # later tests finish sooner
+            time.sleep(0.05 / int(test.name[1:]))
+            if test.name == 't3':
+                raise ValueError("failed to execute test")
+            with self.lock:
+                self.executed.append((container.uid, test.name))
+            return TestOutcome(ExecResponse(0, 0.1, test.name), True)
+        finally:
+            with self.lock:
+                self.busy.remove(container.uid)
+
+
+class FakeExtractor(object):
+    def __init__(self, container) -> None:
+        self.container = container
+        self.prepared = False
+        self.cleaned = False
+
+    def prepare(self) -> None:
+        self.prepared = True
+
+    def extract(self) -> FileLineSet:
+        return FileLineSet({'foo.c': [1, 2]})
+
+    def cleanup(self) -> None:
+        self.cleaned = True
+
+
+class FakeInstallation(object):
+    def __init__(self) -> None:
+        self.containers = FakeContainerManager()
+
+
+class TestSchedulerTestCase(unittest.TestCase):
+    def setUp(self):
+        self.installation = FakeInstallation()
+        self.fleet = [Container(uid='c{}'.format(i), bug='fake:bug', tools=[])
+                      for i in range(1, 3)]
+        self.scheduler = TestScheduler(self.installation, self.fleet)
+        self.extractors = {}
+
+    def build_extractor(self, installation, container) -> FakeExtractor:
+        extractor = FakeExtractor(container)
+        self.extractors[container.uid] = extractor
+        return extractor
+
+    def test_order(self):
+        tests = [build_test('t1'), build_test('t2'), build_test('t4')]
+        outcomes = self.scheduler.execute(tests)
+        self.assertEqual([o.response.output for o in outcomes],
+                         ['t1', 't2', 't4'])
+
+    def test_sharding(self):
+        tests = [build_test('t{}'.format(i)) for i in (1, 2, 4, 5, 6, 7)]
+        self.scheduler.execute(tests)
+        executed = self.installation.containers.executed
+        self.assertEqual(sorted(name for (_, name) in executed),
+                         sorted(t.name for t in tests))
+        self.assertEqual(set(uid for (uid, _) in executed), {'c1', 'c2'})
+
+    def test_error(self):
+        tests = [build_test('t1'), build_test('t3'), build_test('t4')]
+        with self.assertRaises(ValueError):
+            self.scheduler.execute(tests)
+
+    def test_coverage(self):
+        tests = [build_test('t1'), build_test('t2')]
+        with mock.patch.object(CoverageExtractor, 'build',
+                               self.build_extractor):
+            coverage = self.scheduler.coverage(tests)
+        self.assertEqual(set(coverage), {'t1', 't2'})
+        for extractor in self.extractors.values():
+            self.assertTrue(extractor.prepared)
+            self.assertTrue(extractor.cleaned)
+
+    def test_coverage_cleanup(self):
+        # containers are cleaned up if a test fails to execute, but only if
+        # they were instrumented by the scheduler
+        tests = [build_test('t1'), build_test('t3')]
+        for instrument in (True, False):
+            with mock.patch.object(CoverageExtractor, 'build',
+                                   self.build_extractor):
+                with self.assertRaises(ValueError):
+                    self.scheduler.coverage(tests, instrument=instrument)
+            for extractor in self.extractors.values():
+                self.assertEqual(extractor.prepared, instrument)
+                self.assertEqual(extractor.cleaned, instrument)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,179 @@
+#!/usr/bin/env python
+import unittest
+
+from collections import OrderedDict
+import json
+
+import bugzoo.server
+from bugzoo.cmd import ExecResponse
+from bugzoo.core import test
+from bugzoo.core.container import Container
+from bugzoo.core.fileline import FileLine
+from bugzoo.mgr import cache
+
+
+def build_test(name: str) -> test.TestCase:
+    return test.TestCase(name, 10, './test.sh {}'.format(name), '/', True,
+                         test.TestCaseOracle())
+
+
+class FakeBug(object):
+    name = 'fake:bug'
+    image = 'fake/bug'
+    tests = OrderedDict((name, build_test(name)) for name in ('t1', 't2'))
+
+
+class FakeBugManager(object):
+    def __init__(self) -> None:
+        self.installed = True
+        self.calls = []
+
+    def __getitem__(self, name: str) -> FakeBug:
+        if name != FakeBug.name:
+            raise KeyError(name)
+        return FakeBug()
+
+    def is_installed(self, bug) -> bool:
+        return self.installed
+
+    def localize(self, bug, formula, limit=None, files=None):
+        return [(FileLine('foo.c', 3), float('inf')),
+                (FileLine('foo.c', 1), 0.5)]
+
+    def test(self, bug, tests=None, containers=None, workers=1):
+        self.calls.append((tests, containers, workers))
+        if tests is None:
+            tests = bug.tests.values()
+        return OrderedDict(
+            (t.name, test.TestOutcome(ExecResponse(0, 0.1, t.name), True))
+            for t in tests)
+
+
+class FakeContainerManager(object):
+    def __init__(self) -> None:
+        self.outcome_cache = cache.TestOutcomeCache()
+        self.containers = {
+            'c1': Container(uid='c1', bug=FakeBug.name, tools=[]),
+            'c2': Container(uid='c2', bug='other:bug', tools=[])}
+        self.pools = {}
+        self.patches = []
+
+    def __getitem__(self, uid: str) -> Container:
+        return self.containers[uid]
+
+    def patch(self, container, patch, in_process=False) -> bool:
+        self.patches.append((container.uid, in_process))
+        return True
+
+    def create_pool(self, bug, **kwargs) -> None:
+        self.pools[bug.name] = kwargs
+
+
+class FakeDaemon(object):
+    def __init__(self) -> None:
+        self.bugs = FakeBugManager()
+        self.containers = FakeContainerManager()
+
+
+class ServerTestCase(unittest.TestCase):
+    def setUp(self):
+        self.daemon = FakeDaemon()
+        bugzoo.server.daemon = self.daemon
+        self.client = bugzoo.server.app.test_client()
+
+    def tearDown(self):
+        bugzoo.server.daemon = None
+
+    def test_outcome_cache_stats(self):
+        self.daemon.containers.outcome_cache.get('missing')
+        r = self.client.get('/cache/outcomes/stats')
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(r.get_json(),
+                         {'hits': 0, 'misses': 1, 'hit-ratio': 0.0})
+
+    def test_bug_tests(self):
+        calls = self.daemon.bugs.calls
+        r = self.client.post('/bugs/fake:bug/test', json={'workers': 2})
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual([o['test'] for o in r.get_json()], ['t1', 't2'])
+        self.assertEqual(calls.pop(), (None, None, 2))
+
+        r = self.client.post('/bugs/fake:bug/test',
+                             json={'tests': ['t2'], 'containers': ['c1']})
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(r.get_json()[0]['outcome']['passed'], True)
+        tests, containers, workers = calls.pop()
+        self.assertEqual([t.name for t in tests], ['t2'])
+        self.assertEqual([c.uid for c in containers], ['c1'])
+        self.assertEqual(workers, 1)
+
+    def test_bug_tests_errors(self):
+        def post(uid, jsn):
+            r = self.client.post('/bugs/{}/test'.format(uid), json=jsn)
+            return r.status_code, r.get_json()['error']['kind']
+
+        self.assertEqual(post('missing', {}), (404, 'BugNotFound'))
+        self.assertEqual(post('fake:bug', {'workers': 0}),
+                         (400, 'ArgumentNotSpecified'))
+        self.assertEqual(post('fake:bug', {'tests': ['t3']}),
+                         (404, 'TestNotFound'))
+        self.assertEqual(post('fake:bug', {'containers': ['c2']}),
+                         (404, 'ContainerNotFound'))
+        self.daemon.bugs.installed = False
+        self.assertEqual(post('fake:bug', {}), (400, 'ImageNotInstalled'))
+        self.assertEqual(self.daemon.bugs.calls, [])
+
+    def test_localize_infinite_score(self):
+        def reject(constant):
+            raise ValueError("non-standard JSON: {}".format(constant))
+
+        r = self.client.get('/bugs/fake:bug/localize?formula=dstar')
+        self.assertEqual(r.status_code, 200)
+        jsn = json.loads(r.get_data(as_text=True), parse_constant=reject)
+        self.assertEqual(jsn, [{'line': 'foo.c:3', 'score': 'inf'},
+                               {'line': 'foo.c:1', 'score': 0.5}])
+
+    def test_patch_container(self):
+        diff = '--- foo.c\n+++ foo.c\n@@ -1 +1 @@\n-int x;\n+int y;\n'
+        for (query, in_process) in [('', False), ('?in-process=yes', True)]:
+            r = self.client.patch('/containers/c1' + query, data=diff)
+            self.assertEqual(r.status_code, 204)
+            self.assertEqual(self.daemon.containers.patches.pop(),
+                             ('c1', in_process))
+
+    def test_pool(self):
+        pools = self.daemon.containers.pools
+        r = self.client.put('/bugs/fake:bug/pool', json={'min-size': 2})
+        self.assertEqual(r.status_code, 204)
+        self.assertEqual(pools['fake:bug'], {'min_size': 2,
+                                             'max_size': 4,
+                                             'idle_timeout': 300.0})
+
+        r = self.client.put('/bugs/fake:bug/pool',
+                            json={'min-size': 0, 'max-size': 1,
+                                  'idle-timeout': 5})
+        self.assertEqual(r.status_code, 204)
+        self.assertEqual(pools['fake:bug'], {'min_size': 0,
+                                             'max_size': 1,
+                                             'idle_timeout': 5})
+
+    def test_pool_invalid(self):
+        invalid = [('min-size', {'min-size': -1}),
+                   ('min-size', {'min-size': 'two'}),
+                   ('min-size', {'min-size': 1.5}),
+                   ('max-size', {'max-size': 0}),
+                   ('max-size', {'min-size': 3, 'max-size': 2}),
+                   ('max-size', {'max-size': True}),
+                   ('idle-timeout', {'idle-timeout': 0}),
+                   ('idle-timeout', {'idle-timeout': None})]
+        for (argument, jsn) in invalid:
+            r = self.client.put('/bugs/fake:bug/pool', json=jsn)
+            self.assertEqual(r.status_code, 400, jsn)
+            err = r.get_json()['error']
+            self.assertEqual(err['kind'], 'ArgumentNotSpecified')
+            self.assertEqual(err['data']['argument'], argument)
+        self.assertEqual(self.daemon.containers.pools, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
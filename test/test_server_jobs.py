@@ -0,0 +1,146 @@
+#!/usr/bin/env python
+import threading
+import time
+import unittest
+
+import bugzoo.server
+from bugzoo.core.container import Container
+from bugzoo.mgr.job import JobManager
+
+
+class FakeBug(object):
+    name = 'fake:bug'
+    image = 'fake/bug'
+
+
+class FakeBugManager(object):
+    def __init__(self) -> None:
+        self.steps = threading.Semaphore(0)
+
+    def __getitem__(self, name: str) -> FakeBug:
+        if name != FakeBug.name:
+            raise KeyError(name)
+        return FakeBug()
+
+    def is_installed(self, bug) -> bool:
+        return True
+
+    def coverage(self, bug, job=None):
+        # reports progress after each of three "tests"
+        for i in range(1, 4):
+            self.steps.acquire()
+            job.report(i / 3)
+        raise AssertionError("expected the job to be cancelled")
+
+
+class FakeContainerManager(object):
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.provisioned = []
+        self.destroyed = []
+        self.release = threading.Event()
+
+    def provision(self, bug, tools=None, ccache=False) -> Container:
+        self.release.wait(5)
+        with self.lock:
+            uid = 'c{}'.format(len(self.provisioned) + 1)
+            self.provisioned.append(uid)
+        return Container(uid=uid, bug=bug.name, tools=[])
+
+    def __delitem__(self, uid: str) -> None:
+        with self.lock:
+            self.destroyed.append(uid)
+
+
+class FakeDaemon(object):
+    def __init__(self) -> None:
+        self.bugs = FakeBugManager()
+        self.containers = FakeContainerManager()
+        self.jobs = JobManager(workers=2, max_finished=2)
+
+
+def wait_until(condition, timeout: float = 5.0) -> None:
+    time_stop = time.time() + timeout
+    while not condition():
+        assert time.time() < time_stop, "timed out"
+        time.sleep(0.01)
+
+
+class ServerJobsTestCase(unittest.TestCase):
+    def setUp(self):
+        self.daemon = FakeDaemon()
+        bugzoo.server.daemon = self.daemon
+        self.client = bugzoo.server.app.test_client()
+
+    def tearDown(self):
+        self.daemon.containers.release.set()
+        for _ in range(3):
+            self.daemon.bugs.steps.release()
+        self.daemon.jobs.shutdown()
+        bugzoo.server.daemon = None
+
+    def status(self, uid: str) -> dict:
+        r = self.client.get('/jobs/{}'.format(uid))
+        self.assertEqual(r.status_code, 200)
+        return r.get_json()
+
+    def provision(self) -> str:
+        r = self.client.post('/bugs/fake:bug/provision?async=yes', json={})
+        self.assertEqual(r.status_code, 202)
+        return r.get_json()['uid']
+
+    def test_progress_and_cancel(self):
+        r = self.client.get('/bugs/fake:bug/coverage?async=yes')
+        self.assertEqual(r.status_code, 202)
+        uid = r.get_json()['uid']
+        self.assertEqual(r.headers['Location'].split('/')[-1], uid)
+
+        self.daemon.bugs.steps.release()
+        wait_until(lambda: self.status(uid)['progress'] is not None)
+        self.assertAlmostEqual(self.status(uid)['progress'], 1 / 3)
+
+        r = self.client.post('/jobs/{}/cancel'.format(uid))
+        self.assertEqual(r.get_json()['status'], 'running')
+        self.daemon.bugs.steps.release()
+        r = self.client.get('/jobs/{}/result?wait=5'.format(uid))
+        self.assertEqual(r.status_code, 409)
+        self.assertEqual(r.get_json()['error']['kind'], 'JobCancelled')
+        self.assertEqual(self.status(uid)['status'], 'cancelled')
+
+    def test_cancel_provision_after_create(self):
+        uid = self.provision()
+        wait_until(lambda: self.status(uid)['status'] == 'running')
+        self.client.post('/jobs/{}/cancel'.format(uid))
+        self.daemon.containers.release.set()
+        wait_until(lambda: self.status(uid)['status'] == 'cancelled')
+        self.assertEqual(self.daemon.containers.destroyed, ['c1'])
+
+    def test_discard_provision(self):
+        self.daemon.containers.release.set()
+        claimed = self.provision()
+        r = self.client.get('/jobs/{}/result?wait=5'.format(claimed))
+        self.assertEqual(r.get_json()['uid'], 'c1')
+
+        # containers whose jobs are deleted before their result has been
+        # retrieved are destroyed
+        deleted = self.provision()
+        wait_until(lambda: self.status(deleted)['status'] == 'succeeded')
+        r = self.client.delete('/jobs/{}'.format(deleted))
+        self.assertEqual(r.status_code, 204)
+        self.assertEqual(self.daemon.containers.destroyed, ['c2'])
+
+        # so are those whose jobs are pruned, but not those whose results
+        # have been retrieved
+        pruned = self.provision()
+        wait_until(lambda: self.status(pruned)['status'] == 'succeeded')
+        for _ in range(2):
+            uid = self.provision()
+            wait_until(lambda: self.status(uid)['status'] == 'succeeded')
+        r = self.client.get('/jobs/{}'.format(pruned))
+        self.assertEqual(r.status_code, 404)
+        self.assertEqual(r.get_json()['error']['kind'], 'JobNotFound')
+        self.assertEqual(self.daemon.containers.destroyed, ['c2', 'c3'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,167 @@
+#!/usr/bin/env python
+import re
+import socket
+import struct
+import threading
+import time
+import unittest
+
+from docker.utils.socket import STDERR, STDOUT
+
+from bugzoo.exceptions import BugZooException
+from bugzoo.mgr.session import ShellSession
+
+SENTINEL = re.compile(r"printf '\\n%s %d\\n' (\S+) \$\?$")
+
+
+def frame(data: bytes, stream: int = STDOUT) -> bytes:
+    return struct.pack('>BxxxL', stream, len(data)) + data
+
+
+class FakeShell(object):
+    """
+    Simulates a shell at the other end of a socket. Each command is answered
+    by a response that is given by the test: a sequence of raw chunks that
+    should be written to the socket, each of which may contain any number
+    of (partial) frames, or None if the shell should exit.
+    """
+    def __init__(self, sock: socket.socket) -> None:
+        self.sock = sock
+        self.commands = []
+        self.responses = []
+        self.release = threading.Event()
+        self.release.set()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def respond(self, sentinel: str, output: bytes, code: int = 0) -> None:
+        trailer = '\n{} {}\n'.format(sentinel, code).encode('utf-8')
+        self.responses.append([frame(output), frame(trailer)])
+
+    def run(self) -> None:
+        buff = b''
+        while True:
+            data = self.sock.recv(4096)
+            if not data:
+                return
+            buff += data
+            while b'\n' in buff:
+                line, buff = buff.split(b'\n', 1)
+                line = line.decode('utf-8')
+                self.commands.append(line)
+                if line == 'exit':
+                    self.sock.close()
+                    return
+                if not SENTINEL.search(line):
+                    continue
+                self.release.wait(5)
+                for chunk in self.responses.pop(0):
+                    if chunk is None:
+                        self.sock.close()
+                        return
+                    self.sock.sendall(chunk)
+                    time.sleep(0.01)
+
+
+class FakeDockerAPI(object):
+    def __init__(self) -> None:
+        self.socket, other = socket.socketpair()
+        self.shell = FakeShell(other)
+
+    def exec_create(self, container, cmd, **kwargs):
+        return {'Id': 'exec'}
+
+    def exec_start(self, exec_id, tty=False, socket=False):
+        assert socket
+        return self.socket
+
+
+class ShellSessionTestCase(unittest.TestCase):
+    def setUp(self):
+        self.api = FakeDockerAPI()
+        self.shell = self.api.shell
+        self.session = ShellSession(self.api, 'c1')
+
+    def tearDown(self):
+        self.shell.release.set()
+        self.session.close()
+
+    @property
+    def sentinel(self) -> str:
+        # the sentinel is private to the session
+        return self.session._ShellSession__sentinel
+
+    def test_execute(self):
+        self.shell.respond(self.sentinel, b'hello\nworld\n')
+        response = self.session.try_execute('echo hello', '/src')
+        self.assertEqual(response.code, 0)
+        self.assertEqual(response.output, 'hello\nworld')
+        command = self.shell.commands[-1]
+        self.assertEqual(self.shell.commands[0], 'source /.environment')
+        self.assertIn("'cd /src && echo hello'", command)
+        self.assertIn('2> /dev/null', command)
+
+        self.shell.respond(self.sentinel, b'', code=2)
+        response = self.session.try_execute('false', '/', stderr=True)
+        self.assertEqual(response.code, 2)
+        self.assertEqual(response.output, '')
+        self.assertIn('2>&1', self.shell.commands[-1])
+
+    def test_partial_reads(self):
+        output = b'x' * 10000 + b'\n'
+        trailer = '\n{} 3\n'.format(self.sentinel).encode('utf-8')
+        data = frame(output[:5000]) + frame(b'ignored', STDERR) + \
+            frame(output[5000:]) + frame(trailer[:10]) + frame(trailer[10:])
+        # split the frames, including their headers, across many writes
+        chunks = [data[i:i + 7] for i in range(0, 70, 7)]
+        chunks += [data[70:6000], data[6000:]]
+        self.shell.responses.append(chunks)
+        response = self.session.try_execute('./big', '/')
+        self.assertEqual(response.code, 3)
+        self.assertEqual(response.output, 'x' * 10000)
+
+    def test_output_contains_sentinel(self):
+        output = '\n{} is the sentinel\n'.format(self.sentinel)
+        self.shell.respond(self.sentinel, output.encode('utf-8'), code=1)
+        response = self.session.try_execute('cat notes', '/')
+        self.assertEqual(response.code, 1)
+        self.assertEqual(response.output, output.rstrip('\n'))
+
+        # the session remains usable
+        self.shell.respond(self.sentinel, b'ok\n')
+        self.assertEqual(self.session.try_execute('true', '/').output, 'ok')
+
+    def test_time_limit(self):
+        self.shell.respond(self.sentinel, b'', code=124)
+        response = self.session.try_execute('sleep 60', '/',
+                                            time_limit=5, kill_after=2)
+        self.assertEqual(response.code, 124)
+        command = self.shell.commands[-1]
+        self.assertTrue(command.startswith(
+            'timeout --kill-after=2 --signal=SIGTERM 5 /bin/bash -c'))
+
+    def test_busy(self):
+        self.shell.release.clear()
+        self.shell.respond(self.sentinel, b'slow\n')
+        responses = []
+        thread = threading.Thread(
+            target=lambda: responses.append(
+                self.session.try_execute('./slow', '/')))
+        thread.start()
+        while not any('./slow' in c for c in self.shell.commands):
+            time.sleep(0.01)
+        self.assertIsNone(self.session.try_execute('true', '/'))
+        self.shell.release.set()
+        thread.join(5)
+        self.assertEqual(responses[0].output, 'slow')
+
+    def test_closed_unexpectedly(self):
+        self.shell.responses.append([frame(b'partial output'), None])
+        with self.assertRaises(BugZooException):
+            self.session.try_execute('true', '/')
+        self.assertTrue(self.session.closed)
+        self.assertIsNone(self.session.try_execute('true', '/'))
+
+
+if __name__ == '__main__':
+    unittest.main()
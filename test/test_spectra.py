@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+import unittest
+
+import numpy
+
+from bugzoo.cmd import ExecResponse
+from bugzoo.core.coverage import TestCoverage, TestSuiteCoverage
+from bugzoo.core.fileline import FileLine, FileLineSet
+from bugzoo.core.localization import formulas, top_k
+from bugzoo.core.matrix import CoverageMatrix
+from bugzoo.core.spectra import Spectra
+from bugzoo.core.test import TestOutcome
+from bugzoo.exceptions import FormulaNotFound
+
+
+def build_coverage() -> TestSuiteCoverage:
+    def cov(name, passed, lines):
+        outcome = TestOutcome(ExecResponse(0 if passed else 1, 0.1, ''),
+                              passed)
+        return TestCoverage(name, outcome, FileLineSet(lines))
+    return TestSuiteCoverage({
+        'p1': cov('p1', True, {'foo.c': [1, 2, 3]}),
+        'p2': cov('p2', True, {'foo.c': [1, 2], 'bar.c': [10]}),
+        'n1': cov('n1', False, {'foo.c': [1, 3], 'bar.c': [10, 11]})})
+
+
+class CoverageMatrixTestCase(unittest.TestCase):
+    def test_from_coverage(self):
+        matrix = CoverageMatrix.from_coverage(build_coverage())
+        self.assertEqual(matrix.matrix.shape, (3, 5))
+        self.assertEqual(matrix.num_passing, 2)
+        self.assertEqual(matrix.num_failing, 1)
+        self.assertEqual(list(matrix.lines),
+                         [FileLine('bar.c', 10), FileLine('bar.c', 11),
+                          FileLine('foo.c', 1), FileLine('foo.c', 2),
+                          FileLine('foo.c', 3)])
+        self.assertEqual(matrix.lines.index(FileLine('foo.c', 2)), 3)
+        self.assertIsNone(matrix.lines.index(FileLine('foo.c', 4)))
+        row = matrix.tests.index('n1')
+        self.assertEqual(matrix.matrix[row].tolist(),
+                         [True, True, True, False, True])
+
+
+class SpectraTestCase(unittest.TestCase):
+    def test_from_coverage(self):
+        spectra = Spectra.from_coverage(build_coverage())
+        self.assertEqual(len(spectra), 5)
+        self.assertEqual(spectra.ep.tolist(), [1, 0, 2, 2, 1])
+        self.assertEqual(spectra.ef.tolist(), [1, 1, 1, 0, 1])
+        self.assertEqual(spectra.np.tolist(), [1, 2, 0, 0, 1])
+        self.assertEqual(spectra.nf.tolist(), [0, 0, 0, 1, 0])
+
+        line = spectra[FileLine('foo.c', 2)]
+        self.assertEqual((line.ep, line.ef, line.np, line.nf), (2, 0, 0, 1))
+        line = spectra[FileLine('qux.c', 1)]
+        self.assertEqual((line.ep, line.ef, line.np, line.nf), (0, 0, 2, 1))
+
+    def test_restricted_to_files(self):
+        spectra = Spectra.from_coverage(build_coverage())
+        spectra = spectra.restricted_to_files(['foo.c'])
+        self.assertEqual(list(spectra),
+                         [FileLine('foo.c', 1), FileLine('foo.c', 2),
+                          FileLine('foo.c', 3)])
+        self.assertEqual(spectra.ep.tolist(), [2, 2, 1])
+        self.assertEqual(spectra.ef.tolist(), [1, 0, 1])
+
+
+class LocalizationTestCase(unittest.TestCase):
+    def test_top_k(self):
+        scores = numpy.array([0.5, 1.0, 0.5, 0.0, 1.0])
+        self.assertEqual(top_k(scores).tolist(), [1, 4, 0, 2, 3])
+        self.assertEqual(top_k(scores, 3).tolist(), [1, 4, 0])
+        self.assertEqual(top_k(scores, 0).tolist(), [])
+
+    def test_rank(self):
+        spectra = Spectra.from_coverage(build_coverage())
+        ranking = spectra.rank('ochiai', limit=2)
+        self.assertEqual([line for (line, _) in ranking],
+                         [FileLine('bar.c', 11), FileLine('bar.c', 10)])
+        self.assertAlmostEqual(ranking[0][1], 1.0)
+        self.assertAlmostEqual(ranking[1][1], 0.5 ** 0.5)
+
+        for name in formulas():
+            ranking = spectra.rank(name)
+            self.assertEqual(len(ranking), len(spectra))
+            self.assertEqual(ranking[0][0], FileLine('bar.c', 11), name)
+
+        with self.assertRaises(FormulaNotFound):
+            spectra.rank('no-such-formula')
+
+
+if __name__ == '__main__':
+    unittest.main()
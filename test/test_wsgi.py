@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+from concurrent.futures import ThreadPoolExecutor
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+import unittest
+
+import flask
+import requests
+
+try:
+    import waitress
+except ImportError:
+    waitress = None
+
+from bugzoo.server import wsgi
+
+SERVER = """
+import sys
+import time
+import flask
+from bugzoo.server import wsgi
+
+app = flask.Flask(__name__)
+
+@app.route('/status')
+def status():
+    return '', 204
+
+@app.route('/slow')
+def slow():
+    time.sleep(1.0)
+    return 'done'
+
+wsgi.serve(app, host='127.0.0.1', port=int(sys.argv[1]), threads=4)
+"""
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+@unittest.skipIf(waitress is None, "requires waitress")
+class ServeTestCase(unittest.TestCase):
+    def setUp(self):
+        self.port = free_port()
+        self.url = 'http://127.0.0.1:{}'.format(self.port)
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        env = dict(os.environ, PYTHONPATH=root)
+        self.process = subprocess.Popen([sys.executable, '-c', SERVER,
+                                         str(self.port)],
+                                        env=env)
+        for _ in range(100):
+            try:
+                requests.get(self.url + '/status', timeout=1.0)
+                break
+            except requests.exceptions.ConnectionError:
+                time.sleep(0.05)
+
+    def tearDown(self):
+        if self.process.poll() is None:
+            self.process.kill()
+        self.process.wait()
+
+    def test_drain(self):
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            futures = [executor.submit(requests.get, self.url + '/slow')
+                       for _ in range(2)]
+            time.sleep(0.3)
+            self.process.send_signal(signal.SIGTERM)
+            responses = [f.result() for f in futures]
+
+        # in-progress requests are completed before the server stops
+        self.assertEqual([r.text for r in responses], ['done', 'done'])
+        self.process.wait(timeout=10)
+
+
+@unittest.skipIf(waitress is None, "requires waitress")
+class MultiSocketTestCase(unittest.TestCase):
+    def test_stop_accepting(self):
+        # servers that listen on several sockets share a single map
+        app = flask.Flask(__name__)
+        server = waitress.create_server(app,
+                                        listen='127.0.0.1:0 127.0.0.1:0',
+                                        threads=2)
+        try:
+            listeners = wsgi._listeners(server)
+            self.assertEqual(len(listeners), 2)
+            wsgi._stop_accepting(server)
+            self.assertFalse(any(l.accepting for l in listeners))
+
+            # worker threads are briefly active whilst they start
+            for _ in range(100):
+                if wsgi._is_idle(server):
+                    break
+                time.sleep(0.01)
+            self.assertTrue(wsgi._is_idle(server))
+        finally:
+            server.close()
+
+
+if __name__ == '__main__':
+    unittest.main()